@@ -2145,6 +2145,7 @@ class RouteSignature(NamedTuple):
     emit_timings: bool = False
     encode_message: Callable[[Any], bytes] | None = None
     decode_message: Callable[[bytes], Any] | None = None
+    backpressure: str = "block"
 
 
 class FalServer(uvicorn.Server):
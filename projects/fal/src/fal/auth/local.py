@@ -10,12 +10,20 @@ _TOKEN_FILE = "auth0_token"
 _LOCK_FILE = ".portalock"
 
 
+def get_home_dir() -> Path:
+    """
+    The directory fal keeps its local state in: FAL_HOME_DIR if set, ~/.fal
+    otherwise. It may not exist yet.
+    """
+    return Path(_FAL_HOME_DIR).expanduser()
+
+
 def _check_dir_exist():
     """
     Checks if a specific directory exists, creates if not.
     In case the user didn't set a custom dir, will turn to the default home
     """
-    dir = Path(_FAL_HOME_DIR).expanduser()
+    dir = get_home_dir()
 
     if not dir.exists():
         dir.mkdir(parents=True)
@@ -1,3 +1,14 @@
-from fal.distributed.worker import DistributedRunner, DistributedWorker  # noqa
+from fal.distributed.utils import PreviewConfig, register_encoder  # noqa
+from fal.distributed.worker import (  # noqa
+    DistributedRunner,
+    DistributedWorker,
+    PreviewStats,
+)
 
-__all__ = ["DistributedRunner", "DistributedWorker"]
+__all__ = [
+    "DistributedRunner",
+    "DistributedWorker",
+    "PreviewConfig",
+    "PreviewStats",
+    "register_encoder",
+]
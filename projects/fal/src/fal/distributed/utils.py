@@ -1,18 +1,49 @@
 import base64
 import datetime
 import json
+import mmap
 import os
 import pickle
 import threading
+import uuid
 import warnings
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 if TYPE_CHECKING:
     import torch.multiprocessing as mp
 
+# Array buffers at least this large are handed over to the receiving process
+# through shared memory rather than copied through the socket.
+SHARED_MEMORY_THRESHOLD = 16 * 1024 * 1024
+SHARED_MEMORY_DIR = "/dev/shm"
+SHARED_MEMORY_PREFIX = "fal-distributed-"
+
+
+_TYPE_NAMES: Dict[type, frozenset] = {}
+
+
+def _type_names(cls: type) -> frozenset:
+    """
+    The names of the types in the MRO of a type, computed once per type.
+    """
+    names = _TYPE_NAMES.get(cls)
+    if names is None:
+        names = _TYPE_NAMES[cls] = frozenset(t.__name__ for t in cls.mro())
+    return names
+
 
 def has_type_name(maybe_type: Any, type_name: str) -> bool:
     """
@@ -25,8 +56,7 @@ def has_type_name(maybe_type: Any, type_name: str) -> bool:
     if not isinstance(maybe_type, type):
         maybe_type = type(maybe_type)
 
-    mro_types = [t.__name__ for t in maybe_type.mro()]
-    return type_name in mro_types
+    return type_name in _type_names(maybe_type)
 
 
 def is_torch_tensor(obj: Any) -> bool:
@@ -50,115 +80,264 @@ def is_pil_image(obj: Any) -> bool:
     return has_type_name(obj, "Image")
 
 
-def format_for_serialization(
-    response: Any,
-    image_format: str = "jpeg",
-    is_final: bool = False,
-    as_data_urls: bool = False,
-) -> Any:
+@dataclass(frozen=True)
+class PreviewConfig:
     """
-    Formats the response for serialization.
-    Most importantly, it encodes images to base64 and returns the image format and size.
-    :param response: The response to format.
-    :param is_final: Whether this is the final response.
-    :return: The formatted response.
+    How the images in intermediate (streamed) results are encoded.
+
+    When set as a worker's `preview_config`, its streaming results are encoded on
+    a background thread rather than by the code adding them, so they must not
+    be modified in place once added.
     """
-    if is_torch_tensor(response):
-        import torch
 
-        with BytesIO() as buffer:
-            torch.save(response.detach().cpu(), buffer)
-            tensor_bytes = buffer.getvalue()
+    # "jpeg" or "webp"
+    format: str = "jpeg"
+    quality: int = 60
+    # Images are downscaled to fit in a square of this size
+    max_size: Optional[int] = None
+    # Whether to only keep the latest result when results are added faster than
+    # they are encoded, dropping the older ones that are still pending
+    drop_stale: bool = True
+
+
+DEFAULT_PREVIEW_CONFIG = PreviewConfig()
 
-        if as_data_urls:
-            base64_tensor = base64.b64encode(tensor_bytes).decode("utf-8")
-            data = None
-            url = f"data:application/tensor;base64,{base64_tensor}"
-        else:
-            data = tensor_bytes
-            url = None
 
+class _FormatOptions(NamedTuple):
+    image_format: str
+    is_final: bool
+    as_data_urls: bool
+    raw_arrays: bool
+    preview: PreviewConfig = DEFAULT_PREVIEW_CONFIG
+
+
+# Formats a value for serialization, given the formatting options
+_Formatter = Callable[[Any, _FormatOptions], Any]
+
+
+def _format_tensor(response: Any, options: _FormatOptions) -> Any:
+    import torch
+
+    if options.raw_arrays:
+        tensor = response.detach().cpu().contiguous()
         return {
             "content_type": "application/tensor",
-            "shape": response.shape,
-            "dtype": str(response.dtype),
-            "data": data,
-            "url": url,
+            "shape": tuple(tensor.shape),
+            "dtype": str(tensor.dtype),
+            # Viewed as bytes, since NumPy lacks some of torch's dtypes
+            "data": tensor.reshape(-1).view(torch.uint8).numpy(),
+            "url": None,
         }
-    if is_numpy_array(response):
-        import numpy as np
 
-        with BytesIO() as buffer:
-            np.save(buffer, response)
-            array_bytes = buffer.getvalue()
+    with BytesIO() as buffer:
+        torch.save(response.detach().cpu(), buffer)
+        tensor_bytes = buffer.getvalue()
 
-        if as_data_urls:
-            base64_array = base64.b64encode(array_bytes).decode("utf-8")
-            data = None
-            url = f"data:application/ndarray;base64,{base64_array}"
-        else:
-            data = array_bytes
-            url = None
+    if options.as_data_urls:
+        base64_tensor = base64.b64encode(tensor_bytes).decode("utf-8")
+        data = None
+        url = f"data:application/tensor;base64,{base64_tensor}"
+    else:
+        data = tensor_bytes
+        url = None
+
+    return {
+        "content_type": "application/tensor",
+        "shape": response.shape,
+        "dtype": str(response.dtype),
+        "data": data,
+        "url": url,
+    }
 
+
+def _format_ndarray(response: Any, options: _FormatOptions) -> Any:
+    if options.raw_arrays:
         return {
             "content_type": "application/ndarray",
             "shape": response.shape,
             "dtype": str(response.dtype),
-            "data": data,
-            "url": url,
+            "data": response,
+            "url": None,
         }
-    elif is_pil_image(response):
-        width, height = response.size
-
-        with BytesIO() as buffer:
-            if is_final:
-                if image_format == "jpeg":
-                    response.save(buffer, format="jpeg", quality=95)
-                else:
-                    response.save(buffer, format=image_format)
-            else:
-                image_format = "jpeg"
-                response.save(buffer, format="jpeg", quality=60)
 
-            image_bytes = buffer.getvalue()
+    import numpy as np
+
+    with BytesIO() as buffer:
+        np.save(buffer, response)
+        array_bytes = buffer.getvalue()
 
-        if as_data_urls:
-            base64_image = base64.b64encode(image_bytes).decode("utf-8")
-            url = f"data:image/{image_format};base64,{base64_image}"
-            data = None
+    if options.as_data_urls:
+        base64_array = base64.b64encode(array_bytes).decode("utf-8")
+        data = None
+        url = f"data:application/ndarray;base64,{base64_array}"
+    else:
+        data = array_bytes
+        url = None
+
+    return {
+        "content_type": "application/ndarray",
+        "shape": response.shape,
+        "dtype": str(response.dtype),
+        "data": data,
+        "url": url,
+    }
+
+
+def _format_image(response: Any, options: _FormatOptions) -> Any:
+    image_format = options.image_format
+    preview = options.preview
+    if (
+        not options.is_final
+        and preview.max_size is not None
+        and max(response.size) > preview.max_size
+    ):
+        response = response.copy()
+        response.thumbnail((preview.max_size, preview.max_size))
+    width, height = response.size
+
+    with BytesIO() as buffer:
+        if options.is_final:
+            if image_format == "jpeg":
+                response.save(buffer, format="jpeg", quality=95)
+            else:
+                response.save(buffer, format=image_format)
         else:
-            url = None
-            data = image_bytes
+            image_format = preview.format
+            response.save(buffer, format=image_format, quality=preview.quality)
 
+        image_bytes = buffer.getvalue()
+
+    if options.as_data_urls:
+        base64_image = base64.b64encode(image_bytes).decode("utf-8")
+        url = f"data:image/{image_format};base64,{base64_image}"
+        data = None
+    else:
+        url = None
+        data = image_bytes
+
+    return {
+        "content_type": f"image/{image_format}",
+        "width": width,
+        "height": height,
+        "data": data,
+        "url": url,
+    }
+
+
+def _format_list(response: list, options: _FormatOptions) -> Any:
+    return [_format(item, options) for item in response]
+
+
+def _format_dict(response: dict, options: _FormatOptions) -> Any:
+    return {key: _format(value, options) for key, value in response.items()}
+
+
+class _Encoder(NamedTuple):
+    content_type: str
+    encode: Callable[[Any], Any]
+
+
+def _custom_formatter(encoder: _Encoder) -> _Formatter:
+    def format_custom(response: Any, options: _FormatOptions) -> Any:
         return {
-            "content_type": f"image/{image_format}",
-            "width": width,
-            "height": height,
-            "data": data,
-            "url": url,
-        }
-    elif isinstance(response, list):
-        return [
-            format_for_serialization(
-                item,
-                image_format=image_format,
-                is_final=is_final,
-                as_data_urls=as_data_urls,
-            )
-            for item in response
-        ]
-    elif isinstance(response, dict):
-        return {
-            key: format_for_serialization(
-                value,
-                image_format=image_format,
-                is_final=is_final,
-                as_data_urls=as_data_urls,
-            )
-            for key, value in response.items()
+            "content_type": encoder.content_type,
+            "data": _format(encoder.encode(response), options),
         }
 
-    return response
+    return format_custom
+
+
+# Custom encoders and decoders, by type and by content type
+_ENCODERS: Dict[type, _Encoder] = {}
+_DECODERS: Dict[str, Callable[[Any], Any]] = {}
+# The formatter of each type formatted so far, None for values that are
+# serialized as they are
+_FORMATTERS: Dict[type, Optional[_Formatter]] = {
+    str: None,
+    int: None,
+    float: None,
+    bool: None,
+    bytes: None,
+    type(None): None,
+}
+
+
+def _find_formatter(cls: type) -> Optional[_Formatter]:
+    for base in cls.mro():
+        if base in _ENCODERS:
+            return _custom_formatter(_ENCODERS[base])
+
+    if has_type_name(cls, "Tensor"):
+        return _format_tensor
+    elif has_type_name(cls, "ndarray"):
+        return _format_ndarray
+    elif has_type_name(cls, "Image"):
+        return _format_image
+    elif issubclass(cls, list):
+        return _format_list
+    elif issubclass(cls, dict):
+        return _format_dict
+    return None
+
+
+def _format(response: Any, options: _FormatOptions) -> Any:
+    cls = type(response)
+    try:
+        formatter = _FORMATTERS[cls]
+    except KeyError:
+        formatter = _FORMATTERS[cls] = _find_formatter(cls)
+
+    if formatter is None:
+        return response
+    return formatter(response, options)
+
+
+def register_encoder(
+    cls: type,
+    content_type: str,
+    encode: Callable[[Any], Any],
+    decode: Optional[Callable[[Any], Any]] = None,
+) -> None:
+    """
+    Registers how instances of a type (and its subclasses) are serialized in
+    distributed responses.
+    :param cls: The type to encode.
+    :param content_type: The content type of the encoded values, which selects
+        the decoder on deserialization.
+    :param encode: Converts an instance to a value that can be serialized,
+        which may contain images, tensors and arrays.
+    :param decode: Converts the encoded value back. If not given, deserialized
+        responses contain the encoded value.
+    """
+    _ENCODERS[cls] = _Encoder(content_type, encode)
+    if decode is not None:
+        _DECODERS[content_type] = decode
+    # Types may now be formatted differently
+    _FORMATTERS.clear()
+
+
+def format_for_serialization(
+    response: Any,
+    image_format: str = "jpeg",
+    is_final: bool = False,
+    as_data_urls: bool = False,
+    raw_arrays: bool = False,
+    preview: PreviewConfig = DEFAULT_PREVIEW_CONFIG,
+) -> Any:
+    """
+    Formats the response for serialization.
+    Most importantly, it encodes images to base64 and returns the image format and size.
+    :param response: The response to format.
+    :param is_final: Whether this is the final response.
+    :param raw_arrays: Whether to keep the data of tensors and arrays as NumPy
+        arrays, for their buffers to be pickled out-of-band.
+    :param preview: How images are encoded if this isn't the final response.
+    :return: The formatted response.
+    """
+    return _format(
+        response,
+        _FormatOptions(image_format, is_final, as_data_urls, raw_arrays, preview),
+    )
 
 
 def format_deserialized_data(data: Any) -> Any:
@@ -168,7 +347,22 @@ def format_deserialized_data(data: Any) -> Any:
     :return: The formatted data.
     """
     if isinstance(data, dict):
-        if data.get("content_type", "").startswith("image/"):
+        content_type = data.get("content_type")
+        decoder = _DECODERS.get(content_type) if isinstance(content_type, str) else None
+        if decoder is not None:
+            return decoder(format_deserialized_data(data["data"]))
+        elif is_numpy_array(data.get("data")):
+            if data["content_type"] == "application/tensor":
+                import torch
+
+                with warnings.catch_warnings():
+                    # The array is read-only if its buffer is
+                    warnings.simplefilter("ignore", UserWarning)
+                    tensor = torch.from_numpy(data["data"])
+                dtype = getattr(torch, data["dtype"].split(".")[-1])
+                return tensor.view(dtype).reshape(data["shape"])
+            return data["data"]
+        elif data.get("content_type", "").startswith("image/"):
             from PIL import Image
 
             # Deserialize image data
@@ -235,17 +429,160 @@ def distributed_serialize(
     return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
 
 
+def _write_shared_memory(buffer: memoryview) -> str:
+    """
+    Copies a buffer to a new shared memory file.
+    :return: The name of the file, which the reader removes.
+    """
+    name = f"{SHARED_MEMORY_PREFIX}{uuid.uuid4().hex}"
+    path = os.path.join(SHARED_MEMORY_DIR, name)
+    fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_RDWR, 0o600)
+    try:
+        os.ftruncate(fd, buffer.nbytes)
+        with mmap.mmap(fd, buffer.nbytes) as shared:
+            shared[:] = buffer
+    except BaseException:
+        os.unlink(path)
+        raise
+    finally:
+        os.close(fd)
+    return name
+
+
+def _read_shared_memory(name: str) -> memoryview:
+    """
+    Maps a shared memory file written by `_write_shared_memory` and removes it.
+    The memory is released once the returned buffer is no longer referenced.
+    """
+    if not name.startswith(SHARED_MEMORY_PREFIX) or os.sep in name:
+        raise ValueError(f"Invalid shared memory name: {name}")
+
+    path = os.path.join(SHARED_MEMORY_DIR, name)
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.unlink(path)
+        return memoryview(mmap.mmap(fd, os.fstat(fd).st_size))
+    finally:
+        os.close(fd)
+
+
+def distributed_serialize_frames(
+    obj: Any,
+    is_final: bool = False,
+    image_format: str = "jpeg",
+    copy_buffers: bool = False,
+    shared_memory_threshold: Optional[int] = SHARED_MEMORY_THRESHOLD,
+    preview: PreviewConfig = DEFAULT_PREVIEW_CONFIG,
+) -> List[Any]:
+    """
+    Serializes an object to ZeroMQ message frames. Unlike `distributed_serialize`,
+    the data of tensors and arrays isn't copied into the pickled object but sent
+    as separate frames (or through shared memory, for buffers of at least
+    `shared_memory_threshold` bytes), with only their dtype and shape pickled.
+    :param obj: The object to serialize.
+    :param copy_buffers: Whether to copy the data of tensors and arrays, for the
+        object to be safely modified before the frames are sent.
+    :param shared_memory_threshold: The minimum size of the buffers to hand over
+        through shared memory, or None to send all buffers as frames. Frames
+        with shared memory must be read by a process on the same host.
+    :param preview: How images are encoded if this isn't the final response.
+    :return: The frames: a header, the pickled object, and the buffers.
+    """
+    data = format_for_serialization(
+        obj,
+        is_final=is_final,
+        image_format=image_format,
+        raw_arrays=True,
+        preview=preview,
+    )
+    buffers: List[pickle.PickleBuffer] = []
+    pickled = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+
+    shared_memory: List[Optional[str]] = []
+    frames: List[Any] = []
+    use_shared_memory = shared_memory_threshold is not None and os.path.isdir(
+        SHARED_MEMORY_DIR
+    )
+    try:
+        for buffer in buffers:
+            raw = buffer.raw()
+            # Empty buffers can't be mapped, and are cheaper to send as frames
+            if (
+                use_shared_memory
+                and raw.nbytes > 0
+                and raw.nbytes >= shared_memory_threshold  # type: ignore[operator]
+            ):
+                shared_memory.append(_write_shared_memory(raw))
+                frames.append(b"")
+            else:
+                shared_memory.append(None)
+                frames.append(raw.tobytes() if copy_buffers else raw)
+    except BaseException:
+        release_frames([json.dumps(shared_memory).encode(), pickled])
+        raise
+
+    return [json.dumps(shared_memory).encode(), pickled, *frames]
+
+
+def distributed_deserialize_frames(frames: Sequence[Any]) -> Any:
+    """
+    Deserializes the frames of `distributed_serialize_frames`. Arrays and tensors
+    share the memory of the frames they were received in. A single frame is
+    deserialized with `distributed_deserialize`.
+    :param frames: The frames, either bytes or `zmq.Frame`s.
+    :return: The deserialized object.
+    """
+    buffers = [getattr(frame, "buffer", frame) for frame in frames]
+    if len(buffers) == 1:
+        return distributed_deserialize(bytes(buffers[0]))
+
+    shared_memory = json.loads(bytes(buffers[0]))
+    array_buffers = [
+        _read_shared_memory(name) if name else buffer
+        for name, buffer in zip(shared_memory, buffers[2:])
+    ]
+    data = pickle.loads(buffers[1], buffers=array_buffers)
+    return format_deserialized_data(data)
+
+
+def release_frames(frames: Sequence[Any]) -> None:
+    """
+    Frees the shared memory of frames that won't be deserialized.
+    :param frames: The frames, either bytes or `zmq.Frame`s.
+    """
+    if len(frames) < 2:
+        return
+    try:
+        shared_memory = json.loads(bytes(getattr(frames[0], "buffer", frames[0])))
+    except ValueError:
+        return
+    for name in shared_memory:
+        if name and name.startswith(SHARED_MEMORY_PREFIX) and os.sep not in name:
+            try:
+                os.unlink(os.path.join(SHARED_MEMORY_DIR, name))
+            except OSError:
+                pass
+
+
 def encode_text_event(
-    obj: Any, is_final: bool = False, image_format: str = "jpeg"
+    obj: Any,
+    is_final: bool = False,
+    image_format: str = "jpeg",
+    preview: PreviewConfig = DEFAULT_PREVIEW_CONFIG,
 ) -> bytes:
     """
     Encodes a text response as a JSON string.
     :param response: The text response to encode.
     :param is_final: Whether this is the final response.
+    :param preview: How images are encoded if this isn't the final response.
     :return: The encoded JSON string.
     """
     formatted = format_for_serialization(
-        obj, image_format=image_format, is_final=is_final, as_data_urls=True
+        obj,
+        image_format=image_format,
+        is_final=is_final,
+        as_data_urls=True,
+        preview=preview,
     )
     return f"data: {json.dumps(formatted)}\n\n".encode()
 
@@ -273,6 +610,7 @@ def wrap_distributed_worker(
     cwd: Optional[Union[str, Path]],
     args: Tuple[Any],
     kwargs: Dict[str, Any],
+    backend: str = "nccl",
 ) -> None:
     """
     Worker function for distributed training or inference.
@@ -285,6 +623,7 @@ def wrap_distributed_worker(
     :param rank: The rank of the current process.
     :param master_addr: The address of the master node.
     :param master_port: The port on which the master node will listen.
+    :param backend: The torch.distributed backend, e.g. "gloo" for CPU workers.
     """
     import torch
     import torch.distributed as dist
@@ -300,12 +639,12 @@ def wrap_distributed_worker(
 
     print(f"[debug] Worker {rank} started with PID {os.getpid()}.")
     dist.init_process_group(
-        backend="nccl",
+        backend=backend,
         init_method="env://",
         world_size=world_size,
         rank=rank,
         timeout=datetime.timedelta(seconds=timeout),
-        device_id=torch.device(f"cuda:{rank}"),
+        device_id=torch.device(f"cuda:{rank}") if backend == "nccl" else None,
     )
 
     try:
@@ -322,6 +661,7 @@ def launch_distributed_processes(
     timeout: int = 1800,
     cwd: Optional[Union[str, Path]] = None,
     *args: Any,
+    backend: str = "nccl",
     **kwargs: Any,
 ) -> "mp.ProcessContext":
     """
@@ -332,6 +672,7 @@ def launch_distributed_processes(
     :param world_size: The total number of processes to spawn.
     :param master_addr: The address of the master node.
     :param master_port: The port on which the master node will listen.
+    :param backend: The torch.distributed backend, e.g. "gloo" for CPU workers.
     :return: The process context for the spawned processes.
     """
 
@@ -367,6 +708,7 @@ def launch_distributed_processes(
             cwd,
             args,
             kwargs,
+            backend,
         ),
         nprocs=world_size,
         join=False,
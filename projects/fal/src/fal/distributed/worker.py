@@ -5,24 +5,33 @@ import inspect
 import os
 import pickle
 import queue
+import tempfile
 import threading
 import time
 import traceback
 import uuid
 import warnings
+from collections import deque
 from collections.abc import AsyncIterator, Callable, Coroutine
 from concurrent.futures import Future
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional, Union
 
 from fal.distributed.utils import (
+    DEFAULT_PREVIEW_CONFIG,
+    SHARED_MEMORY_THRESHOLD,
     KeepAliveTimer,
+    PreviewConfig,
     distributed_deserialize,
+    distributed_deserialize_frames,
     distributed_serialize,
+    distributed_serialize_frames,
     encode_text_event,
     launch_distributed_processes,
+    release_frames,
 )
 
 if TYPE_CHECKING:
@@ -30,16 +39,131 @@ if TYPE_CHECKING:
     import torch.multiprocessing as mp
     from zmq.sugar.socket import Socket
 
+# How often a request waiting for a response checks that the workers are alive.
+LIVENESS_CHECK_INTERVAL = 1.0
+# How long rank 0 waits for the other ranks to subscribe to its commands.
+FANOUT_SUBSCRIBE_TIMEOUT = 60.0
+
+
+@dataclass
+class PreviewStats:
+    """
+    Counters of a worker's preview encoder.
+    """
+
+    # Streaming results added by the worker
+    submitted: int = 0
+    # Results that were encoded and queued to be sent
+    encoded: int = 0
+    # Results that were replaced by a newer one before they were encoded
+    dropped: int = 0
+    encode_seconds: float = 0.0
+    max_encode_seconds: float = 0.0
+
+    @property
+    def mean_encode_seconds(self) -> float:
+        return self.encode_seconds / self.encoded if self.encoded else 0.0
+
+
+class _PreviewEncoder:
+    """
+    Encodes a worker's streaming results on a background thread, so that adding
+    them doesn't hold up the generation, and puts the frames into the worker's
+    queue in the order the results were added.
+    """
+
+    def __init__(self, worker: DistributedWorker, config: PreviewConfig) -> None:
+        self.worker = worker
+        self.config = config
+        self.stats = PreviewStats()
+        # (is_result, encode), or (False, None) for the end of a stream
+        self._pending: deque[tuple[bool, Optional[Callable[[], list[Any]]]]] = deque()
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, encode: Callable[[], list[Any]]) -> None:
+        """
+        Queue a result to be encoded by `encode`.
+        """
+        with self._condition:
+            self.stats.submitted += 1
+            if self.config.drop_stale:
+                # Only the results added since the last error or end of stream
+                # are dropped, the client still gets those.
+                while self._pending and self._pending[-1][0]:
+                    self._pending.pop()
+                    self.stats.dropped += 1
+            self._pending.append((True, encode))
+            self._condition.notify()
+
+    def submit_error(self, frames: list[Any]) -> None:
+        with self._condition:
+            self._pending.append((False, lambda: frames))
+            self._condition.notify()
+
+    def end_stream(self) -> None:
+        """
+        Put the end of stream marker into the worker's queue once the pending
+        results are encoded.
+        """
+        with self._condition:
+            self._pending.append((False, None))
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                is_result, encode = self._pending.popleft()
+
+            if encode is None:
+                self.worker.queue.put_nowait(None)
+                continue
+
+            start = time.perf_counter()
+            try:
+                frames = encode()
+            except Exception as e:
+                frames = [distributed_serialize({"error": str(e)}, is_final=False)]
+            elapsed = time.perf_counter() - start
+
+            if is_result:
+                with self._condition:
+                    self.stats.encoded += 1
+                    self.stats.encode_seconds += elapsed
+                    self.stats.max_encode_seconds = max(
+                        self.stats.max_encode_seconds, elapsed
+                    )
+            self.worker.queue.put_nowait(frames)
+
 
 class DistributedWorker:
     """
     A base class for distributed workers.
     """
 
-    queue: queue.Queue[bytes]
+    queue: queue.Queue[Optional[list[Any]]]
     loop: asyncio.AbstractEventLoop
     thread: threading.Thread
 
+    # Dynamic batching: when greater than 1, rank 0 collects up to this many
+    # invocations that arrive within `batch_timeout` seconds of the first one
+    # and runs them with a single call to `batch`.
+    max_batch_size: int = 1
+    batch_timeout: float = 0.005
+
+    # Whether request payloads are sent to all ranks. When False, only rank 0
+    # reads them and the other ranks are called with an empty payload, e.g. for
+    # workers that share what they need from rank 0 with their own collectives.
+    broadcast_payload: bool = True
+
+    # How the images in streaming results are encoded. When set, results are
+    # encoded on a background thread, and those the client hasn't been sent
+    # yet are replaced by newer ones if `drop_stale` is set.
+    preview_config: Optional[PreviewConfig] = None
+
     def __init__(
         self,
         rank: int = 0,
@@ -48,6 +172,7 @@ class DistributedWorker:
         self.rank = rank
         self.world_size = world_size
         self.queue = queue.Queue()
+        self._preview_encoder: Optional[_PreviewEncoder] = None
 
         try:
             import uvloop
@@ -90,13 +215,25 @@ class DistributedWorker:
         """
         return self.thread.is_alive()
 
+    @property
+    def preview_stats(self) -> Optional[PreviewStats]:
+        """
+        :return: The counters of the preview encoder, if `preview_config` is set.
+        """
+        encoder = self._preview_encoder
+        if encoder is None:
+            return None
+        with encoder._condition:
+            return PreviewStats(**vars(encoder.stats))
+
     def initialize(self, **kwargs: Any) -> None:
         """
         Initialize the worker.
         """
         import torch
 
-        torch.cuda.set_device(self.device)
+        if self.device.type == "cuda":
+            torch.cuda.set_device(self.device)
         self.rank_print(f"Initializing worker on device {self.device}")
 
         setup_start = time.time()
@@ -115,26 +252,68 @@ class DistributedWorker:
         Add a streaming result to the queue.
         :param result: The result to add to the queue.
         """
-        if as_text_event:
-            serialized = encode_text_event(
-                result, is_final=False, image_format=image_format
+        encoder = self._get_preview_encoder()
+        if encoder is None:
+            self.queue.put_nowait(
+                self._encode_streaming_result(result, image_format, as_text_event)
             )
-        else:
-            serialized = distributed_serialize(
-                result, is_final=False, image_format=image_format
+        elif self.rank == 0:
+            # Only the results of rank 0 are sent
+            encoder.submit(
+                partial(
+                    self._encode_streaming_result, result, image_format, as_text_event
+                )
             )
 
-        self.queue.put_nowait(serialized)
-
     def add_streaming_error(self, error: Exception) -> None:
         """
         Add an error to the queue.
         :param error: The error to add to the queue.
         """
-        self.queue.put_nowait(
-            distributed_serialize({"error": str(error)}, is_final=False)
+        frames = [distributed_serialize({"error": str(error)}, is_final=False)]
+        encoder = self._get_preview_encoder()
+        if encoder is None:
+            self.queue.put_nowait(frames)
+        elif self.rank == 0:
+            # Sent after the results that were added before it
+            encoder.submit_error(frames)
+
+    def _get_preview_encoder(self) -> Optional[_PreviewEncoder]:
+        if self.preview_config is not None and self._preview_encoder is None:
+            self._preview_encoder = _PreviewEncoder(self, self.preview_config)
+        return self._preview_encoder
+
+    def _encode_streaming_result(
+        self, result: Any, image_format: str, as_text_event: bool
+    ) -> list[Any]:
+        preview = self.preview_config or DEFAULT_PREVIEW_CONFIG
+        if as_text_event:
+            return [
+                encode_text_event(
+                    result, is_final=False, image_format=image_format, preview=preview
+                )
+            ]
+        return distributed_serialize_frames(
+            result,
+            is_final=False,
+            image_format=image_format,
+            # The result may be modified by the caller before it is sent
+            copy_buffers=True,
+            # Only the results of rank 0 are sent
+            shared_memory_threshold=SHARED_MEMORY_THRESHOLD if self.rank == 0 else None,
+            preview=preview,
         )
 
+    def _end_stream(self) -> None:
+        """
+        Mark the end of the streaming results of the current call.
+        """
+        encoder = self._preview_encoder
+        if encoder is None:
+            self.queue.put_nowait(None)
+        else:
+            encoder.end_stream()
+
     def rank_print(self, message: str, debug: bool = False) -> None:
         """
         Print a message with the rank of the current worker.
@@ -217,6 +396,160 @@ class DistributedWorker:
         """
         return {}
 
+    def batch(self, payloads: list[dict[str, Any]]) -> list[Any]:
+        """
+        Override this method to run several invocations at once when
+        `max_batch_size` is greater than 1.
+        :param payloads: The payloads of the batched invocations.
+        :return: The result of each invocation, in the order of the payloads.
+        """
+        return [self(**payload) for payload in payloads]
+
+
+class _CommandFanout:
+    """
+    Forwards the commands rank 0 receives from the runner to the other ranks
+    as they were received, over a ZeroMQ XPUB socket, instead of pickling them
+    into torch.distributed collectives.
+    """
+
+    def __init__(self, context: Any, address: str, subscribers: int) -> None:
+        import zmq
+
+        self.subscribers = subscribers
+        self.socket = context.socket(zmq.XPUB)
+        # Never drop commands, and report every subscription, not only the
+        # first one for each topic
+        self.socket.setsockopt(zmq.SNDHWM, 0)
+        self.socket.setsockopt(zmq.XPUB_VERBOSE, 1)
+        self.socket.bind(address)
+
+    def wait_for_subscribers(self, timeout: float = FANOUT_SUBSCRIBE_TIMEOUT) -> None:
+        """
+        Wait until all the other ranks have subscribed, since commands sent
+        before a rank subscribed would never reach it.
+        """
+        subscribed = 0
+        deadline = time.perf_counter() + timeout
+        while subscribed < self.subscribers:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not self.socket.poll(timeout=int(remaining * 1000)):
+                raise TimeoutError(
+                    f"Only {subscribed} of {self.subscribers} ranks subscribed "
+                    f"to commands after {timeout} seconds."
+                )
+            if self.socket.recv().startswith(b"\x01"):
+                subscribed += 1
+
+    def send(self, parts: list[bytes]) -> None:
+        self.socket.send_multipart(parts, copy=False)
+
+    def close(self) -> None:
+        self.socket.close(linger=0)
+
+
+class _CommandSubscriber:
+    """
+    Receives the commands forwarded by rank 0's `_CommandFanout`.
+    """
+
+    def __init__(self, context: Any, address: str) -> None:
+        import zmq
+
+        self.socket = context.socket(zmq.SUB)
+        self.socket.setsockopt(zmq.RCVHWM, 0)
+        self.socket.setsockopt(zmq.SUBSCRIBE, b"")
+        self.socket.connect(address)
+
+    def recv(self) -> list[bytes]:
+        return self.socket.recv_multipart()
+
+    def close(self) -> None:
+        self.socket.close(linger=0)
+
+
+def _is_done(frames: list[Any]) -> bool:
+    """
+    Whether the frames of a response are the DONE message ending a stream.
+    """
+    return len(frames) == 1 and bytes(frames[0]) == b"DONE"
+
+
+def _wake_waiter(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class _ResponseDispatcher:
+    """
+    Reads the responses of rank 0 from the runner's socket and routes them to
+    the requests waiting for them by request ID, waking them as soon as a
+    response arrives. Responses to requests that are no longer waiting for them
+    (e.g. cancelled ones) are discarded.
+    """
+
+    def __init__(self, socket: Socket[Any]) -> None:
+        self.socket = socket
+        self._requests: dict[bytes, tuple[asyncio.Queue[Any], bool]] = {}
+        self._reader: Optional[asyncio.Task[None]] = None
+
+    def register(self, request_id: bytes, streaming: bool) -> asyncio.Queue[Any]:
+        """
+        Start routing the responses to a request.
+        :param request_id: The request ID.
+        :param streaming: Whether responses are routed until a DONE message
+            rather than only the first one.
+        :return: The queue the responses (or a reading error) are put into.
+        """
+        responses: asyncio.Queue[Any] = asyncio.Queue()
+        self._requests[request_id] = (responses, streaming)
+        loop = asyncio.get_running_loop()
+        if (
+            self._reader is None
+            or self._reader.done()
+            or self._reader.get_loop() is not loop
+        ):
+            self._reader = loop.create_task(self._read())
+        return responses
+
+    def unregister(self, request_id: bytes, responses: asyncio.Queue[Any]) -> None:
+        """
+        Stop routing the responses to a request, freeing the shared memory of
+        the responses it didn't read.
+        :param request_id: The request ID.
+        :param responses: The queue returned by `register` for the request.
+        """
+        self._requests.pop(request_id, None)
+        while not responses.empty():
+            frames = responses.get_nowait()
+            if not isinstance(frames, Exception):
+                release_frames(frames)
+        if not self._requests and self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+
+    async def _read(self) -> None:
+        try:
+            while self._requests:
+                rank, request_id, *frames = await self.socket.recv_multipart(copy=False)  # type: ignore[misc]
+                assert bytes(rank) == b"0", "Expected response from worker with rank 0"
+
+                entry = self._requests.get(bytes(request_id))
+                if entry is None:
+                    # Stale response from other request, discard and continue
+                    print("[debug] Discarding stale response")
+                    release_frames(frames)
+                    continue
+
+                responses, streaming = entry
+                responses.put_nowait(frames)
+                if not streaming or _is_done(frames):
+                    del self._requests[bytes(request_id)]
+        except Exception as e:
+            for responses, _ in self._requests.values():
+                responses.put_nowait(e)
+            self._requests.clear()
+
 
 class DistributedRunner:
     """
@@ -227,6 +560,7 @@ class DistributedRunner:
     context: Optional[mp.ProcessContext]
     keepalive_timer: Optional[KeepAliveTimer]
     _lock: threading.Lock
+    _slot_waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]]
 
     def __init__(
         self,
@@ -241,6 +575,8 @@ class DistributedRunner:
         keepalive_interval: Optional[Union[int, float]] = None,
         cwd: Optional[Union[str, Path]] = None,
         set_device: Optional[bool] = None,  # deprecated
+        backend: str = "nccl",
+        max_concurrent_requests: int = 1,
     ) -> None:
         self.worker_cls = worker_cls
         self.world_size = world_size
@@ -250,12 +586,24 @@ class DistributedRunner:
         self.worker_port = worker_port
         self.timeout = timeout
         self.cwd = cwd
+        self.backend = backend
+        # Rank 0 forwards commands to the other ranks, which always run on
+        # the same host, over this address
+        self.fanout_address = (
+            f"ipc://{tempfile.gettempdir()}/fal-distributed-{uuid.uuid4().hex[:16]}"
+        )
         self.zmq_socket = None
+        self._dispatcher: Optional[_ResponseDispatcher] = None
         self.context = None
         self.keepalive_payload = keepalive_payload
         self.keepalive_interval = keepalive_interval
         self.keepalive_timer = None
+        self.max_concurrent_requests = max_concurrent_requests
         self._lock = threading.Lock()
+        self._free_request_slots = max_concurrent_requests
+        self._slot_waiters = deque()
+        self._requests_in_flight = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._keepalive_shutdown = False
         self._keepalive_loop: Optional[asyncio.AbstractEventLoop] = None
         self._keepalive_loop_thread: Optional[threading.Thread] = None
@@ -264,20 +612,65 @@ class DistributedRunner:
             warnings.warn("set_device is deprecated and will be removed in the future.")
 
     @asynccontextmanager
-    async def _invocation_lock(self) -> AsyncIterator[None]:
+    async def _request_slot(self) -> AsyncIterator[None]:
         """
-        Acquire the invocation lock using a threading.Lock so it serializes
-        across event loops (main loop vs keepalive loop). Uses non-blocking
-        acquire with asyncio.sleep to stay cancellation-safe: if the caller
-        is cancelled while waiting, the lock is never acquired and cannot
-        be left permanently held.
+        Acquire one of the `max_concurrent_requests` request slots, so that at
+        most that many requests are in flight at once; further requests wait
+        here, in order. Requests can come from several event loops (e.g. the
+        keepalive one), so a released slot is handed to the next waiter through
+        its own loop, waking it right away. A waiter that is cancelled after it
+        was handed a slot passes it on.
+
+        The keepalive timer is paused while any request is in flight.
         """
-        while not self._lock.acquire(blocking=False):
-            await asyncio.sleep(0.01)
+        loop = asyncio.get_running_loop()
+        waiter: Optional[asyncio.Future[None]] = None
+        with self._lock:
+            if self._free_request_slots > 0 and not self._slot_waiters:
+                self._free_request_slots -= 1
+            else:
+                waiter = loop.create_future()
+                self._slot_waiters.append((loop, waiter))
+        if waiter is not None:
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    handed = (loop, waiter) not in self._slot_waiters
+                    if not handed:
+                        self._slot_waiters.remove((loop, waiter))
+                if handed:
+                    self._release_request_slot()
+                raise
         try:
-            yield
+            self._loop = asyncio.get_running_loop()
+            with self._lock:
+                self._requests_in_flight += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._requests_in_flight -= 1
+                    idle = self._requests_in_flight == 0
+                if idle:
+                    self.maybe_start_keepalive()  # Restart the keepalive timer
         finally:
-            self._lock.release()
+            self._release_request_slot()
+
+    def _release_request_slot(self) -> None:
+        """
+        Hand a request slot to the next waiter, or free it if none is waiting.
+        """
+        with self._lock:
+            while self._slot_waiters:
+                loop, waiter = self._slot_waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(_wake_waiter, waiter)
+                    return
+                except RuntimeError:
+                    # The waiter's loop was closed, try the next one
+                    continue
+            self._free_request_slots += 1
 
     def is_alive(self) -> bool:
         """
@@ -382,6 +775,50 @@ class DistributedRunner:
                     f"{traceback.format_exc()}"
                 )
             self.zmq_socket = None
+            self._dispatcher = None
+
+    def _get_dispatcher(self) -> _ResponseDispatcher:
+        """
+        Returns the dispatcher of the responses read from the ZeroMQ socket.
+        """
+        socket = self.get_zmq_socket()
+        if self._dispatcher is None or self._dispatcher.socket is not socket:
+            self._dispatcher = _ResponseDispatcher(socket)
+        return self._dispatcher
+
+    async def _next_response(
+        self,
+        responses: asyncio.Queue[Any],
+        timeout: Optional[float],
+    ) -> Optional[list[Any]]:
+        """
+        Waits for the next response to a request, checking that the workers are
+        still alive while waiting.
+        :param responses: The queue the dispatcher routes the responses to.
+        :param timeout: The maximum time to wait for, if any.
+        :return: The frames of the response, or None if the timeout was reached.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        getter = asyncio.ensure_future(responses.get())
+        response = None
+        try:
+            while True:
+                wait = LIVENESS_CHECK_INTERVAL
+                if deadline is not None:
+                    wait = min(wait, deadline - time.perf_counter())
+                done, _ = await asyncio.wait({getter}, timeout=max(wait, 0))
+                if done:
+                    response = getter.result()
+                    if isinstance(response, Exception):
+                        raise response
+                    return response
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return None
+                self.ensure_alive()
+        finally:
+            if not getter.cancel() and not getter.cancelled() and response is None:
+                # Received as the request was cancelled, leave it to be released
+                responses.put_nowait(getter.result())
 
     def run(self, **kwargs: Any) -> None:
         """
@@ -402,10 +839,19 @@ class DistributedRunner:
         socket.setsockopt(zmq.IDENTITY, str(rank).encode("utf-8"))
         socket.connect(f"tcp://{self.worker_addr}:{self.worker_port}")
 
+        fanout: Optional[_CommandFanout] = None
+        subscriber: Optional[_CommandSubscriber] = None
+        if self.world_size > 1 and rank == 0:
+            fanout = _CommandFanout(context, self.fanout_address, self.world_size - 1)
+        elif self.world_size > 1:
+            subscriber = _CommandSubscriber(context, self.fanout_address)
+
         # Create and setup the worker
         worker = self.worker_cls(rank, self.world_size)
         try:
             worker.initialize(**kwargs)
+            if fanout is not None:
+                fanout.wait_for_subscribers()
         except Exception as e:
             worker.rank_print(
                 f"Error during initialization: {e}\n{traceback.format_exc()}"
@@ -418,6 +864,17 @@ class DistributedRunner:
         socket.send_multipart([b"READY"])
         dist.barrier()
 
+        def load_payload(payload: bytes) -> dict[str, Any]:
+            """
+            Deserialize a payload, which is empty on the ranks other than rank 0
+            if the worker doesn't broadcast payloads.
+            """
+            if not payload:
+                return {}
+            payload_dict = distributed_deserialize(payload)
+            assert isinstance(payload_dict, dict)
+            return payload_dict
+
         # Define execution methods to invoke from workers
         def execute(payload: bytes, request_id: bytes) -> Any:
             """
@@ -426,8 +883,7 @@ class DistributedRunner:
             :param request_id: The request ID to echo back in responses.
             :return: The result from the worker.
             """
-            payload_dict = distributed_deserialize(payload)
-            assert isinstance(payload_dict, dict)
+            payload_dict = load_payload(payload)
             payload_dict["streaming"] = False
 
             try:
@@ -445,9 +901,79 @@ class DistributedRunner:
                 return
 
             socket.send_multipart(
-                [request_id, distributed_serialize(result, is_final=True)]
+                [request_id, *distributed_serialize_frames(result, is_final=True)],
+                copy=False,
             )
 
+        def execute_batch(payloads: list[bytes], request_ids: list[bytes]) -> None:
+            """
+            Execute several invocations with a single call to the worker.
+            :param payloads: The payloads of the invocations.
+            :param request_ids: The request IDs to echo back in responses.
+            """
+            payload_dicts = []
+            for payload in payloads:
+                payload_dict = load_payload(payload)
+                payload_dict["streaming"] = False
+                payload_dicts.append(payload_dict)
+
+            try:
+                future = worker.run_in_worker(worker.batch, payload_dicts)
+                results = list(future.result())
+                if len(results) != len(payload_dicts):
+                    raise ValueError(
+                        f"Expected {len(payload_dicts)} results from the batch, "
+                        f"got {len(results)}."
+                    )
+            except Exception as e:
+                error_output = {"error": str(e)}
+                worker.rank_print(
+                    f"Error in batch execution: {error_output}\n"
+                    f"{traceback.format_exc()}"
+                )
+                results = [error_output] * len(payload_dicts)
+
+            dist.barrier()
+            if worker.rank != 0:
+                return
+
+            for request_id, result in zip(request_ids, results):
+                socket.send_multipart(
+                    [request_id, *distributed_serialize_frames(result, is_final=True)],
+                    copy=False,
+                )
+
+        # Commands received while collecting a batch that are not part of it
+        pending_commands: deque[list[bytes]] = deque()
+
+        def next_command(timeout: Optional[float] = None) -> Optional[list[bytes]]:
+            """
+            Get the next command, waiting at most `timeout` seconds if given.
+            """
+            if pending_commands:
+                return pending_commands.popleft()
+            if timeout is not None and not socket.poll(timeout=int(timeout * 1000)):
+                return None
+            return socket.recv_multipart()
+
+        def collect_batch(parts: list[bytes]) -> list[list[bytes]]:
+            """
+            Collect the invocations that arrive within the worker's batch
+            timeout of the given one, up to its maximum batch size.
+            """
+            batch = [parts]
+            deadline = time.perf_counter() + worker.batch_timeout
+            while len(batch) < worker.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                next_parts = next_command(max(remaining, 0))
+                if next_parts is None:
+                    break
+                if next_parts[0] != b"invoke":
+                    pending_commands.appendleft(next_parts)
+                    break
+                batch.append(next_parts)
+            return batch
+
         def stream(payload: bytes, as_text_events: bool, request_id: bytes) -> None:
             """
             Stream the result from the worker function with the given payload.
@@ -456,23 +982,23 @@ class DistributedRunner:
             :param request_id: The request ID to echo back in responses.
             :return: An async iterator that yields the result from the worker.
             """
-            payload_dict = distributed_deserialize(payload)
-            assert isinstance(payload_dict, dict)
+            payload_dict = load_payload(payload)
             payload_dict["streaming"] = True
             image_format = payload_dict.get("image_format", "jpeg")
-            encoded_response: Optional[bytes] = None
+            encoded_response: Optional[list[Any]] = None
 
             try:
                 future = worker.run_in_worker(worker.__call__, **payload_dict)
-                while not future.done():
-                    try:
-                        intermediate = worker.queue.get(timeout=0.1)
-                        if intermediate is not None and worker.rank == 0:
-                            socket.send_multipart(
-                                [request_id, intermediate]
-                            )  # already serialized
-                    except queue.Empty:
-                        pass
+                # Wake up the forwarding loop below once the call is done
+                future.add_done_callback(lambda _: worker._end_stream())
+                while True:
+                    intermediate = worker.queue.get()
+                    if intermediate is None:
+                        break
+                    if worker.rank == 0:
+                        socket.send_multipart(
+                            [request_id, *intermediate], copy=False
+                        )  # already serialized
                 result = future.result()
             except Exception as e:
                 error_output = {"error": str(e)}
@@ -481,17 +1007,19 @@ class DistributedRunner:
                 )
                 if worker.rank == 0:
                     if as_text_events:
-                        encoded_response = encode_text_event(error_output)
+                        encoded_response = [encode_text_event(error_output)]
                     else:
-                        encoded_response = distributed_serialize(error_output)
+                        encoded_response = [distributed_serialize(error_output)]
             else:
                 if worker.rank == 0:
                     if as_text_events:
-                        encoded_response = encode_text_event(
-                            result, is_final=True, image_format=image_format
-                        )
+                        encoded_response = [
+                            encode_text_event(
+                                result, is_final=True, image_format=image_format
+                            )
+                        ]
                     else:
-                        encoded_response = distributed_serialize(
+                        encoded_response = distributed_serialize_frames(
                             result, is_final=True, image_format=image_format
                         )
 
@@ -500,57 +1028,80 @@ class DistributedRunner:
                 return
 
             if encoded_response is not None:
-                socket.send_multipart([request_id, encoded_response])
+                socket.send_multipart([request_id, *encoded_response], copy=False)
             socket.send_multipart([request_id, b"DONE"])
 
+        def handle(parts: list[bytes]) -> None:
+            """
+            Handle a command, received from the runner on rank 0 and forwarded
+            as is to the other ranks. Batches are forwarded as
+            [b"batch", count, *request_ids, *payloads].
+            """
+            command = parts[0]
+            if command == b"invoke":
+                execute(parts[2], parts[1])
+            elif command == b"stream":
+                stream(parts[3], parts[1] == b"1", parts[2])
+            elif command == b"batch":
+                count = int(parts[1])
+                execute_batch(parts[2 + count :], parts[2 : 2 + count])
+
+        def forward(parts: list[bytes]) -> None:
+            """
+            Forward a command to the other ranks, without its payloads if the
+            worker doesn't broadcast them.
+            """
+            if fanout is None:
+                return
+            if not worker.broadcast_payload:
+                if parts[0] == b"batch":
+                    count = int(parts[1])
+                    parts = parts[: 2 + count] + [b""] * count
+                elif parts[0] in (b"invoke", b"stream"):
+                    parts = [*parts[:-1], b""]
+            fanout.send(parts)
+
         # Runtime code
         if rank == 0:
             worker.rank_print("Master worker is ready to receive tasks.")
             while True:
-                parts = socket.recv_multipart()
+                parts = next_command()
+                assert parts is not None
                 command = parts[0]
 
                 # Check for EXIT command
                 if command == b"EXIT":
-                    params = [b"EXIT", False, False, b""]
-                    dist.broadcast_object_list(params, src=0)
+                    forward([b"EXIT"])
                     worker.rank_print("Received exit payload, exiting.")
                     break
 
-                if command == b"invoke":
-                    request_id, payload = parts[1], parts[2]
-                    streaming = False
-                    as_text_events = False
-                elif command == b"stream":
-                    text_flag, request_id, payload = parts[1], parts[2], parts[3]
-                    streaming = True
-                    as_text_events = text_flag == b"1"
-                else:
+                if command == b"invoke" and worker.max_batch_size > 1:
+                    batch = collect_batch(parts)
+                    if len(batch) > 1:
+                        parts = [
+                            b"batch",
+                            str(len(batch)).encode(),
+                            *(batch_parts[1] for batch_parts in batch),
+                            *(batch_parts[2] for batch_parts in batch),
+                        ]
+
+                if parts[0] not in (b"invoke", b"stream", b"batch"):
                     worker.rank_print(f"Unknown command: {command}")
                     continue
 
-                params = [payload, streaming, as_text_events, request_id]
-                dist.broadcast_object_list(params, src=0)
-
-                if streaming:
-                    stream(payload, as_text_events, request_id)
-                else:
-                    execute(payload, request_id)
+                forward(parts)
+                handle(parts)
         else:
+            assert subscriber is not None
             worker.rank_print("Worker waiting for tasks.")
             while True:
                 try:
-                    params = [None, None, None, None]
-                    dist.broadcast_object_list(params, src=0)
-                    payload, streaming, as_text_events, request_id = params  # type: ignore[assignment]
-                    if payload == b"EXIT":
+                    parts = subscriber.recv()
+                    if parts[0] == b"EXIT":
                         worker.rank_print("Received exit payload, exiting.")
                         break
 
-                    if streaming:
-                        stream(payload, as_text_events, request_id)  # type: ignore[arg-type]
-                    else:
-                        execute(payload, request_id)  # type: ignore[arg-type]
+                    handle(parts)
                 except Exception as e:
                     worker.rank_print(f"Error in worker: {e}\n{traceback.format_exc()}")
 
@@ -562,6 +1113,10 @@ class DistributedRunner:
         except Exception as e:
             worker.rank_print(f"Error during teardown: {e}\n{traceback.format_exc()}")
 
+        if fanout is not None:
+            fanout.close()
+        if subscriber is not None:
+            subscriber.close()
         socket.send_multipart([b"EXIT"])
         socket.close()
 
@@ -584,6 +1139,7 @@ class DistributedRunner:
             master_port=self.master_port,
             timeout=self.timeout,
             cwd=self.cwd,
+            backend=self.backend,
             **kwargs,
         )
 
@@ -626,9 +1182,13 @@ class DistributedRunner:
 
     def _get_keepalive_loop(self) -> asyncio.AbstractEventLoop:
         """
-        Return a persistent event loop for keepalive calls.
+        Return the event loop for keepalive calls: the loop requests are made
+        from while it is running, so that all requests share the same socket
+        reader, or a persistent event loop otherwise.
         Reuses the same loop across ticks to avoid creating throwaway loops.
         """
+        if self._loop is not None and self._loop.is_running():
+            return self._loop
         if (
             self._keepalive_loop is None
             or self._keepalive_loop.is_closed()
@@ -753,7 +1313,7 @@ class DistributedRunner:
         :param as_text_events: Whether to yield results as text events.
         :return: An async iterator that yields the result from the worker.
         """
-        async with self._invocation_lock():
+        async with self._request_slot():
             async for result in self._stream(
                 payload, timeout, streaming_timeout, as_text_events
             ):
@@ -766,64 +1326,60 @@ class DistributedRunner:
         streaming_timeout: Optional[int] = None,
         as_text_events: bool = False,
     ) -> AsyncIterator[Any]:
-        import zmq
-
         self.ensure_alive()
         self.maybe_cancel_keepalive()  # Cancel until the streaming is done
         socket = self.get_zmq_socket()
+        dispatcher = self._get_dispatcher()
         payload_serialized = distributed_serialize(payload, is_final=True)
         request_id = uuid.uuid4().bytes
         text_flag = b"1" if as_text_events else b"0"
-        await socket.send_multipart(
-            [b"0", b"stream", text_flag, request_id, payload_serialized]
-        )
+        responses = dispatcher.register(request_id, streaming=True)
 
-        start_time = time.perf_counter()
-        last_yield_time = start_time
-        yielded_once = False
+        try:
+            await socket.send_multipart(
+                [b"0", b"stream", text_flag, request_id, payload_serialized]
+            )
 
-        while True:
-            iter_start_time = time.perf_counter()
-            try:
-                rank, response_request_id, response_data = await socket.recv_multipart(
-                    flags=zmq.NOBLOCK
-                )  # type: ignore[misc]
-            except zmq.Again:
-                if timeout is not None and iter_start_time - start_time > timeout:
-                    raise TimeoutError(f"Streaming timed out after {timeout} seconds.")
-                if (
-                    streaming_timeout is not None
-                    and iter_start_time - last_yield_time > streaming_timeout
-                ):
+            start_time = time.perf_counter()
+            last_yield_time = start_time
+            yielded_once = False
+
+            while True:
+                now = time.perf_counter()
+                wait_timeouts = []
+                if timeout is not None:
+                    wait_timeouts.append(start_time + timeout - now)
+                if streaming_timeout is not None:
+                    wait_timeouts.append(last_yield_time + streaming_timeout - now)
+
+                response = await self._next_response(
+                    responses, min(wait_timeouts) if wait_timeouts else None
+                )
+                if response is None:
+                    now = time.perf_counter()
+                    if timeout is not None and now - start_time >= timeout:
+                        raise TimeoutError(
+                            f"Streaming timed out after {timeout} seconds."
+                        )
                     raise TimeoutError(
                         f"Streaming timed out after {streaming_timeout} "
                         f"seconds of inactivity."
                     )
 
-                await asyncio.sleep(0.1)
-                continue
-
-            assert rank == b"0", "Expected response from worker with rank 0"
-
-            if response_request_id != request_id:
-                print("[debug] Discarding stale response")
-                # Stale response from other request, discard and continue
-                continue
-
-            if response_data == b"DONE":
-                if not yielded_once:
-                    raise RuntimeError("No data was yielded from the worker.")
-                break
-
-            if as_text_events:
-                yield response_data
-            else:
-                yield distributed_deserialize(response_data)
+                if _is_done(response):
+                    if not yielded_once:
+                        raise RuntimeError("No data was yielded from the worker.")
+                    break
 
-            yielded_once = True
-            last_yield_time = iter_start_time
+                if as_text_events:
+                    yield bytes(response[0])
+                else:
+                    yield distributed_deserialize_frames(response)
 
-        self.maybe_start_keepalive()  # Restart the keepalive timer
+                yielded_once = True
+                last_yield_time = time.perf_counter()
+        finally:
+            dispatcher.unregister(request_id, responses)
 
     async def invoke(
         self,
@@ -836,8 +1392,8 @@ class DistributedRunner:
         :param timeout: The timeout for the overall operation.
         :return: The result from the worker.
         """
-        # Lock the invocation to prevent concurrent invocations
-        async with self._invocation_lock():
+        # Wait for a request slot if too many requests are in flight
+        async with self._request_slot():
             return await self._invoke(payload, timeout)
 
     async def _invoke(
@@ -845,45 +1401,30 @@ class DistributedRunner:
         payload: dict[str, Any],
         timeout: Optional[int],
     ) -> Any:
-        import zmq
-
         self.ensure_alive()
         self.maybe_cancel_keepalive()  # Cancel until the invocation is done
         socket = self.get_zmq_socket()
+        dispatcher = self._get_dispatcher()
         payload_serialized = distributed_serialize(payload, is_final=True)
 
         request_id = uuid.uuid4().bytes
-        await socket.send_multipart([b"0", b"invoke", request_id, payload_serialized])
-
-        # Wait for the response from the worker
-        start_time = time.perf_counter()
-        while True:
-            try:
-                rank, response_request_id, response_data = await socket.recv_multipart(
-                    flags=zmq.NOBLOCK
-                )  # type: ignore[misc]
-                if response_request_id != request_id:
-                    print("[debug] Discarding stale response")
-                    # Stale response from other request, discard and continue
-                    continue
-
-                # Exit the loop if we received our response
-                break
-
-            except zmq.Again:
-                elapsed = time.perf_counter() - start_time
-                if timeout is not None and elapsed > timeout:
-                    raise TimeoutError(f"Invocation timed out after {timeout} seconds.")
+        responses = dispatcher.register(request_id, streaming=False)
+        try:
+            await socket.send_multipart(
+                [b"0", b"invoke", request_id, payload_serialized]
+            )
 
-                await asyncio.sleep(0.1)
-                self.ensure_alive()
-            except BaseException as e:
-                print(f"Error in invoke: {e}\n{traceback.format_exc()}")
-                raise e
+            # Wait for the response from the worker
+            response = await self._next_response(responses, timeout)
+            if response is None:
+                raise TimeoutError(f"Invocation timed out after {timeout} seconds.")
+        except BaseException as e:
+            print(f"Error in invoke: {e}\n{traceback.format_exc()}")
+            raise e
+        finally:
+            dispatcher.unregister(request_id, responses)
 
-        self.maybe_start_keepalive()  # Restart the keepalive timer
-        assert rank == b"0", "Expected response from worker with rank 0"
-        return distributed_deserialize(response_data)
+        return distributed_deserialize_frames(response)
 
     async def __aenter__(self) -> DistributedRunner:
         """
@@ -1,7 +1,10 @@
 import concurrent.futures
 import hashlib
+import json
 import os
 import re
+import threading
+import time
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path, PurePosixPath
@@ -12,6 +15,7 @@ from rich.tree import Tree
 
 import fal.flags as flags
 from fal._user_agent import USER_AGENT
+from fal.auth.local import get_home_dir
 from fal.console import console
 from fal.console.icons import get_cross_icon
 from fal.exceptions import (
@@ -30,6 +34,14 @@ if TYPE_CHECKING:
 FILE_SIZE_LIMIT = 1024 * 1024 * 1024  # 1GB
 DEFAULT_CONCURRENCY_UPLOADS = 10
 WINDOWS_PATHS = os.name == "nt"
+# hashlib releases the GIL while hashing, so files are hashed on threads.
+DEFAULT_CONCURRENCY_HASHES = min(32, (os.cpu_count() or 1) + 4)
+HASH_CHUNK_SIZE = 1024 * 1024
+# Cached hashes of files that haven't been seen for this long are dropped.
+HASH_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+# Files modified this recently (in ns) aren't cached: a write within the same
+# mtime tick could go unnoticed.
+HASH_CACHE_MIN_MTIME_AGE = 2 * 1000 * 1000 * 1000
 
 
 @dataclass
@@ -107,7 +119,7 @@ def sanitize_relative_path(rel_path: str, original_path: Path) -> str:
 def compute_hash(file_path: Path, mode: int) -> str:
     file_hash = hashlib.sha256()
     with file_path.open("rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
             file_hash.update(chunk)
 
     # Include metadata in hash
@@ -117,6 +129,90 @@ def compute_hash(file_path: Path, mode: int) -> str:
     return file_hash.hexdigest()
 
 
+class FileHashCache:
+    """Persistent cache of file hashes, keyed by the file's path and validated
+    against its size, mtime, inode and mode, so that unchanged files are not
+    read again on every deploy.
+
+    Disabled by setting FAL_FILE_HASH_CACHE=0."""
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path is not None:
+            try:
+                with path.open() as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                entries = {}
+            if isinstance(entries, dict):
+                self._entries = {
+                    key: entry
+                    for key, entry in entries.items()
+                    if isinstance(entry, list) and len(entry) == 6
+                }
+
+    @classmethod
+    def default(cls) -> "FileHashCache":
+        if os.getenv("FAL_FILE_HASH_CACHE") == "0":
+            return cls(None)
+        return cls(get_home_dir() / "cache" / "file_hashes.json")
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> List[int]:
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_mode]
+
+    def get(self, absolute_path: str, stat: os.stat_result) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(absolute_path)
+            if entry is None or entry[:4] != self._signature(stat):
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            entry[5] = int(time.time())
+            self._dirty = True
+            return entry[4]
+
+    def put(self, absolute_path: str, stat: os.stat_result, file_hash: str) -> None:
+        if time.time_ns() - stat.st_mtime_ns < HASH_CACHE_MIN_MTIME_AGE:
+            return
+        with self._lock:
+            self._entries[absolute_path] = [
+                *self._signature(stat),
+                file_hash,
+                int(time.time()),
+            ]
+            self._dirty = True
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+
+        cutoff = time.time() - HASH_CACHE_MAX_AGE
+        with self._lock:
+            entries = {
+                path: entry
+                for path, entry in self._entries.items()
+                if entry[5] >= cutoff
+            }
+            self._dirty = False
+
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The cache is best effort.
+            pass
+
+
 def _get_script_dir(
     base_path_str: str, files_context_dir: Optional[str] = None
 ) -> Path:
@@ -201,7 +297,12 @@ class FileMetadata:
 
     @classmethod
     def from_path(
-        cls, file_path: Path, *, relative: str, absolute: str
+        cls,
+        file_path: Path,
+        *,
+        relative: str,
+        absolute: str,
+        hash_cache: Optional[FileHashCache] = None,
     ) -> "FileMetadata":
         stat = file_path.stat()
         # Limit allowed individual file size
@@ -210,7 +311,11 @@ class FileMetadata:
                 message=f"{file_path} is larger than {FILE_SIZE_LIMIT} bytes."
             )
 
-        file_hash = compute_hash(file_path, stat.st_mode)
+        file_hash = hash_cache.get(absolute, stat) if hash_cache else None
+        if file_hash is None:
+            file_hash = compute_hash(file_path, stat.st_mode)
+            if hash_cache:
+                hash_cache.put(absolute, stat, file_hash)
         return FileMetadata(
             size=stat.st_size,
             mtime=stat.st_mtime,
@@ -288,8 +393,8 @@ class FileSync:
         lexical_root: str,
         context_dir: Path,
         patterns: List[re.Pattern],
-    ) -> List[FileMetadata]:
-        files: List[FileMetadata] = []
+    ) -> List[Tuple[Path, str, str]]:
+        files: List[Tuple[Path, str, str]] = []
 
         for current, _, filenames in os.walk(root, followlinks=False):
             current_path = Path(current)
@@ -308,21 +413,50 @@ class FileSync:
                 absolute, resolved_relative = _normalize_path(
                     str(file_path), context_dir
                 )
-                files.append(
-                    FileMetadata.from_path(
-                        Path(absolute), relative=resolved_relative, absolute=absolute
-                    )
-                )
+                files.append((Path(absolute), resolved_relative, absolute))
 
         return files
 
+    def _collect_metadata(
+        self,
+        files: List[Tuple[Path, str, str]],
+        hash_cache: FileHashCache,
+        max_concurrency: int = DEFAULT_CONCURRENCY_HASHES,
+    ) -> List[FileMetadata]:
+        started = time.monotonic()
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency
+        ) as executor:
+            collected = list(
+                executor.map(
+                    lambda file: FileMetadata.from_path(
+                        file[0],
+                        relative=file[1],
+                        absolute=file[2],
+                        hash_cache=hash_cache,
+                    ),
+                    files,
+                )
+            )
+        hash_cache.save()
+
+        if flags.DEBUG:
+            total_size = sum(metadata.size for metadata in collected)
+            console.print(
+                f"Hashed {len(collected)} files ({total_size / 1e6:.1f} MB, "
+                f"{hash_cache.hits} cached, {hash_cache.misses} read) in "
+                f"{time.monotonic() - started:.2f}s"
+            )
+
+        return collected
+
     def collect_files(
         self,
         paths: List[str],
         files_context_dir: Optional[str] = None,
         files_ignore: Optional[List[re.Pattern]] = None,
     ) -> List[FileMetadata]:
-        collected_files: List[FileMetadata] = []
+        collected_files: List[Tuple[Path, str, str]] = []
         context_dir = _get_script_dir(self.local_file_path, files_context_dir)
         patterns = files_ignore or []
 
@@ -340,11 +474,7 @@ class FileSync:
             if not resolved_path.exists():
                 console.print(f"{resolved_path} was not found, it will be skipped")
             elif resolved_path.is_file():
-                collected_files.append(
-                    FileMetadata.from_path(
-                        resolved_path, relative=relative, absolute=absolute
-                    )
-                )
+                collected_files.append((resolved_path, relative, absolute))
             elif resolved_path.is_dir():
                 collected_files.extend(
                     self._collect_directory(
@@ -352,7 +482,7 @@ class FileSync:
                     )
                 )
 
-        return collected_files
+        return self._collect_metadata(collected_files, FileHashCache.default())
 
     def check_hashes_on_server(self, hashes: List[str]) -> List[str]:
         try:
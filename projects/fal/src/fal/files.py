@@ -75,9 +75,18 @@ class FalFileSystem(AbstractFileSystem):
                 detail = response.json()["detail"]
             except Exception:
                 detail = response.text
+            if response.status_code == 404:
+                raise FileNotFoundError(detail)
             raise FalServerlessException(detail)
         return response
 
+    def close(self) -> None:
+        """Close the connections to the files API. They are opened again on the
+        next request."""
+        client = self.__dict__.pop("_client", None)
+        if client is not None:
+            client.close()
+
     def _abspath(self, rpath):
         if rpath.startswith("/"):
             return rpath
@@ -152,6 +161,11 @@ class FalFileSystem(AbstractFileSystem):
             response = self._request("GET", f"/files/file/{abs_rpath}")
             fobj.write(response.content)
 
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        abs_path = self._abspath(path)
+        response = self._request("GET", f"/files/file/{abs_path}")
+        return response.content[start:end]
+
     def _put_file_multipart(self, lpath, rpath, size, progress):
         md5 = _compute_md5(lpath)
 
@@ -203,6 +217,15 @@ class FalFileSystem(AbstractFileSystem):
                 progress.advance(task)
         self.dircache.clear()
 
+    def pipe_file(self, path, value, mode="overwrite", **kwargs):
+        abs_path = self._abspath(path)
+        self._request(
+            "POST",
+            f"/files/file/local/{abs_path}",
+            files={"file_upload": (posixpath.basename(abs_path), value)},
+        )
+        self.dircache.clear()
+
     def put_file_from_url(self, url, rpath, mode="overwrite", **kwargs):
         abs_rpath = self._abspath(rpath)
         self._request(
@@ -7,7 +7,8 @@ import logging
 import typing
 from collections import deque
 from contextlib import suppress
-from typing import Any, Callable
+from dataclasses import dataclass
+from typing import Any, Callable, Literal
 
 from fastapi import WebSocket, WebSocketDisconnect
 
@@ -16,6 +17,16 @@ from fal.api import RouteSignature
 
 logger = logging.getLogger(__name__)
 
+# What happens to an output when the client is slower than the endpoint and the
+# outputs waiting to be sent are at capacity:
+# - "block": the endpoint waits for an output to be sent
+# - "drop_oldest": the oldest waiting output is dropped
+# - "coalesce_latest": all the waiting outputs are dropped, so that the client
+#   gets the latest one next
+# Outputs are always sent in the order they were produced.
+BackpressureMode = Literal["block", "drop_oldest", "coalesce_latest"]
+BACKPRESSURE_MODES = typing.get_args(BackpressureMode)
+
 
 def msgpack_decode_message(message: bytes) -> Any:
     import msgpack
@@ -214,14 +225,127 @@ async def _emit_message(websocket: WebSocket, message: bytes | str) -> None:
         raise TypeError(f"Can't send message of type {type(message)}")
 
 
-async def _background_emitter(
-    outgoing_messages: asyncio.Queue[bytes | str],
-    websocket: WebSocket,
-) -> None:
-    while True:
-        output = await outgoing_messages.get()
-        await _emit_message(websocket, output)
-        outgoing_messages.task_done()
+@dataclass
+class OutputQueueStats:
+    """Per-connection counters of a realtime endpoint's outgoing messages."""
+
+    # Outputs sent to the client, and dropped because of backpressure
+    sent: int = 0
+    dropped: int = 0
+    # Outputs the endpoint had to wait for room in the queue for
+    blocked: int = 0
+    max_depth: int = 0
+    # Time from an output being queued until it was sent
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.sent if self.sent else 0.0
+
+
+class _OutputQueue:
+    """Sends the outputs of a realtime session from a background task, in the
+    order they were produced, holding at most `maxsize` of them while the client
+    is slower than the endpoint. An output is a group of messages (e.g. a
+    result and its timings) that are sent, or dropped, together."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        *,
+        maxsize: int,
+        backpressure: str = "block",
+    ) -> None:
+        self.websocket = websocket
+        self.maxsize = max(maxsize, 1)
+        self.backpressure = backpressure
+        self.stats = OutputQueueStats()
+        self._loop = asyncio.get_running_loop()
+        self._pending: deque[tuple[float, list[bytes | str]]] = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._emitter = asyncio.create_task(self._emit())
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    async def put(self, *messages: bytes | str) -> None:
+        self._check_emitter()
+        if len(self._pending) >= self.maxsize:
+            if self.backpressure == "block":
+                self.stats.blocked += 1
+                while len(self._pending) >= self.maxsize:
+                    await self._wait_for_space()
+            elif self.backpressure == "drop_oldest":
+                self._pending.popleft()
+                self.stats.dropped += 1
+            else:
+                self.stats.dropped += len(self._pending)
+                self._pending.clear()
+
+        self._pending.append((self._loop.time(), list(messages)))
+        self.stats.max_depth = max(self.stats.max_depth, len(self._pending))
+        self._idle.clear()
+        self._ready.set()
+
+    async def close(self) -> None:
+        """Wait for the queued outputs to be sent and stop the emitter."""
+        if not self._emitter.done():
+            idle = asyncio.ensure_future(self._idle.wait())
+            try:
+                await asyncio.wait(
+                    {idle, self._emitter}, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                idle.cancel()
+        self._emitter.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._emitter
+        logger.debug("Realtime output queue stats: %s", self.stats)
+
+    @property
+    def failed(self) -> bool:
+        """Whether messages can no longer be sent, e.g. the client went away."""
+        return self._emitter.done()
+
+    def _check_emitter(self) -> None:
+        if self._emitter.done() and not self._emitter.cancelled():
+            exc = self._emitter.exception()
+            if exc is not None:
+                raise exc
+
+    async def _wait_for_space(self) -> None:
+        self._space.clear()
+        space = asyncio.ensure_future(self._space.wait())
+        try:
+            await asyncio.wait(
+                {space, self._emitter}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            space.cancel()
+        self._check_emitter()
+
+    async def _emit(self) -> None:
+        while True:
+            if not self._pending:
+                self._idle.set()
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            queued_at, messages = self._pending.popleft()
+            self._space.set()
+            for message in messages:
+                await _emit_message(self.websocket, message)
+
+            latency = self._loop.time() - queued_at
+            self.stats.sent += 1
+            self.stats.total_latency += latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
 
 
 async def _mirror_output(
@@ -235,13 +359,12 @@ async def _mirror_output(
     input_ready: asyncio.Event,
 ) -> None:
     loop = asyncio.get_event_loop()
-    max_allowed_buffering = route_signature.buffering or 1
-    outgoing_messages: asyncio.Queue[bytes | str] = asyncio.Queue(
-        maxsize=max_allowed_buffering * 2  # x2 for outgoing timings
+    outgoing = _OutputQueue(
+        websocket,
+        maxsize=route_signature.buffering or 1,
+        backpressure=route_signature.backpressure,
     )
 
-    emitter = asyncio.create_task(_background_emitter(outgoing_messages, websocket))
-
     while True:
         if not queue:
             await input_ready.wait()
@@ -249,13 +372,8 @@ async def _mirror_output(
             continue
 
         input = queue.popleft()
-        if input is None or emitter.done():
-            if not emitter.done():
-                await outgoing_messages.join()
-                emitter.cancel()
-
-            with suppress(asyncio.CancelledError):
-                await emitter
+        if input is None or outgoing.failed:
+            await outgoing.close()
             return None  # End of input
 
         batch = [input]
@@ -295,11 +413,7 @@ async def _mirror_output(
             }
             messages.append(json.dumps(timings, separators=(",", ":")))
 
-        for message in messages:
-            try:
-                outgoing_messages.put_nowait(message)
-            except asyncio.QueueFull:
-                await _emit_message(websocket, message)
+        await outgoing.put(*messages)
 
 
 async def _run_streaming_session(
@@ -313,29 +427,15 @@ async def _run_streaming_session(
     realtime_mode: str,
 ) -> None:
     loop = asyncio.get_event_loop()
-    max_allowed_buffering = route_signature.buffering or 1
-    outgoing_messages: asyncio.Queue[bytes | str] = asyncio.Queue(
-        maxsize=max_allowed_buffering * 2  # x2 for outgoing timings
+    outgoing = _OutputQueue(
+        websocket,
+        # Each output is a message of its own, x2 as in unary sessions where an
+        # output can come with its timings
+        maxsize=(route_signature.buffering or 1) * 2,
+        backpressure=route_signature.backpressure,
     )
-
-    emitter = asyncio.create_task(_background_emitter(outgoing_messages, websocket))
-
-    async def send_message(message):
-        try:
-            outgoing_messages.put_nowait(message)
-        except asyncio.QueueFull:
-            logger.warning(
-                "Realtime outgoing queue full (maxsize=%s); sending message directly "
-                "may reorder outputs.",
-                outgoing_messages.maxsize,
-            )
-            await _emit_message(websocket, message)
-
-    async def close_emitter():
-        await outgoing_messages.join()
-        emitter.cancel()
-        with suppress(asyncio.CancelledError):
-            await emitter
+    send_message = outgoing.put
+    close_emitter = outgoing.close
 
     if realtime_mode == "server_streaming":
         input_value = await _receive_input(
@@ -628,8 +728,18 @@ def realtime(
     content_type: str = "application/msgpack",
     encode_message: Callable[[Any], bytes] | None = None,
     decode_message: Callable[[bytes], Any] | None = None,
+    backpressure: BackpressureMode = "block",
 ) -> Callable[[EndpointT], EndpointT]:
-    """Designate the decorated function as a realtime application endpoint."""
+    """Designate the decorated function as a realtime application endpoint.
+
+    `backpressure` sets what happens to outputs when the client can't keep up
+    with the endpoint, see `BackpressureMode`."""
+
+    if backpressure not in BACKPRESSURE_MODES:
+        raise ValueError(
+            f"Unknown backpressure mode {backpressure!r}, "
+            f"expected one of {BACKPRESSURE_MODES}"
+        )
 
     def marker_fn(original_func: EndpointT) -> EndpointT:
         nonlocal input_modal, output_modal
@@ -683,6 +793,7 @@ def realtime(
             max_batch_size=max_batch_size,
             encode_message=encode_message,
             decode_message=decode_message,
+            backpressure=backpressure,
         )
         return _fal_websocket_template(
             original_func,
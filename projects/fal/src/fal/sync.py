@@ -1,16 +1,38 @@
 from __future__ import annotations
 
+import concurrent.futures
 import hashlib
+import io
+import json
 import os
+import posixpath
+import queue
+import threading
 import zipfile
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from openapi_fal_rest.client import Client
 
+    from fal.files import FalFileSystem
+
 from pathspec import PathSpec
 
+from fal.file_sync import FileHashCache, compute_hash
+
+HASH_FILE = ".fal_hash"
+# Maps the relative paths of the synced files to their hashes and sizes, so that
+# incremental syncs only upload what changed.
+MANIFEST_FILE = ".fal_manifest.json"
+DEFAULT_CONCURRENCY_UPLOADS = 10
+READ_CHUNK_SIZE = 1024 * 1024
+# Archives are streamed to the server in chunks of READ_CHUNK_SIZE, with at most
+# this many chunks buffered in memory.
+ARCHIVE_MAX_BUFFERED_CHUNKS = 8
+
+Manifest = Dict[str, Dict[str, object]]
+
 
 def _check_hash(client: Client, target_path: str, hash_string: str) -> bool:
     import openapi_fal_rest.api.files.check_dir_hash as check_dir_hash_api
@@ -27,28 +49,31 @@ def _check_hash(client: Client, target_path: str, hash_string: str) -> bool:
 
 
 def _upload_file(
-    client: Client, source_path: str, target_path: str, unzip: bool = False
+    client: Client,
+    file_to_upload: BinaryIO,
+    file_name: str,
+    target_path: str,
+    unzip: bool = False,
 ):
     import openapi_fal_rest.api.files.upload_local_file as upload_local_file_api
     import openapi_fal_rest.models.body_upload_local_file as upload_file_model
     import openapi_fal_rest.types as rest_types
 
-    with open(source_path, "rb") as file_to_upload:
-        body = upload_file_model.BodyUploadLocalFile(
-            rest_types.File(
-                payload=file_to_upload,
-                # We need to set a file_name, otherwise the server errors
-                # processing the file
-                file_name=os.path.basename(source_path),
-            )
+    body = upload_file_model.BodyUploadLocalFile(
+        rest_types.File(
+            payload=file_to_upload,
+            # We need to set a file_name, otherwise the server errors
+            # processing the file
+            file_name=file_name,
         )
+    )
 
-        response = upload_local_file_api.sync_detailed(
-            target_path,
-            client=client,
-            unzip=unzip,
-            multipart_data=body,
-        )
+    response = upload_local_file_api.sync_detailed(
+        target_path,
+        client=client,
+        unzip=unzip,
+        multipart_data=body,
+    )
 
     if response.status_code != 200:
         raise Exception(
@@ -63,43 +88,323 @@ def _compute_directory_hash(dir_path: str) -> str:
     for root, _, files in os.walk(dir_path):
         for file in files:
             file_path = os.path.join(root, file)
-            if file != ".fal_hash":
+            if file != HASH_FILE:
                 with open(file_path, "rb") as f:
-                    hash.update(f.read())
+                    for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+                        hash.update(chunk)
     return hash.hexdigest()
 
 
-def _load_gitignore_patterns(dir_path: str) -> list:
-    # TODO: consider looking at .gitignore files in child directories
-    gitignore_path = os.path.join(dir_path, ".gitignore")
-    if os.path.exists(gitignore_path):
-        with open(gitignore_path) as f:
-            gitignore_patterns = f.read().splitlines()
-    else:
-        gitignore_patterns = []
-    return gitignore_patterns
-
-
-def _is_ignored(file_path: str, gitignore_patterns: list[str]) -> bool:
-    pathspec = PathSpec.from_lines("gitwildmatch", gitignore_patterns)
-    return pathspec.match_file(file_path)
-
-
-def _zip_directory(dir_path: str, zip_path: str) -> None:
-    gitignore_patterns = _load_gitignore_patterns(dir_path)
-
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for root, _, files in os.walk(dir_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, dir_path)
-
-                if not _is_ignored(relative_path, gitignore_patterns):
-                    arcname = relative_path
-                    zipf.write(file_path, arcname)
-
-
-def sync_dir(local_dir: str | Path, remote_dir: str, force_upload=False) -> str:
+def _load_gitignore_patterns(dir_path: str, prefix: str = "") -> List[str]:
+    """Patterns of the .gitignore in `dir_path`, rewritten to match paths relative
+    to the synced directory when `dir_path` is its subdirectory `prefix`."""
+    try:
+        with open(os.path.join(dir_path, ".gitignore")) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+
+    if not prefix:
+        return lines
+
+    patterns = []
+    for line in lines:
+        pattern = line.strip()
+        if not pattern or pattern.startswith("#"):
+            continue
+        negation = "!" if pattern.startswith("!") else ""
+        pattern = pattern[len(negation) :]
+        if "/" in pattern.rstrip("/"):
+            # Patterns with a slash are relative to the .gitignore's directory.
+            pattern = f"{prefix}/{pattern.lstrip('/')}"
+        else:
+            pattern = f"{prefix}/**/{pattern}"
+        patterns.append(negation + pattern)
+    return patterns
+
+
+def _walk_files(dir_path: str) -> Iterator[Tuple[str, str]]:
+    """Yield the files in `dir_path` that aren't ignored by a .gitignore in it or
+    its subdirectories, with their paths relative to `dir_path`.
+
+    The rules of each .gitignore are compiled once, and ignored directories are
+    not visited."""
+    rules: Dict[str, Tuple[List[str], PathSpec]] = {}
+    for root, dirnames, files in os.walk(dir_path):
+        relative_root = Path(os.path.relpath(root, dir_path)).as_posix()
+        if relative_root == ".":
+            relative_root = ""
+            patterns: List[str] = []
+            pathspec = PathSpec.from_lines("gitwildmatch", patterns)
+        else:
+            patterns, pathspec = rules[posixpath.dirname(relative_root)]
+
+        if ".gitignore" in files:
+            patterns = patterns + _load_gitignore_patterns(root, relative_root)
+            pathspec = PathSpec.from_lines("gitwildmatch", patterns)
+        rules[relative_root] = (patterns, pathspec)
+
+        def _relative(name: str) -> str:
+            return posixpath.join(relative_root, name) if relative_root else name
+
+        dirnames[:] = sorted(
+            dirname
+            for dirname in dirnames
+            if not pathspec.match_file(_relative(dirname) + "/")
+        )
+        for file in sorted(files):
+            relative_path = _relative(file)
+            if not pathspec.match_file(relative_path):
+                yield os.path.join(root, file), relative_path
+
+
+class _ChunkWriter:
+    """Write-only file that hands what is written to `put` in large chunks."""
+
+    def __init__(self, put, chunk_size: int = READ_CHUNK_SIZE) -> None:
+        self._put = put
+        self._chunk_size = chunk_size
+        self._pending = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._pending += data
+        if len(self._pending) >= self._chunk_size:
+            self.flush_pending()
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def flush_pending(self) -> None:
+        if self._pending:
+            self._put(bytes(self._pending))
+            self._pending.clear()
+
+
+class _ZipStream(io.RawIOBase):
+    """Zip archive of the files `_walk_files` yields for a directory, produced by
+    a background thread as the archive is read, with bounded memory use."""
+
+    def __init__(
+        self,
+        dir_path: str,
+        chunk_size: int = READ_CHUNK_SIZE,
+        max_buffered_chunks: int = ARCHIVE_MAX_BUFFERED_CHUNKS,
+    ) -> None:
+        super().__init__()
+        self._chunk_size = chunk_size
+        self._chunks: queue.Queue[Optional[bytes]] = queue.Queue(max_buffered_chunks)
+        self._buffer = memoryview(b"")
+        self._finished = False
+        self._error: Optional[BaseException] = None
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(
+            target=self._write_archive, args=(dir_path,), daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, chunk: Optional[bytes]) -> None:
+        while not self._cancelled.is_set():
+            try:
+                self._chunks.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise RuntimeError("Archive stream was closed")
+
+    def _write_archive(self, dir_path: str) -> None:
+        writer = _ChunkWriter(self._put, self._chunk_size)
+        try:
+            with zipfile.ZipFile(writer, "w", zipfile.ZIP_DEFLATED) as zipf:  # type: ignore[call-overload]
+                for file_path, relative_path in _walk_files(dir_path):
+                    zipf.write(file_path, relative_path)
+            writer.flush_pending()
+        except BaseException as exc:
+            self._error = exc
+        finally:
+            try:
+                self._put(None)
+            except RuntimeError:
+                pass
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer and not self._finished:
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._finished = True
+                if self._error is not None:
+                    raise self._error
+            else:
+                self._buffer = memoryview(chunk)
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        self._cancelled.set()
+        self._thread.join()
+        super().close()
+
+
+def _compute_manifest(dir_path: str) -> Manifest:
+    hash_cache = FileHashCache.default()
+
+    def _hash(file_path: str) -> str:
+        stat = os.stat(file_path)
+        file_hash = hash_cache.get(file_path, stat)
+        if file_hash is None:
+            file_hash = compute_hash(Path(file_path), stat.st_mode)
+            hash_cache.put(file_path, stat, file_hash)
+        return file_hash
+
+    file_paths: dict[str, str] = {
+        relative_path: os.path.abspath(file_path)
+        for file_path, relative_path in _walk_files(dir_path)
+        if relative_path not in (HASH_FILE, MANIFEST_FILE)
+    }
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        hashes = executor.map(_hash, file_paths.values())
+        manifest: Manifest = {
+            relative_path: {
+                "hash": file_hash,
+                "size": os.path.getsize(file_path),
+            }
+            for (relative_path, file_path), file_hash in zip(file_paths.items(), hashes)
+        }
+    hash_cache.save()
+    return manifest
+
+
+def _load_remote_manifest(fs: FalFileSystem, remote_root: str) -> Manifest:
+    try:
+        manifest = json.loads(fs.cat_file(f"{remote_root}/{MANIFEST_FILE}"))
+    except (FileNotFoundError, ValueError):
+        # Nothing was synced incrementally to this directory yet.
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _upload_remote_file(fs: FalFileSystem, local_path: str, remote_path: str) -> None:
+    fs.put_file(local_path, remote_path)
+
+
+def _upload_manifest(fs: FalFileSystem, remote_root: str, manifest: Manifest) -> None:
+    fs.pipe_file(f"{remote_root}/{MANIFEST_FILE}", json.dumps(manifest).encode())
+
+
+def _remove_remote_file(fs: FalFileSystem, remote_path: str) -> None:
+    try:
+        fs.rm(remote_path)
+    except FileNotFoundError:
+        # Already removed, e.g. by an interrupted sync
+        pass
+
+
+def _remove_empty_remote_dirs(
+    fs: FalFileSystem, remote_root: str, removed: List[str]
+) -> None:
+    """Remove the directories under `remote_root` that the removed files left
+    empty, deepest first."""
+    dirs = set()
+    for path in removed:
+        parent = posixpath.dirname(path)
+        while parent:
+            dirs.add(parent)
+            parent = posixpath.dirname(parent)
+
+    for path in sorted(dirs, key=lambda path: path.count("/"), reverse=True):
+        remote_path = f"{remote_root}/{path}"
+        try:
+            if not fs.ls(remote_path, detail=False):
+                fs.rm(remote_path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_remote_manifest(remote_root: str) -> None:
+    """Drop the manifest of earlier incremental syncs, which no longer describes
+    the directory after a full one."""
+    from fal.files import FalFileSystem
+
+    fs = FalFileSystem()
+    try:
+        _remove_remote_file(fs, f"{remote_root}/{MANIFEST_FILE}")
+    finally:
+        fs.close()
+
+
+def _sync_dir_incremental(
+    fs: FalFileSystem,
+    local_dir_abs: str,
+    remote_root: str,
+    force_upload: bool = False,
+    max_concurrency: int = DEFAULT_CONCURRENCY_UPLOADS,
+) -> None:
+    local_manifest = _compute_manifest(local_dir_abs)
+    remote_manifest = {} if force_upload else _load_remote_manifest(fs, remote_root)
+
+    changed = [
+        path
+        for path, entry in local_manifest.items()
+        if remote_manifest.get(path) != entry
+    ]
+    removed = [path for path in remote_manifest if path not in local_manifest]
+    if not changed and not removed:
+        print(f"{remote_root} already uploaded and matches {local_dir_abs}")
+        return
+
+    # Until the sync completes, the remote manifest only lists the files that are
+    # left untouched or still to be deleted, so an interrupted sync is picked up
+    # by the next one. The hash of full syncs no longer describes the directory
+    # either.
+    _upload_manifest(
+        fs,
+        remote_root,
+        {path: entry for path, entry in remote_manifest.items() if path not in changed},
+    )
+    _remove_remote_file(fs, f"{remote_root}/{HASH_FILE}")
+
+    print(f"Uploading {len(changed)} files, deleting {len(removed)} files...")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [
+            executor.submit(
+                _upload_remote_file,
+                fs,
+                os.path.join(local_dir_abs, path),
+                f"{remote_root}/{path}",
+            )
+            for path in changed
+        ]
+        futures += [
+            executor.submit(_remove_remote_file, fs, f"{remote_root}/{path}")
+            for path in removed
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+    _remove_empty_remote_dirs(fs, remote_root, removed)
+
+    _upload_manifest(fs, remote_root, local_manifest)
+
+
+def sync_dir(
+    local_dir: str | Path,
+    remote_dir: str,
+    force_upload=False,
+    incremental: bool = False,
+) -> str:
+    """Upload `local_dir` to `remote_dir` (an absolute path under `/data`) unless
+    it is already there, and return the remote directory's path relative to
+    `/data`.
+
+    By default the whole directory is uploaded as an archive whenever anything in
+    it changed. With `incremental=True`, only new and changed files are uploaded
+    and files that were removed locally are deleted remotely."""
     from fal.api.client import SyncServerlessClient
 
     local_dir_abs = os.path.expanduser(local_dir)
@@ -111,6 +416,23 @@ def sync_dir(local_dir: str | Path, remote_dir: str, force_upload=False) -> str:
 
     remote_dir = remote_dir.replace("/data/", "", 1)
 
+    if incremental:
+        from fal.files import FalFileSystem
+
+        print(f"Syncing {local_dir} with {remote_dir}...")
+        fs = FalFileSystem()
+        try:
+            _sync_dir_incremental(
+                fs,
+                os.path.abspath(local_dir_abs),
+                f"/data/{remote_dir}",
+                force_upload=force_upload,
+            )
+        finally:
+            fs.close()
+        print("Done")
+        return remote_dir
+
     # Compute the local directory hash
     local_hash = _compute_directory_hash(local_dir_abs)
 
@@ -122,18 +444,20 @@ def sync_dir(local_dir: str | Path, remote_dir: str, force_upload=False) -> str:
         print(f"{remote_dir} already uploaded and matches {local_dir}")
         return remote_dir
 
-    with open(os.path.join(local_dir_abs, ".fal_hash"), "w") as f:
+    with open(os.path.join(local_dir_abs, HASH_FILE), "w") as f:
         f.write(local_hash)
 
-    # Zip the local directory
-    zip_path = f"{local_dir_abs}.zip"
-
-    _zip_directory(local_dir_abs, zip_path)
-
-    # Upload the zipped directory to the serverless environment
-    _upload_file(client, zip_path, remote_dir, unzip=True)
-
-    os.remove(zip_path)
+    # Upload the zipped directory to the serverless environment, zipping it as
+    # it is sent
+    with _ZipStream(local_dir_abs) as archive:
+        _upload_file(
+            client,
+            archive,  # type: ignore[arg-type]
+            f"{os.path.basename(os.path.normpath(local_dir_abs))}.zip",
+            remote_dir,
+            unzip=True,
+        )
+    _remove_remote_manifest(f"/data/{remote_dir}")
 
     print("Done")
 
@@ -38,6 +38,8 @@ from fal.toolkit.utils import (
     clone_repository,
     download_file,
     download_model_weights,
+    evict_model_weights,
+    list_model_weights,
 )
 from fal.toolkit.utils.download_utils import DownloadError
 from fal.toolkit.video.video import Video, VideoField
@@ -72,6 +74,8 @@ __all__ = [
     "clone_repository",
     "download_file",
     "download_model_weights",
+    "evict_model_weights",
+    "list_model_weights",
     "get_gpu_type",
     "load_inductor_cache",
     "sync_inductor_cache",
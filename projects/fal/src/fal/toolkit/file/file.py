@@ -31,10 +31,20 @@ from fal.toolkit.file.providers.fal import (
     FalFileRepositoryV2,  # noqa: F401
     FalFileRepositoryV3,
     InMemoryRepository,
+    VariableReference,
 )
 from fal.toolkit.file.providers.gcp import GoogleStorageRepository
 from fal.toolkit.file.providers.r2 import R2Repository
 from fal.toolkit.file.types import FileData, FileRepository, RepositoryId
+from fal.toolkit.file.upload_cache import (
+    DEFAULT_MAX_ENTRIES,
+    DEFAULT_TTL,
+    UploadCache,
+    content_digest,
+    default_upload_cache,
+    file_digest,
+    lifecycle_expiration,
+)
 from fal.toolkit.utils.download_utils import download_file
 
 FileRepositoryFactory = Callable[[], FileRepository]
@@ -73,6 +83,57 @@ DEFAULT_REPOSITORY: FileRepository | RepositoryId = "fal_v3"
 FALLBACK_REPOSITORY: list[FileRepository | RepositoryId] = ["fal"]
 OBJECT_LIFECYCLE_PREFERENCE_KEY = "x-fal-object-lifecycle-preference"
 
+_UPLOAD_CACHE: VariableReference[UploadCache | None] = VariableReference(
+    default_upload_cache()
+)
+
+
+def enable_upload_cache(
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    directory: str | Path | None = None,
+    ttl: float = DEFAULT_TTL,
+) -> UploadCache:
+    """Make `File.from_bytes` and `File.from_path` return the URL of an earlier
+    upload of the same content (with the same repository, content type and
+    lifecycle) instead of uploading it again, for as long as that URL is valid.
+    Pass `directory` to also keep the cache on disk."""
+    cache = UploadCache(max_entries=max_entries, directory=directory, ttl=ttl)
+    _UPLOAD_CACHE.set(cache)
+    return cache
+
+
+def disable_upload_cache() -> None:
+    _UPLOAD_CACHE.set(None)
+
+
+def _cached_url(
+    cache: UploadCache,
+    digest: str,
+    file_name: str | None,
+    repository: FileRepository | RepositoryId,
+    content_type: str | None,
+    save_kwargs: dict,
+) -> tuple[str, str | None]:
+    """The cache key of an upload, and the URL of an earlier upload of the same
+    content with the same options if it is still valid."""
+    key = cache.key(
+        digest,
+        file_name,
+        repository,
+        content_type,
+        save_kwargs["object_lifecycle_preference"],
+    )
+    return key, cache.get(key)
+
+
+def _remember_url(
+    cache: UploadCache | None, key: str | None, url: str, save_kwargs: dict
+) -> None:
+    if cache is not None and key is not None:
+        cache.put(
+            key, url, lifecycle_expiration(save_kwargs["object_lifecycle_preference"])
+        )
+
 
 @wraps(Field)
 def FileField(*args, **kwargs):
@@ -99,16 +160,14 @@ def FileField(*args, **kwargs):
     return Field(*args, **kwargs)
 
 
-def _try_with_fallback(
-    func: str,
-    args: list[Any],
+def _fallback_attempts(
     repository: FileRepository | RepositoryId,
     fallback_repository: Optional[
         FileRepository | RepositoryId | list[FileRepository | RepositoryId]
     ],
     save_kwargs: dict,
     fallback_save_kwargs: dict,
-) -> Any:
+) -> list[tuple[FileRepository | RepositoryId, dict]]:
     if fallback_repository is None:
         fallback_repository = []
     elif isinstance(fallback_repository, list):
@@ -116,10 +175,25 @@ def _try_with_fallback(
     else:
         fallback_repository = [fallback_repository]
 
-    attempts: list[tuple[FileRepository | RepositoryId, dict]] = [
+    return [
         (repository, save_kwargs),
         *((fallback, fallback_save_kwargs) for fallback in fallback_repository),
     ]
+
+
+def _try_with_fallback(
+    func: str,
+    args: list[Any],
+    repository: FileRepository | RepositoryId,
+    fallback_repository: Optional[
+        FileRepository | RepositoryId | list[FileRepository | RepositoryId]
+    ],
+    save_kwargs: dict,
+    fallback_save_kwargs: dict,
+) -> Any:
+    attempts = _fallback_attempts(
+        repository, fallback_repository, save_kwargs, fallback_save_kwargs
+    )
     for idx, (repo, kwargs) in enumerate(attempts):
         repo_obj = get_builtin_repository(repo)
         try:
@@ -135,6 +209,56 @@ def _try_with_fallback(
             )
 
 
+async def _try_with_fallback_async(
+    func: str,
+    args: list[Any],
+    repository: FileRepository | RepositoryId,
+    fallback_repository: Optional[
+        FileRepository | RepositoryId | list[FileRepository | RepositoryId]
+    ],
+    save_kwargs: dict,
+    fallback_save_kwargs: dict,
+) -> Any:
+    attempts = _fallback_attempts(
+        repository, fallback_repository, save_kwargs, fallback_save_kwargs
+    )
+    for idx, (repo, kwargs) in enumerate(attempts):
+        repo_obj = get_builtin_repository(repo)
+        try:
+            return await getattr(repo_obj, func)(*args, **kwargs)
+        except Exception as exc:
+            if idx >= len(attempts) - 1:
+                raise
+
+            traceback.print_exc()
+            print(
+                f"Failed to {func} to repository {repo}: {exc}, "
+                f"falling back to {attempts[idx + 1][0]}"
+            )
+
+
+def _prepare_save_kwargs(
+    request: Optional[Request],
+    save_kwargs: Optional[dict],
+    fallback_save_kwargs: Optional[dict],
+    **defaults: Any,
+) -> tuple[dict, dict]:
+    save_kwargs = save_kwargs or {}
+    fallback_save_kwargs = fallback_save_kwargs or {}
+
+    if request:
+        object_lifecycle_preference = request_lifecycle_preference(request)
+    else:
+        object_lifecycle_preference = _get_object_lifecycle_preference_from_context()
+
+    defaults = {"object_lifecycle_preference": object_lifecycle_preference, **defaults}
+    for key, value in defaults.items():
+        save_kwargs.setdefault(key, value)
+        fallback_save_kwargs.setdefault(key, value)
+
+    return save_kwargs, fallback_save_kwargs
+
+
 def _get_object_lifecycle_preference_from_context() -> dict[str, str] | None:
     current_app = get_current_app()
     if current_app is None or current_app.current_request is None:
@@ -231,33 +355,34 @@ class File(BaseModel):
         save_kwargs: Optional[dict] = None,
         fallback_save_kwargs: Optional[dict] = None,
     ) -> File:
-        save_kwargs = save_kwargs or {}
-        fallback_save_kwargs = fallback_save_kwargs or {}
+        save_kwargs, fallback_save_kwargs = _prepare_save_kwargs(
+            request, save_kwargs, fallback_save_kwargs
+        )
 
         fdata = FileData(data, content_type, file_name)
 
-        if request:
-            object_lifecycle_preference = request_lifecycle_preference(request)
-        else:
-            object_lifecycle_preference = (
-                _get_object_lifecycle_preference_from_context()
+        cache = _UPLOAD_CACHE.get()
+        cache_key = url = None
+        if cache is not None:
+            cache_key, url = _cached_url(
+                cache,
+                content_digest(data),
+                file_name,
+                repository,
+                fdata.content_type,
+                save_kwargs,
             )
 
-        save_kwargs.setdefault(
-            "object_lifecycle_preference", object_lifecycle_preference
-        )
-        fallback_save_kwargs.setdefault(
-            "object_lifecycle_preference", object_lifecycle_preference
-        )
-
-        url = _try_with_fallback(
-            "save",
-            [fdata],
-            repository=repository,
-            fallback_repository=fallback_repository,
-            save_kwargs=save_kwargs,
-            fallback_save_kwargs=fallback_save_kwargs,
-        )
+        if url is None:
+            url = _try_with_fallback(
+                "save",
+                [fdata],
+                repository=repository,
+                fallback_repository=fallback_repository,
+                save_kwargs=save_kwargs,
+                fallback_save_kwargs=fallback_save_kwargs,
+            )
+            _remember_url(cache, cache_key, url, save_kwargs)
 
         return cls(
             url=url,
@@ -281,16 +406,41 @@ class File(BaseModel):
         save_kwargs: Optional[dict] = None,
         fallback_save_kwargs: Optional[dict] = None,
     ) -> File:
-        return await run_in_thread(
-            cls.from_bytes,
-            data,
-            content_type=content_type,
-            file_name=file_name,
-            repository=repository,
-            fallback_repository=fallback_repository,
-            request=request,
-            save_kwargs=save_kwargs,
-            fallback_save_kwargs=fallback_save_kwargs,
+        save_kwargs, fallback_save_kwargs = _prepare_save_kwargs(
+            request, save_kwargs, fallback_save_kwargs
+        )
+
+        fdata = FileData(data, content_type, file_name)
+
+        cache = _UPLOAD_CACHE.get()
+        cache_key = url = None
+        if cache is not None:
+            cache_key, url = _cached_url(
+                cache,
+                await run_in_thread(content_digest, data),
+                file_name,
+                repository,
+                fdata.content_type,
+                save_kwargs,
+            )
+
+        if url is None:
+            url = await _try_with_fallback_async(
+                "save_async",
+                [fdata],
+                repository=repository,
+                fallback_repository=fallback_repository,
+                save_kwargs=save_kwargs,
+                fallback_save_kwargs=fallback_save_kwargs,
+            )
+            _remember_url(cache, cache_key, url, save_kwargs)
+
+        return cls(
+            url=url,
+            content_type=fdata.content_type,
+            file_name=fdata.file_name,
+            file_size=len(data),
+            file_data=data,
         )
 
     @classmethod
@@ -311,30 +461,35 @@ class File(BaseModel):
         if not file_path.exists():
             raise FileNotFoundError(f"File {file_path} does not exist")
 
-        save_kwargs = save_kwargs or {}
-        fallback_save_kwargs = fallback_save_kwargs or {}
-
         content_type = content_type or "application/octet-stream"
-
-        if request:
-            object_lifecycle_preference = request_lifecycle_preference(request)
-        else:
-            object_lifecycle_preference = (
-                _get_object_lifecycle_preference_from_context()
-            )
-
-        save_kwargs.setdefault(
-            "object_lifecycle_preference", object_lifecycle_preference
-        )
-        fallback_save_kwargs.setdefault(
-            "object_lifecycle_preference", object_lifecycle_preference
+        save_kwargs, fallback_save_kwargs = _prepare_save_kwargs(
+            request,
+            save_kwargs,
+            fallback_save_kwargs,
+            multipart=multipart,
+            content_type=content_type,
         )
 
-        save_kwargs.setdefault("multipart", multipart)
-        fallback_save_kwargs.setdefault("multipart", multipart)
-
-        save_kwargs.setdefault("content_type", content_type)
-        fallback_save_kwargs.setdefault("content_type", content_type)
+        cache = _UPLOAD_CACHE.get()
+        cache_key = None
+        if cache is not None:
+            cache_key, cached_url = _cached_url(
+                cache,
+                file_digest(file_path),
+                file_path.name,
+                repository,
+                save_kwargs["content_type"],
+                save_kwargs,
+            )
+            if cached_url is not None:
+                # The file is not read into memory when it is not uploaded.
+                return cls(
+                    url=cached_url,
+                    file_data=None,
+                    content_type=content_type,
+                    file_name=file_path.name,
+                    file_size=file_path.stat().st_size,
+                )
 
         url, data = _try_with_fallback(
             "save_file",
@@ -344,6 +499,7 @@ class File(BaseModel):
             save_kwargs=save_kwargs,
             fallback_save_kwargs=fallback_save_kwargs,
         )
+        _remember_url(cache, cache_key, url, save_kwargs)
 
         return cls(
             url=url,
@@ -367,17 +523,56 @@ class File(BaseModel):
         save_kwargs: Optional[dict] = None,
         fallback_save_kwargs: Optional[dict] = None,
     ) -> File:
-        return await run_in_thread(
-            cls.from_path,
-            path,
+        file_path = Path(path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"File {file_path} does not exist")
+
+        content_type = content_type or "application/octet-stream"
+        save_kwargs, fallback_save_kwargs = _prepare_save_kwargs(
+            request,
+            save_kwargs,
+            fallback_save_kwargs,
+            multipart=multipart,
             content_type=content_type,
+        )
+
+        cache = _UPLOAD_CACHE.get()
+        cache_key = None
+        if cache is not None:
+            cache_key, cached_url = _cached_url(
+                cache,
+                await run_in_thread(file_digest, file_path),
+                file_path.name,
+                repository,
+                save_kwargs["content_type"],
+                save_kwargs,
+            )
+            if cached_url is not None:
+                return cls(
+                    url=cached_url,
+                    file_data=None,
+                    content_type=content_type,
+                    file_name=file_path.name,
+                    file_size=file_path.stat().st_size,
+                )
+
+        url, data = await _try_with_fallback_async(
+            "save_file_async",
+            [file_path],
             repository=repository,
-            multipart=multipart,
             fallback_repository=fallback_repository,
-            request=request,
             save_kwargs=save_kwargs,
             fallback_save_kwargs=fallback_save_kwargs,
         )
+        _remember_url(cache, cache_key, url, save_kwargs)
+
+        return cls(
+            url=url,
+            file_data=data.data if data else None,
+            content_type=content_type,
+            file_name=file_path.name,
+            file_size=file_path.stat().st_size,
+        )
 
     def as_bytes(self) -> bytes:
         if self.file_data is None:
@@ -1,32 +1,50 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import math
 import os
 import threading
+import time
 from base64 import b64encode
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Generator, Generic, TypeVar
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Generic,
+    TypeVar,
+)
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse, urlunparse
-from urllib.request import Request, urlopen
+from urllib.request import Request
 from urllib.response import addinfourl
 
+import httpx
+
 from fal._user_agent import USER_AGENT
 from fal.auth import AuthCredentials, fetch_auth_credentials
+from fal.compat import run_in_thread
 from fal.exceptions.auth import UnauthenticatedException
 from fal.flags import REST_HOST
 from fal.ref import get_current_app
 from fal.toolkit.exceptions import FileUploadException
 from fal.toolkit.file.types import FileData, FileRepository
+from fal.toolkit.utils.http_session import shared_session
 from fal.toolkit.utils.retry import retry
 
 _FAL_CDN_V3 = "https://v3.fal.media"
 
+logger = logging.getLogger(__name__)
+
 
 def _require_auth_credentials() -> AuthCredentials:
     try:
@@ -47,6 +65,10 @@ RETRY_CODES = [408, 409, 429, 500, 502, 503, 504]
 def _should_retry(exc: Exception) -> bool:
     if isinstance(exc, HTTPError) and exc.code in RETRY_CODES:
         return True
+    elif isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRY_CODES
+    elif isinstance(exc, httpx.TransportError):
+        return True
     elif type(exc) is URLError:
         # URLError is a base class for other errors,
         # but it can be raised directly, e.g.
@@ -73,7 +95,7 @@ def _maybe_retry_request(
         backoff_type="exponential",
         jitter=True,
         should_retry=_should_retry,
-    )(partial(urlopen, request, timeout=timeout))
+    )(partial(shared_session().urlopen, request, timeout=timeout))
 
     response = _urlopen_with_retry()
     try:
@@ -82,6 +104,40 @@ def _maybe_retry_request(
         response.close()
 
 
+def _async_http_client() -> httpx.AsyncClient:
+    return shared_session().async_client()
+
+
+async def _async_maybe_retry_request(
+    method: str,
+    url: str,
+    **kwargs: Any,
+) -> httpx.Response:
+    timeout = kwargs.pop("timeout", DEFAULT_REQUEST_TIMEOUT)
+
+    @retry(
+        max_retries=MAX_ATTEMPTS,
+        base_delay=BASE_DELAY,
+        max_delay=MAX_DELAY,
+        backoff_type="exponential",
+        jitter=True,
+        should_retry=_should_retry,
+    )
+    async def _request_with_retry() -> httpx.Response:
+        response = await _async_http_client().request(
+            method,
+            url,
+            # Waiting for a pooled connection is not bounded by the timeout.
+            timeout=httpx.Timeout(timeout, pool=None),
+            extensions=shared_session().async_extensions(url),
+            **kwargs,
+        )
+        response.raise_for_status()
+        return response
+
+    return await _request_with_retry()
+
+
 def _object_lifecycle_headers(
     headers: dict[str, str],
     object_lifecycle_preference: dict[str, str] | None,
@@ -320,6 +376,240 @@ class FalFileRepositoryBase(FileRepository):
             )
 
 
+# Multipart uploads pick their part size from the upload's size: large enough to
+# split it into about MULTIPART_TARGET_PARTS parts (but no larger than
+# MULTIPART_MAX_CHUNK_SIZE unless needed to stay under MULTIPART_MAX_PARTS).
+MULTIPART_MAX_CHUNK_SIZE = 64 * 1024 * 1024
+MULTIPART_TARGET_PARTS = 256
+MULTIPART_MAX_PARTS = 10_000
+# Unless a fixed concurrency is requested, uploads start with this many parts in
+# flight and adjust that number to the observed throughput.
+MULTIPART_INITIAL_CONCURRENCY = 4
+MULTIPART_TUNING_TOLERANCE = 0.1
+
+
+def _multipart_chunk_size(size: int, min_chunk_size: int) -> int:
+    chunk_size = max(
+        min_chunk_size,
+        min(math.ceil(size / MULTIPART_TARGET_PARTS), MULTIPART_MAX_CHUNK_SIZE),
+        math.ceil(size / MULTIPART_MAX_PARTS),
+    )
+    # Round up to whole MiBs.
+    return -(-chunk_size // (1024 * 1024)) * (1024 * 1024)
+
+
+@dataclass(frozen=True)
+class MultipartUploadStats:
+    chunk_size: int
+    parts: int
+    # The final and the highest number of parts that were allowed in flight.
+    concurrency: int
+    max_concurrency: int
+    bytes: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Achieved throughput, in MB/s."""
+        return self.bytes / self.seconds / 1e6 if self.seconds else 0.0
+
+
+class _PartThrottle:
+    """Caps the number of parts in flight. Unless `fixed`, the cap is tuned to the
+    throughput measured over each window of `limit` finished parts: it doubles
+    while throughput keeps improving, then moves up or down one part at a time.
+
+    Uploads take slots from `_SyncPartThrottle` or `_AsyncPartThrottle`."""
+
+    def __init__(self, initial: int, maximum: int, fixed: bool = False) -> None:
+        self.limit = maximum if fixed else min(initial, maximum)
+        self.maximum = maximum
+        self.fixed = fixed
+        self.peak = self.limit
+        self.parts = 0
+        self.bytes = 0
+        self._in_flight = 0
+        self._started = time.monotonic()
+        self._window_started = self._started
+        self._window_parts = 0
+        self._window_bytes = 0
+        self._last_throughput: float | None = None
+        self._slow_start = True
+
+    def _record(self, size: int) -> None:
+        self.parts += 1
+        self.bytes += size
+        self._window_parts += 1
+        self._window_bytes += size
+        if self.fixed or self._window_parts < self.limit:
+            return
+
+        now = time.monotonic()
+        throughput = self._window_bytes / max(now - self._window_started, 1e-6)
+        previous = self._last_throughput
+        if previous is None or throughput > previous * (1 + MULTIPART_TUNING_TOLERANCE):
+            step = self.limit if self._slow_start else 1
+            self.limit = min(self.limit + step, self.maximum)
+        else:
+            self._slow_start = False
+            if throughput < previous * (1 - MULTIPART_TUNING_TOLERANCE):
+                self.limit = max(self.limit - 1, 1)
+        self.peak = max(self.peak, self.limit)
+        self._last_throughput = throughput
+        self._window_started = now
+        self._window_parts = 0
+        self._window_bytes = 0
+
+    def stats(self, chunk_size: int) -> MultipartUploadStats:
+        return MultipartUploadStats(
+            chunk_size=chunk_size,
+            parts=self.parts,
+            concurrency=self.limit,
+            max_concurrency=self.peak,
+            bytes=self.bytes,
+            seconds=time.monotonic() - self._started,
+        )
+
+
+class _SyncPartThrottle(_PartThrottle):
+    def __init__(self, initial: int, maximum: int, fixed: bool = False) -> None:
+        super().__init__(initial, maximum, fixed=fixed)
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self, size: int) -> Generator[None, None, None]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                if succeeded:
+                    self._record(size)
+                self._condition.notify_all()
+
+
+class _AsyncPartThrottle(_PartThrottle):
+    def __init__(self, initial: int, maximum: int, fixed: bool = False) -> None:
+        super().__init__(initial, maximum, fixed=fixed)
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self, size: int) -> AsyncGenerator[None, None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                if succeeded:
+                    self._record(size)
+                self._condition.notify_all()
+
+
+def _upload_parts(
+    multipart: MultipartUploadGCS | MultipartUploadV3 | InternalMultipartUploadV3,
+    size: int,
+    read: Callable[[int, int], bytes],
+) -> None:
+    """Upload `size` bytes, read with `read(start, length)`, as the parts of an
+    initiated multipart upload, and record the upload's stats on it."""
+    import concurrent.futures  # noqa: PLC0415
+
+    if multipart._auto_chunk_size:
+        multipart.chunk_size = _multipart_chunk_size(
+            size, multipart.MULTIPART_CHUNK_SIZE
+        )
+    throttle = _SyncPartThrottle(
+        MULTIPART_INITIAL_CONCURRENCY,
+        multipart.max_concurrency,
+        fixed=multipart._fixed_concurrency,
+    )
+
+    def _upload_part(part_number: int) -> None:
+        start = (part_number - 1) * multipart.chunk_size
+        length = min(multipart.chunk_size, size - start)
+        with throttle.slot(length):
+            multipart.upload_part(part_number, read(start, length))
+
+    parts = math.ceil(size / multipart.chunk_size)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=multipart.max_concurrency
+    ) as executor:
+        futures = [
+            executor.submit(_upload_part, part_number)
+            for part_number in range(1, parts + 1)
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+    _finish_stats(multipart, throttle)
+
+
+async def _upload_parts_async(
+    multipart: MultipartUploadV3,
+    size: int,
+    read: Callable[[int, int], Awaitable[bytes]],
+) -> None:
+    """Async version of `_upload_parts`, with parts uploaded as concurrent tasks."""
+    if multipart._auto_chunk_size:
+        multipart.chunk_size = _multipart_chunk_size(
+            size, multipart.MULTIPART_CHUNK_SIZE
+        )
+    throttle = _AsyncPartThrottle(
+        MULTIPART_INITIAL_CONCURRENCY,
+        multipart.max_concurrency,
+        fixed=multipart._fixed_concurrency,
+    )
+
+    async def _upload_part(part_number: int) -> None:
+        start = (part_number - 1) * multipart.chunk_size
+        length = min(multipart.chunk_size, size - start)
+        async with throttle.slot(length):
+            await multipart.upload_part_async(part_number, await read(start, length))
+
+    parts = math.ceil(size / multipart.chunk_size)
+    tasks = [
+        asyncio.ensure_future(_upload_part(part_number))
+        for part_number in range(1, parts + 1)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    _finish_stats(multipart, throttle)
+
+
+def _finish_stats(
+    multipart: MultipartUploadGCS | MultipartUploadV3 | InternalMultipartUploadV3,
+    throttle: _PartThrottle,
+) -> None:
+    multipart.stats = throttle.stats(multipart.chunk_size)
+    logger.debug(
+        f"Uploaded {multipart.stats.parts} parts of {multipart.file_name} "
+        f"({multipart.stats.chunk_size} bytes each, up to "
+        f"{multipart.stats.max_concurrency} in flight) at "
+        f"{multipart.stats.throughput:.1f} MB/s"
+    )
+
+
+def _read_file_range(file_path: str | Path, start: int, length: int) -> bytes:
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        return f.read(length)
+
+
 class MultipartUploadGCS:
     MULTIPART_THRESHOLD = 100 * 1024 * 1024
     MULTIPART_CHUNK_SIZE = 10 * 1024 * 1024
@@ -336,6 +626,11 @@ class MultipartUploadGCS:
         self.chunk_size = chunk_size or self.MULTIPART_CHUNK_SIZE
         self.content_type = content_type or "application/octet-stream"
         self.max_concurrency = max_concurrency or self.MULTIPART_MAX_CONCURRENCY
+        # Without explicit values, the chunk size is picked from the upload's size
+        # and the concurrency is tuned while uploading.
+        self._auto_chunk_size = chunk_size is None
+        self._fixed_concurrency = max_concurrency is not None
+        self.stats: MultipartUploadStats | None = None
 
         self._access_url: str | None = None
         self._upload_url: str | None = None
@@ -464,8 +759,6 @@ class MultipartUploadGCS:
         max_concurrency: int | None = None,
         object_lifecycle_preference: dict[str, str] | None = None,
     ):
-        import concurrent.futures  # noqa: PLC0415
-
         multipart = cls(
             file.file_name,
             chunk_size=chunk_size,
@@ -473,22 +766,11 @@ class MultipartUploadGCS:
             max_concurrency=max_concurrency,
         )
         multipart.create(object_lifecycle_preference=object_lifecycle_preference)
-
-        parts = math.ceil(len(file.data) / multipart.chunk_size)
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=multipart.max_concurrency
-        ) as executor:
-            futures = []
-            for part_number in range(1, parts + 1):
-                start = (part_number - 1) * multipart.chunk_size
-                data = file.data[start : start + multipart.chunk_size]
-                futures.append(
-                    executor.submit(multipart.upload_part, part_number, data)
-                )
-
-            for future in concurrent.futures.as_completed(futures):
-                future.result()
-
+        _upload_parts(
+            multipart,
+            len(file.data),
+            lambda start, length: file.data[start : start + length],
+        )
         return multipart.complete()
 
     @classmethod
@@ -500,8 +782,6 @@ class MultipartUploadGCS:
         max_concurrency: int | None = None,
         object_lifecycle_preference: dict[str, str] | None = None,
     ) -> str:
-        import concurrent.futures  # noqa: PLC0415
-
         file_name = os.path.basename(file_path)
         size = os.path.getsize(file_path)
 
@@ -512,26 +792,7 @@ class MultipartUploadGCS:
             max_concurrency=max_concurrency,
         )
         multipart.create(object_lifecycle_preference=object_lifecycle_preference)
-
-        parts = math.ceil(size / multipart.chunk_size)
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=multipart.max_concurrency
-        ) as executor:
-            futures = []
-            for part_number in range(1, parts + 1):
-
-                def _upload_part(pn: int) -> None:
-                    with open(file_path, "rb") as f:
-                        start = (pn - 1) * multipart.chunk_size
-                        f.seek(start)
-                        data = f.read(multipart.chunk_size)
-                        multipart.upload_part(pn, data)
-
-                futures.append(executor.submit(_upload_part, part_number))
-
-            for future in concurrent.futures.as_completed(futures):
-                future.result()
-
+        _upload_parts(multipart, size, partial(_read_file_range, file_path))
         return multipart.complete()
 
 
@@ -628,6 +889,11 @@ class MultipartUploadV3:
         self.chunk_size = chunk_size or self.MULTIPART_CHUNK_SIZE
         self.content_type = content_type or "application/octet-stream"
         self.max_concurrency = max_concurrency or self.MULTIPART_MAX_CONCURRENCY
+        # Without explicit values, the chunk size is picked from the upload's size
+        # and the concurrency is tuned while uploading.
+        self._auto_chunk_size = chunk_size is None
+        self._fixed_concurrency = max_concurrency is not None
+        self.stats: MultipartUploadStats | None = None
 
         self._access_url: str | None = None
         self._upload_url: str | None = None
@@ -740,6 +1006,83 @@ class MultipartUploadV3:
 
         return self.access_url
 
+    async def create_async(
+        self, object_lifecycle_preference: dict[str, str] | None = None
+    ) -> None:
+        url = f"https://{REST_HOST}/storage/upload/initiate-multipart?storage_type=fal-cdn-v3"
+
+        headers = {
+            **self.auth_headers,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        _object_lifecycle_headers(headers, object_lifecycle_preference)
+        try:
+            response = await _async_maybe_retry_request(
+                "POST",
+                url,
+                headers=headers,
+                json={
+                    "file_name": self.file_name,
+                    "content_type": self.content_type,
+                },
+            )
+        except httpx.HTTPStatusError as exc:
+            raise FileUploadException(
+                f"Error initiating upload. Status {exc.response.status_code}: "
+                f"{exc.response.reason_phrase}"
+            )
+
+        result = response.json()
+        self._access_url = result["file_url"]
+        self._upload_url = result["upload_url"]
+
+    async def upload_part_async(self, part_number: int, data: bytes) -> None:
+        parsed = urlparse(self.upload_url)
+        part_path = parsed.path + f"/{part_number}"
+        url = urlunparse(parsed._replace(path=part_path))
+
+        try:
+            response = await _async_maybe_retry_request(
+                "PUT",
+                url,
+                headers={"Content-Type": self.content_type},
+                content=data,
+                timeout=PUT_REQUEST_TIMEOUT,
+            )
+        except httpx.HTTPStatusError as exc:
+            raise FileUploadException(
+                f"Error uploading part {part_number} to {url}. "
+                f"Status {exc.response.status_code}: {exc.response.reason_phrase}"
+            )
+
+        self._parts.append(
+            {
+                "partNumber": part_number,
+                "etag": response.headers["ETag"],
+            }
+        )
+
+    async def complete_async(self) -> str:
+        parsed = urlparse(self.upload_url)
+        complete_path = parsed.path + "/complete"
+        url = urlunparse(parsed._replace(path=complete_path))
+
+        try:
+            await _async_maybe_retry_request(
+                "POST",
+                url,
+                headers={"Accept": "application/json"},
+                json={"parts": self._parts},
+            )
+        except httpx.HTTPStatusError as exc:
+            raise FileUploadException(
+                f"Error completing upload {url}. Status "
+                f"{exc.response.status_code}: {exc.response.reason_phrase}"
+            )
+
+        return self.access_url
+
     @classmethod
     def save(
         cls,
@@ -748,8 +1091,6 @@ class MultipartUploadV3:
         max_concurrency: int | None = None,
         object_lifecycle_preference: dict[str, str] | None = None,
     ):
-        import concurrent.futures  # noqa: PLC0415
-
         multipart = cls(
             file.file_name,
             chunk_size=chunk_size,
@@ -757,22 +1098,11 @@ class MultipartUploadV3:
             max_concurrency=max_concurrency,
         )
         multipart.create(object_lifecycle_preference=object_lifecycle_preference)
-
-        parts = math.ceil(len(file.data) / multipart.chunk_size)
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=multipart.max_concurrency
-        ) as executor:
-            futures = []
-            for part_number in range(1, parts + 1):
-                start = (part_number - 1) * multipart.chunk_size
-                data = file.data[start : start + multipart.chunk_size]
-                futures.append(
-                    executor.submit(multipart.upload_part, part_number, data)
-                )
-
-            for future in concurrent.futures.as_completed(futures):
-                future.result()
-
+        _upload_parts(
+            multipart,
+            len(file.data),
+            lambda start, length: file.data[start : start + length],
+        )
         return multipart.complete()
 
     @classmethod
@@ -784,8 +1114,6 @@ class MultipartUploadV3:
         max_concurrency: int | None = None,
         object_lifecycle_preference: dict[str, str] | None = None,
     ) -> str:
-        import concurrent.futures  # noqa: PLC0415
-
         file_name = os.path.basename(file_path)
         size = os.path.getsize(file_path)
 
@@ -796,27 +1124,58 @@ class MultipartUploadV3:
             max_concurrency=max_concurrency,
         )
         multipart.create(object_lifecycle_preference=object_lifecycle_preference)
+        _upload_parts(multipart, size, partial(_read_file_range, file_path))
+        return multipart.complete()
 
-        parts = math.ceil(size / multipart.chunk_size)
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=multipart.max_concurrency
-        ) as executor:
-            futures = []
-            for part_number in range(1, parts + 1):
+    @classmethod
+    async def save_async(
+        cls,
+        file: FileData,
+        chunk_size: int | None = None,
+        max_concurrency: int | None = None,
+        object_lifecycle_preference: dict[str, str] | None = None,
+    ) -> str:
+        multipart = cls(
+            file.file_name,
+            chunk_size=chunk_size,
+            content_type=file.content_type,
+            max_concurrency=max_concurrency,
+        )
+        await multipart.create_async(
+            object_lifecycle_preference=object_lifecycle_preference
+        )
 
-                def _upload_part(pn: int) -> None:
-                    with open(file_path, "rb") as f:
-                        start = (pn - 1) * multipart.chunk_size
-                        f.seek(start)
-                        data = f.read(multipart.chunk_size)
-                        multipart.upload_part(pn, data)
+        async def _read(start: int, length: int) -> bytes:
+            return file.data[start : start + length]
 
-                futures.append(executor.submit(_upload_part, part_number))
+        await _upload_parts_async(multipart, len(file.data), _read)
+        return await multipart.complete_async()
 
-            for future in concurrent.futures.as_completed(futures):
-                future.result()
+    @classmethod
+    async def save_file_async(
+        cls,
+        file_path: str | Path,
+        chunk_size: int | None = None,
+        content_type: str | None = None,
+        max_concurrency: int | None = None,
+        object_lifecycle_preference: dict[str, str] | None = None,
+    ) -> str:
+        file_name = os.path.basename(file_path)
+        size = os.path.getsize(file_path)
 
-        return multipart.complete()
+        multipart = cls(
+            file_name,
+            chunk_size=chunk_size,
+            content_type=content_type,
+            max_concurrency=max_concurrency,
+        )
+        await multipart.create_async(
+            object_lifecycle_preference=object_lifecycle_preference
+        )
+        await _upload_parts_async(
+            multipart, size, partial(run_in_thread, _read_file_range, file_path)
+        )
+        return await multipart.complete_async()
 
 
 class InternalMultipartUploadV3:
@@ -835,6 +1194,11 @@ class InternalMultipartUploadV3:
         self.chunk_size = chunk_size or self.MULTIPART_CHUNK_SIZE
         self.content_type = content_type or "application/octet-stream"
         self.max_concurrency = max_concurrency or self.MULTIPART_MAX_CONCURRENCY
+        # Without explicit values, the chunk size is picked from the upload's size
+        # and the concurrency is tuned while uploading.
+        self._auto_chunk_size = chunk_size is None
+        self._fixed_concurrency = max_concurrency is not None
+        self.stats: MultipartUploadStats | None = None
         self._access_url: str | None = None
         self._upload_id: str | None = None
 
@@ -945,8 +1309,6 @@ class InternalMultipartUploadV3:
         max_concurrency: int | None = None,
         object_lifecycle_preference: dict[str, str] | None = None,
     ):
-        import concurrent.futures  # noqa: PLC0415
-
         multipart = cls(
             file.file_name,
             chunk_size=chunk_size,
@@ -954,22 +1316,11 @@ class InternalMultipartUploadV3:
             max_concurrency=max_concurrency,
         )
         multipart.create(object_lifecycle_preference=object_lifecycle_preference)
-
-        parts = math.ceil(len(file.data) / multipart.chunk_size)
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=multipart.max_concurrency
-        ) as executor:
-            futures = []
-            for part_number in range(1, parts + 1):
-                start = (part_number - 1) * multipart.chunk_size
-                data = file.data[start : start + multipart.chunk_size]
-                futures.append(
-                    executor.submit(multipart.upload_part, part_number, data)
-                )
-
-            for future in concurrent.futures.as_completed(futures):
-                future.result()
-
+        _upload_parts(
+            multipart,
+            len(file.data),
+            lambda start, length: file.data[start : start + length],
+        )
         return multipart.complete()
 
     @classmethod
@@ -981,8 +1332,6 @@ class InternalMultipartUploadV3:
         max_concurrency: int | None = None,
         object_lifecycle_preference: dict[str, str] | None = None,
     ) -> str:
-        import concurrent.futures  # noqa: PLC0415
-
         file_name = os.path.basename(file_path)
         size = os.path.getsize(file_path)
 
@@ -993,26 +1342,7 @@ class InternalMultipartUploadV3:
             max_concurrency=max_concurrency,
         )
         multipart.create(object_lifecycle_preference=object_lifecycle_preference)
-
-        parts = math.ceil(size / multipart.chunk_size)
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=multipart.max_concurrency
-        ) as executor:
-            futures = []
-            for part_number in range(1, parts + 1):
-
-                def _upload_part(pn: int) -> None:
-                    with open(file_path, "rb") as f:
-                        start = (pn - 1) * multipart.chunk_size
-                        f.seek(start)
-                        data = f.read(multipart.chunk_size)
-                        multipart.upload_part(pn, data)
-
-                futures.append(executor.submit(_upload_part, part_number))
-
-            for future in concurrent.futures.as_completed(futures):
-                future.result()
-
+        _upload_parts(multipart, size, partial(_read_file_range, file_path))
         return multipart.complete()
 
 
@@ -1146,6 +1476,105 @@ class FalFileRepositoryV3(FileRepository):
 
         return url, data
 
+    async def save_async(
+        self,
+        file: FileData,
+        multipart: bool | None = None,
+        multipart_threshold: int | None = None,
+        multipart_chunk_size: int | None = None,
+        multipart_max_concurrency: int | None = None,
+        object_lifecycle_preference: dict[str, str] | None = None,
+    ) -> str:
+        if multipart is None:
+            threshold = multipart_threshold or MultipartUploadV3.MULTIPART_THRESHOLD
+            multipart = len(file.data) > threshold
+
+        if multipart:
+            return await MultipartUploadV3.save_async(
+                file,
+                chunk_size=multipart_chunk_size,
+                max_concurrency=multipart_max_concurrency,
+                object_lifecycle_preference=object_lifecycle_preference,
+            )
+
+        headers = {
+            **self.auth_headers,
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        _object_lifecycle_headers(headers, object_lifecycle_preference)
+
+        url = f"https://{REST_HOST}/storage/upload/initiate?storage_type=fal-cdn-v3"
+
+        try:
+            response = await _async_maybe_retry_request(
+                "POST",
+                url,
+                headers=headers,
+                json={
+                    "file_name": file.file_name,
+                    "content_type": file.content_type,
+                },
+            )
+        except httpx.HTTPStatusError as e:
+            raise FileUploadException(
+                f"Error initiating upload. Status {e.response.status_code}: "
+                f"{e.response.reason_phrase}"
+            )
+        result = response.json()
+
+        try:
+            await _async_maybe_retry_request(
+                "PUT",
+                result["upload_url"],
+                headers={"Content-Type": file.content_type},
+                content=file.data,
+                timeout=PUT_REQUEST_TIMEOUT,
+            )
+        except httpx.HTTPStatusError as e:
+            raise FileUploadException(
+                f"Error uploading file. Status {e.response.status_code}: "
+                f"{e.response.reason_phrase}"
+            )
+
+        return result["file_url"]
+
+    async def save_file_async(
+        self,
+        file_path: str | Path,
+        content_type: str,
+        multipart: bool | None = None,
+        multipart_threshold: int | None = None,
+        multipart_chunk_size: int | None = None,
+        multipart_max_concurrency: int | None = None,
+        object_lifecycle_preference: dict[str, str] | None = None,
+    ) -> tuple[str, FileData | None]:
+        if multipart is None:
+            threshold = multipart_threshold or MultipartUploadV3.MULTIPART_THRESHOLD
+            multipart = os.path.getsize(file_path) > threshold
+
+        if multipart:
+            url = await MultipartUploadV3.save_file_async(
+                file_path,
+                chunk_size=multipart_chunk_size,
+                content_type=content_type,
+                max_concurrency=multipart_max_concurrency,
+                object_lifecycle_preference=object_lifecycle_preference,
+            )
+            data = None
+        else:
+            data = FileData(
+                await run_in_thread(Path(file_path).read_bytes),
+                content_type=content_type,
+                file_name=os.path.basename(file_path),
+            )
+            url = await self.save_async(
+                data,
+                object_lifecycle_preference=object_lifecycle_preference,
+            )
+
+        return url, data
+
 
 # This is only available for internal users to have long-lived access tokens
 @dataclass
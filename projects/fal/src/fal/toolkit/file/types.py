@@ -6,6 +6,8 @@ from pathlib import Path
 from typing import Literal, Optional
 from uuid import uuid4
 
+from fal.compat import run_in_thread
+
 
 class FileData:
     data: bytes
@@ -71,3 +73,44 @@ class FileRepository:
             multipart_max_concurrency=multipart_max_concurrency,
             object_lifecycle_preference=object_lifecycle_preference,
         ), data
+
+    async def save_async(
+        self,
+        data: FileData,
+        multipart: bool | None = None,
+        multipart_threshold: int | None = None,
+        multipart_chunk_size: int | None = None,
+        multipart_max_concurrency: int | None = None,
+        object_lifecycle_preference: Optional[dict[str, str]] = None,
+    ) -> str:
+        # Repositories without a native async implementation save on a thread.
+        return await run_in_thread(
+            self.save,
+            data,
+            multipart=multipart,
+            multipart_threshold=multipart_threshold,
+            multipart_chunk_size=multipart_chunk_size,
+            multipart_max_concurrency=multipart_max_concurrency,
+            object_lifecycle_preference=object_lifecycle_preference,
+        )
+
+    async def save_file_async(
+        self,
+        file_path: str | Path,
+        content_type: str,
+        multipart: bool | None = None,
+        multipart_threshold: int | None = None,
+        multipart_chunk_size: int | None = None,
+        multipart_max_concurrency: int | None = None,
+        object_lifecycle_preference: Optional[dict[str, str]] = None,
+    ) -> tuple[str, FileData | None]:
+        return await run_in_thread(
+            self.save_file,
+            file_path,
+            content_type,
+            multipart=multipart,
+            multipart_threshold=multipart_threshold,
+            multipart_chunk_size=multipart_chunk_size,
+            multipart_max_concurrency=multipart_max_concurrency,
+            object_lifecycle_preference=object_lifecycle_preference,
+        )
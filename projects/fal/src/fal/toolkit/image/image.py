@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import io
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import Context, copy_context
 from functools import wraps
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import TYPE_CHECKING, Literal, Optional, Union
+from typing import TYPE_CHECKING, Literal, Optional, Sequence, Union, cast
 from urllib.parse import urlparse
 
 from fastapi import Request
 from pydantic import BaseModel, Field
 
+from fal.compat import run_in_thread
 from fal.toolkit.constraints import ImageSizeConstraints, to_xfal
 from fal.toolkit.file.file import (
     DEFAULT_REPOSITORY,
@@ -26,6 +30,8 @@ if TYPE_CHECKING:
 
 
 MAX_IMAGE_DOWNLOAD_SIZE = 50 * 1024 * 1024
+# Images of a batch that are encoded and uploaded at the same time.
+DEFAULT_BATCH_CONCURRENCY = 8
 
 ImageSizePreset = Literal[
     "square_hd",
@@ -112,6 +118,50 @@ def ImageSizeField(
 ImageFormat = Literal["png", "jpeg", "jpg", "webp", "gif"]
 
 
+def _encode_pil(
+    pil_image: PILImage.Image, format: ImageFormat | None = None
+) -> tuple[bytes, ImageFormat, ImageSize]:
+    size = ImageSize(width=pil_image.width, height=pil_image.height)
+    if format is None:
+        format = pil_image.format or "png"  # type: ignore[assignment]
+        assert format  # for type checker
+
+    saving_options = {}
+    if format == "png":
+        # PNG compression is an extremely slow process, and for the
+        # purposes of our client applications we want to get a good
+        # enough result quickly to utilize the underlying resources
+        # efficiently.
+        saving_options["compress_level"] = 1
+    elif format == "jpeg":
+        # JPEG quality is set to 95 by default, which is a good balance
+        # between file size and image quality.
+        saving_options["quality"] = 95
+
+    with io.BytesIO() as f:
+        pil_image.save(f, format=format, **saving_options)
+        return f.getvalue(), format, size
+
+
+def _batch_file_names(
+    pil_images: Sequence[PILImage.Image], file_names: Sequence[str | None] | None
+) -> Sequence[str | None]:
+    if file_names is None:
+        return [None] * len(pil_images)
+    if len(file_names) != len(pil_images):
+        raise ValueError(
+            f"Got {len(file_names)} file names for {len(pil_images)} images"
+        )
+    return file_names
+
+
+def _check_max_concurrency(max_concurrency: int) -> None:
+    if max_concurrency <= 0:
+        raise ValueError(
+            f"max_concurrency must be a positive integer, got {max_concurrency}"
+        )
+
+
 @wraps(Field)
 def ImageField(*args, **kwargs):
     if IS_PYDANTIC_V2:
@@ -203,26 +253,7 @@ class Image(File):
         save_kwargs: Optional[dict] = None,
         fallback_save_kwargs: Optional[dict] = None,
     ) -> Image:
-        size = ImageSize(width=pil_image.width, height=pil_image.height)
-        if format is None:
-            format = pil_image.format or "png"  # type: ignore[assignment]
-            assert format  # for type checker
-
-        saving_options = {}
-        if format == "png":
-            # PNG compression is an extremely slow process, and for the
-            # purposes of our client applications we want to get a good
-            # enough result quickly to utilize the underlying resources
-            # efficiently.
-            saving_options["compress_level"] = 1
-        elif format == "jpeg":
-            # JPEG quality is set to 95 by default, which is a good balance
-            # between file size and image quality.
-            saving_options["quality"] = 95
-
-        with io.BytesIO() as f:
-            pil_image.save(f, format=format, **saving_options)
-            raw_image = f.getvalue()
+        raw_image, format, size = _encode_pil(pil_image, format)
 
         return cls.from_bytes(
             raw_image,
@@ -236,6 +267,134 @@ class Image(File):
             fallback_save_kwargs=fallback_save_kwargs,
         )
 
+    @classmethod
+    async def from_bytes_async(
+        cls,
+        data: bytes,
+        content_type: Optional[str] = None,
+        file_name: Optional[str] = None,
+        repository: FileRepository | RepositoryId = DEFAULT_REPOSITORY,
+        fallback_repository: Optional[
+            FileRepository | RepositoryId | list[FileRepository | RepositoryId]
+        ] = FALLBACK_REPOSITORY,
+        request: Optional[Request] = None,
+        save_kwargs: Optional[dict] = None,
+        fallback_save_kwargs: Optional[dict] = None,
+        *,
+        size: ImageSize | None = None,
+    ) -> Image:
+        """Async version of `File.from_bytes`, which also records the `size` of
+        the image."""
+        file = await super().from_bytes_async(
+            data,
+            content_type=content_type,
+            file_name=file_name,
+            repository=repository,
+            fallback_repository=fallback_repository,
+            request=request,
+            save_kwargs=save_kwargs,
+            fallback_save_kwargs=fallback_save_kwargs,
+        )
+        obj = cast(Image, file)
+        obj.width = size.width if size else None
+        obj.height = size.height if size else None
+        return obj
+
+    @classmethod
+    def from_pil_batch(
+        cls,
+        pil_images: Sequence[PILImage.Image],
+        format: ImageFormat | None = None,
+        file_names: Sequence[str | None] | None = None,
+        repository: FileRepository | RepositoryId = DEFAULT_REPOSITORY,
+        fallback_repository: Optional[
+            FileRepository | RepositoryId | list[FileRepository | RepositoryId]
+        ] = FALLBACK_REPOSITORY,
+        request: Optional[Request] = None,
+        save_kwargs: Optional[dict] = None,
+        fallback_save_kwargs: Optional[dict] = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> list[Image]:
+        """Encode and upload a batch of images, up to `max_concurrency` at a time,
+        like calling `from_pil` on each of them. The images are returned in the
+        order they were given, and each one falls back to `fallback_repository`
+        on its own."""
+        _check_max_concurrency(max_concurrency)
+        file_names = _batch_file_names(pil_images, file_names)
+        if not pil_images:
+            return []
+
+        def _from_pil(
+            context: Context, pil_image: PILImage.Image, file_name: str | None
+        ) -> Image:
+            return context.run(
+                cls.from_pil,
+                pil_image,
+                format,
+                file_name,
+                repository,
+                fallback_repository=fallback_repository,
+                request=request,
+                save_kwargs=dict(save_kwargs or {}),
+                fallback_save_kwargs=dict(fallback_save_kwargs or {}),
+            )
+
+        # Pillow releases the GIL while encoding, so threads encode in parallel.
+        with ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(pil_images))
+        ) as executor:
+            # Each upload sees the caller's context, e.g. its current request.
+            futures = [
+                executor.submit(_from_pil, copy_context(), pil_image, file_name)
+                for pil_image, file_name in zip(pil_images, file_names)
+            ]
+            return [future.result() for future in futures]
+
+    @classmethod
+    async def from_pil_batch_async(
+        cls,
+        pil_images: Sequence[PILImage.Image],
+        format: ImageFormat | None = None,
+        file_names: Sequence[str | None] | None = None,
+        repository: FileRepository | RepositoryId = DEFAULT_REPOSITORY,
+        fallback_repository: Optional[
+            FileRepository | RepositoryId | list[FileRepository | RepositoryId]
+        ] = FALLBACK_REPOSITORY,
+        request: Optional[Request] = None,
+        save_kwargs: Optional[dict] = None,
+        fallback_save_kwargs: Optional[dict] = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> list[Image]:
+        """Async version of `from_pil_batch`. Images are encoded on threads and
+        uploaded concurrently on the event loop."""
+        _check_max_concurrency(max_concurrency)
+        file_names = _batch_file_names(pil_images, file_names)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _from_pil(pil_image: PILImage.Image, file_name: str | None) -> Image:
+            async with semaphore:
+                raw_image, image_format, size = await run_in_thread(
+                    _encode_pil, pil_image, format
+                )
+                return await cls.from_bytes_async(
+                    raw_image,
+                    f"image/{image_format}",
+                    file_name,
+                    repository,
+                    size=size,
+                    fallback_repository=fallback_repository,
+                    request=request,
+                    save_kwargs=dict(save_kwargs or {}),
+                    fallback_save_kwargs=dict(fallback_save_kwargs or {}),
+                )
+
+        return await asyncio.gather(
+            *(
+                _from_pil(pil_image, file_name)
+                for pil_image, file_name in zip(pil_images, file_names)
+            )
+        )
+
     def to_pil(self, mode: str = "RGB") -> PILImage.Image:
         try:
             from PIL import Image as PILImage
@@ -2,24 +2,37 @@ from __future__ import annotations
 
 import errno
 import hashlib
+import http.client
+import json
 import os
+import re
 import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from dataclasses import dataclass, field
 from email.message import Message
+from functools import partial
 from pathlib import Path, PurePath
 from tempfile import TemporaryDirectory, mkstemp
+from typing import Callable, Collection
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 
+from fal.toolkit.utils.file_lock import FileLock
+from fal.toolkit.utils.retry import retry
 from fal.toolkit.utils.ssrf import (
     SafeResponse,
+    SSRFConnectionError,
     SSRFError,
     SSRFHTTPStatusError,
+    _ssrf_safe_get_stream,
     _ssrf_safe_get_to_file,
 )
+from fal.toolkit.utils.weights_cache import WeightsCache, WeightsCacheEntry
 
 FAL_PERSISTENT_DIR = PurePath("/data")
 FAL_REPOSITORY_DIR = FAL_PERSISTENT_DIR / ".fal" / "repos"
@@ -35,10 +48,47 @@ TEMP_HEADERS = {
 }
 
 
+# Files of at least this size are downloaded in segments over several
+# connections, when the server supports range requests.
+PARALLEL_DOWNLOAD_THRESHOLD = 64 * 1024**2
+DOWNLOAD_SEGMENT_SIZE = 16 * 1024**2
+DEFAULT_DOWNLOAD_CONNECTIONS = 8
+# Attempts at downloading a segment before the whole download fails.
+SEGMENT_MAX_ATTEMPTS = 3
+SEGMENT_RETRY_DELAY = 0.5
+# How often a process waiting for another one's download reports its progress.
+DOWNLOAD_WAIT_REPORT_INTERVAL = 10.0
+
+
 class DownloadError(Exception):
     pass
 
 
+@dataclass
+class DownloadStats:
+    url: str
+    # Bytes downloaded
+    size: int
+    seconds: float
+    connections: int
+    # Segments that had to be requested again after a failure
+    retries: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second."""
+        return self.size / self.seconds if self.seconds > 0 else 0.0
+
+
+class _UseRangedDownload(Exception):
+    """Aborts a single connection download once the response headers show that
+    the file can be downloaded in segments instead."""
+
+    def __init__(self, headers: dict[str, str]):
+        super().__init__("The file can be downloaded in segments")
+        self.headers = headers
+
+
 def _hash_url(url: str) -> str:
     """Hashes a URL using SHA-256.
 
@@ -85,6 +135,397 @@ def _content_length_from_headers(headers: dict[str, str]) -> int:
         return -1
 
 
+def _supports_ranged_download(headers: dict[str, str], connections: int) -> bool:
+    return (
+        connections > 1
+        and hasattr(os, "pwrite")
+        and headers.get("accept-ranges", "").lower() == "bytes"
+        and _content_length_from_headers(headers) >= PARALLEL_DOWNLOAD_THRESHOLD
+    )
+
+
+def _is_transient_error(error: Exception) -> bool:
+    if isinstance(error, SSRFHTTPStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, (SSRFConnectionError, OSError, http.client.HTTPException))
+
+
+class _StreamingHash:
+    """The SHA-256 of a file that is being written, in any order. Data written at
+    the end of what was hashed so far is hashed as it is written, and ranges
+    written ahead of it are read back once it reaches them."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self._hash = hashlib.sha256()
+        self._offset = 0
+        # End offsets of the ranges written ahead, by their start offset
+        self._written: dict[int, int] = {}
+
+    def update(self, offset: int, data: bytes) -> None:
+        """Hash `data`, which was written at `offset`, if it is next."""
+        with self._lock:
+            if offset != self._offset:
+                return
+            self._hash.update(data)
+            self._offset += len(data)
+            if self._offset in self._written:
+                self._catch_up()
+
+    def written(self, start: int, end: int) -> None:
+        """Record that the `start`-`end` (exclusive) byte range was written."""
+        with self._lock:
+            if end > self._offset:
+                self._written[start] = max(end, self._written.get(start, end))
+                self._catch_up()
+
+    def hexdigest(self, size: int) -> str:
+        self.written(0, size)
+        return self._hash.hexdigest()
+
+    def _catch_up(self) -> None:
+        caught_up = False
+        while not caught_up:
+            caught_up = True
+            for start, end in sorted(self._written.items()):
+                if start > self._offset:
+                    break
+                del self._written[start]
+                if end > self._offset:
+                    self._read(end)
+                    caught_up = False
+
+    def _read(self, end: int, chunk_size: int = 1024**2) -> None:
+        with open(self.path, "rb") as file:
+            file.seek(self._offset)
+            while self._offset < end:
+                chunk = file.read(min(chunk_size, end - self._offset))
+                if not chunk:
+                    raise DownloadError("Received less data than expected.")
+                self._hash.update(chunk)
+                self._offset += len(chunk)
+
+
+def _file_sha256(path: Path) -> str:
+    return _StreamingHash(path).hexdigest(path.stat().st_size)
+
+
+def _write_range(
+    fd: int,
+    start: int,
+    end: int,
+    response: http.client.HTTPResponse,
+    headers: dict[str, str],
+    *,
+    size: int,
+    etag: str | None,
+    hasher: _StreamingHash | None = None,
+    chunk_size: int = 1024**2,
+) -> None:
+    if response.status != 206:
+        raise DownloadError("Server did not honor the range request")
+
+    expected_range = f"bytes {start}-{end}/{size}"
+    if headers.get("content-range") != expected_range:
+        raise DownloadError(
+            f"Unexpected content range {headers.get('content-range')!r}, "
+            f"expected {expected_range!r}"
+        )
+    if etag is not None and headers.get("etag") != etag:
+        raise DownloadError("Remote file changed during the download")
+
+    offset = start
+    while offset <= end:
+        chunk = response.read(min(chunk_size, end + 1 - offset))
+        if not chunk:
+            raise SSRFConnectionError(
+                "Received less data than expected from the server."
+            )
+
+        chunk_start = offset
+        view = memoryview(chunk)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            offset += written
+            view = view[written:]
+        if hasher is not None:
+            hasher.update(chunk_start, chunk)
+
+
+def _download_segment(
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    *,
+    size: int,
+    etag: str | None,
+    request_headers: dict[str, str],
+    failed: threading.Event,
+    on_segment: Callable[[int], None] | None = None,
+    hasher: _StreamingHash | None = None,
+) -> int:
+    """Download the `start`-`end` byte range of `url` into `fd`, retrying it
+    on transient errors. Returns how many times it was retried."""
+    attempts = 0
+
+    @retry(
+        max_retries=SEGMENT_MAX_ATTEMPTS,
+        base_delay=SEGMENT_RETRY_DELAY,
+        should_retry=_is_transient_error,
+    )
+    def fetch() -> None:
+        nonlocal attempts
+        # Another segment failed for good, so this one isn't needed anymore
+        if failed.is_set():
+            return
+
+        attempts += 1
+        _ssrf_safe_get_stream(
+            url,
+            partial(_write_range, fd, start, end, size=size, etag=etag, hasher=hasher),
+            headers={**request_headers, "Range": f"bytes={start}-{end}"},
+        )
+
+    try:
+        fetch()
+    except BaseException:
+        failed.set()
+        raise
+    if failed.is_set():
+        return max(attempts - 1, 0)
+    if hasher is not None:
+        hasher.written(start, end + 1)
+    if on_segment is not None:
+        on_segment(start)
+    return max(attempts - 1, 0)
+
+
+def _download_ranges(
+    url: str,
+    target_path: Path,
+    size: int,
+    *,
+    etag: str | None,
+    request_headers: dict[str, str],
+    connections: int,
+    segment_size: int,
+    completed: Collection[int] = (),
+    on_segment: Callable[[int], None] | None = None,
+    hasher: _StreamingHash | None = None,
+) -> tuple[int, int]:
+    """Download `url` into `target_path` in segments of `segment_size` over up
+    to `connections` connections, skipping the segments starting at the offsets
+    in `completed`. `on_segment` is called with the start offset of each segment
+    once it is written, and `hasher` is fed the downloaded data. Returns the
+    number of connections used and how many segments had to be retried."""
+    segments = [
+        (start, min(start + segment_size, size) - 1)
+        for start in range(0, size, segment_size)
+        if start not in completed
+    ]
+    failed = threading.Event()
+    workers = max(min(connections, len(segments)), 1)
+
+    fd = os.open(target_path, os.O_WRONLY)
+    try:
+        # Allocating the whole file upfront avoids fragmenting it, and running
+        # out of space in the middle of the download.
+        try:
+            os.posix_fallocate(fd, 0, size)
+        except (AttributeError, OSError):
+            # Not supported by the platform or the filesystem
+            os.ftruncate(fd, size)
+
+        if hasher is not None:
+            for start in completed:
+                hasher.written(start, min(start + segment_size, size))
+
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="fal-download",
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _download_segment,
+                    url,
+                    fd,
+                    start,
+                    end,
+                    size=size,
+                    etag=etag,
+                    request_headers=request_headers,
+                    failed=failed,
+                    on_segment=on_segment,
+                    hasher=hasher,
+                )
+                for start, end in segments
+            ]
+            retries = sum(future.result() for future in futures)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+    if target_path.stat().st_size != size:
+        raise DownloadError("Received less data than expected from the server.")
+
+    return workers, retries
+
+
+@dataclass
+class _PartialDownload:
+    """A download kept under a name derived from its URL, so that a later
+    attempt can resume it, along with a sidecar recording the validators of the
+    remote file and, for segmented downloads, the segments already written."""
+
+    path: Path
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    size: int = -1
+    segment_size: int | None = None
+    # Start offsets of the segments that were written, for segmented downloads
+    segments: set[int] = field(default_factory=set)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def state_path(self) -> Path:
+        return self.path.with_name(f"{self.path.name}.json")
+
+    @property
+    def segmented(self) -> bool:
+        return self.segment_size is not None
+
+    @classmethod
+    def load(cls, target_dir: Path, url: str) -> _PartialDownload:
+        partial = cls(target_dir / f".fal_download.partial.{_hash_url(url)}", url)
+        try:
+            state = json.loads(partial.state_path.read_text())
+        except (OSError, ValueError):
+            return partial
+
+        if state.get("url") != url or not partial.path.exists():
+            return partial
+
+        partial.etag = state.get("etag")
+        partial.last_modified = state.get("last_modified")
+        partial.size = state.get("size", -1)
+        partial.segment_size = state.get("segment_size")
+        partial.segments = set(state.get("segments", []))
+        return partial
+
+    def if_range(self) -> str | None:
+        """The validator for an `If-Range` header, which only accepts strong
+        ETags."""
+        if self.etag is not None and not self.etag.startswith("W/"):
+            return self.etag
+        return self.last_modified
+
+    def matches(self, headers: dict[str, str], size: int) -> bool:
+        """Whether the remote file is still the one that was partially
+        downloaded."""
+        if size < 0 or size != self.size:
+            return False
+        if self.etag is not None:
+            return headers.get("etag") == self.etag
+        if self.last_modified is not None:
+            return headers.get("last-modified") == self.last_modified
+        return False
+
+    def reset(
+        self, headers: dict[str, str], size: int, segment_size: int | None = None
+    ) -> None:
+        """Start over with the file described by `headers`."""
+        self.etag = headers.get("etag")
+        self.last_modified = headers.get("last-modified")
+        self.size = size
+        self.segment_size = segment_size
+        self.segments = set()
+        with open(self.path, "wb"):
+            pass
+        self.save()
+
+    def complete_segment(self, start: int) -> None:
+        with self._lock:
+            self.segments.add(start)
+            self.save()
+
+    def save(self) -> None:
+        state = {
+            "url": self.url,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "size": self.size,
+            "segment_size": self.segment_size,
+            "segments": sorted(self.segments),
+        }
+        temp_path = self.state_path.with_name(f"{self.state_path.name}.tmp")
+        temp_path.write_text(json.dumps(state))
+        os.replace(temp_path, self.state_path)
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+        self.state_path.unlink(missing_ok=True)
+
+
+def _write_resumed_body(
+    partial: _PartialDownload,
+    response: http.client.HTTPResponse,
+    headers: dict[str, str],
+    *,
+    offset: int,
+    check_headers: Callable[[dict[str, str], bool], None],
+    max_size: int | None,
+    hasher: _StreamingHash | None = None,
+    chunk_size: int = 1024**2,
+) -> dict[str, str]:
+    """Write a response to a request for `partial` from `offset` into it, from
+    the start if the server sent the whole file instead, feeding `hasher` the
+    data. Returns the headers of the whole file."""
+    if response.status == 206:
+        match = re.fullmatch(
+            r"bytes (\d+)-(\d+)/(\d+)", headers.get("content-range", "")
+        )
+        if match is None or int(match.group(1)) != offset:
+            raise DownloadError(
+                f"Unexpected content range {headers.get('content-range')!r}"
+            )
+        if int(match.group(3)) != partial.size:
+            raise DownloadError("Remote file changed during the download")
+        file_headers = {**headers, "content-length": match.group(3)}
+        check_headers(file_headers, False)
+    else:
+        # The file changed, or the server doesn't support ranges
+        offset = 0
+        file_headers = headers
+        check_headers(file_headers, True)
+        partial.reset(file_headers, _content_length_from_headers(file_headers))
+
+    size = _content_length_from_headers(file_headers)
+    if hasher is not None:
+        hasher.reset()
+        # The part that was downloaded before
+        hasher.written(0, offset)
+    with open(partial.path, "r+b") as file:
+        file.seek(offset)
+        file.truncate()
+        while chunk := response.read(chunk_size):
+            file.write(chunk)
+            if hasher is not None:
+                hasher.update(offset, chunk)
+            offset += len(chunk)
+            if max_size is not None and offset > max_size:
+                raise SSRFError(f"File body exceeded {max_size} bytes during download")
+
+    if size >= 0 and offset < size:
+        raise SSRFConnectionError("Received less data than expected from the server.")
+    return file_headers
+
+
 def download_file(
     url: str,
     target_dir: str | Path,
@@ -92,6 +533,11 @@ def download_file(
     force: bool = False,
     request_headers: dict[str, str] | None = None,
     filesize_limit: int | None = None,
+    connections: int = DEFAULT_DOWNLOAD_CONNECTIONS,
+    on_download: Callable[[DownloadStats], None] | None = None,
+    resume: bool = False,
+    expected_sha256: str | None = None,
+    expected_size: int | None = None,
 ) -> Path:
     """Downloads a file from the specified URL to the target directory.
 
@@ -106,6 +552,19 @@ def download_file(
     ensures that the target directory exists and handles any errors that may occur
     during the download process, raising a `DownloadError` if necessary.
 
+    Files of at least `PARALLEL_DOWNLOAD_THRESHOLD` bytes are downloaded in
+    segments over several connections when the server accepts range requests.
+    Segments that fail are retried on their own.
+
+    With `resume`, a download that is interrupted is kept in the target directory
+    and continued by the next call for the same URL, as long as the remote file
+    still has the same ETag (or Last-Modified date) and size. Otherwise, it is
+    downloaded again from the start.
+
+    With `expected_sha256`, the file is hashed while it is downloaded and is only
+    moved into place if it has this hash. An existing file is then only kept if it
+    has this hash too.
+
     Parameters:
         url: The URL of the file to be downloaded.
         target_dir: The directory where the downloaded file will be saved. If it's not
@@ -116,7 +575,16 @@ def download_file(
             the HTTP request. Defaults to `None`.
         filesize_limit: An integer specifying the maximum downloadable size,
             in megabytes. Defaults to `None`.
-
+        connections: The maximum number of connections to download the file over.
+            `1` disables segmented downloads. Defaults to
+            `DEFAULT_DOWNLOAD_CONNECTIONS`.
+        on_download: A function called with the size, duration and throughput of
+            the download, once the file is downloaded. Defaults to `None`.
+        resume: If `True`, interrupted downloads are resumed by later calls.
+            Defaults to `False`.
+        expected_sha256: The SHA-256 hex digest the file must have. Defaults to
+            `None`.
+        expected_size: The size in bytes the file must have. Defaults to `None`.
 
     Returns:
         A Path object representing the full path to the downloaded file.
@@ -132,12 +600,25 @@ def download_file(
         expected_filesize = _content_length_from_headers(headers)
         expected_filesize_mb = expected_filesize / ONE_MB
 
+        if expected_size is not None and expected_filesize not in (-1, expected_size):
+            raise DownloadError(
+                f"File to be downloaded is {expected_filesize} bytes, "
+                f"expected {expected_size} bytes"
+            )
+
         if filesize_limit is not None and expected_filesize_mb > filesize_limit:
             raise DownloadError(
                 f"""File to be downloaded is of size {expected_filesize_mb},
                     which is over the limit of {filesize_limit}"""
             )
 
+    def check_response_headers(
+        headers: dict[str, str], allow_segments: bool = True
+    ) -> None:
+        raise_if_declared_size_exceeds_limit(headers)
+        if allow_segments and _supports_ranged_download(headers, connections):
+            raise _UseRangedDownload(headers)
+
     target_dir_path = Path(target_dir)
 
     # If target_dir is not an absolute path, use "/data" as the relative directory
@@ -147,10 +628,70 @@ def download_file(
     target_dir_path = target_dir_path.resolve()
     target_dir_path.mkdir(parents=True, exist_ok=True)
     target_path: Path | None = None
+    if expected_sha256 is not None:
+        expected_sha256 = expected_sha256.lower()
+
+    def is_downloaded(path: Path, size: int) -> bool:
+        return (
+            not force
+            and path.exists()
+            and size >= 0
+            and path.stat().st_size == size
+            and (expected_sha256 is None or _file_sha256(path) == expected_sha256)
+        )
 
-    fd, temp_file_path = mkstemp(dir=target_dir_path, prefix=".fal_download.tmp.")
-    os.close(fd)
-    temp_path = Path(temp_file_path)
+    partial: _PartialDownload | None = None
+    if resume and parsed_url.scheme != "data":
+        partial = _PartialDownload.load(target_dir_path, url)
+        temp_path = partial.path
+    else:
+        fd, temp_file_path = mkstemp(dir=target_dir_path, prefix=".fal_download.tmp.")
+        os.close(fd)
+        temp_path = Path(temp_file_path)
+    hasher = _StreamingHash(temp_path) if expected_sha256 is not None else None
+    download_start = time.monotonic()
+    stats: DownloadStats | None = None
+
+    def discard_temp(error: Exception | None = None) -> None:
+        if partial is None:
+            temp_path.unlink(missing_ok=True)
+        elif error is not None and _is_transient_error(error):
+            print(f"Keeping the partial download of {url} to resume it later")
+        else:
+            partial.discard()
+
+    def resume_download(partial: _PartialDownload) -> SafeResponse:
+        headers = _headers(request_headers)
+        offset = 0
+        validator = partial.if_range()
+        if not partial.segmented and validator is not None:
+            offset = partial.path.stat().st_size
+            if 0 < offset < partial.size:
+                print(f"Resuming the download of {url} from byte {offset}")
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = validator
+            else:
+                offset = 0
+
+        file_headers: dict[str, str] = {}
+
+        def consume(
+            response: http.client.HTTPResponse, response_headers: dict[str, str]
+        ) -> None:
+            file_headers.update(
+                _write_resumed_body(
+                    partial,
+                    response,
+                    response_headers,
+                    offset=offset,
+                    check_headers=check_response_headers,
+                    max_size=limit_bytes,
+                    hasher=hasher,
+                )
+            )
+
+        _ssrf_safe_get_stream(url, consume, headers=headers)
+        return SafeResponse(200, headers=file_headers)
 
     try:
         if parsed_url.scheme == "data":
@@ -166,53 +707,134 @@ def download_file(
                 headers={"content-length": str(temp_path.stat().st_size)},
             )
         else:
-            response = _ssrf_safe_get_to_file(
+            try:
+                if partial is not None:
+                    response = resume_download(partial)
+                else:
+                    response = _ssrf_safe_get_to_file(
+                        url,
+                        temp_path,
+                        headers=_headers(request_headers),
+                        max_size=limit_bytes,
+                        on_response_headers=check_response_headers,
+                    )
+            except _UseRangedDownload as ranged:
+                response = SafeResponse(200, headers=ranged.headers)
+                expected_filesize = _content_length_from_response(response)
+                target_path = target_dir_path / _filename_from_response(url, response)
+                if is_downloaded(target_path, expected_filesize):
+                    discard_temp()
+                    return target_path
+
+                segment_size = DOWNLOAD_SEGMENT_SIZE
+                completed: Collection[int] = ()
+                on_segment = None
+                if partial is not None:
+                    if not (
+                        partial.segmented
+                        and partial.matches(ranged.headers, expected_filesize)
+                    ):
+                        partial.reset(ranged.headers, expected_filesize, segment_size)
+                    elif partial.segments:
+                        print(
+                            f"Resuming the download of {url}, "
+                            f"{len(partial.segments)} segments are already done"
+                        )
+                    segment_size = partial.segment_size or segment_size
+                    completed = set(partial.segments)
+                    on_segment = partial.complete_segment
+
+                workers, retries = _download_ranges(
+                    url,
+                    temp_path,
+                    expected_filesize,
+                    etag=ranged.headers.get("etag"),
+                    request_headers=_headers(request_headers),
+                    connections=connections,
+                    segment_size=segment_size,
+                    completed=completed,
+                    on_segment=on_segment,
+                    hasher=hasher,
+                )
+                stats = DownloadStats(
+                    url,
+                    expected_filesize,
+                    time.monotonic() - download_start,
+                    connections=workers,
+                    retries=retries,
+                )
+
+        if stats is None:
+            stats = DownloadStats(
                 url,
-                temp_path,
-                headers=_headers(request_headers),
-                max_size=limit_bytes,
-                on_response_headers=raise_if_declared_size_exceeds_limit,
+                temp_path.stat().st_size,
+                time.monotonic() - download_start,
+                connections=1,
             )
 
         file_name = _filename_from_response(url, response)
         expected_filesize = _content_length_from_response(response)
         target_path = target_dir_path / file_name
 
-        if (
-            target_path.exists()
-            and expected_filesize >= 0
-            and target_path.stat().st_size == expected_filesize
-            and not force
-        ):
-            temp_path.unlink(missing_ok=True)
+        if is_downloaded(target_path, expected_filesize):
+            discard_temp()
             return target_path
 
+        if expected_size is not None and stats.size != expected_size:
+            raise DownloadError(
+                f"Downloaded {stats.size} bytes from {url}, "
+                f"expected {expected_size} bytes"
+            )
+        if hasher is not None:
+            sha256 = hasher.hexdigest(stats.size)
+            if sha256 != expected_sha256:
+                raise DownloadError(
+                    f"Downloaded file from {url} has the SHA-256 {sha256}, "
+                    f"expected {expected_sha256}"
+                )
+
         if force:
             print(f"File already exists. Forcing download of {url} to {target_path}")
         else:
             print(f"Downloading {url} to {target_path}")
 
         os.replace(temp_path, target_path)
+        if partial is not None:
+            partial.discard()
+        _report_download(stats, on_download)
     except DownloadError:
-        temp_path.unlink(missing_ok=True)
+        discard_temp()
         raise
     except SSRFHTTPStatusError as e:
-        temp_path.unlink(missing_ok=True)
+        discard_temp(e)
         raise DownloadError(f"Failed to get remote file properties for {url}") from e
     except SSRFError as e:
-        temp_path.unlink(missing_ok=True)
+        discard_temp(e)
         if str(e).startswith("File body exceeded"):
             error_target = target_path or target_dir_path
             raise DownloadError(f"Failed to download {url} to {error_target}") from e
         raise DownloadError(str(e)) from e
     except Exception as e:
-        temp_path.unlink(missing_ok=True)
+        discard_temp(e)
         error_target = target_path or target_dir_path
         raise DownloadError(f"Failed to download {url} to {error_target}") from e
 
     return target_path
 
 
+def _report_download(
+    stats: DownloadStats, on_download: Callable[[DownloadStats], None] | None
+) -> None:
+    ONE_MB = 1024**2
+    print(
+        f"Downloaded {stats.url} ({stats.size / ONE_MB:.2f} MB) in "
+        f"{stats.seconds:.2f}s, {stats.throughput / ONE_MB:.2f} MB/s over "
+        f"{stats.connections} connection(s)"
+    )
+    if on_download is not None:
+        on_download(stats)
+
+
 def _download_file_python(
     url: str,
     target_path: Path | str,
@@ -302,6 +924,9 @@ def download_model_weights(
     url: str,
     force: bool = False,
     request_headers: dict[str, str] | None = None,
+    connections: int = DEFAULT_DOWNLOAD_CONNECTIONS,
+    sha256: str | None = None,
+    size: int | None = None,
 ) -> Path:
     """Downloads model weights from the specified URL and saves them to a
     predefined directory.
@@ -312,7 +937,14 @@ def download_model_weights(
     It calls the `download_file` function with the provided
     URL and the target directory set to a pre-defined location for model weights.
     The downloaded model weights are saved in this directory, and the function returns
-    the full path to the downloaded weights file.
+    the full path to the downloaded weights file. A download that is interrupted is
+    resumed by the next call, see `download_file`.
+
+    With `sha256`, the weights are verified while they are downloaded and stored
+    under their hash, so that they are shared by all the URLs they are downloaded
+    from and found again without any request. The weights directories are indexed
+    with their size and last use, see `list_model_weights` and
+    `evict_model_weights`.
 
     Args:
         url: The URL from which the model weights will be downloaded.
@@ -321,42 +953,153 @@ def download_model_weights(
             the remote file. Defaults to `False`.
         request_headers: A dictionary containing additional headers to be included in
             the HTTP request. Defaults to `None`.
+        connections: The maximum number of connections to download the weights
+            over. Defaults to `DEFAULT_DOWNLOAD_CONNECTIONS`.
+        sha256: The SHA-256 hex digest of the weights. Defaults to `None`.
+        size: The size of the weights in bytes. Defaults to `None`.
 
     Returns:
         A Path object representing the full path to the downloaded model weights.
+
+    Raises:
+        DownloadError: If the downloaded weights don't have the given hash or size.
     """
     # This is not a protected path, so the user may change stuff internally
-    weights_dir = Path(FAL_MODEL_WEIGHTS_DIR / _hash_url(url))
+    if sha256 is not None:
+        if not re.fullmatch(r"[0-9a-fA-F]{64}", sha256):
+            raise ValueError(f"Invalid SHA-256 hex digest: {sha256!r}")
+        sha256 = sha256.lower()
+        weights_dir = Path(FAL_MODEL_WEIGHTS_DIR / f"sha256-{sha256}")
+    else:
+        weights_dir = Path(FAL_MODEL_WEIGHTS_DIR / _hash_url(url))
+
+    def use(weights_path: Path) -> Path:
+        _mark_used_dir(weights_dir)
+        _weights_cache().record_use(
+            weights_dir.name, weights_path, url=url, sha256=sha256
+        )
+        return weights_path
 
-    if weights_dir.exists() and not force:
+    if not force and (weights_path := _existing_weights(weights_dir, size)):
+        # Unless the weights were evicted since, then they are downloaded again
+        with suppress(FileNotFoundError):
+            return use(weights_path)
+
+    # Runners starting at once download the weights only once, the others wait
+    lock, waited = _acquire_download_lock(weights_dir, url)
+    try:
+        # Weights downloaded while waiting are reused, even when forcing
+        if (not force or waited) and (
+            weights_path := _existing_weights(weights_dir, size)
+        ):
+            return use(weights_path)
+
+        path = download_file(
+            url,
+            target_dir=weights_dir,
+            force=force,
+            request_headers=request_headers,
+            connections=connections,
+            resume=True,
+            expected_sha256=sha256,
+            expected_size=size,
+        )
+        # The lock keeps the weights from being evicted until they are marked
+        return use(path)
+    finally:
+        lock.release()
+
+
+def _acquire_download_lock(weights_dir: Path, url: str) -> tuple[FileLock, bool]:
+    """Lock `weights_dir` for downloading, returning the lock and whether it had
+    to wait for it."""
+    while True:
+        weights_dir.mkdir(parents=True, exist_ok=True)
+        lock = FileLock(weights_dir / ".fal_download.lock")
         try:
-            # TODO: sometimes the directory can hold multiple files
-            # Example:
-            # .fal/model_weights/00155dc2d9579360d577d1a87d31b52c21135c14a5f44fcbab36fbb8352f3e0d  # noqa: E501
-            # We need to either not allow multiple files in the directory or
-            # find the one that is the most recently used.
-            weights_path = next(
-                # Ignore .fal dotfiles since they are metadata files
-                f
-                for f in weights_dir.glob("*")
-                if not f.name.startswith(".fal")
-            )
-            _mark_used_dir(weights_dir)
-            return weights_path
-        # The model weights directory is empty, so we need to download the weights
-        except StopIteration:
-            pass
+            waited = lock.acquire(on_wait=_download_progress_reporter(weights_dir, url))
+        except FileNotFoundError:
+            # Evicted before it was locked, see `WeightsCache._remove`
+            continue
+        return lock, waited
+
+
+def _weights_cache() -> WeightsCache:
+    return WeightsCache(Path(FAL_MODEL_WEIGHTS_DIR))
+
+
+def list_model_weights() -> list[WeightsCacheEntry]:
+    """Lists the model weights downloaded by `download_model_weights`, with
+    their size and when they were last used.
+
+    Returns:
+        The entries of the model weights cache.
+    """
+    return _weights_cache().entries()
+
+
+def evict_model_weights(
+    max_size: int, *, dry_run: bool = False
+) -> list[WeightsCacheEntry]:
+    """Removes the least recently used model weights until the model weights take
+    at most `max_size` bytes of the persistent storage. Weights that are being
+    downloaded are kept.
 
-    path = download_file(
-        url,
-        target_dir=weights_dir,
-        force=force,
-        request_headers=request_headers,
+    Args:
+        max_size: The size budget of the model weights, in bytes.
+        dry_run: If `True`, nothing is removed. Defaults to `False`.
+
+    Returns:
+        The entries that were removed, or would be with `dry_run`.
+    """
+    return _weights_cache().evict(max_size, dry_run=dry_run)
+
+
+def _existing_weights(weights_dir: Path, size: int | None = None) -> Path | None:
+    # TODO: sometimes the directory can hold multiple files
+    # Example:
+    # .fal/model_weights/00155dc2d9579360d577d1a87d31b52c21135c14a5f44fcbab36fbb8352f3e0d  # noqa: E501
+    # We need to either not allow multiple files in the directory or
+    # find the one that is the most recently used.
+    if not weights_dir.exists():
+        return None
+
+    return next(
+        (
+            f
+            for f in weights_dir.glob("*")
+            # Ignore .fal dotfiles since they are metadata files
+            if not f.name.startswith(".fal")
+            and (size is None or f.stat().st_size == size)
+        ),
+        None,
     )
 
-    _mark_used_dir(weights_dir)
 
-    return path
+def _download_progress_reporter(target_dir: Path, url: str) -> Callable[[], None]:
+    last_report = time.monotonic()
+
+    def report() -> None:
+        nonlocal last_report
+        if time.monotonic() - last_report < DOWNLOAD_WAIT_REPORT_INTERVAL:
+            return
+        last_report = time.monotonic()
+
+        ONE_MB = 1024**2
+        partial = _PartialDownload.load(target_dir, url)
+        done = 0
+        if partial.segmented:
+            assert partial.segment_size is not None
+            done = min(len(partial.segments) * partial.segment_size, partial.size)
+        else:
+            with suppress(OSError):
+                done = partial.path.stat().st_size
+        progress = f"{done / ONE_MB:.2f} MB"
+        if partial.size > 0:
+            progress += f" of {partial.size / ONE_MB:.2f} MB"
+        print(f"Waiting for another process to download {url} ({progress})")
+
+    return report
 
 
 def clone_repository(
@@ -403,19 +1146,50 @@ def clone_repository(
 
     local_repo_path = Path(target_dir) / repo_name  # type: ignore[arg-type]
 
+    # NOTE: using the target_dir to be able to avoid potential copies across temp fs
+    # and target fs, and also to be able to atomically rename repo_name dir into place
+    # when we are done setting it up.
+    os.makedirs(target_dir, exist_ok=True)  # type: ignore[arg-type]
+
+    # Runners starting at once clone the repository only once, the others wait
+    lock = FileLock(local_repo_path.with_name(f".{local_repo_path.name}.fal_lock"))
+    waited = lock.acquire()
+    try:
+        _clone_repository(
+            https_url,
+            local_repo_path,
+            commit_hash=commit_hash,
+            force=force,
+            waited=waited,
+        )
+    finally:
+        lock.release()
+
+    if include_to_path:
+        __add_local_path_to_sys_path(local_repo_path)
+
+    return local_repo_path
+
+
+def _clone_repository(
+    https_url: str,
+    local_repo_path: Path,
+    *,
+    commit_hash: str | None,
+    force: bool,
+    waited: bool,
+) -> None:
     if local_repo_path.exists():
         local_repo_commit_hash = _git_rev_parse(local_repo_path, "HEAD")
         full_commit_hash = (
             _git_rev_parse(local_repo_path, commit_hash) if commit_hash else None
         )
-        if (
-            full_commit_hash
-            and local_repo_commit_hash == full_commit_hash
-            and not force
-        ):
-            if include_to_path:
-                __add_local_path_to_sys_path(local_repo_path)
-            return local_repo_path
+        checked_out = (
+            full_commit_hash is not None and local_repo_commit_hash == full_commit_hash
+        )
+        # A repository cloned while waiting for the lock is reused, even when forcing
+        if (checked_out and not force) or (waited and (checked_out or not commit_hash)):
+            return
         else:
             if local_repo_commit_hash != commit_hash:
                 print(
@@ -429,7 +1203,7 @@ def clone_repository(
                 )
             print(f"Removing the existing repository: {local_repo_path} ")
             with TemporaryDirectory(
-                dir=target_dir, suffix=f"{local_repo_path.name}.tmp.old"
+                dir=local_repo_path.parent, suffix=f"{local_repo_path.name}.tmp.old"
             ) as tmp_dir:
                 with suppress(FileNotFoundError):
                     # repository might be already deleted by another worker
@@ -437,12 +1211,8 @@ def clone_repository(
                     # sometimes seeing FileNotFoundError even here on juicefs
                     shutil.rmtree(tmp_dir, ignore_errors=True)
 
-    # NOTE: using the target_dir to be able to avoid potential copies across temp fs
-    # and target fs, and also to be able to atomically rename repo_name dir into place
-    # when we are done setting it up.
-    os.makedirs(target_dir, exist_ok=True)  # type: ignore[arg-type]
     with TemporaryDirectory(
-        dir=target_dir,
+        dir=local_repo_path.parent,
         suffix=f"{local_repo_path.name}.tmp",
     ) as temp_dir:
         try:
@@ -482,11 +1252,6 @@ def clone_repository(
             print(f"{error}\nFailed to clone repository '{https_url}' .")
             raise error
 
-    if include_to_path:
-        __add_local_path_to_sys_path(local_repo_path)
-
-    return local_repo_path
-
 
 def __add_local_path_to_sys_path(local_path: Path | str):
     local_path_str = str(local_path)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import suppress
+from pathlib import Path
+from typing import Callable
+
+# How often the holder of a lock shows it is still alive.
+LOCK_HEARTBEAT_INTERVAL = 5.0
+# A lock whose heartbeat stopped for this many seconds is taken over.
+LOCK_STALE_AFTER = 30.0
+LOCK_POLL_INTERVAL = 0.5
+
+
+class FileLock:
+    """A lock shared by the processes, on this host or others, that can see
+    `path`, e.g. on the shared /data volume.
+
+    The holder touches the lock file every `heartbeat_interval` seconds. Waiters
+    take over a lock that wasn't touched for `stale_after` seconds, measured on
+    their own clock, so a holder that was killed doesn't block them forever."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        heartbeat_interval: float = LOCK_HEARTBEAT_INTERVAL,
+        stale_after: float = LOCK_STALE_AFTER,
+        poll_interval: float = LOCK_POLL_INTERVAL,
+    ) -> None:
+        self.path = Path(path)
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._token: str | None = None
+        self._stop_heartbeat = threading.Event()
+        self._heartbeat: threading.Thread | None = None
+
+    @property
+    def locked(self) -> bool:
+        return self._token is not None
+
+    def acquire(
+        self,
+        timeout: float | None = None,
+        on_wait: Callable[[], None] | None = None,
+    ) -> bool:
+        """Wait for the lock, calling `on_wait` every poll while another process
+        holds it. Returns whether it had to wait.
+
+        Raises:
+            TimeoutError: If the lock isn't acquired within `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        # The last state of the lock file seen, and since when
+        observed: tuple[tuple[str, float] | None, float] | None = None
+
+        while not self._try_acquire():
+            waited = True
+            state = self._state()
+            now = time.monotonic()
+            if observed is None or observed[0] != state:
+                observed = (state, now)
+            elif now - observed[1] >= self.stale_after:
+                self._break(state)
+                observed = None
+                continue
+
+            if deadline is not None and now >= deadline:
+                raise TimeoutError(f"Timed out waiting for the lock {self.path}")
+            if on_wait is not None:
+                on_wait()
+            time.sleep(self.poll_interval)
+
+        self._stop_heartbeat.clear()
+        self._heartbeat = threading.Thread(
+            target=self._beat, name="fal-file-lock", daemon=True
+        )
+        self._heartbeat.start()
+        return waited
+
+    def release(self) -> None:
+        if self._token is None:
+            return
+
+        self._stop_heartbeat.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+
+        # The lock may have been taken over if this process stalled
+        if self._read_token(self.path) == self._token:
+            with suppress(FileNotFoundError):
+                self.path.unlink()
+        self._token = None
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+    def _try_acquire(self) -> bool:
+        token = uuid.uuid4().hex
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+
+        owner = {"token": token, "host": socket.gethostname(), "pid": os.getpid()}
+        with os.fdopen(fd, "w") as file:
+            json.dump(owner, file)
+        self._token = token
+        return True
+
+    def _state(self) -> tuple[str, float] | None:
+        try:
+            return (self._read_token(self.path) or "", self.path.stat().st_mtime)
+        except FileNotFoundError:
+            return None
+
+    def _break(self, state: tuple[str, float] | None) -> None:
+        if state is None:
+            return
+
+        # Only one of the waiters can move the lock file away
+        stale_path = self.path.with_name(f"{self.path.name}.stale.{uuid.uuid4().hex}")
+        try:
+            os.rename(self.path, stale_path)
+        except FileNotFoundError:
+            return
+
+        if self._read_token(stale_path) != state[0]:
+            # Another waiter took the lock over in the meantime, give it back
+            with suppress(OSError):
+                os.link(stale_path, self.path)
+        else:
+            print(f"Took over the stale lock {self.path}")
+        stale_path.unlink(missing_ok=True)
+
+    def _beat(self) -> None:
+        while not self._stop_heartbeat.wait(self.heartbeat_interval):
+            with suppress(OSError):
+                os.utime(self.path)
+
+    @staticmethod
+    def _read_token(path: Path) -> str | None:
+        try:
+            return json.loads(path.read_text()).get("token")
+        except (OSError, ValueError, AttributeError):
+            return None
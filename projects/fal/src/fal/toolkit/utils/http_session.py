@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from http.client import HTTPMessage
+from io import BytesIO
+from typing import Any, Callable
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
+from urllib.request import Request
+from urllib.response import addinfourl
+
+import httpx
+
+from fal._user_agent import USER_AGENT
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+# Idle connections are closed after this many seconds.
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+@dataclass
+class HostConnectionStats:
+    requests: int = 0
+    # Connections that had to be opened, i.e. TCP (and TLS) handshakes.
+    connections: int = 0
+
+    @property
+    def reused(self) -> int:
+        """Requests that were sent over an already open connection."""
+        return max(self.requests - self.connections, 0)
+
+
+class HTTPSession:
+    """Thread-safe keep-alive HTTP session shared by the toolkit's file
+    repositories and KV store, so consecutive requests to the same host reuse
+    connections instead of opening a new one each time.
+
+    Sync requests share a single pooled client; async requests share a pooled
+    client per event loop. Both are recreated in forked processes."""
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._client: httpx.Client | None = None
+        self._async_clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+        self._stats: dict[str, HostConnectionStats] = {}
+
+    def configure(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    ) -> None:
+        """Change the pool limits. Open connections are closed."""
+        self.close()
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+
+    def client(self) -> httpx.Client:
+        with self._lock:
+            self._check_pid()
+            if self._client is None:
+                self._client = httpx.Client(
+                    headers={"User-Agent": USER_AGENT},
+                    limits=self.limits,
+                    follow_redirects=True,
+                )
+            return self._client
+
+    def async_client(self) -> httpx.AsyncClient:
+        """The pooled client for async requests on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._check_pid()
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(
+                    headers={"User-Agent": USER_AGENT},
+                    limits=self.limits,
+                    follow_redirects=True,
+                )
+                self._async_clients[loop] = client
+            return client
+
+    def extensions(self, url: str) -> dict[str, Any]:
+        """Request extensions that record a request to `url` in the session's
+        per-host stats."""
+        record = self._recorder(url)
+
+        def trace(event: str, info: dict[str, Any]) -> None:
+            record(event)
+
+        return {"trace": trace}
+
+    def async_extensions(self, url: str) -> dict[str, Any]:
+        record = self._recorder(url)
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            record(event)
+
+        return {"trace": trace}
+
+    def urlopen(self, request: Request, timeout: float | None = None) -> addinfourl:
+        """Send a urllib request through the session. Responses and errors are
+        the same as those of `urllib.request.urlopen`."""
+        url = request.full_url
+        try:
+            response = self.client().request(
+                request.get_method(),
+                url,
+                headers=dict(request.header_items()),
+                content=request.data,  # type: ignore[arg-type]
+                # Waiting for a pooled connection is not bounded by the timeout.
+                timeout=httpx.Timeout(timeout, pool=None),
+                extensions=self.extensions(url),
+            )
+        except httpx.TimeoutException as exc:
+            raise TimeoutError(str(exc)) from exc
+        except httpx.TransportError as exc:
+            raise URLError(exc) from exc
+
+        headers = HTTPMessage()
+        for key, value in response.headers.multi_items():
+            headers[key] = value
+
+        if response.is_error:
+            raise HTTPError(
+                url,
+                response.status_code,
+                response.reason_phrase,
+                headers,
+                BytesIO(response.content),
+            )
+
+        return addinfourl(BytesIO(response.content), headers, url, response.status_code)
+
+    def stats(self) -> dict[str, HostConnectionStats]:
+        """Requests sent and connections opened so far, by host."""
+        with self._lock:
+            return {
+                host: HostConnectionStats(stats.requests, stats.connections)
+                for host, stats in self._stats.items()
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+            # Async clients are left to be closed with their event loops.
+            self._async_clients = weakref.WeakKeyDictionary()
+
+    def _check_pid(self) -> None:
+        # Connections can't be shared with a parent process.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._client = None
+            self._async_clients = weakref.WeakKeyDictionary()
+            self._stats = {}
+
+    def _recorder(self, url: str) -> Callable[[str], None]:
+        host = urlparse(url).netloc
+        with self._lock:
+            stats = self._stats.setdefault(host, HostConnectionStats())
+            stats.requests += 1
+
+        def record(event: str) -> None:
+            if event.endswith("connect_tcp.complete"):
+                with self._lock:
+                    stats.connections += 1
+
+        return record
+
+
+_SHARED_SESSION = HTTPSession()
+
+
+def shared_session() -> HTTPSession:
+    """The session used by the toolkit's file repositories and KV store."""
+    return _SHARED_SESSION
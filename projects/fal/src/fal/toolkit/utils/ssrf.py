@@ -7,23 +7,33 @@ HTTP_PROXY or HTTPS_PROXY environment variables.
 from __future__ import annotations
 
 import contextlib
+import functools
 import http.client
 import ipaddress
 import os
+import select
 import socket
 import ssl
 import tempfile
+import threading
+import time
 import urllib.parse
 import warnings
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Any, Callable, Dict, Tuple
 
 DEFAULT_ALLOWED_SCHEMES: frozenset[str] = frozenset({"http", "https"})
 DEFAULT_MAX_REDIRECT_HOPS = 5
+# Validated DNS resolutions are reused for this many seconds.
+DEFAULT_DNS_CACHE_TTL = 30.0
+# Idle connections kept per target address, and closed after this many seconds.
+DEFAULT_MAX_IDLE_CONNECTIONS = 4
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
 
 _BODY_CONTENT = "content"
 _BODY_HEADERS = "headers"
 _BODY_FILE = "file"
+_BODY_STREAM = "stream"
 _REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
 _CROSS_ORIGIN_STRIPPED_HEADERS: frozenset[str] = frozenset(
     {"authorization", "cookie", "proxy-authorization"}
@@ -32,6 +42,8 @@ _DEFAULT_PORTS = {"http": 80, "https": 443}
 _CGNAT_NETWORK = ipaddress.ip_network("100.64.0.0/10")
 _NAT64_WELL_KNOWN_PREFIX = ipaddress.ip_network("64:ff9b::/96")
 _PROXY_ENV_VARS = ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy")
+# Bodies of redirects up to this size are read so the connection can be reused.
+_MAX_DRAINED_BODY_SIZE = 64 * 1024
 
 
 class SSRFError(Exception):
@@ -55,6 +67,24 @@ class SafeResponse:
     content: bytes = b""
 
 
+# Reads the body of a successful response, given the response and its headers.
+_BodyConsumer = Callable[[http.client.HTTPResponse, Dict[str, str]], None]
+
+
+@dataclass
+class HostConnectionStats:
+    requests: int = 0
+    # Connections that had to be opened, i.e. TCP (and TLS) handshakes.
+    connections: int = 0
+    # Resolutions that weren't served from the DNS cache.
+    dns_lookups: int = 0
+
+    @property
+    def reused(self) -> int:
+        """Requests that were sent over an already open connection."""
+        return max(self.requests - self.connections, 0)
+
+
 def _socket_getaddrinfo(
     host: str | None,
     port: int | str | None,
@@ -238,6 +268,13 @@ def _raise_if_declared_size_exceeds_limit(
         raise SSRFError(f"File body exceeded {max_size} bytes before download")
 
 
+@functools.lru_cache(maxsize=1)
+def _shared_ssl_context() -> ssl.SSLContext:
+    # Loading the CA certificates is expensive, and a context can be shared by
+    # connections across threads.
+    return ssl.create_default_context()
+
+
 class _PinnedHTTPSConnection(http.client.HTTPSConnection):
     def __init__(
         self,
@@ -247,7 +284,7 @@ class _PinnedHTTPSConnection(http.client.HTTPSConnection):
         server_hostname: str,
         timeout: float,
     ):
-        ssl_context = ssl.create_default_context()
+        ssl_context = _shared_ssl_context()
         super().__init__(
             target_ip,
             port=port,
@@ -281,7 +318,9 @@ def _open_connection(
 
     if parsed.scheme == "https":
         if target_ip is None:
-            return http.client.HTTPSConnection(parsed.hostname, port, timeout=timeout)
+            return http.client.HTTPSConnection(
+                parsed.hostname, port, timeout=timeout, context=_shared_ssl_context()
+            )
         return _PinnedHTTPSConnection(
             target_ip,
             port,
@@ -292,6 +331,201 @@ def _open_connection(
     return http.client.HTTPConnection(connect_host, port, timeout=timeout)
 
 
+# (scheme, target IP, port, TLS server name)
+_PoolKey = Tuple[str, str, int, str]
+
+
+def _is_dropped(connection: http.client.HTTPConnection) -> bool:
+    # An idle connection has nothing to read unless the server closed it (or
+    # sent something unexpected), either way it can't be reused.
+    if connection.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([connection.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+class _ConnectionPool:
+    """Keep-alive connections and validated DNS resolutions shared by the
+    SSRF-safe requests.
+
+    Connections are pooled by the validated IP they are pinned to, along with
+    the scheme, port and TLS server name, so a pooled connection is only ever
+    reused for the address it was opened for. Resolutions are only cached once
+    all their addresses passed validation."""
+
+    def __init__(
+        self,
+        dns_cache_ttl: float = DEFAULT_DNS_CACHE_TTL,
+        max_idle_connections: int = DEFAULT_MAX_IDLE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    ) -> None:
+        self.dns_cache_ttl = dns_cache_ttl
+        self.max_idle_connections = max_idle_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._resolutions: dict[str, tuple[float, list[str]]] = {}
+        self._idle: dict[_PoolKey, list[tuple[float, http.client.HTTPConnection]]] = {}
+        self._stats: dict[str, HostConnectionStats] = {}
+
+    def resolve(self, parsed) -> list[str]:
+        """The validated addresses of the host of `parsed`, from the cache if
+        possible."""
+        hostname = parsed.hostname
+        key = hostname.lower()
+        now = time.monotonic()
+        with self._lock:
+            self._check_pid()
+            cached = self._resolutions.get(key)
+            if cached is not None and cached[0] > now:
+                return list(cached[1])
+
+        ips = resolve_and_validate_host(hostname, parsed.port)
+        with self._lock:
+            self._host_stats(hostname, self._key(parsed, None)[2]).dns_lookups += 1
+            if self.dns_cache_ttl > 0:
+                self._resolutions[key] = (now + self.dns_cache_ttl, list(ips))
+        return ips
+
+    def forget(self, hostname: str) -> None:
+        """Drop the cached resolution of `hostname`, e.g. when none of its
+        addresses could be reached."""
+        with self._lock:
+            self._resolutions.pop(hostname.lower(), None)
+
+    def acquire(
+        self, parsed, target_ip: str | None, *, timeout: float
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """An idle connection to `target_ip` if there is one, otherwise a new
+        one. Also returns whether the connection was reused."""
+        key = self._key(parsed, target_ip)
+        now = time.monotonic()
+        with self._lock:
+            self._check_pid()
+            self._host_stats(parsed.hostname, key[2]).requests += 1
+            idle = self._idle.get(key, [])
+            while idle:
+                idle_since, connection = idle.pop()
+                if now - idle_since < self.keepalive_expiry and not _is_dropped(
+                    connection
+                ):
+                    connection.timeout = timeout
+                    if connection.sock is not None:
+                        connection.sock.settimeout(timeout)
+                    return connection, True
+                connection.close()
+
+        return self.connect(parsed, target_ip, timeout=timeout), False
+
+    def connect(
+        self, parsed, target_ip: str | None, *, timeout: float
+    ) -> http.client.HTTPConnection:
+        """A new connection to `target_ip`."""
+        connection = _open_connection(parsed, target_ip, timeout=timeout)
+        with self._lock:
+            port = self._key(parsed, target_ip)[2]
+            self._host_stats(parsed.hostname, port).connections += 1
+        return connection
+
+    def release(
+        self, parsed, target_ip: str | None, connection: http.client.HTTPConnection
+    ) -> None:
+        """Return a connection whose response was fully read to the pool."""
+        key = self._key(parsed, target_ip)
+        with self._lock:
+            if self._pid == os.getpid():
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_connections:
+                    idle.append((time.monotonic(), connection))
+                    return
+        connection.close()
+
+    def stats(self) -> dict[str, HostConnectionStats]:
+        """Requests sent, connections opened and DNS lookups so far, by host."""
+        with self._lock:
+            return {
+                host: HostConnectionStats(
+                    stats.requests, stats.connections, stats.dns_lookups
+                )
+                for host, stats in self._stats.items()
+            }
+
+    def clear(self) -> None:
+        """Close the idle connections and forget the cached resolutions."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+            self._resolutions = {}
+        for connections in idle.values():
+            for _, connection in connections:
+                connection.close()
+
+    def _key(self, parsed, target_ip: str | None) -> _PoolKey:
+        port = parsed.port if parsed.port is not None else _DEFAULT_PORTS[parsed.scheme]
+        hostname = parsed.hostname or ""
+        return (parsed.scheme, target_ip or hostname, port, hostname)
+
+    def _host_stats(
+        self, hostname: str | None, port: int | None
+    ) -> HostConnectionStats:
+        return self._stats.setdefault(f"{hostname}:{port}", HostConnectionStats())
+
+    def _check_pid(self) -> None:
+        # Connections can't be shared with a parent process.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle = {}
+            self._stats = {}
+
+
+_CONNECTION_POOL = _ConnectionPool()
+
+
+def connection_stats() -> dict[str, HostConnectionStats]:
+    """Requests sent, connections opened and DNS lookups by the SSRF-safe
+    requests so far, by host."""
+    return _CONNECTION_POOL.stats()
+
+
+def close_connections() -> None:
+    """Close the idle SSRF-safe connections and clear the DNS cache."""
+    _CONNECTION_POOL.clear()
+
+
+def _send_request(
+    parsed,
+    *,
+    target_ip: str | None,
+    timeout: float,
+    headers: dict[str, str],
+) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+    connection, reused = _CONNECTION_POOL.acquire(parsed, target_ip, timeout=timeout)
+    try:
+        connection.request("GET", _path_and_query(parsed), headers=headers)
+        return connection, connection.getresponse()
+    except (OSError, http.client.HTTPException):
+        connection.close()
+        if not reused:
+            raise
+
+    # The server closed the pooled connection after it was checked.
+    connection = _CONNECTION_POOL.connect(parsed, target_ip, timeout=timeout)
+    try:
+        connection.request("GET", _path_and_query(parsed), headers=headers)
+        return connection, connection.getresponse()
+    except BaseException:
+        connection.close()
+        raise
+
+
+def _drain_small_body(response: http.client.HTTPResponse) -> None:
+    if response.length is not None and response.length <= _MAX_DRAINED_BODY_SIZE:
+        with contextlib.suppress(OSError, http.client.HTTPException):
+            response.read()
+
+
 def _strip_sensitive_headers_for_cross_origin(
     headers: dict[str, str],
     initial_origin: tuple[str, str | None, int],
@@ -398,14 +632,18 @@ def _request_one_hop(
     target_path: str | None = None,
     chunk_size: int = 64 * 1024,
     on_response_headers: Callable[[dict[str, str]], None] | None = None,
+    consume_body: _BodyConsumer | None = None,
 ) -> SafeResponse:
-    connection = _open_connection(parsed, target_ip, timeout=timeout)
+    connection, response = _send_request(
+        parsed, target_ip=target_ip, timeout=timeout, headers=headers
+    )
+    completed = False
     try:
-        connection.request("GET", _path_and_query(parsed), headers=headers)
-        response = connection.getresponse()
         response_headers = _headers_from_response(response)
 
         if response.status in _REDIRECT_STATUSES:
+            _drain_small_body(response)
+            completed = True
             return SafeResponse(response.status, response_headers)
 
         if response.status < 200 or response.status >= 300:
@@ -430,20 +668,30 @@ def _request_one_hop(
                 expected_size=expected_size,
                 chunk_size=chunk_size,
             )
+            completed = True
             return SafeResponse(response.status, response_headers)
 
-        return SafeResponse(
-            response.status,
-            response_headers,
-            _read_response_content(
-                response,
-                max_size,
-                expected_size=expected_size,
-                chunk_size=chunk_size,
-            ),
+        if body_mode == _BODY_STREAM:
+            if consume_body is None:
+                raise SSRFError("Body consumer is required")
+            consume_body(response, response_headers)
+            completed = True
+            return SafeResponse(response.status, response_headers)
+
+        content = _read_response_content(
+            response,
+            max_size,
+            expected_size=expected_size,
+            chunk_size=chunk_size,
         )
+        completed = True
+        return SafeResponse(response.status, response_headers, content)
     finally:
-        connection.close()
+        # Only connections whose response was read to the end can be reused.
+        if completed and response.isclosed() and not response.will_close:
+            _CONNECTION_POOL.release(parsed, target_ip, connection)
+        else:
+            connection.close()
 
 
 def _request_resolved_url(
@@ -456,13 +704,14 @@ def _request_resolved_url(
     target_path: str | None,
     chunk_size: int,
     on_response_headers: Callable[[dict[str, str]], None] | None,
+    consume_body: _BodyConsumer | None = None,
 ) -> SafeResponse:
     hostname = parsed.hostname
     if not hostname:
         raise SSRFError("URL has no hostname")
 
     last_error: Exception | None = None
-    for ip in resolve_and_validate_host(hostname, parsed.port):
+    for ip in _CONNECTION_POOL.resolve(parsed):
         try:
             return _request_one_hop(
                 parsed,
@@ -474,10 +723,13 @@ def _request_resolved_url(
                 target_path=target_path,
                 chunk_size=chunk_size,
                 on_response_headers=on_response_headers,
+                consume_body=consume_body,
             )
         except (OSError, SSRFConnectionError, http.client.IncompleteRead) as exc:
             last_error = exc
 
+    # The host may have moved to other addresses.
+    _CONNECTION_POOL.forget(hostname)
     raise SSRFConnectionError("All validated addresses failed") from last_error
 
 
@@ -497,6 +749,7 @@ def _safe_request(
     target_path: str | None = None,
     chunk_size: int = 64 * 1024,
     on_response_headers: Callable[[dict[str, str]], None] | None = None,
+    consume_body: _BodyConsumer | None = None,
 ) -> SafeResponse:
     _warn_if_proxy_configured()
 
@@ -526,6 +779,7 @@ def _safe_request(
             target_path=target_path,
             chunk_size=chunk_size,
             on_response_headers=on_response_headers,
+            consume_body=consume_body,
         )
 
         if response.status_code not in _REDIRECT_STATUSES:
@@ -629,3 +883,28 @@ def _ssrf_safe_get_to_file(
         chunk_size=chunk_size,
         on_response_headers=on_response_headers,
     )
+
+
+def _ssrf_safe_get_stream(
+    url: str,
+    consume_body: _BodyConsumer,
+    *,
+    timeout: float = 30.0,
+    max_size: int | None = None,
+    max_hops: int = DEFAULT_MAX_REDIRECT_HOPS,
+    headers: dict[str, str] | None = None,
+    allowed_schemes: frozenset[str] = DEFAULT_ALLOWED_SCHEMES,
+) -> SafeResponse:
+    """Like `ssrf_safe_get`, but the body of the final response is read by
+    `consume_body`, which should read it to the end for the connection to be
+    reused."""
+    return _safe_request(
+        url,
+        timeout=timeout,
+        max_size=max_size,
+        max_hops=max_hops,
+        headers=headers,
+        allowed_schemes=allowed_schemes,
+        body_mode=_BODY_STREAM,
+        consume_body=consume_body,
+    )
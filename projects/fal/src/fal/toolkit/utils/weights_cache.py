@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from fal.toolkit.utils.file_lock import FileLock
+
+MANIFEST_NAME = ".fal_manifest.json"
+# How often the last use of an entry is written to the manifest.
+USE_RECORD_INTERVAL = 3600.0
+
+
+@dataclass
+class WeightsCacheEntry:
+    """A directory of the model weights cache."""
+
+    name: str
+    size: int
+    last_used: float
+    # The weights file, relative to the directory of the entry
+    file: str | None = None
+    url: str | None = None
+    sha256: str | None = None
+
+
+def _disk_usage(path: Path) -> int:
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                pass
+    return size
+
+
+class WeightsCache:
+    """The index of the model weights directories under `root`, with their size
+    and when they were last used, kept in a manifest shared by the processes
+    using `root`."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            return json.loads(self.manifest_path.read_text())["entries"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _update(self, update: Callable[[dict[str, dict]], None]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.root / ".fal_manifest.lock", poll_interval=0.05):
+            entries = self._load()
+            update(entries)
+            temp_path = self.manifest_path.with_name(
+                f"{MANIFEST_NAME}.{uuid.uuid4().hex}.tmp"
+            )
+            temp_path.write_text(json.dumps({"entries": entries}))
+            os.replace(temp_path, self.manifest_path)
+
+    def get(self, name: str) -> WeightsCacheEntry | None:
+        entry = self._load().get(name)
+        return WeightsCacheEntry(name=name, **entry) if entry is not None else None
+
+    def record_use(
+        self,
+        name: str,
+        file: Path,
+        *,
+        url: str | None = None,
+        sha256: str | None = None,
+    ) -> None:
+        """Record that the weights in `file` were used now, at most every
+        `USE_RECORD_INTERVAL` seconds."""
+        entry = self.get(name)
+        now = time.time()
+        if (
+            entry is not None
+            and entry.file == file.name
+            and now - entry.last_used < USE_RECORD_INTERVAL
+        ):
+            return
+
+        new_entry = WeightsCacheEntry(
+            name=name,
+            size=_disk_usage(self.root / name),
+            last_used=now,
+            file=file.name,
+            url=url,
+            sha256=sha256 or (entry.sha256 if entry is not None else None),
+        )
+
+        def update(entries: dict[str, dict]) -> None:
+            entries[name] = {
+                key: value for key, value in asdict(new_entry).items() if key != "name"
+            }
+
+        self._update(update)
+
+    def entries(self) -> list[WeightsCacheEntry]:
+        """The entries of the cache, including directories that are missing from
+        the manifest, e.g. because they were created by an older version."""
+        if not self.root.is_dir():
+            return []
+
+        manifest = self._load()
+        entries = []
+        for path in self.root.iterdir():
+            if path.name.startswith(".fal") or not path.is_dir():
+                continue
+
+            if path.name in manifest:
+                entry = WeightsCacheEntry(name=path.name, **manifest[path.name])
+            else:
+                used_file = path / ".fal_used"
+                used_path = used_file if used_file.exists() else path
+                entry = WeightsCacheEntry(
+                    name=path.name,
+                    size=_disk_usage(path),
+                    last_used=used_path.stat().st_mtime,
+                )
+            entries.append(entry)
+        return entries
+
+    def evict(self, max_size: int, *, dry_run: bool = False) -> list[WeightsCacheEntry]:
+        """Remove the least recently used entries until the cache takes at most
+        `max_size` bytes. Entries being downloaded are kept. Returns the entries
+        that were removed, or would be with `dry_run`."""
+        entries = sorted(self.entries(), key=lambda entry: entry.last_used)
+        total = sum(entry.size for entry in entries)
+        evicted = []
+        for entry in entries:
+            if total <= max_size:
+                break
+
+            if not dry_run and not self._remove(entry):
+                continue
+            evicted.append(entry)
+            total -= entry.size
+
+        if evicted and not dry_run:
+            names = {entry.name for entry in evicted}
+
+            def update(manifest: dict[str, dict]) -> None:
+                for name in names:
+                    manifest.pop(name, None)
+
+            self._update(update)
+        return evicted
+
+    def _remove(self, entry: WeightsCacheEntry) -> bool:
+        path = self.root / entry.name
+        lock = FileLock(path / ".fal_download.lock")
+        try:
+            lock.acquire(timeout=0)
+        except TimeoutError:
+            print(f"Not evicting {path}, it is being downloaded")
+            return False
+        except FileNotFoundError:
+            # Already removed by another process
+            return True
+
+        evicted_path = self.root / f".fal_evicted.{uuid.uuid4().hex}"
+        try:
+            os.rename(path, evicted_path)
+        except FileNotFoundError:
+            return True
+        finally:
+            lock.release()
+
+        print(f"Evicting the model weights in {path} ({entry.size} bytes)")
+        shutil.rmtree(evicted_path, ignore_errors=True)
+        return True
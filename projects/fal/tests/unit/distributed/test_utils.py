@@ -1,19 +1,31 @@
+import inspect
+import json
+import os
 import threading
+import time
+import timeit
+from dataclasses import dataclass
 
 import numpy as np
 import pytest
 from PIL import Image
 
 from fal.distributed.utils import (
+    SHARED_MEMORY_DIR,
     KeepAliveTimer,
     distributed_deserialize,
+    distributed_deserialize_frames,
     distributed_serialize,
+    distributed_serialize_frames,
     encode_text_event,
     format_for_serialization,
     has_type_name,
     is_numpy_array,
     is_pil_image,
     is_torch_tensor,
+    launch_distributed_processes,
+    register_encoder,
+    release_frames,
 )
 
 
@@ -155,3 +167,306 @@ def test_keepalive_timer_reset():
     timer.cancel()
     time.sleep(0.1)  # Make sure it doesn't fire after cancel
     assert len(calls) == 0
+
+
+def test_frames_send_arrays_out_of_band():
+    """Test that array data is sent in separate frames and not copied back."""
+    data = {
+        "latents": np.arange(1024, dtype=np.float16).reshape(4, 256),
+        "mask": np.asfortranarray(np.eye(8, dtype=bool)),
+        "frames": [np.zeros((2, 2, 3), dtype=np.uint8)],
+        "image": Image.new("RGB", (4, 4)),
+        "text": "hello",
+    }
+    frames = distributed_serialize_frames(data, shared_memory_threshold=None)
+
+    assert len(frames) == 5
+    # Only the dtype and shape of the arrays are pickled
+    assert len(frames[1]) < data["latents"].nbytes
+    received = [bytearray(frame) for frame in frames]
+    deserialized = distributed_deserialize_frames(received)
+
+    np.testing.assert_array_equal(deserialized["latents"], data["latents"])
+    np.testing.assert_array_equal(deserialized["mask"], data["mask"])
+    np.testing.assert_array_equal(deserialized["frames"][0], data["frames"][0])
+    assert deserialized["image"].size == (4, 4)
+    assert deserialized["text"] == "hello"
+    latents_buffer = np.frombuffer(received[2], dtype=np.float16)
+    assert np.shares_memory(deserialized["latents"], latents_buffer)
+
+
+def test_frames_accept_single_pickled_frame():
+    data = {"array": np.array([1, 2, 3])}
+    deserialized = distributed_deserialize_frames([distributed_serialize(data)])
+    np.testing.assert_array_equal(deserialized["array"], data["array"])
+
+
+def test_frames_copy_buffers():
+    array = np.zeros(16)
+    frames = distributed_serialize_frames(
+        array, copy_buffers=True, shared_memory_threshold=None
+    )
+    array[:] = 1
+    np.testing.assert_array_equal(distributed_deserialize_frames(frames), 0)
+
+
+@pytest.mark.skipif(
+    not os.path.isdir(SHARED_MEMORY_DIR), reason="Shared memory not available"
+)
+def test_frames_hand_large_arrays_over_shared_memory():
+    array = np.arange(4096, dtype=np.int64)
+    frames = distributed_serialize_frames(
+        {"small": np.ones(2), "large": array}, shared_memory_threshold=1024
+    )
+    (name,) = (name for name in json.loads(frames[0]) if name)
+    path = os.path.join(SHARED_MEMORY_DIR, name)
+    assert os.path.exists(path)
+
+    deserialized = distributed_deserialize_frames(frames)
+    np.testing.assert_array_equal(deserialized["large"], array)
+    np.testing.assert_array_equal(deserialized["small"], np.ones(2))
+    assert not os.path.exists(path)
+
+    # Frames that are discarded free their shared memory
+    frames = distributed_serialize_frames(array, shared_memory_threshold=1024)
+    (name,) = json.loads(frames[0])
+    release_frames(frames)
+    assert not os.path.exists(os.path.join(SHARED_MEMORY_DIR, name))
+
+
+@pytest.mark.skipif(
+    not os.path.isdir(SHARED_MEMORY_DIR), reason="Shared memory not available"
+)
+def test_empty_arrays_are_sent_as_frames():
+    before = set(os.listdir(SHARED_MEMORY_DIR))
+    frames = distributed_serialize_frames(
+        {"empty": np.zeros(0), "full": np.ones(4)}, shared_memory_threshold=0
+    )
+
+    assert json.loads(frames[0])[0] is None
+    deserialized = distributed_deserialize_frames(frames)
+    assert deserialized["empty"].shape == (0,)
+    np.testing.assert_array_equal(deserialized["full"], np.ones(4))
+    assert set(os.listdir(SHARED_MEMORY_DIR)) - before == set()
+
+
+@pytest.mark.skipif(
+    not os.path.isdir(SHARED_MEMORY_DIR), reason="Shared memory not available"
+)
+def test_failed_shared_memory_writes_are_removed(monkeypatch):
+    before = set(os.listdir(SHARED_MEMORY_DIR))
+
+    def fail(fd, size):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(os, "ftruncate", fail)
+    with pytest.raises(OSError, match="No space"):
+        distributed_serialize_frames(np.ones(16), shared_memory_threshold=0)
+
+    assert set(os.listdir(SHARED_MEMORY_DIR)) - before == set()
+
+
+def test_frames_tensors():
+    torch = pytest.importorskip("torch")
+    data = {
+        "latents": torch.randn(2, 4, 8, dtype=torch.bfloat16),
+        "scalar": torch.tensor(3),
+    }
+    frames = distributed_serialize_frames(data, shared_memory_threshold=None)
+    deserialized = distributed_deserialize_frames(frames)
+
+    assert deserialized["latents"].dtype == torch.bfloat16
+    assert torch.equal(deserialized["latents"], data["latents"])
+    assert torch.equal(deserialized["scalar"], data["scalar"])
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("size_mb", [1, 16, 128])
+def test_array_transport_benchmark(size_mb):
+    """Compare the throughput of sending an array between processes over ZeroMQ
+    with the pickled and the framed serialization."""
+    import zmq
+
+    array = np.ones(size_mb * 1024 * 1024, dtype=np.uint8)
+    context = zmq.Context()
+    receiver = context.socket(zmq.PULL)
+    port = receiver.bind_to_random_port("tcp://127.0.0.1")
+    sender = context.socket(zmq.PUSH)
+    sender.connect(f"tcp://127.0.0.1:{port}")
+
+    def pickled():
+        sender.send(distributed_serialize({"array": array}))
+        return distributed_deserialize(receiver.recv())
+
+    def framed(shared_memory_threshold):
+        frames = distributed_serialize_frames(
+            {"array": array}, shared_memory_threshold=shared_memory_threshold
+        )
+        sender.send_multipart(frames, copy=False)
+        return distributed_deserialize_frames(receiver.recv_multipart(copy=False))
+
+    modes = {
+        "pickled": pickled,
+        "frames": lambda: framed(None),
+        "shared memory": lambda: framed(0),
+    }
+    throughputs = {}
+    try:
+        for mode, transport in modes.items():
+            start = time.perf_counter()
+            result = transport()
+            elapsed = time.perf_counter() - start
+            assert result["array"].shape == array.shape
+            throughputs[mode] = size_mb / elapsed
+            del result
+    finally:
+        sender.close(linger=0)
+        receiver.close(linger=0)
+        context.term()
+
+    print(
+        f"{size_mb}MB: "
+        + ", ".join(f"{mode} {mbps:.0f}MB/s" for mode, mbps in throughputs.items())
+    )
+    if size_mb >= 16:
+        assert throughputs["frames"] > throughputs["pickled"]
+
+
+@dataclass
+class Detection:
+    label: str
+    box: np.ndarray
+
+
+class LabeledDetection(Detection):
+    pass
+
+
+@pytest.fixture
+def detection_encoder(monkeypatch):
+    from fal.distributed import utils
+
+    monkeypatch.setattr(utils, "_ENCODERS", {})
+    monkeypatch.setattr(utils, "_DECODERS", {})
+    monkeypatch.setattr(utils, "_FORMATTERS", {})
+    register_encoder(
+        Detection,
+        "application/x-detection",
+        encode=lambda detection: {"label": detection.label, "box": detection.box},
+        decode=lambda data: Detection(**data),
+    )
+
+
+def test_registered_encoders(detection_encoder):
+    data = {
+        "detections": [
+            Detection("cat", np.array([0, 0, 4, 4])),
+            LabeledDetection("dog", np.array([1, 1, 2, 2])),
+        ]
+    }
+
+    formatted = format_for_serialization(data)
+    assert formatted["detections"][1]["content_type"] == "application/x-detection"
+    assert formatted["detections"][1]["data"]["label"] == "dog"
+    # Values returned by encoders are formatted too
+    assert formatted["detections"][1]["data"]["box"]["content_type"] == (
+        "application/ndarray"
+    )
+
+    for deserialized in (
+        distributed_deserialize(distributed_serialize(data)),
+        distributed_deserialize_frames(
+            distributed_serialize_frames(data, shared_memory_threshold=None)
+        ),
+    ):
+        first, second = deserialized["detections"]
+        assert isinstance(first, Detection)
+        assert (first.label, second.label) == ("cat", "dog")
+        np.testing.assert_array_equal(second.box, [1, 1, 2, 2])
+
+
+def test_registering_an_encoder_updates_cached_dispatch(detection_encoder):
+    class Point:
+        def __init__(self, x):
+            self.x = x
+
+    point = Point(1)
+    # Unknown types are serialized as they are
+    assert format_for_serialization(point) is point
+
+    register_encoder(Point, "application/x-point", encode=lambda point: point.x)
+    assert format_for_serialization(point) == {
+        "content_type": "application/x-point",
+        "data": 1,
+    }
+    # Without a decoder, the encoded value is deserialized
+    assert distributed_deserialize(distributed_serialize(point)) == {
+        "content_type": "application/x-point",
+        "data": 1,
+    }
+
+
+def _plain_copy(value):
+    if isinstance(value, list):
+        return [_plain_copy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain_copy(item) for key, item in value.items()}
+    return value
+
+
+def test_format_for_serialization_keeps_plain_values():
+    payload = {
+        "values": [
+            {"id": i, "score": i / 3, "label": f"item {i}", "ok": None}
+            for i in range(3)
+        ],
+        "boxes": [[0.0, 1.0, 2.0, 3.0]],
+        "nested": {"labels": ["cat"], "count": 1},
+    }
+
+    formatted = format_for_serialization(payload)
+
+    assert formatted == payload
+    assert formatted["values"] is not payload["values"]
+    assert formatted["nested"]["labels"] is not payload["nested"]["labels"]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {
+            "values": [
+                {"id": i, "score": i / 3, "label": f"item {i}", "ok": True}
+                for i in range(2000)
+            ]
+        },
+        {
+            "boxes": [[float(j) for j in range(4)] for _ in range(5000)],
+            "labels": ["cat"] * 5000,
+        },
+        {
+            "embeddings": [np.zeros(4) for _ in range(100)],
+            "meta": [{"index": i} for i in range(1000)],
+        },
+    ],
+    ids=["scalars", "detections", "mixed"],
+)
+def test_format_for_serialization_benchmark(payload):
+    """Compare formatting nested responses with a plain recursive copy of them."""
+    number = 20
+    elapsed = timeit.timeit(lambda: format_for_serialization(payload), number=number)
+    baseline = timeit.timeit(lambda: _plain_copy(payload), number=number)
+
+    print(
+        f"format_for_serialization: {elapsed / number * 1000:.2f}ms per response, "
+        f"{elapsed / baseline:.1f}x a plain copy"
+    )
+    assert elapsed < baseline * 10
+
+
+def test_launch_distributed_processes_backend_is_keyword_only():
+    parameters = inspect.signature(launch_distributed_processes).parameters
+
+    assert parameters["backend"].kind is inspect.Parameter.KEYWORD_ONLY
+    assert list(parameters).index("args") < list(parameters).index("backend")
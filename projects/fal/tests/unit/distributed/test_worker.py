@@ -1,12 +1,30 @@
 import asyncio
+import contextlib
+import multiprocessing
+import os
+import socket
+import statistics
+import threading
+import time
 from unittest.mock import AsyncMock, MagicMock
 
+import numpy as np
 import pytest
 
-from fal.distributed.utils import distributed_serialize
+from fal.distributed.utils import (
+    SHARED_MEMORY_DIR,
+    SHARED_MEMORY_PREFIX,
+    PreviewConfig,
+    distributed_deserialize,
+    distributed_deserialize_frames,
+    distributed_serialize,
+    distributed_serialize_frames,
+)
 from fal.distributed.worker import (
     DistributedRunner,
     DistributedWorker,
+    _CommandFanout,
+    _CommandSubscriber,
 )
 
 
@@ -124,6 +142,69 @@ def test_add_streaming_error():
     worker.shutdown()
 
 
+class PreviewWorker(SimpleWorker):
+    preview_config = PreviewConfig(format="webp", quality=50, max_size=32)
+
+
+def _drain(worker):
+    items = []
+    while (item := worker.queue.get(timeout=5)) is not None:
+        items.append(distributed_deserialize_frames(item))
+    return items
+
+
+def test_streaming_previews_are_encoded_off_thread():
+    """Test that previews are downscaled and encoded with the preview config."""
+    from PIL import Image
+
+    worker = PreviewWorker(rank=0, world_size=1)
+    worker.add_streaming_result({"image": Image.new("RGB", (128, 64))})
+    worker.add_streaming_error(ValueError("test error"))
+    worker._end_stream()
+
+    (preview, error) = _drain(worker)
+    assert preview["image"].format == "WEBP"
+    assert preview["image"].size == (32, 16)
+    assert error == {"error": "test error"}
+    stats = worker.preview_stats
+    assert (stats.submitted, stats.encoded, stats.dropped) == (1, 1, 0)
+    assert stats.mean_encode_seconds > 0
+
+    worker.shutdown()
+
+
+def test_stale_previews_are_dropped():
+    """Test that a slow encoder only sends the latest of the pending previews."""
+    encoding = threading.Event()
+    release = threading.Event()
+
+    class SlowPreviewWorker(PreviewWorker):
+        def _encode_streaming_result(self, result, *args):
+            encoding.set()
+            assert release.wait(timeout=5)
+            time.sleep(0.2)
+            return super()._encode_streaming_result(result, *args)
+
+    worker = SlowPreviewWorker(rank=0, world_size=1)
+    worker.add_streaming_result({"step": 0})
+    assert encoding.wait(timeout=5)
+
+    # Adding results doesn't wait for them to be encoded, the encoder is still
+    # blocked on the first one
+    for step in range(1, 10):
+        worker.add_streaming_result({"step": step})
+    assert worker.preview_stats.encoded == 0
+    release.set()
+    worker._end_stream()
+
+    assert _drain(worker) == [{"step": 0}, {"step": 9}]
+    stats = worker.preview_stats
+    assert (stats.submitted, stats.encoded, stats.dropped) == (10, 2, 8)
+    assert stats.max_encode_seconds >= 0.2
+
+    worker.shutdown()
+
+
 def test_runner_gather_errors_when_no_errors():
     """Test gather_errors returns empty list when no errors."""
     runner = DistributedRunner(SimpleWorker, world_size=1)
@@ -340,3 +421,518 @@ async def test_stream_discards_stale_responses():
     assert results[0] == {"chunk": "correct"}
     # recv called: 1 (cancelled), 2 (stale discarded), 3 (correct chunk), 4 (DONE)
     assert call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_responses_are_routed_by_request_id():
+    """Test that responses are delivered to the request they belong to."""
+    runner = DistributedRunner(SimpleWorker, world_size=1)
+    responses: asyncio.Queue = asyncio.Queue()
+
+    async def capture_send(msg):
+        # Answer with a stale response first
+        await responses.put((b"0", b"other", distributed_serialize({"stale": 1})))
+        await responses.put((b"0", msg[2], distributed_serialize({"ok": 1})))
+
+    mock_socket = AsyncMock()
+    mock_socket.send_multipart = capture_send
+    mock_socket.recv_multipart = lambda **kwargs: responses.get()
+    runner.zmq_socket = mock_socket
+    runner.context = MagicMock()
+    runner.context.processes = [MagicMock(is_alive=MagicMock(return_value=True))]
+
+    assert await runner.invoke({}) == {"ok": 1}
+    # The reader stops once no request is waiting
+    assert runner._dispatcher is not None
+    assert runner._dispatcher._reader is None
+
+
+@pytest.mark.asyncio
+async def test_invoke_checks_workers_while_waiting(monkeypatch):
+    """Test that a request waiting on dead workers fails instead of hanging."""
+    monkeypatch.setattr("fal.distributed.worker.LIVENESS_CHECK_INTERVAL", 0.05)
+    runner = DistributedRunner(SimpleWorker, world_size=1)
+    mock_socket = AsyncMock()
+    mock_socket.recv_multipart = lambda **kwargs: asyncio.Event().wait()
+    runner.zmq_socket = mock_socket
+    process = MagicMock(is_alive=MagicMock(return_value=True))
+    runner.context = MagicMock()
+    runner.context.processes = [process]
+    runner.context.error_files = []
+
+    task = asyncio.create_task(runner.invoke({}))
+    await asyncio.sleep(0.1)
+    process.is_alive.return_value = False
+
+    with pytest.raises(RuntimeError, match="not running"):
+        await asyncio.wait_for(task, timeout=1)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _fake_rank_zero(port: int, stop: threading.Event) -> None:
+    """Answer the runner's requests like rank 0 would, timestamping each
+    response as it is sent."""
+    import zmq
+
+    context = zmq.Context()
+    dealer = context.socket(zmq.DEALER)
+    dealer.setsockopt(zmq.IDENTITY, b"0")
+    dealer.connect(f"tcp://127.0.0.1:{port}")
+    dealer.send_multipart([b"READY"])
+    while not stop.is_set():
+        if not dealer.poll(timeout=50):
+            continue
+        parts = dealer.recv_multipart()
+        request_id, payload = parts[-2], distributed_deserialize(parts[-1])
+        if parts[0] == b"invoke":
+            dealer.send_multipart(
+                [request_id, distributed_serialize({"sent_at": time.perf_counter()})]
+            )
+            continue
+        for i in range(payload["tokens"]):
+            # Emulate the time it takes to generate a token
+            time.sleep(payload.get("delay", 0.002))
+            token = {"i": i, "sent_at": time.perf_counter()}
+            if payload.get("shared_memory"):
+                token["array"] = np.ones(64 * 1024, dtype=np.uint8)
+                frames = distributed_serialize_frames(token, shared_memory_threshold=0)
+                dealer.send_multipart([request_id, *frames])
+                continue
+            dealer.send_multipart([request_id, distributed_serialize(token)])
+        dealer.send_multipart([request_id, b"DONE"])
+    dealer.close()
+    context.term()
+
+
+def _overheads(samples: list) -> tuple:
+    quantiles = statistics.quantiles(samples, n=100)
+    return quantiles[49], quantiles[98]
+
+
+@contextlib.asynccontextmanager
+async def _runner_with_fake_rank_zero():
+    port = _free_port()
+    runner = DistributedRunner(SimpleWorker, world_size=1, worker_port=port)
+    runner.context = MagicMock()
+    runner.context.processes = [MagicMock(is_alive=MagicMock(return_value=True))]
+    zmq_socket = runner.get_zmq_socket()
+    stop = threading.Event()
+    thread = threading.Thread(target=_fake_rank_zero, args=(port, stop))
+    thread.start()
+
+    try:
+        assert await zmq_socket.recv_multipart() == [b"0", b"READY"]
+        yield runner
+    finally:
+        stop.set()
+        thread.join()
+        runner.close_zmq_socket()
+
+
+@pytest.mark.asyncio
+async def test_responses_are_routed_as_they_arrive():
+    """Test that each token reaches the runner before rank 0 generates the next
+    one, rather than when the runner next checks on the workers."""
+    delay = 0.02
+    async with _runner_with_fake_rank_zero() as runner:
+        tokens = []
+        async for token in runner.stream({"tokens": 50, "delay": delay}):
+            tokens.append((token["i"], time.perf_counter() - token["sent_at"]))
+        result = await runner.invoke({})
+
+    assert [i for i, _ in tokens] == list(range(50))
+    assert statistics.median(overhead for _, overhead in tokens) < delay
+    assert "sent_at" in result
+
+
+def _shared_memory_files() -> set:
+    return {
+        name
+        for name in os.listdir(SHARED_MEMORY_DIR)
+        if name.startswith(SHARED_MEMORY_PREFIX)
+    }
+
+
+@pytest.mark.asyncio
+async def test_closing_a_stream_early_frees_shared_memory():
+    """Test that the shared memory of the responses a stream didn't read is
+    freed when it is closed."""
+    before = _shared_memory_files()
+    async with _runner_with_fake_rank_zero() as runner:
+        stream = runner.stream({"tokens": 20, "delay": 0, "shared_memory": True})
+        token = await stream.__anext__()
+        assert token["i"] == 0
+        await asyncio.sleep(0.1)
+        await stream.aclose()
+        # Responses that arrive once the stream was closed are discarded
+        assert "sent_at" in await runner.invoke({})
+
+    assert _shared_memory_files() - before == set()
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_response_latency_benchmark():
+    """Benchmark the delay between rank 0 sending a response and the runner
+    returning it."""
+    async with _runner_with_fake_rank_zero() as runner:
+        token_overheads = []
+        async for token in runner.stream({"tokens": 200}):
+            token_overheads.append(time.perf_counter() - token["sent_at"])
+
+        invoke_overheads = []
+        for _ in range(50):
+            result = await runner.invoke({})
+            invoke_overheads.append(time.perf_counter() - result["sent_at"])
+
+    p50, p99 = _overheads(token_overheads)
+    print(f"Per-token overhead: p50={p50 * 1000:.2f}ms p99={p99 * 1000:.2f}ms")
+    invoke_p50, invoke_p99 = _overheads(invoke_overheads)
+    print(
+        f"Per-invocation overhead: p50={invoke_p50 * 1000:.2f}ms "
+        f"p99={invoke_p99 * 1000:.2f}ms"
+    )
+    # Polling every 100ms would put the median around 50ms.
+    assert p50 < 0.02
+    assert invoke_p50 < 0.02
+
+
+class CPUWorker(DistributedWorker):
+    @property
+    def device(self):
+        import torch
+
+        return torch.device("cpu")
+
+
+class CPUStreamingWorker(CPUWorker):
+    def __call__(self, streaming: bool = False, tokens: int = 0, **kwargs):
+        for _ in range(tokens):
+            time.sleep(0.002)
+            self.add_streaming_result({"sent_at": time.time()})
+        return {"sent_at": time.time()}
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_gloo_response_latency_benchmark():
+    """Benchmark the per-token overhead of streaming from CPU workers."""
+    pytest.importorskip("torch")
+
+    runner = DistributedRunner(
+        CPUStreamingWorker,
+        world_size=2,
+        master_port=_free_port(),
+        worker_port=_free_port(),
+        backend="gloo",
+    )
+    await runner.start(timeout=60)
+    try:
+        overheads = []
+        async for token in runner.stream({"tokens": 200}):
+            overheads.append(time.time() - token["sent_at"])
+    finally:
+        await runner.stop()
+
+    # The final result is sent after a barrier across the ranks
+    p50, p99 = _overheads(overheads[:-1])
+    print(f"Per-token overhead (gloo): p50={p50 * 1000:.2f}ms p99={p99 * 1000:.2f}ms")
+    assert p50 < 0.02
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_demultiplexed():
+    """Test that concurrent requests each get their own response, whatever
+    order the responses arrive in, with at most max_concurrent_requests in
+    flight."""
+    runner = DistributedRunner(SimpleWorker, world_size=1, max_concurrent_requests=2)
+    responses: asyncio.Queue = asyncio.Queue()
+    in_flight: list = []
+    max_in_flight = 0
+
+    async def capture_send(msg):
+        nonlocal max_in_flight
+        in_flight.append(msg)
+        max_in_flight = max(max_in_flight, len(in_flight))
+        if len(in_flight) == 2 or msg[3] == distributed_serialize({"i": 2}):
+            # Answer in the reverse order, echoing the payloads
+            for request in reversed(in_flight):
+                await responses.put((b"0", request[2], request[3]))
+            in_flight.clear()
+
+    mock_socket = AsyncMock()
+    mock_socket.send_multipart = capture_send
+    mock_socket.recv_multipart = lambda **kwargs: responses.get()
+    runner.zmq_socket = mock_socket
+    runner.context = MagicMock()
+    runner.context.processes = [MagicMock(is_alive=MagicMock(return_value=True))]
+
+    results = await asyncio.gather(*(runner.invoke({"i": i}) for i in range(3)))
+
+    assert results == [{"i": 0}, {"i": 1}, {"i": 2}]
+    assert max_in_flight == 2
+    assert runner._requests_in_flight == 0
+
+
+async def _hold_slot(runner, held: asyncio.Event, release: asyncio.Event) -> None:
+    async with runner._request_slot():
+        held.set()
+        await release.wait()
+
+
+async def _yield_to_loop(times: int = 5) -> None:
+    for _ in range(times):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_waiting_requests_are_woken_when_a_slot_is_released():
+    """Test that a released request slot goes to the next waiting request
+    right away, in order, rather than on its next poll."""
+    runner = DistributedRunner(SimpleWorker, world_size=1)
+    runner.maybe_start_keepalive = MagicMock()
+    events = [(asyncio.Event(), asyncio.Event()) for _ in range(3)]
+    tasks = [
+        asyncio.create_task(_hold_slot(runner, held, release))
+        for held, release in events
+    ]
+    await _yield_to_loop()
+    assert [held.is_set() for held, _ in events] == [True, False, False]
+
+    # A cancelled waiter doesn't keep the slot from the next one
+    tasks[1].cancel()
+    events[0][1].set()
+    await _yield_to_loop()
+    assert events[2][0].is_set()
+    assert not events[1][0].is_set()
+
+    events[2][1].set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert runner._free_request_slots == 1
+    assert not runner._slot_waiters
+
+
+@pytest.mark.asyncio
+async def test_request_slots_are_handed_to_other_event_loops():
+    runner = DistributedRunner(SimpleWorker, world_size=1)
+    runner.maybe_start_keepalive = MagicMock()
+    held, release = asyncio.Event(), asyncio.Event()
+    holder = asyncio.create_task(_hold_slot(runner, held, release))
+    await held.wait()
+
+    acquired = threading.Event()
+
+    async def wait_for_slot():
+        async with runner._request_slot():
+            acquired.set()
+
+    thread = threading.Thread(target=asyncio.run, args=(wait_for_slot(),))
+    thread.start()
+    while not runner._slot_waiters:
+        await asyncio.sleep(0.001)
+    release.set()
+    await holder
+    thread.join(timeout=5)
+
+    assert acquired.is_set()
+    assert runner._free_request_slots == 1
+
+
+class CPUBatchingWorker(CPUWorker):
+    max_batch_size = 4
+    batch_timeout = 0.2
+
+    def __call__(self, streaming: bool = False, value: int = 0, **kwargs):
+        return {"value": value, "batch_size": 1}
+
+    def batch(self, payloads):
+        return [
+            {"value": payload["value"], "batch_size": len(payloads)}
+            for payload in payloads
+        ]
+
+
+@pytest.mark.asyncio
+async def test_gloo_concurrent_invocations_are_batched():
+    """Test that rank 0 batches invocations that arrive together."""
+    pytest.importorskip("torch")
+
+    runner = DistributedRunner(
+        CPUBatchingWorker,
+        world_size=2,
+        master_port=_free_port(),
+        worker_port=_free_port(),
+        backend="gloo",
+        max_concurrent_requests=4,
+    )
+    await runner.start(timeout=60)
+    try:
+        results = await asyncio.gather(*(runner.invoke({"value": i}) for i in range(4)))
+    finally:
+        await runner.stop()
+
+    assert [result["value"] for result in results] == [0, 1, 2, 3]
+    assert max(result["batch_size"] for result in results) > 1
+
+
+def _acknowledge_commands(fanout_address: str, ack_address: str, rank: int) -> None:
+    """Receive commands like the ranks other than rank 0 do, acknowledging
+    each of them."""
+    import zmq
+
+    context = zmq.Context()
+    subscriber = _CommandSubscriber(context, fanout_address)
+    ack = context.socket(zmq.PUSH)
+    ack.connect(ack_address)
+    while True:
+        parts = subscriber.recv()
+        if parts[0] == b"EXIT":
+            break
+        ack.send_multipart([str(rank).encode(), parts[1]])
+    subscriber.close()
+    ack.close()
+    context.term()
+
+
+def test_command_fanout_delivers_every_command_in_order(tmp_path):
+    """Test that each of the other ranks receives every command, in the order
+    rank 0 sent them."""
+    import zmq
+
+    ranks = 4
+    fanout_address = f"ipc://{tmp_path}/fanout"
+    context = zmq.Context()
+    acks = context.socket(zmq.PULL)
+    ack_port = acks.bind_to_random_port("tcp://127.0.0.1")
+    fanout = _CommandFanout(context, fanout_address, subscribers=ranks - 1)
+    threads = [
+        threading.Thread(
+            target=_acknowledge_commands,
+            args=(fanout_address, f"tcp://127.0.0.1:{ack_port}", rank),
+        )
+        for rank in range(1, ranks)
+    ]
+    for thread in threads:
+        thread.start()
+
+    received: dict = {rank: [] for rank in range(1, ranks)}
+    try:
+        fanout.wait_for_subscribers(timeout=30)
+        request_ids = [str(i).encode() for i in range(100)]
+        for request_id in request_ids:
+            fanout.send([b"invoke", request_id, distributed_serialize({})])
+        for _ in range(len(request_ids) * (ranks - 1)):
+            rank, request_id = acks.recv_multipart()
+            received[int(rank)].append(request_id)
+        fanout.send([b"EXIT"])
+    finally:
+        for thread in threads:
+            thread.join(timeout=10)
+        fanout.close()
+        acks.close(linger=0)
+        context.term()
+
+    assert received == {rank: request_ids for rank in range(1, ranks)}
+
+
+@pytest.mark.benchmark
+def test_command_fanout_dispatch_benchmark(tmp_path):
+    """Benchmark the time for a request to reach all the other ranks, each in
+    its own process."""
+    import zmq
+
+    ranks = 3
+    payload = distributed_serialize({"prompt": "x" * 64 * 1024})
+    fanout_address = f"ipc://{tmp_path}/fanout"
+    context = zmq.Context()
+    acks = context.socket(zmq.PULL)
+    ack_port = acks.bind_to_random_port("tcp://127.0.0.1")
+    fanout = _CommandFanout(context, fanout_address, subscribers=ranks - 1)
+
+    spawn = multiprocessing.get_context("spawn")
+    processes = [
+        spawn.Process(
+            target=_acknowledge_commands,
+            args=(fanout_address, f"tcp://127.0.0.1:{ack_port}", rank),
+        )
+        for rank in range(1, ranks)
+    ]
+    for process in processes:
+        process.start()
+
+    overheads = []
+    try:
+        fanout.wait_for_subscribers(timeout=30)
+        for i in range(200):
+            request_id = str(i).encode()
+            start = time.perf_counter()
+            fanout.send([b"invoke", request_id, payload])
+            received = {tuple(acks.recv_multipart()) for _ in range(ranks - 1)}
+            overheads.append(time.perf_counter() - start)
+            assert received == {
+                (str(rank).encode(), request_id) for rank in range(1, ranks)
+            }
+        fanout.send([b"EXIT"])
+        for process in processes:
+            process.join(timeout=10)
+            assert process.exitcode == 0
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        fanout.close()
+        acks.close(linger=0)
+        context.term()
+
+    p50, p99 = _overheads(overheads)
+    print(
+        f"Dispatch to {ranks - 1} ranks: p50={p50 * 1000:.2f}ms p99={p99 * 1000:.2f}ms"
+    )
+    assert p50 < 0.01
+
+
+class CPUPayloadWorker(CPUWorker):
+    broadcast_payload = False
+
+    def __call__(self, streaming: bool = False, **kwargs):
+        import torch
+        import torch.distributed as dist
+
+        # Rank 0 shares the payload with the other ranks itself
+        value = torch.tensor([kwargs.get("value", 0)])
+        dist.broadcast(value, src=0)
+        return {"value": int(value), "keys": sorted(kwargs)}
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_gloo_request_dispatch_benchmark():
+    """Benchmark the round trip of requests to CPU workers, with payloads read
+    only by rank 0."""
+    pytest.importorskip("torch")
+
+    runner = DistributedRunner(
+        CPUPayloadWorker,
+        world_size=3,
+        master_port=_free_port(),
+        worker_port=_free_port(),
+        backend="gloo",
+    )
+    await runner.start(timeout=60)
+    try:
+        round_trips = []
+        for i in range(100):
+            start = time.perf_counter()
+            result = await runner.invoke({"value": i})
+            round_trips.append(time.perf_counter() - start)
+            assert result == {"value": i, "keys": ["value"]}
+    finally:
+        await runner.stop()
+
+    p50, p99 = _overheads(round_trips)
+    print(f"Request round trip (gloo): p50={p50 * 1000:.2f}ms p99={p99 * 1000:.2f}ms")
@@ -10,6 +10,14 @@ import fal.file_sync as file_sync_mod
 from fal.file_sync import FileSync
 
 
+@pytest.fixture(autouse=True)
+def fal_home_dir(tmp_path, monkeypatch):
+    """Keep the file hash cache out of the real home directory"""
+    home = tmp_path / "fal_home"
+    monkeypatch.setattr("fal.auth.local._FAL_HOME_DIR", str(home))
+    return home
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for tests"""
@@ -220,6 +228,64 @@ def test_collect_files_directory(temp_dir):
     assert "config/settings.yml" in relative_paths
 
 
+def _write_old_file(path: Path, content: str) -> None:
+    path.write_text(content)
+    # Files modified in the last couple of seconds are never cached.
+    os.utime(path, (1_600_000_000, 1_600_000_000))
+
+
+def test_collect_files_reuses_cached_hashes(temp_dir, fal_home_dir):
+    """Test unchanged files are not hashed again on the next collection"""
+    app_file = Path(temp_dir) / "app.py"
+    app_file.write_text("# app file")
+    data_dir = Path(temp_dir) / "data"
+    data_dir.mkdir()
+    for i in range(5):
+        _write_old_file(data_dir / f"{i}.bin", f"content {i}")
+    (data_dir / "fresh.bin").write_text("just written")
+
+    fs = FileSync(str(app_file))
+    first = fs.collect_files(["data/"])
+    assert (fal_home_dir / "cache" / "file_hashes.json").exists()
+
+    _write_old_file(data_dir / "0.bin", "changed content")
+    with patch.object(
+        file_sync_mod, "compute_hash", wraps=file_sync_mod.compute_hash
+    ) as compute_hash:
+        second = fs.collect_files(["data/"])
+
+    # Only the changed and the recently written files are read again.
+    hashed = sorted(call.args[0].name for call in compute_hash.call_args_list)
+    assert hashed == ["0.bin", "fresh.bin"]
+
+    first_hashes = {f.relative_path: f.hash for f in first}
+    second_hashes = {f.relative_path: f.hash for f in second}
+    assert second_hashes["data/0.bin"] != first_hashes["data/0.bin"]
+    assert second_hashes["data/0.bin"] == file_sync_mod.compute_hash(
+        data_dir / "0.bin", (data_dir / "0.bin").stat().st_mode
+    )
+    del first_hashes["data/0.bin"], second_hashes["data/0.bin"]
+    assert first_hashes == second_hashes
+
+
+def test_collect_files_without_hash_cache(temp_dir, fal_home_dir, monkeypatch):
+    """Test the hash cache can be disabled"""
+    monkeypatch.setenv("FAL_FILE_HASH_CACHE", "0")
+    app_file = Path(temp_dir) / "app.py"
+    app_file.write_text("# app file")
+    _write_old_file(Path(temp_dir) / "data.bin", "content")
+
+    fs = FileSync(str(app_file))
+    fs.collect_files(["data.bin"])
+    with patch.object(
+        file_sync_mod, "compute_hash", wraps=file_sync_mod.compute_hash
+    ) as compute_hash:
+        fs.collect_files(["data.bin"])
+
+    assert compute_hash.call_count == 1
+    assert not (fal_home_dir / "cache").exists()
+
+
 def test_collect_files_handles_nonexistent_gracefully(temp_dir):
     """Test that nonexistent files/directories are skipped without error"""
     app_file = Path(temp_dir) / "app.py"
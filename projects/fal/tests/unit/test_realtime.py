@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from fal.api import RouteSignature
+from fal.realtime import _mirror_output, _OutputQueue, _run_streaming_session
+
+
+class SlowWebSocket:
+    """A client that takes `delay` seconds to receive each message."""
+
+    def __init__(self, delay: float = 0.01, disconnect_after: int | None = None):
+        self.delay = delay
+        self.disconnect_after = disconnect_after
+        self.received: list[bytes | str] = []
+
+    async def _receive(self, message: bytes | str) -> None:
+        if self.disconnect_after is not None and (
+            len(self.received) >= self.disconnect_after
+        ):
+            raise WebSocketDisconnect()
+        await asyncio.sleep(self.delay)
+        self.received.append(message)
+
+    async def send_bytes(self, message: bytes) -> None:
+        await self._receive(message)
+
+    async def send_text(self, message: str) -> None:
+        await self._receive(message)
+
+
+def _messages(count: int) -> list[bytes]:
+    return [str(i).encode() for i in range(count)]
+
+
+async def _produce(queue: _OutputQueue, count: int, interval: float = 0.01) -> None:
+    # An endpoint producing outputs faster than the client receives them
+    for message in _messages(count):
+        await queue.put(message)
+        await asyncio.sleep(interval)
+
+
+def _is_ordered(received: list) -> bool:
+    indices = [int(message) for message in received]
+    return indices == sorted(set(indices))
+
+
+async def test_block_sends_every_output_in_order():
+    websocket = SlowWebSocket()
+    queue = _OutputQueue(websocket, maxsize=2, backpressure="block")
+    for message in _messages(10):
+        await queue.put(message)
+        assert queue.depth <= 2
+    await queue.close()
+
+    assert websocket.received == _messages(10)
+    assert queue.stats.sent == 10
+    assert queue.stats.dropped == 0
+    assert queue.stats.blocked > 0
+    assert queue.stats.max_depth == 2
+    assert queue.stats.max_latency >= websocket.delay
+
+
+async def test_drop_oldest_keeps_the_newest_outputs_in_order():
+    websocket = SlowWebSocket(delay=0.05)
+    queue = _OutputQueue(websocket, maxsize=3, backpressure="drop_oldest")
+    await _produce(queue, 20)
+    await queue.close()
+
+    assert _is_ordered(websocket.received)
+    assert websocket.received[0] == b"0"
+    # The last outputs were waiting and are sent when the session ends.
+    assert websocket.received[-3:] == [b"17", b"18", b"19"]
+    assert queue.stats.dropped > 0
+    assert queue.stats.sent == len(websocket.received)
+    assert queue.stats.dropped + queue.stats.sent == 20
+    assert queue.stats.max_depth == 3
+
+
+async def test_coalesce_latest_sends_the_latest_output_next():
+    websocket = SlowWebSocket(delay=0.05)
+    queue = _OutputQueue(websocket, maxsize=2, backpressure="coalesce_latest")
+    await _produce(queue, 20)
+    await queue.close()
+
+    assert _is_ordered(websocket.received)
+    assert websocket.received[0] == b"0"
+    assert websocket.received[-1] == b"19"
+    assert queue.stats.dropped > 0
+    assert queue.stats.dropped + queue.stats.sent == 20
+
+
+async def test_outputs_are_dropped_together_with_their_timings():
+    websocket = SlowWebSocket(delay=0.05)
+    queue = _OutputQueue(websocket, maxsize=1, backpressure="drop_oldest")
+    for message in _messages(4):
+        await queue.put(message, f"timings {message.decode()}")
+        await asyncio.sleep(0.01)
+    await queue.close()
+
+    # 1 and 2 were replaced while 0 was being sent
+    assert websocket.received == [b"0", "timings 0", b"3", "timings 3"]
+
+
+async def test_blocked_producer_is_released_when_the_client_goes_away():
+    websocket = SlowWebSocket(disconnect_after=2)
+    queue = _OutputQueue(websocket, maxsize=1, backpressure="block")
+
+    with pytest.raises(WebSocketDisconnect):
+        for message in _messages(10):
+            await asyncio.wait_for(queue.put(message), timeout=5)
+
+    assert queue.failed
+    assert websocket.received == _messages(2)
+
+
+async def test_unary_outputs_are_not_reordered_by_a_slow_client():
+    websocket = SlowWebSocket()
+    inputs = [{"index": i} for i in range(10)] + [None]
+    queue = deque(inputs)
+    route_signature = RouteSignature("/realtime", buffering=1, emit_timings=True)
+
+    await _mirror_output(
+        None,
+        queue,
+        websocket,
+        func=lambda self, input: input,  # type: ignore[arg-type]
+        route_signature=route_signature,
+        encode_message=lambda output: json.dumps(output).encode(),
+        input_ready=asyncio.Event(),
+    )
+
+    outputs = [json.loads(message) for message in websocket.received[::2]]
+    timings = [json.loads(message) for message in websocket.received[1::2]]
+    assert outputs == inputs[:-1]
+    assert all(timing["action"] == "timings" for timing in timings)
+
+
+async def test_server_streaming_outputs_are_not_reordered_by_a_slow_client():
+    websocket = SlowWebSocket(delay=0.005)
+
+    async def receive_bytes():
+        return json.dumps({"count": 50}).encode()
+
+    websocket.receive_bytes = receive_bytes  # type: ignore[attr-defined]
+
+    async def generate(self, input):
+        for i in range(input["count"]):
+            yield {"index": i}
+
+    await _run_streaming_session(
+        None,
+        websocket,
+        func=generate,  # type: ignore[arg-type]
+        route_signature=RouteSignature("/realtime", buffering=1),
+        decode_message=json.loads,
+        encode_message=lambda output: json.dumps(output).encode(),
+        realtime_mode="server_streaming",
+    )
+
+    assert [json.loads(message) for message in websocket.received] == [
+        {"index": i} for i in range(50)
+    ]
@@ -0,0 +1,281 @@
+import hashlib
+import io
+import json
+import os
+import posixpath
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+import fal.sync as sync_mod
+from fal.exceptions import FalServerlessException
+from fal.files import FalFileSystem
+
+REMOTE_ROOT = "/data/synced"
+
+
+class FakeFileSystem(FalFileSystem):
+    """FalFileSystem backed by an in-memory stand-in for the /data files API"""
+
+    def __init__(self):
+        super().__init__(skip_instance_cache=True)
+        self.files = {}
+        self.dirs = set()
+        self.requests = []
+
+    def _request(self, method, path, **kwargs):
+        self.requests.append((method, path))
+        if method == "POST" and path.startswith("/files/file/local/"):
+            _, content = kwargs["files"]["file_upload"]
+            if hasattr(content, "read"):
+                content = content.read()
+            remote_path = path.replace("/files/file/local/", "", 1)
+            self.files[remote_path] = content
+            parent = posixpath.dirname(remote_path)
+            while parent != "/":
+                self.dirs.add(parent)
+                parent = posixpath.dirname(parent)
+            return SimpleNamespace(content=b"")
+
+        remote_path = path.replace("/files/file/", "", 1)
+        if method == "DELETE" and remote_path in self.dirs:
+            self.dirs.remove(remote_path)
+            return SimpleNamespace(content=b"")
+        if remote_path not in self.files:
+            raise FileNotFoundError("Not Found")
+        if method == "DELETE":
+            del self.files[remote_path]
+            return SimpleNamespace(content=b"")
+        return SimpleNamespace(content=self.files[remote_path])
+
+    def _ls(self, path):
+        if path not in self.dirs:
+            raise FileNotFoundError("Not Found")
+        return [
+            {"name": name, "size": 0, "type": "file", "mtime": 0}
+            for name in [*self.files, *self.dirs]
+            if posixpath.dirname(name) == path
+        ]
+
+    def uploads(self):
+        return sorted(
+            path.replace(f"/files/file/local/{REMOTE_ROOT}/", "", 1)
+            for method, path in self.requests
+            if method == "POST"
+        )
+
+    def deletes(self):
+        return sorted(
+            path.replace(f"/files/file/{REMOTE_ROOT}/", "", 1)
+            for method, path in self.requests
+            if method == "DELETE"
+        )
+
+
+@pytest.fixture(autouse=True)
+def fal_home_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("fal.auth.local._FAL_HOME_DIR", str(tmp_path / "fal_home"))
+
+
+@pytest.fixture
+def local_dir(tmp_path):
+    local_dir = tmp_path / "local"
+    (local_dir / "models").mkdir(parents=True)
+    (local_dir / "models" / "weights.bin").write_bytes(b"w" * 1000)
+    (local_dir / "config.json").write_text('{"steps": 10}')
+    (local_dir / "notes.txt").write_text("notes")
+    (local_dir / "debug.log").write_text("ignored")
+    (local_dir / ".gitignore").write_text("*.log\n")
+    return local_dir
+
+
+def test_incremental_sync_uploads_only_changes(local_dir):
+    fs = FakeFileSystem()
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+
+    assert fs.uploads() == [
+        ".fal_manifest.json",
+        ".fal_manifest.json",
+        ".gitignore",
+        "config.json",
+        "models/weights.bin",
+        "notes.txt",
+    ]
+    manifest = json.loads(fs.files[f"{REMOTE_ROOT}/.fal_manifest.json"])
+    assert sorted(manifest) == [
+        ".gitignore",
+        "config.json",
+        "models/weights.bin",
+        "notes.txt",
+    ]
+    assert manifest["notes.txt"]["size"] == 5
+
+    (local_dir / "config.json").write_text('{"steps": 20}')
+    (local_dir / "notes.txt").unlink()
+    (local_dir / "extra.txt").write_text("extra")
+    fs.requests.clear()
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+
+    assert fs.uploads() == [
+        ".fal_manifest.json",
+        ".fal_manifest.json",
+        "config.json",
+        "extra.txt",
+    ]
+    assert "notes.txt" in fs.deletes()
+    assert f"{REMOTE_ROOT}/notes.txt" not in fs.files
+    assert fs.files[f"{REMOTE_ROOT}/config.json"] == b'{"steps": 20}'
+
+    fs.requests.clear()
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+    assert fs.uploads() == []
+
+
+def test_incremental_sync_removes_emptied_directories(local_dir):
+    fs = FakeFileSystem()
+    (local_dir / "models" / "lora").mkdir()
+    (local_dir / "models" / "lora" / "style.bin").write_bytes(b"s" * 10)
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+
+    (local_dir / "models" / "lora" / "style.bin").unlink()
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+    assert f"{REMOTE_ROOT}/models/lora" not in fs.dirs
+    assert f"{REMOTE_ROOT}/models" in fs.dirs
+
+    (local_dir / "models" / "weights.bin").unlink()
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+    assert f"{REMOTE_ROOT}/models" not in fs.dirs
+    assert REMOTE_ROOT in fs.dirs
+
+
+def test_failed_deletes_are_retried_by_the_next_sync(local_dir, monkeypatch):
+    fs = FakeFileSystem()
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+    (local_dir / "notes.txt").unlink()
+
+    remove_remote_file = sync_mod._remove_remote_file
+
+    def forbidden(fs, remote_path):
+        if remote_path.endswith("notes.txt"):
+            raise FalServerlessException("Forbidden")
+        remove_remote_file(fs, remote_path)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(sync_mod, "_remove_remote_file", forbidden)
+        with pytest.raises(FalServerlessException, match="Forbidden"):
+            sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+
+    manifest = json.loads(fs.files[f"{REMOTE_ROOT}/.fal_manifest.json"])
+    assert "notes.txt" in manifest
+
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+    assert f"{REMOTE_ROOT}/notes.txt" not in fs.files
+    manifest = json.loads(fs.files[f"{REMOTE_ROOT}/.fal_manifest.json"])
+    assert "notes.txt" not in manifest
+
+
+def test_interrupted_incremental_sync_is_resumed(local_dir, monkeypatch):
+    fs = FakeFileSystem()
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+    (local_dir / "config.json").write_text('{"steps": 20}')
+
+    def fail(fs, local_path, remote_path):
+        raise RuntimeError("connection lost")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(sync_mod, "_upload_remote_file", fail)
+        with pytest.raises(RuntimeError):
+            sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+
+    manifest = json.loads(fs.files[f"{REMOTE_ROOT}/.fal_manifest.json"])
+    assert "config.json" not in manifest
+
+    fs.requests.clear()
+    sync_mod._sync_dir_incremental(fs, str(local_dir), REMOTE_ROOT)
+    assert "config.json" in fs.uploads()
+
+
+def test_directory_hash_is_streamed(local_dir):
+    expected = hashlib.sha256()
+    for root, _, files in os.walk(local_dir):
+        for file in files:
+            with open(os.path.join(root, file), "rb") as f:
+                expected.update(f.read())
+
+    assert sync_mod._compute_directory_hash(str(local_dir)) == expected.hexdigest()
+
+
+def test_nested_gitignore_files_are_honored(local_dir, monkeypatch):
+    (local_dir / "models" / ".gitignore").write_text("*.bin\n!keep.bin\n/cache/\n")
+    (local_dir / "models" / "keep.bin").write_bytes(b"k")
+    (local_dir / "models" / "cache").mkdir()
+    (local_dir / "models" / "cache" / "entry").write_bytes(b"c")
+    (local_dir / "models" / "sub" / "cache").mkdir(parents=True)
+    (local_dir / "models" / "sub" / "cache" / "entry").write_bytes(b"c")
+    (local_dir / "models" / "sub" / "other.bin").write_bytes(b"o")
+    (local_dir / "build").mkdir()
+    (local_dir / "build" / "out.txt").write_text("out")
+    (local_dir / ".gitignore").write_text("*.log\nbuild/\n")
+
+    walked = []
+    original_walk = os.walk
+
+    def walk(top, *args, **kwargs):
+        for root, dirnames, files in original_walk(top, *args, **kwargs):
+            walked.append(os.path.relpath(root, local_dir))
+            yield root, dirnames, files
+
+    monkeypatch.setattr(sync_mod.os, "walk", walk)
+    files = [relative for _, relative in sync_mod._walk_files(str(local_dir))]
+
+    assert files == [
+        ".gitignore",
+        "config.json",
+        "notes.txt",
+        "models/.gitignore",
+        "models/keep.bin",
+        "models/sub/cache/entry",
+    ]
+    # Ignored directories aren't visited.
+    assert "build" not in walked
+    assert os.path.join("models", "cache") not in walked
+
+
+def test_zip_stream_is_a_valid_archive(local_dir):
+    with sync_mod._ZipStream(str(local_dir)) as stream:
+        data = stream.read()
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert sorted(archive.namelist()) == [
+            ".gitignore",
+            "config.json",
+            "models/weights.bin",
+            "notes.txt",
+        ]
+        assert archive.read("models/weights.bin") == b"w" * 1000
+
+
+def test_zip_stream_buffers_a_bounded_amount(local_dir):
+    for i in range(20):
+        (local_dir / f"random{i}.bin").write_bytes(os.urandom(64 * 1024))
+
+    with sync_mod._ZipStream(
+        str(local_dir), chunk_size=1024, max_buffered_chunks=2
+    ) as stream:
+        first = stream.read(1024)
+        # The archive is written only as far as the reader has consumed it.
+        stream._thread.join(timeout=0.5)
+        assert stream._thread.is_alive()
+        assert stream._chunks.qsize() <= 2
+        data = first + stream.read()
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert len(archive.namelist()) == 24
+
+
+def test_closing_a_zip_stream_stops_the_writer(local_dir):
+    stream = sync_mod._ZipStream(str(local_dir), max_buffered_chunks=1)
+    stream.read(10)
+    stream.close()
+    assert not stream._thread.is_alive()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest import mock
+
+import httpx
+import pytest
+
+from fal.auth import AuthCredentials
+from fal.toolkit.exceptions import FileUploadException
+from fal.toolkit.file import File
+from fal.toolkit.file.providers import fal as providers
+from fal.toolkit.file.types import FileData
+
+MIB = 1024 * 1024
+
+
+class _FakeCDN:
+    """Serves the v3 upload API and records the requests it receives."""
+
+    def __init__(self, fail_puts: int = 0, put_status: int = 503) -> None:
+        self.requests: list[httpx.Request] = []
+        self.parts: dict[int, int] = {}
+        self.completed: list[dict] = []
+        self.fail_puts = fail_puts
+        self.put_status = put_status
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == "/storage/upload/initiate":
+            return httpx.Response(
+                200,
+                json={
+                    "file_url": "https://v3.fal.media/files/x",
+                    "upload_url": "https://upload.test/x",
+                },
+            )
+        if path == "/storage/upload/initiate-multipart":
+            return httpx.Response(
+                200,
+                json={
+                    "file_url": "https://v3.fal.media/files/big",
+                    "upload_url": "https://upload.test/big",
+                },
+            )
+        if request.method == "PUT":
+            if self.fail_puts:
+                self.fail_puts -= 1
+                return httpx.Response(self.put_status)
+            if path.startswith("/big/"):
+                part_number = int(path.rsplit("/", 1)[1])
+                self.parts[part_number] = len(request.content)
+                return httpx.Response(200, headers={"ETag": f"etag-{part_number}"})
+            return httpx.Response(200)
+        if path == "/big/complete":
+            self.completed.append(json.loads(request.content))
+            return httpx.Response(200, json={})
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def cdn():
+    cdn = _FakeCDN()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(cdn))
+    with mock.patch.object(
+        providers, "_async_http_client", return_value=client
+    ), mock.patch.object(
+        providers,
+        "_require_auth_credentials",
+        return_value=AuthCredentials("Key", "key_id:key_secret"),
+    ), mock.patch("fal.toolkit.utils.retry.asyncio.sleep"):
+        yield cdn
+
+
+async def test_concurrent_uploads_do_not_use_threads(cdn):
+    repository = providers.FalFileRepositoryV3()
+    preference = {"expiration_duration_seconds": "60"}
+
+    with mock.patch.object(providers, "run_in_thread") as run_in_thread:
+        urls = await asyncio.gather(
+            *(
+                repository.save_async(
+                    FileData(b"x" * 1024, "image/png"),
+                    object_lifecycle_preference=preference,
+                )
+                for _ in range(20)
+            )
+        )
+
+    run_in_thread.assert_not_called()
+    assert urls == ["https://v3.fal.media/files/x"] * 20
+    initiates = [r for r in cdn.requests if r.method == "POST"]
+    puts = [r for r in cdn.requests if r.method == "PUT"]
+    assert len(initiates) == len(puts) == 20
+    assert initiates[0].headers["Authorization"] == "Key key_id:key_secret"
+    assert initiates[0].headers["X-Fal-Object-Lifecycle"] == json.dumps(preference)
+    assert puts[0].headers["Content-Type"] == "image/png"
+
+
+async def test_multipart_upload_sends_parts_in_parallel(cdn, tmp_path):
+    repository = providers.FalFileRepositoryV3()
+    file_path = tmp_path / "big.bin"
+    file_path.write_bytes(b"x" * (25 * MIB))
+
+    url, data = await repository.save_file_async(
+        file_path, "application/octet-stream", multipart=True
+    )
+
+    assert url == "https://v3.fal.media/files/big"
+    assert data is None
+    assert cdn.parts == {1: 10 * MIB, 2: 10 * MIB, 3: 5 * MIB}
+    (completed,) = cdn.completed
+    assert sorted(part["partNumber"] for part in completed["parts"]) == [1, 2, 3]
+
+
+async def test_transient_errors_are_retried(cdn):
+    cdn.fail_puts = 2
+    url = await providers.FalFileRepositoryV3().save_async(FileData(b"data"))
+
+    assert url == "https://v3.fal.media/files/x"
+    assert len([r for r in cdn.requests if r.method == "PUT"]) == 3
+
+
+async def test_upload_errors_are_wrapped(cdn):
+    cdn.fail_puts = 1
+    cdn.put_status = 403
+
+    with pytest.raises(FileUploadException, match="Status 403"):
+        await providers.FalFileRepositoryV3().save_async(FileData(b"data"))
+
+
+async def test_file_from_bytes_async_uploads_natively(cdn):
+    with mock.patch("fal.toolkit.file.types.run_in_thread") as run_in_thread:
+        file = await File.from_bytes_async(b"data", "text/plain", repository="fal_v3")
+
+    run_in_thread.assert_not_called()
+    assert file.url == "https://v3.fal.media/files/x"
+    assert file.file_size == 4
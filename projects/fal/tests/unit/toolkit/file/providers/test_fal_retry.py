@@ -24,7 +24,7 @@ class MockResponse:
         pass
 
 
-URLOPEN = "fal.toolkit.file.providers.fal.urlopen"
+URLOPEN = "fal.toolkit.utils.http_session.HTTPSession.urlopen"
 SLEEP = "fal.toolkit.utils.retry.time.sleep"
 
 
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+from unittest import mock
+
+import pytest
+
+from fal.toolkit.file.providers import fal as providers
+from fal.toolkit.file.types import FileData
+
+MIB = 1024 * 1024
+
+
+def test_chunk_size_grows_with_upload_size():
+    default = providers.MultipartUploadV3.MULTIPART_CHUNK_SIZE
+
+    assert providers._multipart_chunk_size(100 * MIB, default) == default
+    assert providers._multipart_chunk_size(5 * 1024 * MIB, default) == 20 * MIB
+    assert providers._multipart_chunk_size(100 * 1024 * MIB, default) == 64 * MIB
+
+    size = 1024 * 1024 * MIB
+    chunk_size = providers._multipart_chunk_size(size, default)
+    assert chunk_size % MIB == 0
+    assert -(-size // chunk_size) <= providers.MULTIPART_MAX_PARTS
+
+
+@pytest.mark.parametrize(
+    "multipart_cls",
+    [
+        providers.MultipartUploadGCS,
+        providers.MultipartUploadV3,
+        providers.InternalMultipartUploadV3,
+    ],
+)
+def test_save_tunes_parts_and_reports_stats(multipart_cls, tmp_path):
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    parts: dict[int, int] = {}
+
+    def upload_part(self, part_number: int, data: bytes) -> None:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        parts[part_number] = len(data)
+        with lock:
+            in_flight -= 1
+
+    file_path = tmp_path / "upload.bin"
+    file_path.write_bytes(b"abcdefg" * 1000)
+    saved: list = []
+    original_init = multipart_cls.__init__
+
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        saved.append(self)
+
+    with mock.patch.object(multipart_cls, "__init__", init), mock.patch.object(
+        multipart_cls, "create"
+    ), mock.patch.object(multipart_cls, "upload_part", upload_part), mock.patch.object(
+        multipart_cls, "complete", return_value="https://file"
+    ):
+        assert multipart_cls.save_file(file_path, chunk_size=1000) == "https://file"
+        assert parts == {n: 1000 for n in range(1, 8)}
+        parts.clear()
+        assert (
+            multipart_cls.save(
+                FileData(b"x" * (25 * MIB), content_type="application/octet-stream")
+            )
+            == "https://file"
+        )
+
+    file_upload, data_upload = saved
+    assert file_upload.stats.chunk_size == 1000
+    assert file_upload.stats.parts == 7
+    assert file_upload.stats.bytes == 7000
+    # The concurrency is tuned, never beyond the configured maximum.
+    assert max_in_flight <= file_upload.max_concurrency
+    assert data_upload.stats.chunk_size == multipart_cls.MULTIPART_CHUNK_SIZE
+    assert data_upload.stats.parts == 3
+    assert data_upload.stats.throughput > 0
+    assert parts == {1: 10 * MIB, 2: 10 * MIB, 3: 5 * MIB}
+
+
+def test_explicit_max_concurrency_is_fixed():
+    throttle = providers._PartThrottle(initial=2, maximum=3, fixed=True)
+    assert throttle.limit == 3
+    for _ in range(10):
+        throttle._record(1)
+    assert throttle.limit == throttle.peak == 3
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import threading
 from base64 import b64encode
 from pathlib import Path
 from typing import Any, Optional
@@ -15,6 +16,8 @@ from fal.toolkit.file.file import (
     GoogleStorageRepository,
     _get_object_lifecycle_preference_from_context,
     _try_with_fallback,
+    disable_upload_cache,
+    enable_upload_cache,
     get_builtin_repository,
 )
 from fal.toolkit.file.types import FileData, FileRepository
@@ -525,3 +528,91 @@ class TestContextBasedLifecyclePreference:
             )
             # Should use request preference, not context preference
             assert save_kwargs.get("object_lifecycle_preference") == request_preference
+
+
+class TestUploadCache:
+    @pytest.fixture(autouse=True)
+    def cache(self):
+        cache = enable_upload_cache()
+        yield cache
+        disable_upload_cache()
+
+    def test_from_bytes_reuses_earlier_upload(self, cache):
+        repo = MockRepository("primary")
+
+        first = File.from_bytes(b"same", content_type="image/png", repository=repo)
+        second = File.from_bytes(b"same", content_type="image/png", repository=repo)
+        File.from_bytes(b"other", content_type="image/png", repository=repo)
+        File.from_bytes(b"same", content_type="image/jpeg", repository=repo)
+
+        assert first.url == second.url == "success_url_from_primary"
+        assert second.as_bytes() == b"same"
+        assert len(repo.calls) == 3
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    def test_from_path_shares_entries_with_from_bytes(self, cache, tmp_path):
+        repo = MockRepository("primary")
+        file_path = tmp_path / "image.png"
+        file_path.write_bytes(b"same")
+
+        File.from_bytes(
+            b"same", content_type="image/png", file_name="image.png", repository=repo
+        )
+        file = File.from_path(file_path, content_type="image/png", repository=repo)
+
+        assert file.url == "success_url_from_primary"
+        assert file.file_name == "image.png"
+        assert file.file_size == 4
+        assert len(repo.calls) == 1
+
+    def test_file_name_is_part_of_the_key(self, cache):
+        repo = MockRepository("primary")
+
+        File.from_bytes(b"same", file_name="a.png", repository=repo)
+        File.from_bytes(b"same", file_name="b.png", repository=repo)
+        File.from_bytes(b"same", file_name="a.png", repository=repo)
+
+        assert len(repo.calls) == 2
+
+    def test_lifecycle_is_part_of_the_key(self, cache):
+        repo = MockRepository("primary")
+        preference = {"expiration_duration_seconds": "3600"}
+
+        File.from_bytes(b"same", repository=repo)
+        File.from_bytes(
+            b"same",
+            repository=repo,
+            save_kwargs={"object_lifecycle_preference": preference},
+        )
+        File.from_bytes(
+            b"same",
+            repository=repo,
+            save_kwargs={"object_lifecycle_preference": preference},
+        )
+
+        assert len(repo.calls) == 2
+
+    async def test_from_bytes_async_hashes_off_the_event_loop(self, cache):
+        repo = MockRepository("primary")
+        threads = []
+
+        def content_digest(data):
+            threads.append(threading.current_thread())
+            return "digest"
+
+        with patch("fal.toolkit.file.file.content_digest", content_digest):
+            first = await File.from_bytes_async(b"same", repository=repo)
+            second = await File.from_bytes_async(b"same", repository=repo)
+
+        assert first.url == second.url == "success_url_from_primary"
+        assert len(repo.calls) == 1
+        assert threading.main_thread() not in threads
+
+    def test_disabled_cache_always_uploads(self):
+        disable_upload_cache()
+        repo = MockRepository("primary")
+
+        File.from_bytes(b"same", repository=repo)
+        File.from_bytes(b"same", repository=repo)
+
+        assert len(repo.calls) == 2
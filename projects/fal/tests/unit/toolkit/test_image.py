@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import pytest
+from PIL import Image as PILImage
+
+from fal.toolkit import Image
+from fal.toolkit.file.types import FileData, FileRepository
+from fal.toolkit.image.image import ImageSize
+
+
+class SlowRepository(FileRepository):
+    """Records the uploads it receives and how many of them overlapped."""
+
+    def __init__(self, fail_on: set[int] | None = None, delay: float = 0.05):
+        self.fail_on = fail_on or set()
+        self.delay = delay
+        self.saved: list[FileData] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def save(self, data: FileData, **kwargs: Any) -> str:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            with self._lock:
+                self.saved.append(data)
+            index = int(data.file_name.split(".")[0])
+            if index in self.fail_on:
+                raise RuntimeError(f"Failed to save {data.file_name}")
+            return f"https://primary/{data.file_name}"
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class FallbackRepository(FileRepository):
+    def save(self, data: FileData, **kwargs: Any) -> str:
+        return f"https://fallback/{data.file_name}"
+
+
+def _images(count: int) -> list[PILImage.Image]:
+    return [PILImage.new("RGB", (8 + i, 8), color=(i, 0, 0)) for i in range(count)]
+
+
+def test_from_pil_batch_uploads_concurrently_in_order():
+    repository = SlowRepository(fail_on={2})
+    images = _images(6)
+
+    results = Image.from_pil_batch(
+        images,
+        format="png",
+        file_names=[f"{i}.png" for i in range(6)],
+        repository=repository,
+        fallback_repository=FallbackRepository(),
+        max_concurrency=3,
+    )
+
+    assert [image.url for image in results] == [
+        "https://primary/0.png",
+        "https://primary/1.png",
+        # Only the failed upload falls back.
+        "https://fallback/2.png",
+        "https://primary/3.png",
+        "https://primary/4.png",
+        "https://primary/5.png",
+    ]
+    assert [image.width for image in results] == [8, 9, 10, 11, 12, 13]
+    assert all(image.content_type == "image/png" for image in results)
+    assert 1 < repository.max_in_flight <= 3
+
+
+def test_from_pil_batch_checks_file_names():
+    with pytest.raises(ValueError, match="2 file names for 3 images"):
+        Image.from_pil_batch(_images(3), file_names=["a.png", "b.png"])
+
+
+@pytest.mark.parametrize("max_concurrency", [0, -1])
+def test_from_pil_batch_checks_max_concurrency(max_concurrency):
+    with pytest.raises(ValueError, match="max_concurrency"):
+        Image.from_pil_batch(_images(1), max_concurrency=max_concurrency)
+
+
+async def test_from_pil_batch_async_checks_max_concurrency():
+    with pytest.raises(ValueError, match="max_concurrency"):
+        await Image.from_pil_batch_async(_images(1), max_concurrency=0)
+
+
+async def test_from_pil_batch_async_uploads_concurrently_in_order():
+    repository = SlowRepository()
+
+    results = await Image.from_pil_batch_async(
+        _images(4),
+        format="jpeg",
+        file_names=[f"{i}.jpeg" for i in range(4)],
+        repository=repository,
+        fallback_repository=None,
+        max_concurrency=2,
+    )
+
+    assert [image.url for image in results] == [
+        f"https://primary/{i}.jpeg" for i in range(4)
+    ]
+    assert [image.height for image in results] == [8] * 4
+    assert repository.max_in_flight == 2
+
+
+async def test_from_bytes_async_keeps_the_file_signature():
+    repository = SlowRepository(delay=0)
+
+    image = await Image.from_bytes_async(
+        b"data", "image/png", "0.png", repository, size=ImageSize(width=8, height=4)
+    )
+
+    assert isinstance(image, Image)
+    assert image.content_type == "image/png"
+    assert image.url == "https://primary/0.png"
+    assert (image.width, image.height) == (8, 4)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from fal.toolkit.utils import ssrf
+
+
+class LocalServer(ThreadingHTTPServer):
+    """Serves a test handler on a loopback port and counts its connections."""
+
+    daemon_threads = True
+
+    def __init__(self, handler: type[BaseHTTPRequestHandler], **state: Any) -> None:
+        quiet_handler = type(handler.__name__, (handler,), {"log_message": _no_log})
+        super().__init__(("127.0.0.1", 0), quiet_handler)
+        self.connections = 0
+        # Anything the handler needs to read or record, e.g. a request log
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections += 1
+        return request
+
+
+def _no_log(self: BaseHTTPRequestHandler, format: str, *args: Any) -> None:
+    pass
+
+
+@pytest.fixture
+def local_server() -> Any:
+    servers: list[LocalServer] = []
+
+    def _local_server(
+        handler: type[BaseHTTPRequestHandler], **state: Any
+    ) -> LocalServer:
+        server = LocalServer(handler, **state)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield _local_server
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def loopback_dns() -> Any:
+    """Resolve every host to the loopback address that local servers listen on."""
+    addrinfo = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", 80))]
+    with patch.object(
+        ssrf, "_socket_getaddrinfo", return_value=addrinfo
+    ) as getaddrinfo, patch.object(
+        ssrf, "is_globally_routable_ip", side_effect=lambda ip: ip == "127.0.0.1"
+    ):
+        yield getaddrinfo
+    ssrf.close_connections()
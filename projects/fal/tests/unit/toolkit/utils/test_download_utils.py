@@ -0,0 +1,414 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from fal.toolkit.utils import download_utils
+from fal.toolkit.utils.download_utils import (
+    DownloadError,
+    clone_repository,
+    download_file,
+    download_model_weights,
+    list_model_weights,
+)
+
+KIB = 1024
+CONTENT = os.urandom(1024 * KIB)
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        server: Any = self.server
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range != server.etag:
+            # The file changed, so it is sent whole
+            match = None
+        with server.lock:
+            server.requests.append(self.headers.get("Range"))
+            fail = match is not None and server.fail_ranges.get(match.group(1), 0) > 0
+            if fail:
+                server.fail_ranges[match.group(1)] -= 1
+            truncate_after, server.truncate_after = server.truncate_after, None
+
+        if fail:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        headers = {"Content-Disposition": 'attachment; filename="weights.bin"'}
+        if server.accept_ranges:
+            headers["Accept-Ranges"] = "bytes"
+        if server.etag:
+            headers["ETag"] = server.etag
+            if match is not None and match.group(1) != "0":
+                headers["ETag"] = server.changed_etag or server.etag
+
+        if match is not None and server.accept_ranges and server.honor_ranges:
+            start = int(match.group(1))
+            end = int(match.group(2) or len(CONTENT) - 1)
+            body = CONTENT[start : end + 1]
+            self.send_response(206)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(CONTENT)}"
+        else:
+            body = CONTENT
+            self.send_response(200)
+
+        headers["Content-Length"] = str(len(body))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        try:
+            time.sleep(server.delay)
+            if truncate_after is not None:
+                # The connection is lost in the middle of the body
+                self.wfile.write(body[:truncate_after])
+                self.close_connection = True
+                return
+            self.wfile.write(body)
+        except OSError:
+            # The client stopped reading after the headers
+            pass
+
+
+@pytest.fixture
+def server(monkeypatch, local_server, loopback_dns):
+    monkeypatch.setattr(download_utils, "PARALLEL_DOWNLOAD_THRESHOLD", 256 * KIB)
+    monkeypatch.setattr(download_utils, "DOWNLOAD_SEGMENT_SIZE", 128 * KIB)
+    with patch("fal.toolkit.utils.retry.time.sleep"):
+        yield local_server(
+            _RangeHandler,
+            lock=threading.Lock(),
+            requests=[],
+            # Start offsets of ranges to fail, and how many times
+            fail_ranges={},
+            truncate_after=None,
+            accept_ranges=True,
+            honor_ranges=True,
+            etag='"v1"',
+            changed_etag=None,
+            # Seconds to wait before sending each body
+            delay=0.0,
+        )
+
+
+def _url(server) -> str:
+    return f"http://cdn.example:{server.server_address[1]}/weights.bin"
+
+
+def test_large_files_are_downloaded_in_segments(server, tmp_path) -> None:
+    downloads = []
+    path = download_file(
+        _url(server), tmp_path, connections=4, on_download=downloads.append
+    )
+
+    assert path == tmp_path / "weights.bin"
+    assert path.read_bytes() == CONTENT
+    # The first request is only used for its headers.
+    assert server.requests[0] is None
+    assert sorted(server.requests[1:]) == sorted(
+        f"bytes={start}-{start + 128 * KIB - 1}"
+        for start in range(0, 1024 * KIB, 128 * KIB)
+    )
+    (stats,) = downloads
+    assert (stats.size, stats.connections, stats.retries) == (1024 * KIB, 4, 0)
+    assert stats.throughput > 0
+    assert os.listdir(tmp_path) == ["weights.bin"]
+
+
+def test_failed_segments_are_retried_on_their_own(server, tmp_path) -> None:
+    server.fail_ranges = {str(256 * KIB): 1}
+    downloads = []
+    path = download_file(_url(server), tmp_path, on_download=downloads.append)
+
+    assert path.read_bytes() == CONTENT
+    assert server.requests.count(f"bytes={256 * KIB}-{384 * KIB - 1}") == 2
+    assert len(server.requests) == 1 + 8 + 1
+    assert downloads[0].retries == 1
+
+
+def test_servers_without_range_support_use_one_connection(server, tmp_path) -> None:
+    server.accept_ranges = False
+    downloads = []
+    path = download_file(_url(server), tmp_path, on_download=downloads.append)
+
+    assert path.read_bytes() == CONTENT
+    assert server.requests == [None]
+    assert downloads[0].connections == 1
+
+
+def test_ignored_range_requests_fail_the_download(server, tmp_path) -> None:
+    server.honor_ranges = False
+    with pytest.raises(DownloadError, match="range request"):
+        download_file(_url(server), tmp_path)
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_files_changing_during_the_download_are_rejected(server, tmp_path) -> None:
+    server.changed_etag = '"v2"'
+    with pytest.raises(DownloadError, match="changed during the download"):
+        download_file(_url(server), tmp_path)
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_existing_files_are_kept_before_downloading_segments(server, tmp_path) -> None:
+    (tmp_path / "weights.bin").write_bytes(b"x" * len(CONTENT))
+    path = download_file(_url(server), tmp_path)
+
+    assert path.read_bytes() == b"x" * len(CONTENT)
+    assert server.requests == [None]
+
+
+def _partial_files(directory) -> list[str]:
+    return sorted(name for name in os.listdir(directory) if ".partial." in name)
+
+
+def test_interrupted_downloads_are_resumed(server, tmp_path) -> None:
+    server.truncate_after = 300 * KIB
+    with pytest.raises(DownloadError):
+        download_file(_url(server), tmp_path, connections=1, resume=True)
+
+    partial, state = _partial_files(tmp_path)
+    assert os.path.getsize(tmp_path / partial) == 300 * KIB
+    assert json.loads((tmp_path / state).read_text())["etag"] == '"v1"'
+
+    path = download_file(_url(server), tmp_path, connections=1, resume=True)
+
+    assert path.read_bytes() == CONTENT
+    assert server.requests == [None, f"bytes={300 * KIB}-"]
+    assert _partial_files(tmp_path) == []
+
+
+def test_changed_files_are_downloaded_again(server, tmp_path) -> None:
+    server.truncate_after = 300 * KIB
+    with pytest.raises(DownloadError):
+        download_file(_url(server), tmp_path, connections=1, resume=True)
+
+    server.etag = '"v2"'
+    path = download_file(_url(server), tmp_path, connections=1, resume=True)
+
+    assert path.read_bytes() == CONTENT
+    assert _partial_files(tmp_path) == []
+
+
+def test_interrupted_segmented_downloads_are_resumed(server, tmp_path) -> None:
+    failing_range = f"bytes={256 * KIB}-{384 * KIB - 1}"
+    server.fail_ranges = {str(256 * KIB): download_utils.SEGMENT_MAX_ATTEMPTS}
+    with pytest.raises(DownloadError):
+        download_file(_url(server), tmp_path, resume=True)
+
+    (state,) = (name for name in _partial_files(tmp_path) if name.endswith(".json"))
+    segments = json.loads((tmp_path / state).read_text())["segments"]
+    assert 256 * KIB not in segments
+
+    server.requests.clear()
+    path = download_file(_url(server), tmp_path, resume=True)
+
+    assert path.read_bytes() == CONTENT
+    assert server.requests[0] is None
+    assert failing_range in server.requests
+    assert len(server.requests) == 1 + 8 - len(segments)
+    assert _partial_files(tmp_path) == []
+
+
+def test_downloads_are_not_resumed_by_default(server, tmp_path) -> None:
+    server.truncate_after = 300 * KIB
+    with pytest.raises(DownloadError):
+        download_file(_url(server), tmp_path, connections=1)
+
+    assert os.listdir(tmp_path) == []
+
+
+def _run_concurrently(func, count: int = 4) -> list:
+    results: list = [None] * count
+
+    def run(index: int) -> None:
+        results[index] = func()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_weight_downloads_download_once(
+    server, tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setattr(download_utils, "FAL_MODEL_WEIGHTS_DIR", tmp_path)
+    server.delay = 0.2
+    paths = _run_concurrently(lambda: download_model_weights(_url(server)))
+
+    assert len(set(paths)) == 1
+    assert paths[0].read_bytes() == CONTENT
+    # One probe and eight segments
+    assert len(server.requests) == 1 + 8
+    assert not any(".lock" in name for name in os.listdir(paths[0].parent))
+
+
+def test_weights_evicted_before_they_are_locked_are_downloaded(
+    server, tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setattr(download_utils, "FAL_MODEL_WEIGHTS_DIR", tmp_path)
+    evictions = []
+
+    class EvictedFileLock(download_utils.FileLock):
+        def acquire(self, *args: Any, **kwargs: Any) -> bool:
+            if not evictions:
+                # Another process evicts the directory once it was created
+                evictions.append(self.path.parent)
+                shutil.rmtree(self.path.parent)
+            return super().acquire(*args, **kwargs)
+
+    monkeypatch.setattr(download_utils, "FileLock", EvictedFileLock)
+    path = download_model_weights(_url(server))
+
+    assert evictions == [path.parent]
+    assert path.read_bytes() == CONTENT
+
+
+def test_weights_evicted_while_being_reused_are_downloaded(
+    server, tmp_path, monkeypatch
+) -> None:
+    monkeypatch.setattr(download_utils, "FAL_MODEL_WEIGHTS_DIR", tmp_path)
+    path = download_model_weights(_url(server))
+    existing_weights = download_utils._existing_weights
+
+    def evicted_weights(weights_dir, size=None):
+        weights_path = existing_weights(weights_dir, size)
+        if weights_path is not None and weights_dir.exists():
+            # Another process evicts the weights once they were found
+            shutil.rmtree(weights_dir)
+        return weights_path
+
+    monkeypatch.setattr(download_utils, "_existing_weights", evicted_weights)
+    server.requests.clear()
+    assert download_model_weights(_url(server)) == path
+
+    assert path.read_bytes() == CONTENT
+    assert server.requests
+
+
+def test_concurrent_clones_clone_once(tmp_path, monkeypatch) -> None:
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    for command in (
+        ["git", "init", "-q"],
+        ["git", "-c", "user.name=fal", "-c", "user.email=fal@fal.ai"]
+        + ["commit", "-q", "--allow-empty", "-m", "init"],
+    ):
+        subprocess.check_call(command, cwd=remote)
+
+    clones = []
+    check_call = subprocess.check_call
+
+    def counting_check_call(command, *args, **kwargs):
+        if command[:2] == ["git", "clone"]:
+            clones.append(command)
+            time.sleep(0.2)
+        return check_call(command, *args, **kwargs)
+
+    monkeypatch.setattr(subprocess, "check_call", counting_check_call)
+    paths = _run_concurrently(
+        lambda: clone_repository(str(remote), target_dir=tmp_path / "repos")
+    )
+
+    assert len(set(paths)) == 1
+    assert (paths[0] / ".git").is_dir()
+    assert len(clones) == 1
+    assert os.listdir(tmp_path / "repos") == ["remote"]
+
+
+def test_files_written_out_of_order_are_hashed(tmp_path) -> None:
+    path = tmp_path / "file"
+    path.write_bytes(CONTENT)
+    hasher = download_utils._StreamingHash(path)
+    for start in (512 * KIB, 256 * KIB, 0, 768 * KIB):
+        end = start + 256 * KIB
+        # Only the first chunk of each range is fed, the rest is read back
+        hasher.update(start, CONTENT[start : start + KIB])
+        hasher.written(start, end)
+
+    assert hasher.hexdigest(len(CONTENT)) == SHA256
+
+
+@pytest.mark.parametrize("connections", [1, 4])
+def test_downloads_are_verified_against_their_hash(
+    server, tmp_path, connections
+) -> None:
+    path = download_file(
+        _url(server),
+        tmp_path,
+        connections=connections,
+        resume=True,
+        expected_sha256=SHA256,
+        expected_size=len(CONTENT),
+    )
+
+    assert path.read_bytes() == CONTENT
+
+
+def test_downloads_with_another_hash_are_rejected(server, tmp_path) -> None:
+    with pytest.raises(DownloadError, match="SHA-256"):
+        download_file(_url(server), tmp_path, resume=True, expected_sha256="0" * 64)
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_downloads_with_another_size_are_rejected_upfront(server, tmp_path) -> None:
+    with pytest.raises(DownloadError, match="expected 1 bytes"):
+        download_file(_url(server), tmp_path, expected_size=1)
+
+    assert server.requests == [None]
+    assert os.listdir(tmp_path) == []
+
+
+def test_resumed_downloads_are_verified_against_their_hash(server, tmp_path) -> None:
+    server.truncate_after = 300 * KIB
+    with pytest.raises(DownloadError):
+        download_file(_url(server), tmp_path, connections=1, resume=True)
+
+    path = download_file(
+        _url(server), tmp_path, connections=1, resume=True, expected_sha256=SHA256
+    )
+
+    assert path.read_bytes() == CONTENT
+    assert server.requests[-1] == f"bytes={300 * KIB}-"
+
+
+def test_weights_are_stored_under_their_hash(server, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(download_utils, "FAL_MODEL_WEIGHTS_DIR", tmp_path)
+    path = download_model_weights(_url(server), sha256=SHA256.upper())
+
+    assert path == tmp_path / f"sha256-{SHA256}" / "weights.bin"
+    (entry,) = list_model_weights()
+    assert (entry.name, entry.file, entry.sha256) == (
+        f"sha256-{SHA256}",
+        "weights.bin",
+        SHA256,
+    )
+    assert entry.size >= len(CONTENT)
+
+    # The same weights from another URL are found without any request
+    server.requests.clear()
+    mirror = _url(server).replace("weights.bin", "mirror.bin")
+    assert download_model_weights(mirror, sha256=SHA256) == path
+    assert server.requests == []
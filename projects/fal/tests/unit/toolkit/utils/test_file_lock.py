@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from fal.toolkit.utils.file_lock import FileLock
+
+
+def _lock(path, **kwargs) -> FileLock:
+    kwargs = {"heartbeat_interval": 0.05, "poll_interval": 0.01, **kwargs}
+    return FileLock(path, **kwargs)
+
+
+def test_waiters_acquire_the_lock_once_it_is_released(tmp_path) -> None:
+    path = tmp_path / "lock"
+    holder = _lock(path)
+    assert holder.acquire() is False
+
+    waits = []
+    threading.Timer(0.1, holder.release).start()
+    assert _lock(path).acquire(timeout=5, on_wait=lambda: waits.append(1)) is True
+    assert waits
+
+
+def test_only_one_process_holds_the_lock(tmp_path) -> None:
+    holders = 0
+    max_holders = 0
+    counter_lock = threading.Lock()
+
+    def work() -> None:
+        nonlocal holders, max_holders
+        with _lock(tmp_path / "lock"):
+            with counter_lock:
+                holders += 1
+                max_holders = max(max_holders, holders)
+            time.sleep(0.01)
+            with counter_lock:
+                holders -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max_holders == 1
+    assert os.listdir(tmp_path) == []
+
+
+def test_live_holders_keep_the_lock(tmp_path) -> None:
+    path = tmp_path / "lock"
+    with _lock(path):
+        with pytest.raises(TimeoutError):
+            _lock(path, stale_after=0.2).acquire(timeout=0.5)
+
+
+def test_stale_locks_are_taken_over(tmp_path) -> None:
+    # Left behind by a process that was killed
+    path = tmp_path / "lock"
+    path.write_text(json.dumps({"token": "dead", "host": "elsewhere", "pid": 1}))
+
+    lock = _lock(path, stale_after=0.2)
+    assert lock.acquire(timeout=5) is True
+    assert json.loads(path.read_text())["pid"] == os.getpid()
+    lock.release()
+    assert os.listdir(tmp_path) == []
+
+
+def test_taken_over_locks_are_not_released_by_the_old_holder(tmp_path) -> None:
+    path = tmp_path / "lock"
+    holder = _lock(path)
+    holder.acquire()
+    # The holder stalls for longer than the waiters accept
+    holder._stop_heartbeat.set()
+
+    waiter = _lock(path, stale_after=0.2)
+    waiter.acquire(timeout=5)
+    holder.release()
+
+    assert path.exists()
+    waiter.release()
+    assert not path.exists()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler
+from unittest import mock
+from urllib.error import HTTPError
+from urllib.request import Request
+
+import pytest
+
+from fal.toolkit import kv
+from fal.toolkit.file.providers import fal as providers
+from fal.toolkit.utils.http_session import HTTPSession
+
+REQUESTS = 25
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if self.path.startswith("/get/db/missing"):
+            status, payload = 404, {"error": "not found"}
+        elif self.path.startswith("/fail"):
+            status, payload = 400, {"error": "bad key"}
+        else:
+            status, payload = 200, {"value": body.decode() or "stored"}
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_PUT = do_POST = do_DELETE = _respond
+
+
+@pytest.fixture
+def server(local_server):
+    return local_server(_Handler)
+
+
+def _url(server, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_requests_reuse_connections(server):
+    session = HTTPSession()
+    for _ in range(REQUESTS):
+        with session.urlopen(
+            Request(_url(server, "/set/db/key"), data=b"x", method="PUT"), timeout=5
+        ) as response:
+            assert json.load(response) == {"value": "x"}
+
+    assert server.connections == 1
+    stats = session.stats()[f"127.0.0.1:{server.server_address[1]}"]
+    assert (stats.requests, stats.connections, stats.reused) == (REQUESTS, 1, 24)
+    session.close()
+
+
+def test_errors_match_urllib(server):
+    session = HTTPSession()
+    with pytest.raises(HTTPError) as exc_info:
+        session.urlopen(Request(_url(server, "/fail")), timeout=5)
+
+    assert exc_info.value.status == 400
+    assert exc_info.value.reason == "Bad Request"
+    assert json.loads(exc_info.value.read()) == {"error": "bad key"}
+    session.close()
+
+
+async def test_async_requests_share_a_bounded_pool(server):
+    session = HTTPSession(max_connections=2)
+    client = session.async_client()
+    assert session.async_client() is client
+
+    url = _url(server, "/get/db/key")
+    for _ in range(REQUESTS):
+        response = await client.get(url, extensions=session.async_extensions(url))
+        assert response.status_code == 200
+
+    stats = session.stats()[f"127.0.0.1:{server.server_address[1]}"]
+    assert stats.requests == REQUESTS
+    assert stats.connections == server.connections == 1
+    await client.aclose()
+
+
+def test_kv_store_reuses_connections(server):
+    token = providers.FalV3Token(
+        token="token",
+        token_type="Bearer",
+        base_upload_url="",
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+    session = HTTPSession()
+    with mock.patch.object(kv, "FAL_KV_HOST", _url(server, "")), mock.patch.object(
+        providers.fal_v3_token_manager, "get_token", return_value=token
+    ), mock.patch.object(providers, "shared_session", return_value=session):
+        store = kv.KVStore("db")
+        for _ in range(10):
+            store.set("key", "value")
+        assert store.get("key") == "stored"
+        assert store.get("missing") is None
+
+    assert server.connections == 1
+    session.close()
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import http.client
 import socket
+from http.server import BaseHTTPRequestHandler
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlparse
 
 import pytest
 from fastapi import HTTPException
@@ -29,6 +31,7 @@ def _addrinfo(*ips: str, family: int = socket.AF_INET) -> list[Any]:
 @pytest.fixture(autouse=True)
 def reset_client() -> None:
     read_image_from_url.cache_clear()
+    ssrf.close_connections()
     _request_calls.clear()
     _request_responses.clear()
 
@@ -44,6 +47,7 @@ def _fake_request_one_hop(
     target_path: str | None = None,
     chunk_size: int = 64 * 1024,
     on_response_headers: Any = None,
+    consume_body: Any = None,
 ) -> ssrf.SafeResponse:
     _request_calls.append(
         {
@@ -193,6 +197,7 @@ def test_ssrf_safe_get_headers_tries_later_validated_ips() -> None:
         target_path: str | None = None,
         chunk_size: int = 64 * 1024,
         on_response_headers: Any = None,
+        consume_body: Any = None,
     ) -> ssrf.SafeResponse:
         if target_ip == "2001:4860:4860::8888":
             raise OSError("network unreachable")
@@ -237,6 +242,7 @@ def test_ssrf_safe_get_to_file_retries_later_ips_after_short_body(tmp_path) -> N
         target_path: str | None = None,
         chunk_size: int = 64 * 1024,
         on_response_headers: Any = None,
+        consume_body: Any = None,
     ) -> ssrf.SafeResponse:
         if target_ip == "8.8.8.8":
             raise ssrf.SSRFConnectionError("short body")
@@ -281,6 +287,7 @@ def test_ssrf_safe_get_retries_later_ips_after_incomplete_read() -> None:
         target_path: str | None = None,
         chunk_size: int = 64 * 1024,
         on_response_headers: Any = None,
+        consume_body: Any = None,
     ) -> ssrf.SafeResponse:
         if target_ip == "8.8.8.8":
             raise http.client.IncompleteRead(b"partial")
@@ -682,3 +689,110 @@ def test_read_image_from_url_blocks_private_resolution() -> None:
     ):
         with pytest.raises(HTTPException):
             read_image_from_url("https://attacker.example/private.png")
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path.startswith("/redirect"):
+            self.send_response(302)
+            self.send_header("Location", "/file")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = b"hello"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        if self.path.startswith("/close"):
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def keep_alive_server(local_server, loopback_dns):
+    return local_server(_KeepAliveHandler)
+
+
+def _local_url(server, path: str) -> str:
+    return f"http://cdn.example:{server.server_address[1]}{path}"
+
+
+def test_requests_reuse_pinned_connections_and_resolutions(
+    keep_alive_server, loopback_dns
+) -> None:
+    for _ in range(10):
+        response = ssrf.ssrf_safe_get(_local_url(keep_alive_server, "/file"))
+        assert response.content == b"hello"
+
+    assert keep_alive_server.connections == 1
+    assert loopback_dns.call_count == 1
+    stats = ssrf.connection_stats()[
+        f"cdn.example:{keep_alive_server.server_address[1]}"
+    ]
+    assert (stats.requests, stats.connections, stats.reused) == (10, 1, 9)
+    assert stats.dns_lookups == 1
+
+
+def test_connection_stats_fill_in_default_ports() -> None:
+    pool = ssrf._ConnectionPool()
+    parsed = urlparse("https://cdn.example/file")
+    with patch.object(
+        ssrf, "resolve_and_validate_host", return_value=["203.0.113.1"]
+    ), patch.object(ssrf, "_open_connection", return_value=MagicMock()):
+        (ip,) = pool.resolve(parsed)
+        pool.acquire(parsed, ip, timeout=1)
+
+    stats = pool.stats()
+    assert list(stats) == ["cdn.example:443"]
+    assert (
+        stats["cdn.example:443"].requests,
+        stats["cdn.example:443"].connections,
+        stats["cdn.example:443"].dns_lookups,
+    ) == (1, 1, 1)
+
+
+def test_redirects_and_file_downloads_reuse_connections(
+    keep_alive_server, tmp_path
+) -> None:
+    response = ssrf.ssrf_safe_get(_local_url(keep_alive_server, "/redirect"))
+    ssrf.ssrf_safe_get_to_file(_local_url(keep_alive_server, "/file"), tmp_path / "f")
+
+    assert response.content == b"hello"
+    assert (tmp_path / "f").read_bytes() == b"hello"
+    assert keep_alive_server.connections == 1
+
+
+def test_connections_the_server_closes_are_not_reused(keep_alive_server) -> None:
+    for _ in range(3):
+        ssrf.ssrf_safe_get(_local_url(keep_alive_server, "/close"))
+
+    assert keep_alive_server.connections == 3
+
+
+def test_connections_closed_while_idle_are_replaced(keep_alive_server) -> None:
+    ssrf.ssrf_safe_get(_local_url(keep_alive_server, "/file"))
+    # The server drops the idle keep-alive connection.
+    for connections in ssrf._CONNECTION_POOL._idle.values():
+        for _, connection in connections:
+            connection.sock.shutdown(socket.SHUT_RDWR)
+
+    response = ssrf.ssrf_safe_get(_local_url(keep_alive_server, "/file"))
+    assert response.content == b"hello"
+    assert keep_alive_server.connections == 2
+
+
+def test_resolutions_expire_and_are_revalidated(
+    keep_alive_server, loopback_dns
+) -> None:
+    with patch.object(ssrf._CONNECTION_POOL, "dns_cache_ttl", 0):
+        ssrf.ssrf_safe_get(_local_url(keep_alive_server, "/file"))
+        ssrf.ssrf_safe_get(_local_url(keep_alive_server, "/file"))
+    assert loopback_dns.call_count == 2
+
+    # A host that no longer resolves to a routable address is rejected.
+    loopback_dns.return_value = _addrinfo("10.0.0.1")
+    with pytest.raises(ssrf.SSRFError, match="non-routable"):
+        ssrf.ssrf_safe_get(_local_url(keep_alive_server, "/file"))
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+from fal.toolkit.utils.file_lock import FileLock
+from fal.toolkit.utils.weights_cache import WeightsCache
+
+
+def _add_weights(cache: WeightsCache, name: str, size: int, used_at: float) -> None:
+    path = cache.root / name / "weights.bin"
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"x" * size)
+    with patch("fal.toolkit.utils.weights_cache.time.time", return_value=used_at):
+        cache.record_use(name, path, url=f"https://example.com/{name}")
+
+
+def test_entries_are_indexed_with_their_size_and_last_use(tmp_path) -> None:
+    cache = WeightsCache(tmp_path)
+    _add_weights(cache, "a", 100, used_at=1000)
+    # Created before the manifest existed
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "weights.bin").write_bytes(b"x" * 10)
+
+    entries = {entry.name: entry for entry in cache.entries()}
+
+    assert set(entries) == {"a", "b"}
+    assert (entries["a"].size, entries["a"].last_used) == (100, 1000)
+    assert entries["a"].url == "https://example.com/a"
+    assert entries["b"].size == 10
+    assert entries["b"].file is None
+
+
+def test_uses_are_recorded_at_most_every_interval(tmp_path) -> None:
+    cache = WeightsCache(tmp_path)
+    _add_weights(cache, "a", 100, used_at=1000)
+    path = tmp_path / "a" / "weights.bin"
+
+    with patch("fal.toolkit.utils.weights_cache.time.time", return_value=1010):
+        cache.record_use("a", path)
+    assert cache.get("a").last_used == 1000  # type: ignore[union-attr]
+
+    with patch("fal.toolkit.utils.weights_cache.time.time", return_value=10000):
+        cache.record_use("a", path)
+    assert cache.get("a").last_used == 10000  # type: ignore[union-attr]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path) -> None:
+    cache = WeightsCache(tmp_path)
+    _add_weights(cache, "old", 100, used_at=1000)
+    _add_weights(cache, "older", 100, used_at=500)
+    _add_weights(cache, "new", 100, used_at=2000)
+
+    assert [entry.name for entry in cache.evict(150, dry_run=True)] == [
+        "older",
+        "old",
+    ]
+    assert len(cache.entries()) == 3
+
+    assert [entry.name for entry in cache.evict(150)] == ["older", "old"]
+    assert os.listdir(tmp_path / "new") == ["weights.bin"]
+    assert sorted(name for name in os.listdir(tmp_path) if name[0] != ".") == ["new"]
+    assert [entry.name for entry in cache.entries()] == ["new"]
+    assert cache.get("old") is None
+
+
+def test_entries_being_downloaded_are_not_evicted(tmp_path) -> None:
+    cache = WeightsCache(tmp_path)
+    _add_weights(cache, "downloading", 100, used_at=500)
+    _add_weights(cache, "idle", 100, used_at=1000)
+
+    with FileLock(tmp_path / "downloading" / ".fal_download.lock"):
+        evicted = cache.evict(0)
+
+    assert [entry.name for entry in evicted] == ["idle"]
+    assert (tmp_path / "downloading" / "weights.bin").exists()
@@ -1,5 +1,6 @@
 from fal_client._version import __version__, version_tuple
 from fal_client._headers import set_get_current_app
+from fal_client._upload_cache import UploadCache, default_upload_cache
 from fal_client.client import (
     AsyncClient,
     AsyncRealtimeConnection,
@@ -43,6 +44,7 @@ __all__ = [
     "StorageACLDecision",
     "StorageACLRule",
     "StorageSettings",
+    "UploadCache",
     "SyncRequestHandle",
     "AsyncRequestHandle",
     "run",
@@ -67,7 +69,9 @@ __all__ = [
     "set_get_current_app",
 ]
 
-sync_client = SyncClient()
+_upload_cache = default_upload_cache()
+
+sync_client = SyncClient(upload_cache=_upload_cache)
 run = sync_client.run
 subscribe = sync_client.subscribe
 submit = sync_client.submit
@@ -81,7 +85,7 @@ upload = sync_client.upload
 upload_file = sync_client.upload_file
 upload_image = sync_client.upload_image
 
-async_client = AsyncClient()
+async_client = AsyncClient(upload_cache=_upload_cache)
 run_async = async_client.run
 subscribe_async = async_client.subscribe
 submit_async = async_client.submit
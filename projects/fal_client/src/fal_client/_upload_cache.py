@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+DEFAULT_MAX_ENTRIES = 1024
+# How long cached URLs are trusted when the upload's lifecycle doesn't say when
+# the object expires.
+DEFAULT_TTL = 60 * 60
+# How often `put` removes the expired entries.
+PRUNE_INTERVAL = 60.0
+
+
+class UploadCache:
+    """Maps the content of uploaded files to the URLs they were uploaded to, so
+    uploading the same bytes again returns the existing URL while it is valid.
+
+    Entries are kept in memory (least recently used ones are evicted beyond
+    `max_entries`) and, if `directory` is given, also on disk so that they are
+    shared between processes and survive restarts. Expired entries are removed
+    from both when new ones are added."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        directory: str | os.PathLike | None = None,
+        ttl: float = DEFAULT_TTL,
+    ) -> None:
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+
+    def key(self, digest: str, *parts: Any) -> str:
+        """Cache key for content with the given (BLAKE2) digest, uploaded with the
+        given options (e.g. file name, repository, content type and lifecycle)."""
+        options = json.dumps(parts, sort_keys=True, default=repr)
+        return hashlib.blake2b(
+            f"{digest}:{options}".encode(), digest_size=32
+        ).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+            if entry is not None and entry[1] <= now:
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, url: str, expires_in: float | None = None) -> None:
+        ttl = self.ttl if expires_in is None else min(expires_in, self.ttl)
+        if ttl <= 0:
+            return
+
+        now = time.time()
+        entry = (url, now + ttl)
+        with self._lock:
+            if now >= self._next_prune:
+                self._next_prune = now + PRUNE_INTERVAL
+                self._prune(now)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            self._store(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            if self.directory is not None:
+                for path in self.directory.glob("*.json"):
+                    path.unlink(missing_ok=True)
+
+    def _prune(self, now: float) -> None:
+        for key, (_, expires_at) in list(self._entries.items()):
+            if expires_at <= now:
+                del self._entries[key]
+        if self.directory is None:
+            return
+        # Entries on disk are modified at their expiration time, see `_store`.
+        for path in self.directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime <= now:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def _evict(self) -> None:
+        # Entries evicted from memory stay on disk until they expire.
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}.json"
+
+    def _load(self, key: str) -> tuple[str, float] | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                data = json.load(f)
+            return data["url"], float(data["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _store(self, key: str, entry: tuple[str, float]) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({"url": entry[0], "expires_at": entry[1]}, f)
+            # Lets `_prune` find expired entries without reading them.
+            os.utime(tmp_path, (entry[1], entry[1]))
+            os.replace(tmp_path, path)
+        except OSError:
+            # The on-disk store is best effort.
+            pass
+
+    def _remove(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self.directory is not None:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+
+def lifecycle_expiration(lifecycle: dict[str, Any] | None) -> float | None:
+    """Seconds until an object uploaded with the given lifecycle preference
+    expires, if it sets an expiration."""
+    if not lifecycle:
+        return None
+    try:
+        seconds = float(lifecycle.get("expiration_duration_seconds") or 0)
+    except (TypeError, ValueError):
+        return None
+    return seconds or None
+
+
+def default_upload_cache() -> UploadCache | None:
+    """The upload cache of the module-level clients: enabled by setting
+    FAL_UPLOAD_CACHE=1, and also kept on disk if FAL_UPLOAD_CACHE_DIR is set."""
+    directory = os.getenv("FAL_UPLOAD_CACHE_DIR")
+    if os.getenv("FAL_UPLOAD_CACHE") == "1" or directory:
+        return UploadCache(directory=directory or None)
+    return None
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import inspect
 import io
+import itertools
 import json
 import math
 import os
@@ -13,6 +14,8 @@ import time
 import base64
 import threading
 import logging
+import hashlib
+import heapq
 import concurrent.futures
 from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime, timezone
@@ -20,9 +23,14 @@ from dataclasses import dataclass, field
 from functools import cached_property, partial
 from typing import (
     Any,
+    AsyncGenerator,
+    AsyncIterable,
     AsyncIterator,
     Awaitable,
+    BinaryIO,
     Dict,
+    Generator,
+    Iterable,
     Iterator,
     TYPE_CHECKING,
     Optional,
@@ -33,19 +41,19 @@ from typing import (
 from urllib.parse import urlencode
 import warnings
 
-import aiofiles
-import aiofiles.os
 import httpx
 from asyncstdlib import cached_property as async_cached_property
-from httpx_sse import aconnect_sse, connect_sse
+from httpx_sse import SSEError, aconnect_sse, connect_sse
 
 from fal_client.auth import (
     AuthCredentials,
     FAL_QUEUE_RUN_HOST,
+    _get_fal_home_dir,
     FAL_RUN_HOST,
     fetch_auth_credentials,
     fetch_auth_credentials_async,
 )
+from fal_client._upload_cache import UploadCache, lifecycle_expiration
 from fal_client._version import __version__
 from fal_client._headers import (
     Priority,
@@ -79,6 +87,10 @@ ObjectExpiration = Union[
     int,
 ]
 StorageACLDecision = Literal["hide", "forbid", "allow"]
+# How request handles wait for completion: "poll" checks the status at a fixed
+# interval, "backoff" grows the interval while the status stays the same and
+# "stream" subscribes to the queue's server-sent status events.
+QueueWaitMode = Literal["poll", "backoff", "stream"]
 
 RUN_URL_FORMAT = f"https://{FAL_RUN_HOST}/"
 QUEUE_URL_FORMAT = f"https://{FAL_QUEUE_RUN_HOST}/"
@@ -226,9 +238,487 @@ class AsyncCDNTokenManager:
             return self._token
 
 
+class _CDNTokenAuth(httpx.Auth):
+    """Adds the current CDN token to every request sent through a pooled CDN
+    client, so the client can outlive any single token."""
+
+    def __init__(self, token_manager: CDNTokenManager) -> None:
+        self._token_manager = token_manager
+
+    def sync_auth_flow(
+        self, request: httpx.Request
+    ) -> Generator[httpx.Request, httpx.Response, None]:
+        if "Authorization" not in request.headers:
+            token = self._token_manager.get_token()
+            request.headers["Authorization"] = f"{token.token_type} {token.token}"
+        yield request
+
+
+class _AsyncCDNTokenAuth(httpx.Auth):
+    def __init__(self, token_manager: AsyncCDNTokenManager) -> None:
+        self._token_manager = token_manager
+
+    async def async_auth_flow(
+        self, request: httpx.Request
+    ) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        if "Authorization" not in request.headers:
+            token = await self._token_manager.get_token()
+            request.headers["Authorization"] = f"{token.token_type} {token.token}"
+        yield request
+
+
+# Uploads are sent through one long-lived client per SyncClient/AsyncClient so
+# that consecutive uploads (and multipart parts) reuse CDN connections.
+CDN_MAX_CONNECTIONS = 20
+CDN_MAX_KEEPALIVE_CONNECTIONS = 10
+CDN_KEEPALIVE_EXPIRY = 30.0
+
+
+def _cdn_client_options(
+    auth: httpx.Auth,
+    *,
+    timeout: float,
+    max_connections: int,
+    max_keepalive_connections: int,
+    http2: bool,
+) -> dict[str, Any]:
+    return {
+        "headers": {"User-Agent": USER_AGENT},
+        "auth": auth,
+        "timeout": timeout,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=CDN_KEEPALIVE_EXPIRY,
+        ),
+        "http2": http2,
+    }
+
+
 MULTIPART_THRESHOLD = 100 * 1024 * 1024
+# Default (and smallest automatically chosen) part size. Larger uploads use
+# larger parts, so that they are split into about MULTIPART_TARGET_PARTS parts
+# of at most MULTIPART_MAX_CHUNK_SIZE, and never into more than
+# MULTIPART_MAX_PARTS parts.
 MULTIPART_CHUNK_SIZE = 10 * 1024 * 1024
+MULTIPART_MAX_CHUNK_SIZE = 64 * 1024 * 1024
+MULTIPART_TARGET_PARTS = 256
+MULTIPART_MAX_PARTS = 10_000
+# Unless a fixed concurrency is requested, uploads start with
+# MULTIPART_INITIAL_CONCURRENCY parts in flight and adjust that number to the
+# observed throughput, up to MULTIPART_MAX_CONCURRENCY.
+MULTIPART_INITIAL_CONCURRENCY = 4
 MULTIPART_MAX_CONCURRENCY = 10
+# Relative throughput change that counts as an improvement (or a regression)
+# when tuning the concurrency.
+MULTIPART_TUNING_TOLERANCE = 0.1
+
+
+def _multipart_chunk_size(size: int) -> int:
+    """Pick the part size for a multipart upload of `size` bytes."""
+    chunk_size = max(
+        MULTIPART_CHUNK_SIZE,
+        min(math.ceil(size / MULTIPART_TARGET_PARTS), MULTIPART_MAX_CHUNK_SIZE),
+        math.ceil(size / MULTIPART_MAX_PARTS),
+    )
+    # Round up to whole MiBs.
+    return -(-chunk_size // (1024 * 1024)) * (1024 * 1024)
+
+
+@dataclass(frozen=True)
+class MultipartUploadStats:
+    chunk_size: int
+    parts: int
+    # The final and the highest number of parts that were allowed in flight.
+    concurrency: int
+    max_concurrency: int
+    bytes: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Achieved throughput, in MB/s."""
+        return self.bytes / self.seconds / 1e6 if self.seconds else 0.0
+
+
+class _PartThrottle:
+    """Caps the number of parts in flight. Unless `fixed`, the cap is tuned to the
+    throughput measured over each window of `limit` finished parts: it doubles
+    while throughput keeps improving, then moves up or down one part at a time."""
+
+    def __init__(self, initial: int, maximum: int, fixed: bool = False) -> None:
+        self.limit = maximum if fixed else min(initial, maximum)
+        self.maximum = maximum
+        self.fixed = fixed
+        self.peak = self.limit
+        self.parts = 0
+        self.bytes = 0
+        self._in_flight = 0
+        self._started = time.monotonic()
+        self._window_started = self._started
+        self._window_parts = 0
+        self._window_bytes = 0
+        self._last_throughput: float | None = None
+        self._slow_start = True
+
+    def _record(self, size: int) -> None:
+        self.parts += 1
+        self.bytes += size
+        self._window_parts += 1
+        self._window_bytes += size
+        if self.fixed or self._window_parts < self.limit:
+            return
+
+        now = time.monotonic()
+        throughput = self._window_bytes / max(now - self._window_started, 1e-6)
+        previous = self._last_throughput
+        if previous is None or throughput > previous * (1 + MULTIPART_TUNING_TOLERANCE):
+            step = self.limit if self._slow_start else 1
+            self.limit = min(self.limit + step, self.maximum)
+        else:
+            self._slow_start = False
+            if throughput < previous * (1 - MULTIPART_TUNING_TOLERANCE):
+                self.limit = max(self.limit - 1, 1)
+        self.peak = max(self.peak, self.limit)
+        self._last_throughput = throughput
+        self._window_started = now
+        self._window_parts = 0
+        self._window_bytes = 0
+
+    def stats(self, chunk_size: int) -> MultipartUploadStats:
+        return MultipartUploadStats(
+            chunk_size=chunk_size,
+            parts=self.parts,
+            concurrency=self.limit,
+            max_concurrency=self.peak,
+            bytes=self.bytes,
+            seconds=time.monotonic() - self._started,
+        )
+
+
+class _SyncPartThrottle(_PartThrottle):
+    def __init__(self, initial: int, maximum: int, fixed: bool = False) -> None:
+        super().__init__(initial, maximum, fixed)
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self, size: int) -> Iterator[None]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                if succeeded:
+                    self._record(size)
+                self._condition.notify_all()
+
+
+class _AsyncPartThrottle(_PartThrottle):
+    def __init__(self, initial: int, maximum: int, fixed: bool = False) -> None:
+        super().__init__(initial, maximum, fixed)
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self, size: int) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                if succeeded:
+                    self._record(size)
+                self._condition.notify_all()
+
+
+# Request bodies are streamed in pieces of this size, so an in-flight part only
+# holds this much of its data in memory (unless the data is in memory already).
+UPLOAD_STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+class _MemoryUploadSource:
+    """Upload source over bytes that are already in memory, sliced without copies."""
+
+    blocking = False
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        self._view = memoryview(data).cast("B")
+        self.size = len(self._view)
+
+    def read_at(self, offset: int, size: int) -> memoryview:
+        return self._view[offset : offset + size]
+
+
+class _FileUploadSource:
+    """Upload source over an open binary file, read with positional reads so that
+    parts can be read concurrently from a single file descriptor."""
+
+    blocking = True
+
+    def __init__(self, file: BinaryIO, size: int | None = None) -> None:
+        self._file = file
+        self._start = file.tell()
+        if size is None:
+            size = file.seek(0, os.SEEK_END) - self._start
+            file.seek(self._start)
+        self.size = size
+        self._lock = threading.Lock()
+        try:
+            self._fd: int | None = file.fileno() if hasattr(os, "pread") else None
+        except (AttributeError, io.UnsupportedOperation):
+            self._fd = None
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        size = min(size, self.size - offset)
+        if self._fd is not None:
+            data = os.pread(self._fd, size, self._start + offset)
+        else:
+            with self._lock:
+                self._file.seek(self._start + offset)
+                data = self._file.read(size)
+        if len(data) != size:
+            raise OSError(
+                f"Expected {size} bytes at offset {offset}, got {len(data)}; "
+                "was the file modified during the upload?"
+            )
+        return data
+
+
+_UploadSource = Union[_MemoryUploadSource, _FileUploadSource]
+
+
+@contextmanager
+def _open_upload_source(
+    file: str | os.PathLike | BinaryIO,
+) -> Iterator[_FileUploadSource]:
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            yield _FileUploadSource(f, os.fstat(f.fileno()).st_size)
+    else:
+        yield _FileUploadSource(file)
+
+
+def _open_binary(file: str | os.PathLike) -> BinaryIO:
+    return open(file, "rb")
+
+
+@asynccontextmanager
+async def _async_open_upload_source(
+    file: str | os.PathLike | BinaryIO,
+) -> AsyncIterator[_FileUploadSource]:
+    if isinstance(file, (str, os.PathLike)):
+        loop = asyncio.get_running_loop()
+        f = await loop.run_in_executor(None, _open_binary, file)
+        try:
+            yield _FileUploadSource(f, os.fstat(f.fileno()).st_size)
+        finally:
+            f.close()
+    else:
+        yield _FileUploadSource(file)
+
+
+def _upload_file_name(file: str | os.PathLike | BinaryIO) -> str:
+    if isinstance(file, (str, os.PathLike)):
+        return os.path.basename(file)
+    name = getattr(file, "name", None)
+    if isinstance(name, str):
+        return os.path.basename(name)
+    return "upload.bin"
+
+
+def _source_digest(source: _UploadSource) -> str:
+    # Keys the upload cache by content, whether it comes from memory or a file.
+    hasher = hashlib.blake2b(digest_size=32)
+    for offset in range(0, source.size, UPLOAD_STREAM_CHUNK_SIZE):
+        hasher.update(
+            source.read_at(offset, min(UPLOAD_STREAM_CHUNK_SIZE, source.size - offset))
+        )
+    return hasher.hexdigest()
+
+
+class _UploadBody:
+    """A byte range of an upload source, streamed as a request body.
+
+    Every iteration re-reads the range from the source, so requests sending it can
+    be retried, and no more than UPLOAD_STREAM_CHUNK_SIZE of it is read at once.
+    """
+
+    def __init__(self, source: _UploadSource, offset: int = 0, size: int | None = None):
+        self._source = source
+        self._offset = offset
+        self._size = source.size - offset if size is None else size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ranges(self) -> Iterator[tuple[int, int]]:
+        end = self._offset + self._size
+        for start in range(self._offset, end, UPLOAD_STREAM_CHUNK_SIZE):
+            yield start, min(UPLOAD_STREAM_CHUNK_SIZE, end - start)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        # Without an explicit length httpx would fall back to chunked encoding.
+        return {"Content-Length": str(self._size)}
+
+
+class _SyncUploadBody(_UploadBody):
+    def __iter__(self) -> Iterator[bytes]:
+        for start, size in self._ranges():
+            yield self._source.read_at(start, size)  # type: ignore[misc]
+
+
+class _AsyncUploadBody(_UploadBody):
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        for start, size in self._ranges():
+            if self._source.blocking:
+                yield await loop.run_in_executor(
+                    None, self._source.read_at, start, size
+                )
+            else:
+                yield self._source.read_at(start, size)  # type: ignore[misc]
+
+
+def _content_headers(data: bytes | _UploadBody) -> dict[str, str]:
+    if isinstance(data, _UploadBody):
+        return data.headers
+    return {}
+
+
+def _iter_chunks(stream: Iterable[bytes], chunk_size: int) -> Iterator[bytearray]:
+    buffer = bytearray()
+    for piece in stream:
+        buffer += piece
+        while len(buffer) >= chunk_size:
+            chunk = buffer[:chunk_size]
+            del buffer[:chunk_size]
+            yield chunk
+    if buffer:
+        yield buffer
+
+
+async def _aiter_chunks(
+    stream: AsyncIterable[bytes], chunk_size: int
+) -> AsyncIterator[bytearray]:
+    buffer = bytearray()
+    async for piece in stream:
+        buffer += piece
+        while len(buffer) >= chunk_size:
+            chunk = buffer[:chunk_size]
+            del buffer[:chunk_size]
+            yield chunk
+    if buffer:
+        yield buffer
+
+
+def _default_upload_manifest_dir() -> Path:
+    return _get_fal_home_dir() / "uploads"
+
+
+@dataclass
+class _UploadManifest:
+    """On-disk record of a multipart upload of a local file (upload id, chunk size
+    and uploaded part ETags), so an interrupted upload can be resumed.
+
+    Manifests are keyed by the file's absolute path, size and mtime, so any change
+    to the file starts a new upload."""
+
+    path: Path
+    upload_id: str = ""
+    access_url: str = ""
+    chunk_size: int = 0
+    parts: dict[int, str] = field(default_factory=dict)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @classmethod
+    def for_file(
+        cls, file_path: str | os.PathLike, manifest_dir: str | os.PathLike | None
+    ) -> _UploadManifest:
+        stat = os.stat(file_path)
+        key = hashlib.sha256(
+            f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+        ).hexdigest()
+        directory = Path(manifest_dir or _default_upload_manifest_dir())
+        manifest = cls(path=directory / f"{key}.json")
+        try:
+            with open(manifest.path) as f:
+                data = json.load(f)
+            manifest.upload_id = data["upload_id"]
+            manifest.access_url = data["access_url"]
+            manifest.chunk_size = data["chunk_size"]
+            manifest.parts = {int(n): etag for n, etag in data["parts"].items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning(
+                f"Ignoring unreadable upload manifest {manifest.path}: {exc}"
+            )
+        return manifest
+
+    @property
+    def started(self) -> bool:
+        return bool(self.upload_id)
+
+    def start(self, upload_id: str, access_url: str, chunk_size: int) -> None:
+        with self._lock:
+            self.upload_id = upload_id
+            self.access_url = access_url
+            self.chunk_size = chunk_size
+            self.parts = {}
+            self._save()
+
+    def record_part(self, part_number: int, etag: str) -> None:
+        with self._lock:
+            self.parts[part_number] = etag
+            self._save()
+
+    def discard(self) -> None:
+        with self._lock:
+            self.upload_id = ""
+            self.parts = {}
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "upload_id": self.upload_id,
+                    "access_url": self.access_url,
+                    "chunk_size": self.chunk_size,
+                    "parts": self.parts,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+
+# Statuses with which the CDN rejects parts of an upload id it no longer knows
+# about (e.g. because it was completed or expired), so a resume must start over.
+_STALE_UPLOAD_STATUS_CODES = (404, 410)
+
+
+def _is_stale_upload_error(exc: Exception) -> bool:
+    return (
+        isinstance(exc, FalClientHTTPError)
+        and exc.status_code in _STALE_UPLOAD_STATUS_CODES
+    )
 
 
 class MultipartUpload:
@@ -248,9 +738,15 @@ class MultipartUpload:
         self.chunk_size = chunk_size or MULTIPART_CHUNK_SIZE
         self.content_type = content_type or "application/octet-stream"
         self.max_concurrency = max_concurrency or MULTIPART_MAX_CONCURRENCY
+        # Without explicit values, the chunk size is picked from the upload's size
+        # and the concurrency is tuned while uploading.
+        self._auto_chunk_size = chunk_size is None
+        self._fixed_concurrency = max_concurrency is not None
         self._access_url: str | None = None
         self._upload_id: str | None = None
         self._parts: list[dict] = []
+        self._manifest: _UploadManifest | None = None
+        self.stats: MultipartUploadStats | None = None
 
     @property
     def access_url(self) -> str:
@@ -294,10 +790,10 @@ class MultipartUpload:
         self._access_url = result["access_url"]
         self._upload_id = result["uploadId"]
 
-    def upload_part(self, part_number: int, data: bytes) -> None:
+    def upload_part(self, part_number: int, data: bytes | _SyncUploadBody) -> None:
         url = f"{self.access_url}/multipart/{self.upload_id}/{part_number}"
 
-        response = _request(
+        response = _maybe_retry_request(
             self._client,
             "PUT",
             url,
@@ -305,6 +801,7 @@ class MultipartUpload:
                 **self.auth_headers,
                 "Content-Type": self.content_type,
                 "Accept-Encoding": "identity",  # Keep this to ensure we get ETag headers
+                **_content_headers(data),
             },
             content=data,
             timeout=None,
@@ -317,6 +814,8 @@ class MultipartUpload:
                 "etag": etag,
             }
         )
+        if self._manifest is not None:
+            self._manifest.record_part(part_number, etag)
 
     def complete(self) -> str:
         url = f"{self.access_url}/multipart/{self.upload_id}/complete"
@@ -325,10 +824,137 @@ class MultipartUpload:
             "POST",
             url,
             headers=self.auth_headers,
-            json={"parts": self._parts},
+            json={"parts": sorted(self._parts, key=lambda part: part["partNumber"])},
         )
         return self.access_url
 
+    def _size_parts(self, size: int) -> None:
+        if self._auto_chunk_size:
+            self.chunk_size = _multipart_chunk_size(size)
+            self._auto_chunk_size = False
+
+    def _finish_stats(self, throttle: _PartThrottle) -> None:
+        self.stats = throttle.stats(self.chunk_size)
+        logger.debug(
+            f"Uploaded {self.stats.parts} parts of {self.file_name} "
+            f"({self.stats.chunk_size} bytes each, up to "
+            f"{self.stats.max_concurrency} in flight) at "
+            f"{self.stats.throughput:.1f} MB/s"
+        )
+
+    def _upload_source(self, source: _UploadSource) -> None:
+        self._size_parts(source.size)
+        parts = math.ceil(source.size / self.chunk_size)
+        uploaded = {part["partNumber"] for part in self._parts}
+        throttle = _SyncPartThrottle(
+            MULTIPART_INITIAL_CONCURRENCY, self.max_concurrency, self._fixed_concurrency
+        )
+
+        def upload_part(part_number: int) -> None:
+            start = (part_number - 1) * self.chunk_size
+            size = min(self.chunk_size, source.size - start)
+            with throttle.slot(size):
+                self.upload_part(part_number, _SyncUploadBody(source, start, size))
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrency
+        ) as executor:
+            futures = [
+                executor.submit(upload_part, part_number)
+                for part_number in range(1, parts + 1)
+                if part_number not in uploaded
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        self._finish_stats(throttle)
+
+    def _upload_stream(self, stream: Iterable[bytes]) -> None:
+        # Only `max_concurrency` chunks are buffered at any time: reading the next
+        # one waits for a slot to free up.
+        slots = threading.BoundedSemaphore(self.max_concurrency)
+        throttle = _SyncPartThrottle(
+            MULTIPART_INITIAL_CONCURRENCY, self.max_concurrency, self._fixed_concurrency
+        )
+
+        def upload_part(part_number: int, chunk: bytearray) -> None:
+            try:
+                with throttle.slot(len(chunk)):
+                    self.upload_part(
+                        part_number, _SyncUploadBody(_MemoryUploadSource(chunk))
+                    )
+            finally:
+                slots.release()
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrency
+        ) as executor:
+            futures: list[concurrent.futures.Future] = []
+            chunks = _iter_chunks(stream, self.chunk_size)
+            part_number = 0
+            while True:
+                slots.acquire()
+                for future in futures:
+                    if future.done():
+                        future.result()
+                chunk = next(chunks, None)
+                if chunk is None:
+                    slots.release()
+                    break
+                part_number += 1
+                futures.append(executor.submit(upload_part, part_number, chunk))
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        self._finish_stats(throttle)
+
+    def _resume(self, manifest: _UploadManifest) -> None:
+        # Parts are cut with the chunk size the upload was started with.
+        self._manifest = manifest
+        self._upload_id = manifest.upload_id
+        self._access_url = manifest.access_url
+        self.chunk_size = manifest.chunk_size
+        self._auto_chunk_size = False
+        self._parts = [
+            {"partNumber": part_number, "etag": etag}
+            for part_number, etag in sorted(manifest.parts.items())
+        ]
+
+    def _upload_resumable(
+        self,
+        source: _UploadSource,
+        manifest: _UploadManifest,
+        object_lifecycle_preference: LifecyclePreferencePayload | None = None,
+    ) -> str:
+        self._size_parts(source.size)
+        if manifest.started:
+            logger.debug(
+                f"Resuming upload {manifest.upload_id} of {self.file_name} "
+                f"({len(manifest.parts)} parts already uploaded)"
+            )
+            self._resume(manifest)
+            try:
+                self._upload_source(source)
+                access_url = self.complete()
+            except FalClientHTTPError as exc:
+                if not _is_stale_upload_error(exc):
+                    raise
+                logger.debug(
+                    f"Upload {manifest.upload_id} can no longer be resumed, starting over"
+                )
+                self._manifest = None
+                self._parts = []
+                manifest.discard()
+            else:
+                manifest.discard()
+                return access_url
+
+        self.create(object_lifecycle_preference=object_lifecycle_preference)
+        manifest.start(self.upload_id, self.access_url, self.chunk_size)
+        self._manifest = manifest
+        self._upload_source(source)
+        access_url = self.complete()
+        manifest.discard()
+        return access_url
+
     @classmethod
     def save(
         cls,
@@ -336,14 +962,12 @@ class MultipartUpload:
         client: httpx.Client,
         token_manager: CDNTokenManager,
         file_name: str,
-        data: bytes,
+        data: bytes | bytearray | memoryview,
         content_type: str | None = None,
         chunk_size: int | None = None,
         max_concurrency: int | None = None,
         object_lifecycle_preference: LifecyclePreferencePayload | None = None,
     ):
-        import concurrent.futures
-
         multipart = cls(
             file_name=file_name,
             client=client,
@@ -353,19 +977,7 @@ class MultipartUpload:
             max_concurrency=max_concurrency,
         )
         multipart.create(object_lifecycle_preference=object_lifecycle_preference)
-        parts = math.ceil(len(data) / multipart.chunk_size)
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=multipart.max_concurrency
-        ) as executor:
-            futures = []
-            for part_number in range(1, parts + 1):
-                start = (part_number - 1) * multipart.chunk_size
-                data = data[start : start + multipart.chunk_size]
-                futures.append(
-                    executor.submit(multipart.upload_part, part_number, data)
-                )
-            for future in concurrent.futures.as_completed(futures):
-                future.result()
+        multipart._upload_source(_MemoryUploadSource(data))
         return multipart.complete()
 
     @classmethod
@@ -374,16 +986,55 @@ class MultipartUpload:
         *,
         client: httpx.Client,
         token_manager: CDNTokenManager,
-        file_path: str | Path,
+        file_path: str | Path | BinaryIO,
         chunk_size: int | None = None,
         content_type: str | None = None,
         max_concurrency: int | None = None,
         object_lifecycle_preference: LifecyclePreferencePayload | None = None,
+        resumable: bool = False,
+        manifest_dir: str | os.PathLike | None = None,
     ) -> str:
-        import concurrent.futures
+        """Upload a local file, or the rest of an open binary file object, reading
+        each part straight from the file while it is being sent.
+
+        With `resumable`, the upload's progress is kept in a manifest under
+        `manifest_dir` (default: ~/.fal/uploads) so that uploading the same,
+        unchanged file again only sends the parts that are still missing."""
+        manifest = None
+        if resumable:
+            if not isinstance(file_path, (str, os.PathLike)):
+                raise ValueError("Resumable uploads require a file path.")
+            manifest = _UploadManifest.for_file(file_path, manifest_dir)
+
+        with _open_upload_source(file_path) as source:
+            return cls._save_source(
+                client=client,
+                token_manager=token_manager,
+                source=source,
+                file_name=_upload_file_name(file_path),
+                chunk_size=chunk_size,
+                content_type=content_type,
+                max_concurrency=max_concurrency,
+                object_lifecycle_preference=object_lifecycle_preference,
+                manifest=manifest,
+            )
 
-        file_name = os.path.basename(file_path)
-        size = os.path.getsize(file_path)
+    @classmethod
+    def _save_source(
+        cls,
+        *,
+        client: httpx.Client,
+        token_manager: CDNTokenManager,
+        source: _FileUploadSource,
+        file_name: str,
+        chunk_size: int | None = None,
+        content_type: str | None = None,
+        max_concurrency: int | None = None,
+        object_lifecycle_preference: LifecyclePreferencePayload | None = None,
+        manifest: _UploadManifest | None = None,
+    ) -> str:
+        """Upload an already open file source, resuming the upload recorded in
+        `manifest` if there is one."""
         multipart = cls(
             file_name=file_name,
             client=client,
@@ -392,24 +1043,40 @@ class MultipartUpload:
             content_type=content_type,
             max_concurrency=max_concurrency,
         )
-        multipart.create(object_lifecycle_preference=object_lifecycle_preference)
-        parts = math.ceil(size / multipart.chunk_size)
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=multipart.max_concurrency
-        ) as executor:
-            futures = []
-            for part_number in range(1, parts + 1):
+        if manifest is not None:
+            return multipart._upload_resumable(
+                source, manifest, object_lifecycle_preference
+            )
 
-                def _upload_part(pn: int) -> None:
-                    with open(file_path, "rb") as f:
-                        start = (pn - 1) * multipart.chunk_size
-                        f.seek(start)
-                        data = f.read(multipart.chunk_size)
-                        multipart.upload_part(pn, data)
+        multipart.create(object_lifecycle_preference=object_lifecycle_preference)
+        multipart._upload_source(source)
+        return multipart.complete()
 
-                futures.append(executor.submit(_upload_part, part_number))
-            for future in concurrent.futures.as_completed(futures):
-                future.result()
+    @classmethod
+    def save_stream(
+        cls,
+        *,
+        client: httpx.Client,
+        token_manager: CDNTokenManager,
+        file_name: str,
+        stream: Iterable[bytes],
+        content_type: str | None = None,
+        chunk_size: int | None = None,
+        max_concurrency: int | None = None,
+        object_lifecycle_preference: LifecyclePreferencePayload | None = None,
+    ) -> str:
+        """Upload data of unknown size from an iterator of byte strings, keeping at
+        most `max_concurrency` chunks of it in memory."""
+        multipart = cls(
+            file_name=file_name,
+            client=client,
+            token_manager=token_manager,
+            chunk_size=chunk_size,
+            content_type=content_type,
+            max_concurrency=max_concurrency,
+        )
+        multipart.create(object_lifecycle_preference=object_lifecycle_preference)
+        multipart._upload_stream(stream)
         return multipart.complete()
 
 
@@ -430,9 +1097,15 @@ class AsyncMultipartUpload:
         self.chunk_size = chunk_size or MULTIPART_CHUNK_SIZE
         self.content_type = content_type or "application/octet-stream"
         self.max_concurrency = max_concurrency or MULTIPART_MAX_CONCURRENCY
+        # Without explicit values, the chunk size is picked from the upload's size
+        # and the concurrency is tuned while uploading.
+        self._auto_chunk_size = chunk_size is None
+        self._fixed_concurrency = max_concurrency is not None
         self._access_url: str | None = None
         self._upload_id: str | None = None
         self._parts: list[dict] = []
+        self._manifest: _UploadManifest | None = None
+        self.stats: MultipartUploadStats | None = None
 
     @property
     def access_url(self) -> str:
@@ -476,11 +1149,13 @@ class AsyncMultipartUpload:
         self._access_url = result["access_url"]
         self._upload_id = result["uploadId"]
 
-    async def upload_part(self, part_number: int, data: bytes) -> None:
+    async def upload_part(
+        self, part_number: int, data: bytes | _AsyncUploadBody
+    ) -> None:
         url = f"{self.access_url}/multipart/{self.upload_id}/{part_number}"
         headers = await self.get_auth_headers()
 
-        response = await _async_request(
+        response = await _async_maybe_retry_request(
             self._client,
             "PUT",
             url,
@@ -488,6 +1163,7 @@ class AsyncMultipartUpload:
                 **headers,
                 "Content-Type": self.content_type,
                 "Accept-Encoding": "identity",  # Keep this to ensure we get ETag headers
+                **_content_headers(data),
             },
             content=data,
             timeout=None,
@@ -500,6 +1176,10 @@ class AsyncMultipartUpload:
                 "etag": etag,
             }
         )
+        if self._manifest is not None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._manifest.record_part, part_number, etag
+            )
 
     async def complete(self) -> str:
         url = f"{self.access_url}/multipart/{self.upload_id}/complete"
@@ -509,10 +1189,143 @@ class AsyncMultipartUpload:
             "POST",
             url,
             headers=headers,
-            json={"parts": self._parts},
+            json={"parts": sorted(self._parts, key=lambda part: part["partNumber"])},
         )
         return self.access_url
 
+    def _size_parts(self, size: int) -> None:
+        if self._auto_chunk_size:
+            self.chunk_size = _multipart_chunk_size(size)
+            self._auto_chunk_size = False
+
+    def _finish_stats(self, throttle: _PartThrottle) -> None:
+        self.stats = throttle.stats(self.chunk_size)
+        logger.debug(
+            f"Uploaded {self.stats.parts} parts of {self.file_name} "
+            f"({self.stats.chunk_size} bytes each, up to "
+            f"{self.stats.max_concurrency} in flight) at "
+            f"{self.stats.throughput:.1f} MB/s"
+        )
+
+    async def _upload_source(self, source: _UploadSource) -> None:
+        self._size_parts(source.size)
+        parts = math.ceil(source.size / self.chunk_size)
+        uploaded = {part["partNumber"] for part in self._parts}
+        throttle = _AsyncPartThrottle(
+            MULTIPART_INITIAL_CONCURRENCY, self.max_concurrency, self._fixed_concurrency
+        )
+
+        async def bounded_upload(part_number: int) -> None:
+            start = (part_number - 1) * self.chunk_size
+            size = min(self.chunk_size, source.size - start)
+            async with throttle.slot(size):
+                await self.upload_part(
+                    part_number, _AsyncUploadBody(source, start, size)
+                )
+
+        tasks = [
+            asyncio.ensure_future(bounded_upload(part_number))
+            for part_number in range(1, parts + 1)
+            if part_number not in uploaded
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        self._finish_stats(throttle)
+
+    async def _upload_stream(self, stream: AsyncIterable[bytes]) -> None:
+        # Only `max_concurrency` chunks are buffered at any time: reading the next
+        # one waits for a slot to free up.
+        slots = asyncio.Semaphore(self.max_concurrency)
+        throttle = _AsyncPartThrottle(
+            MULTIPART_INITIAL_CONCURRENCY, self.max_concurrency, self._fixed_concurrency
+        )
+
+        async def upload_part(part_number: int, chunk: bytearray) -> None:
+            try:
+                async with throttle.slot(len(chunk)):
+                    await self.upload_part(
+                        part_number, _AsyncUploadBody(_MemoryUploadSource(chunk))
+                    )
+            finally:
+                slots.release()
+
+        tasks: list[asyncio.Future] = []
+        chunks = _aiter_chunks(stream, self.chunk_size)
+        try:
+            part_number = 0
+            while True:
+                await slots.acquire()
+                for task in tasks:
+                    if task.done():
+                        task.result()
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    slots.release()
+                    break
+                part_number += 1
+                tasks.append(asyncio.ensure_future(upload_part(part_number, chunk)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        self._finish_stats(throttle)
+
+    def _resume(self, manifest: _UploadManifest) -> None:
+        # Parts are cut with the chunk size the upload was started with.
+        self._manifest = manifest
+        self._upload_id = manifest.upload_id
+        self._access_url = manifest.access_url
+        self.chunk_size = manifest.chunk_size
+        self._auto_chunk_size = False
+        self._parts = [
+            {"partNumber": part_number, "etag": etag}
+            for part_number, etag in sorted(manifest.parts.items())
+        ]
+
+    async def _upload_resumable(
+        self,
+        source: _UploadSource,
+        manifest: _UploadManifest,
+        object_lifecycle_preference: LifecyclePreferencePayload | None = None,
+    ) -> str:
+        self._size_parts(source.size)
+        loop = asyncio.get_running_loop()
+        if manifest.started:
+            logger.debug(
+                f"Resuming upload {manifest.upload_id} of {self.file_name} "
+                f"({len(manifest.parts)} parts already uploaded)"
+            )
+            self._resume(manifest)
+            try:
+                await self._upload_source(source)
+                access_url = await self.complete()
+            except FalClientHTTPError as exc:
+                if not _is_stale_upload_error(exc):
+                    raise
+                logger.debug(
+                    f"Upload {manifest.upload_id} can no longer be resumed, starting over"
+                )
+                self._manifest = None
+                self._parts = []
+                await loop.run_in_executor(None, manifest.discard)
+            else:
+                await loop.run_in_executor(None, manifest.discard)
+                return access_url
+
+        await self.create(object_lifecycle_preference=object_lifecycle_preference)
+        await loop.run_in_executor(
+            None, manifest.start, self.upload_id, self.access_url, self.chunk_size
+        )
+        self._manifest = manifest
+        await self._upload_source(source)
+        access_url = await self.complete()
+        await loop.run_in_executor(None, manifest.discard)
+        return access_url
+
     @classmethod
     async def save(
         cls,
@@ -520,7 +1333,7 @@ class AsyncMultipartUpload:
         client: httpx.AsyncClient,
         token_manager: AsyncCDNTokenManager,
         file_name: str,
-        data: bytes,
+        data: bytes | bytearray | memoryview,
         content_type: str | None = None,
         chunk_size: int | None = None,
         max_concurrency: int | None = None,
@@ -535,22 +1348,7 @@ class AsyncMultipartUpload:
             max_concurrency=max_concurrency,
         )
         await multipart.create(object_lifecycle_preference=object_lifecycle_preference)
-        parts = math.ceil(len(data) / multipart.chunk_size)
-
-        async def upload_part(part_number: int) -> None:
-            start = (part_number - 1) * multipart.chunk_size
-            chunk = data[start : start + multipart.chunk_size]
-            await multipart.upload_part(part_number, chunk)
-
-        sem = asyncio.Semaphore(multipart.max_concurrency)
-
-        async def bounded_upload(part_number: int) -> None:
-            async with sem:
-                await upload_part(part_number)
-
-        await asyncio.gather(
-            *(bounded_upload(part_number) for part_number in range(1, parts + 1))
-        )
+        await multipart._upload_source(_MemoryUploadSource(data))
         return await multipart.complete()
 
     @classmethod
@@ -559,14 +1357,57 @@ class AsyncMultipartUpload:
         *,
         client: httpx.AsyncClient,
         token_manager: AsyncCDNTokenManager,
-        file_path: str | Path,
+        file_path: str | Path | BinaryIO,
+        chunk_size: int | None = None,
+        content_type: str | None = None,
+        max_concurrency: int | None = None,
+        object_lifecycle_preference: LifecyclePreferencePayload | None = None,
+        resumable: bool = False,
+        manifest_dir: str | os.PathLike | None = None,
+    ) -> str:
+        """Upload a local file, or the rest of an open binary file object, reading
+        each part straight from the file (off the event loop) while it is sent.
+
+        With `resumable`, the upload's progress is kept in a manifest under
+        `manifest_dir` (default: ~/.fal/uploads) so that uploading the same,
+        unchanged file again only sends the parts that are still missing."""
+        manifest = None
+        if resumable:
+            if not isinstance(file_path, (str, os.PathLike)):
+                raise ValueError("Resumable uploads require a file path.")
+            manifest = await asyncio.get_running_loop().run_in_executor(
+                None, _UploadManifest.for_file, file_path, manifest_dir
+            )
+
+        async with _async_open_upload_source(file_path) as source:
+            return await cls._save_source(
+                client=client,
+                token_manager=token_manager,
+                source=source,
+                file_name=_upload_file_name(file_path),
+                chunk_size=chunk_size,
+                content_type=content_type,
+                max_concurrency=max_concurrency,
+                object_lifecycle_preference=object_lifecycle_preference,
+                manifest=manifest,
+            )
+
+    @classmethod
+    async def _save_source(
+        cls,
+        *,
+        client: httpx.AsyncClient,
+        token_manager: AsyncCDNTokenManager,
+        source: _FileUploadSource,
+        file_name: str,
         chunk_size: int | None = None,
         content_type: str | None = None,
         max_concurrency: int | None = None,
         object_lifecycle_preference: LifecyclePreferencePayload | None = None,
+        manifest: _UploadManifest | None = None,
     ) -> str:
-        file_name = os.path.basename(file_path)
-        size = await aiofiles.os.path.getsize(file_path)
+        """Upload an already open file source, resuming the upload recorded in
+        `manifest` if there is one."""
         multipart = cls(
             file_name=file_name,
             client=client,
@@ -575,25 +1416,40 @@ class AsyncMultipartUpload:
             content_type=content_type,
             max_concurrency=max_concurrency,
         )
-        await multipart.create(object_lifecycle_preference=object_lifecycle_preference)
-        parts = math.ceil(size / multipart.chunk_size)
-
-        async def upload_part(part_number: int) -> None:
-            async with aiofiles.open(file_path, "rb") as f:
-                start = (part_number - 1) * multipart.chunk_size
-                await f.seek(start)
-                data = await f.read(multipart.chunk_size)
-                await multipart.upload_part(part_number, data)
-
-        sem = asyncio.Semaphore(multipart.max_concurrency)
+        if manifest is not None:
+            return await multipart._upload_resumable(
+                source, manifest, object_lifecycle_preference
+            )
 
-        async def bounded_upload(part_number: int) -> None:
-            async with sem:
-                await upload_part(part_number)
+        await multipart.create(object_lifecycle_preference=object_lifecycle_preference)
+        await multipart._upload_source(source)
+        return await multipart.complete()
 
-        await asyncio.gather(
-            *(bounded_upload(part_number) for part_number in range(1, parts + 1))
+    @classmethod
+    async def save_stream(
+        cls,
+        *,
+        client: httpx.AsyncClient,
+        token_manager: AsyncCDNTokenManager,
+        file_name: str,
+        stream: AsyncIterable[bytes],
+        content_type: str | None = None,
+        chunk_size: int | None = None,
+        max_concurrency: int | None = None,
+        object_lifecycle_preference: LifecyclePreferencePayload | None = None,
+    ) -> str:
+        """Upload data of unknown size from an async iterator of byte strings,
+        keeping at most `max_concurrency` chunks of it in memory."""
+        multipart = cls(
+            file_name=file_name,
+            client=client,
+            token_manager=token_manager,
+            chunk_size=chunk_size,
+            content_type=content_type,
+            max_concurrency=max_concurrency,
         )
+        await multipart.create(object_lifecycle_preference=object_lifecycle_preference)
+        await multipart._upload_stream(stream)
         return await multipart.complete()
 
 
@@ -1046,6 +1902,30 @@ INGRESS_ERROR_CODES = [502, 503, 504]
 # httpx.Timeout object with a shorter connect timeout ensures we detect stalls.
 QUEUE_POLL_TIMEOUT = httpx.Timeout(120.0, connect=30.0)
 DEFAULT_QUEUE_POLL_INTERVAL = 0.1
+QUEUE_MAX_POLL_INTERVAL = 2.0
+QUEUE_POLL_BACKOFF_FACTOR = 1.5
+# The status stream stays open while the request is running. Reads are still
+# bounded so a silently dropped connection gets re-established instead of hanging.
+QUEUE_STREAM_TIMEOUT = httpx.Timeout(120.0, connect=30.0)
+# How many times in a row the status stream is re-established after timing out
+# without any event, before falling back to polling.
+QUEUE_STREAM_MAX_RECONNECTS = 3
+
+
+def _next_poll_interval(
+    interval: float,
+    base_interval: float,
+    max_interval: float | None,
+    previous: Status | None,
+    current: Status,
+) -> float:
+    if max_interval is None:
+        return interval
+    # Any change in the request state (e.g. it started running) is a sign that
+    # more updates are coming soon, so go back to polling at the base rate.
+    if type(previous) is not type(current):
+        return base_interval
+    return min(interval * QUEUE_POLL_BACKOFF_FACTOR, max(max_interval, base_interval))
 
 
 def _is_ingress_error(response: httpx.Response) -> bool:
@@ -1286,7 +2166,7 @@ def _upload_via_storage(
     client: httpx.Client,
     auth: AuthCredentials,
     *,
-    data: bytes,
+    data: bytes | _SyncUploadBody,
     content_type: str,
     file_name: str | None,
     object_lifecycle_preference: LifecyclePreferencePayload | None = None,
@@ -1306,7 +2186,7 @@ def _upload_via_storage(
         "PUT",
         upload_url,
         content=data,
-        headers={"Content-Type": content_type},
+        headers={"Content-Type": content_type, **_content_headers(data)},
         timeout=None,
     )
     return file_url
@@ -1316,7 +2196,7 @@ async def _async_upload_via_storage(
     client: httpx.AsyncClient,
     auth: AuthCredentials,
     *,
-    data: bytes,
+    data: bytes | _AsyncUploadBody,
     content_type: str,
     file_name: str | None,
     object_lifecycle_preference: LifecyclePreferencePayload | None = None,
@@ -1336,7 +2216,7 @@ async def _async_upload_via_storage(
         "PUT",
         upload_url,
         content=data,
-        headers={"Content-Type": content_type},
+        headers={"Content-Type": content_type, **_content_headers(data)},
         timeout=None,
     )
     return file_url
@@ -1345,7 +2225,7 @@ async def _async_upload_via_storage(
 def _upload_v3(
     client: httpx.Client,
     *,
-    data: bytes,
+    data: bytes | _SyncUploadBody,
     headers: dict[str, str],
 ) -> str:
     response = _maybe_retry_request(
@@ -1353,7 +2233,7 @@ def _upload_v3(
         "POST",
         CDN_URL + "/files/upload",
         content=data,
-        headers=headers,
+        headers={**headers, **_content_headers(data)},
     )
     return response.json()["access_url"]
 
@@ -1361,7 +2241,7 @@ def _upload_v3(
 async def _async_upload_v3(
     client: httpx.AsyncClient,
     *,
-    data: bytes,
+    data: bytes | _AsyncUploadBody,
     headers: dict[str, str],
 ) -> str:
     response = await _async_maybe_retry_request(
@@ -1369,7 +2249,7 @@ async def _async_upload_v3(
         "POST",
         CDN_URL + "/files/upload",
         content=data,
-        headers=headers,
+        headers={**headers, **_content_headers(data)},
     )
     return response.json()["access_url"]
 
@@ -1410,6 +2290,56 @@ async def _async_try_upload_with_fallback(
     raise RuntimeError("Upload attempts were exhausted")
 
 
+QUEUE_WAIT_MAX_CONCURRENCY = 16
+
+
+def _check_max_concurrency(max_concurrency: int) -> None:
+    if max_concurrency <= 0:
+        raise ValueError(
+            f"max_concurrency must be a positive integer, got {max_concurrency}"
+        )
+
+
+class _PollSchedule:
+    """Next-poll deadlines for a set of request handles, kept in a heap so that a
+    single waiter can drive all of them."""
+
+    def __init__(self, count: int, interval: float, max_interval: float | None) -> None:
+        self._interval = interval
+        self._max_interval = max_interval
+        self._delays = [interval] * count
+        self._previous: list[Status | None] = [None] * count
+        now = time.monotonic()
+        self._heap: list[tuple[float, int]] = [(now, index) for index in range(count)]
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def pop_due(self, limit: int) -> list[int]:
+        now = time.monotonic()
+        due: list[int] = []
+        while self._heap and len(due) < limit and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    def time_until_next(self) -> float | None:
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - time.monotonic(), 0)
+
+    def reschedule(self, index: int, status: Status) -> None:
+        delay = _next_poll_interval(
+            self._delays[index],
+            self._interval,
+            self._max_interval,
+            self._previous[index],
+            status,
+        )
+        self._delays[index] = delay
+        self._previous[index] = status
+        heapq.heappush(self._heap, (time.monotonic() + delay, index))
+
+
 def _maybe_cancel_request(handle: SyncRequestHandle) -> None:
     try:
         handle.cancel()
@@ -1465,31 +2395,117 @@ class SyncRequestHandle(_BaseRequestHandle):
         return self._parse_status(response.json())
 
     def iter_events(
-        self, *, with_logs: bool = False, interval: float = DEFAULT_QUEUE_POLL_INTERVAL
+        self,
+        *,
+        with_logs: bool = False,
+        interval: float = DEFAULT_QUEUE_POLL_INTERVAL,
+        max_interval: float | None = None,
     ) -> Iterator[Status]:
         """Continuously poll for the status of the request and yield it at each interval till
         the request is completed. If `with_logs` is True, logs will be included in the response.
+
+        If `max_interval` is set, the interval grows while the status stays the same
+        (up to `max_interval`) and resets to `interval` whenever it changes.
         """
 
+        delay = interval
+        previous: Status | None = None
         while True:
             status = self.status(with_logs=with_logs)
             yield status
             if isinstance(status, Completed):
                 break
 
-            time.sleep(interval)
+            delay = _next_poll_interval(delay, interval, max_interval, previous, status)
+            previous = status
+            time.sleep(delay)
 
-    def get(self, *, interval: float = DEFAULT_QUEUE_POLL_INTERVAL) -> AnyJSON:
-        """Wait till the request is completed and return the result of the inference call."""
-        for _ in self.iter_events(with_logs=False, interval=interval):
-            continue
+    def stream_events(
+        self, *, with_logs: bool = False, interval: float = DEFAULT_QUEUE_POLL_INTERVAL
+    ) -> Iterator[Status]:
+        """Yield status updates pushed by the queue's status stream till the request is
+        completed. A stream that ends or times out is re-established, up to
+        `QUEUE_STREAM_MAX_RECONNECTS` times in a row without any event. If the stream
+        can't be used, falls back to polling with backoff, starting at `interval`."""
+
+        reconnects = 0
+        while True:
+            received = False
+            try:
+                with connect_sse(
+                    self.client,
+                    "GET",
+                    self.status_url + "/stream",
+                    params={"logs": with_logs},
+                    timeout=QUEUE_STREAM_TIMEOUT,
+                ) as events:
+                    _raise_for_status(events.response)
+                    for event in events.iter_sse():
+                        status = self._parse_status(event.json())
+                        received = True
+                        yield status
+                        if isinstance(status, Completed):
+                            return
+            except httpx.ReadTimeout:
+                logger.debug(f"Status stream for {self.request_id} timed out")
+            except (httpx.HTTPError, FalClientHTTPError, SSEError) as exc:
+                logger.debug(
+                    f"Status stream for {self.request_id} is unavailable ({exc}), "
+                    "falling back to polling"
+                )
+                break
+
+            if received:
+                reconnects = 0
+            elif reconnects < QUEUE_STREAM_MAX_RECONNECTS:
+                reconnects += 1
+            else:
+                break
 
+        yield from self.iter_events(
+            with_logs=with_logs,
+            interval=interval,
+            max_interval=QUEUE_MAX_POLL_INTERVAL,
+        )
+
+    def _wait_events(
+        self, *, with_logs: bool, interval: float, wait_mode: QueueWaitMode
+    ) -> Iterator[Status]:
+        if wait_mode == "stream":
+            return self.stream_events(with_logs=with_logs, interval=interval)
+        if wait_mode == "backoff":
+            return self.iter_events(
+                with_logs=with_logs,
+                interval=interval,
+                max_interval=QUEUE_MAX_POLL_INTERVAL,
+            )
+        return self.iter_events(with_logs=with_logs, interval=interval)
+
+    def _fetch_result(self) -> AnyJSON:
         response = _maybe_retry_request(
             self.client, "GET", self.response_url, timeout=QUEUE_POLL_TIMEOUT
         )
         _raise_for_status(response)
         return response.json()
 
+    def get(
+        self,
+        *,
+        interval: float = DEFAULT_QUEUE_POLL_INTERVAL,
+        wait_mode: QueueWaitMode = "poll",
+    ) -> AnyJSON:
+        """Wait till the request is completed and return the result of the inference call.
+
+        `wait_mode` selects how completion is detected: "poll" (fixed `interval`),
+        "backoff" (growing interval) or "stream" (status pushed by the server).
+        """
+        for _ in self._wait_events(
+            with_logs=False, interval=interval, wait_mode=wait_mode
+        ):
+            continue
+
+        return self._fetch_result()
+
     def cancel(self) -> None:
         """Cancel the request."""
         response = _maybe_retry_request(
@@ -1542,25 +2558,94 @@ class AsyncRequestHandle(_BaseRequestHandle):
         return self._parse_status(response.json())
 
     async def iter_events(
-        self, *, with_logs: bool = False, interval: float = DEFAULT_QUEUE_POLL_INTERVAL
+        self,
+        *,
+        with_logs: bool = False,
+        interval: float = DEFAULT_QUEUE_POLL_INTERVAL,
+        max_interval: float | None = None,
     ) -> AsyncIterator[Status]:
         """Continuously poll for the status of the request and yield it at each interval till
         the request is completed. If `with_logs` is True, logs will be included in the response.
+
+        If `max_interval` is set, the interval grows while the status stays the same
+        (up to `max_interval`) and resets to `interval` whenever it changes.
         """
 
+        delay = interval
+        previous: Status | None = None
         while True:
             status = await self.status(with_logs=with_logs)
             yield status
             if isinstance(status, Completed):
                 break
 
-            await asyncio.sleep(interval)
+            delay = _next_poll_interval(delay, interval, max_interval, previous, status)
+            previous = status
+            await asyncio.sleep(delay)
 
-    async def get(self, *, interval: float = DEFAULT_QUEUE_POLL_INTERVAL) -> AnyJSON:
-        """Wait till the request is completed and return the result."""
-        async for _ in self.iter_events(with_logs=False, interval=interval):
-            continue
+    async def stream_events(
+        self, *, with_logs: bool = False, interval: float = DEFAULT_QUEUE_POLL_INTERVAL
+    ) -> AsyncIterator[Status]:
+        """Yield status updates pushed by the queue's status stream till the request is
+        completed. A stream that ends or times out is re-established, up to
+        `QUEUE_STREAM_MAX_RECONNECTS` times in a row without any event. If the stream
+        can't be used, falls back to polling with backoff, starting at `interval`."""
+
+        reconnects = 0
+        while True:
+            received = False
+            try:
+                async with aconnect_sse(
+                    self.client,
+                    "GET",
+                    self.status_url + "/stream",
+                    params={"logs": with_logs},
+                    timeout=QUEUE_STREAM_TIMEOUT,
+                ) as events:
+                    _raise_for_status(events.response)
+                    async for event in events.aiter_sse():
+                        status = self._parse_status(event.json())
+                        received = True
+                        yield status
+                        if isinstance(status, Completed):
+                            return
+            except httpx.ReadTimeout:
+                logger.debug(f"Status stream for {self.request_id} timed out")
+            except (httpx.HTTPError, FalClientHTTPError, SSEError) as exc:
+                logger.debug(
+                    f"Status stream for {self.request_id} is unavailable ({exc}), "
+                    "falling back to polling"
+                )
+                break
+
+            if received:
+                reconnects = 0
+            elif reconnects < QUEUE_STREAM_MAX_RECONNECTS:
+                reconnects += 1
+            else:
+                break
 
+        async for status in self.iter_events(
+            with_logs=with_logs,
+            interval=interval,
+            max_interval=QUEUE_MAX_POLL_INTERVAL,
+        ):
+            yield status
+
+    def _wait_events(
+        self, *, with_logs: bool, interval: float, wait_mode: QueueWaitMode
+    ) -> AsyncIterator[Status]:
+        if wait_mode == "stream":
+            return self.stream_events(with_logs=with_logs, interval=interval)
+        if wait_mode == "backoff":
+            return self.iter_events(
+                with_logs=with_logs,
+                interval=interval,
+                max_interval=QUEUE_MAX_POLL_INTERVAL,
+            )
+        return self.iter_events(with_logs=with_logs, interval=interval)
+
+    async def _fetch_result(self) -> AnyJSON:
         response = await _async_maybe_retry_request(
             self.client,
             "GET",
@@ -1570,6 +2655,24 @@ class AsyncRequestHandle(_BaseRequestHandle):
         _raise_for_status(response)
         return response.json()
 
+    async def get(
+        self,
+        *,
+        interval: float = DEFAULT_QUEUE_POLL_INTERVAL,
+        wait_mode: QueueWaitMode = "poll",
+    ) -> AnyJSON:
+        """Wait till the request is completed and return the result.
+
+        `wait_mode` selects how completion is detected: "poll" (fixed `interval`),
+        "backoff" (growing interval) or "stream" (status pushed by the server).
+        """
+        async for _ in self._wait_events(
+            with_logs=False, interval=interval, wait_mode=wait_mode
+        ):
+            continue
+
+        return await self._fetch_result()
+
     async def cancel(self) -> None:
         """Cancel the request."""
         response = await _async_maybe_retry_request(
@@ -1587,6 +2690,12 @@ class AsyncRequestHandle(_BaseRequestHandle):
 class AsyncClient:
     key: str | None = field(default=None, repr=False)
     default_timeout: float = 120.0
+    cdn_max_connections: int = CDN_MAX_CONNECTIONS
+    cdn_max_keepalive_connections: int = CDN_MAX_KEEPALIVE_CONNECTIONS
+    cdn_http2: bool = False
+    # Opt-in: return the URL of an earlier upload of the same content, instead of
+    # uploading it again, while that URL is valid.
+    upload_cache: UploadCache | None = None
 
     @async_cached_property(asyncio.Lock)
     async def _auth(self) -> AuthCredentials:
@@ -1609,13 +2718,22 @@ class AsyncClient:
     async def _token_manager(self) -> AsyncCDNTokenManager:
         return AsyncCDNTokenManager(await self._auth)
 
+    @async_cached_property(asyncio.Lock)
+    async def _pooled_cdn_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            **_cdn_client_options(
+                _AsyncCDNTokenAuth(await self._token_manager),
+                timeout=self.default_timeout,
+                max_connections=self.cdn_max_connections,
+                max_keepalive_connections=self.cdn_max_keepalive_connections,
+                http2=self.cdn_http2,
+            )
+        )
+
     @asynccontextmanager
     async def _cdn_client(self) -> AsyncIterator[httpx.AsyncClient]:
-        async with httpx.AsyncClient(
-            headers={"User-Agent": USER_AGENT},
-            timeout=self.default_timeout,
-        ) as client:
-            yield client
+        # The pooled client is shared by all uploads, so it's not closed here.
+        yield await self._pooled_cdn_client
 
     async def _get_realtime_token(
         self,
@@ -1765,11 +2883,15 @@ class AsyncClient:
         headers: dict[str, str] = {},
         start_timeout: Optional[Union[int, float]] = None,
         client_timeout: Optional[Union[int, float]] = None,
+        wait_mode: QueueWaitMode = "poll",
     ) -> AnyJSON:
         """Subscribe to an application and wait for the result.
 
         Args:
             interval: Polling interval in seconds while waiting for request updates.
+            wait_mode: How to wait for completion: "poll" at a fixed interval,
+                "backoff" with a growing interval, or "stream" status updates
+                pushed by the server (falls back to "backoff" if unavailable).
             start_timeout: Server-side request timeout in seconds. Limits total time spent
                 waiting before processing starts (includes queue wait, retries, and
                 routing). Does not apply once the application begins processing.
@@ -1808,14 +2930,19 @@ class AsyncClient:
                     await result
 
             if on_queue_update is not None:
-                async for event in handle.iter_events(
-                    with_logs=with_logs, interval=interval
+                async for event in handle._wait_events(
+                    with_logs=with_logs, interval=interval, wait_mode=wait_mode
                 ):
                     result = on_queue_update(event)
                     if inspect.isawaitable(result):
                         await result
 
-            return await handle.get(interval=interval)
+                # The stream already delivered the completion, re-opening it
+                # just to observe it again would cost another connection.
+                if wait_mode == "stream":
+                    return await handle._fetch_result()
+
+            return await handle.get(interval=interval, wait_mode=wait_mode)
 
         if client_timeout is None:
             return await _do_subscribe()
@@ -1845,14 +2972,120 @@ class AsyncClient:
         handle = await self.get_handle(application, request_id)
         return await handle.status(with_logs=with_logs)
 
-    async def result(self, application: str, request_id: str) -> AnyJSON:
+    async def result(
+        self,
+        application: str,
+        request_id: str,
+        *,
+        wait_mode: QueueWaitMode = "poll",
+    ) -> AnyJSON:
         handle = await self.get_handle(application, request_id)
-        return await handle.get()
+        return await handle.get(wait_mode=wait_mode)
 
     async def cancel(self, application: str, request_id: str) -> None:
         handle = await self.get_handle(application, request_id)
         await handle.cancel()
 
+    async def _iter_completed(
+        self,
+        handles: list[AsyncRequestHandle],
+        *,
+        interval: float,
+        max_interval: float | None,
+        max_concurrency: int,
+    ) -> AsyncIterator[tuple[int, AnyJSON]]:
+        _check_max_concurrency(max_concurrency)
+        schedule = _PollSchedule(len(handles), interval, max_interval)
+
+        async def check(index: int) -> tuple[int, Status, AnyJSON | None]:
+            handle = handles[index]
+            status = await handle.status()
+            if isinstance(status, Completed):
+                return index, status, await handle._fetch_result()
+            return index, status, None
+
+        in_flight: set[asyncio.Future] = set()
+        try:
+            while schedule or in_flight:
+                for index in schedule.pop_due(max_concurrency - len(in_flight)):
+                    in_flight.add(asyncio.ensure_future(check(index)))
+
+                timeout = schedule.time_until_next()
+                if not in_flight:
+                    await asyncio.sleep(timeout or 0)
+                    continue
+                if len(in_flight) >= max_concurrency:
+                    timeout = None
+
+                done, in_flight = await asyncio.wait(
+                    in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    index, status, result = task.result()
+                    if isinstance(status, Completed):
+                        yield index, result
+                    else:
+                        schedule.reschedule(index, status)
+        finally:
+            # The other handles' checks are cancelled, e.g. when one of them failed
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def as_completed(
+        self,
+        handles: Iterable[AsyncRequestHandle],
+        *,
+        interval: float = DEFAULT_QUEUE_POLL_INTERVAL,
+        max_interval: float | None = QUEUE_MAX_POLL_INTERVAL,
+        max_concurrency: int = QUEUE_WAIT_MAX_CONCURRENCY,
+    ) -> AsyncIterator[tuple[AsyncRequestHandle, AnyJSON]]:
+        """Wait for many requests at once and yield `(handle, result)` pairs in the
+        order they complete.
+
+        All handles share one scheduler: each is polled when its own deadline comes
+        up (backing off up to `max_interval` while its status doesn't change), with
+        at most `max_concurrency` status/result calls in flight.
+
+        If checking the status or fetching the result of a handle fails, its error is
+        raised and the checks of the other handles are cancelled. The handles that
+        weren't yielded yet can be waited for again.
+
+        Raises:
+            ValueError: If `max_concurrency` isn't positive.
+        """
+        handle_list = list(handles)
+        async for index, result in self._iter_completed(
+            handle_list,
+            interval=interval,
+            max_interval=max_interval,
+            max_concurrency=max_concurrency,
+        ):
+            yield handle_list[index], result
+
+    async def wait_many(
+        self,
+        handles: Iterable[AsyncRequestHandle],
+        *,
+        interval: float = DEFAULT_QUEUE_POLL_INTERVAL,
+        max_interval: float | None = QUEUE_MAX_POLL_INTERVAL,
+        max_concurrency: int = QUEUE_WAIT_MAX_CONCURRENCY,
+    ) -> list[AnyJSON]:
+        """Wait for all the given requests and return their results in the same
+        order as `handles`. See `as_completed()` for the scheduling options and
+        how errors are handled."""
+        handle_list = list(handles)
+        results: list[AnyJSON] = [{} for _ in handle_list]
+        async for index, result in self._iter_completed(
+            handle_list,
+            interval=interval,
+            max_interval=max_interval,
+            max_concurrency=max_concurrency,
+        ):
+            results[index] = result
+        return results
+
     async def stream(
         self,
         application: str,
@@ -1918,11 +3151,21 @@ class AsyncClient:
         repository_chain = _normalize_upload_repositories(
             repository, fallback_repository
         )
+        cache_key, url = await self._cached_upload(
+            _MemoryUploadSource(data),
+            content_type,
+            file_name,
+            repository_chain,
+            resolved_lifecycle,
+        )
+        if url is not None:
+            return url
+
         if len(data) > MULTIPART_THRESHOLD and repository_chain[0] == "fal_v3":
             if file_name is None:
                 file_name = "upload.bin"
             async with self._cdn_client() as cdn_client:
-                return await AsyncMultipartUpload.save(
+                url = await AsyncMultipartUpload.save(
                     client=cdn_client,
                     token_manager=token_manager,
                     file_name=file_name,
@@ -1930,11 +3173,61 @@ class AsyncClient:
                     content_type=content_type,
                     object_lifecycle_preference=resolved_lifecycle,
                 )
+        else:
+            url = await self._upload_single(
+                data,
+                content_type,
+                file_name,
+                repository_chain=repository_chain,
+                lifecycle=resolved_lifecycle,
+            )
+        self._cache_upload(cache_key, url, resolved_lifecycle)
+        return url
+
+    async def _cached_upload(
+        self,
+        source: _UploadSource,
+        content_type: str,
+        file_name: str | None,
+        repository_chain: list[UploadRepositoryId],
+        lifecycle: LifecyclePreferencePayload | None,
+    ) -> tuple[str | None, str | None]:
+        """Look the content up in the upload cache, returning its cache key and
+        the URL of an earlier upload (if there is one)."""
+        if self.upload_cache is None:
+            return None, None
+        digest = await asyncio.get_running_loop().run_in_executor(
+            None, _source_digest, source
+        )
+        key = self.upload_cache.key(
+            digest, file_name, repository_chain[0], content_type, lifecycle
+        )
+        return key, self.upload_cache.get(key)
+
+    def _cache_upload(
+        self,
+        key: str | None,
+        url: str,
+        lifecycle: LifecyclePreferencePayload | None,
+    ) -> None:
+        if key is not None and self.upload_cache is not None:
+            self.upload_cache.put(key, url, lifecycle_expiration(lifecycle))
+
+    async def _upload_single(
+        self,
+        data: bytes | _AsyncUploadBody,
+        content_type: str,
+        file_name: str | None,
+        *,
+        repository_chain: list[UploadRepositoryId],
+        lifecycle: LifecyclePreferencePayload | None,
+    ) -> str:
+        token_manager = await self._token_manager
 
         headers = {"Content-Type": content_type}
         if file_name is not None:
             headers["X-Fal-File-Name"] = file_name
-        _object_lifecycle_headers(headers, resolved_lifecycle)
+        _object_lifecycle_headers(headers, lifecycle)
 
         auth: AuthCredentials | None = None
         client: httpx.AsyncClient | None = None
@@ -1967,7 +3260,7 @@ class AsyncClient:
                             data=data,
                             content_type=content_type,
                             file_name=file_name,
-                            object_lifecycle_preference=resolved_lifecycle,
+                            object_lifecycle_preference=lifecycle,
                         ),
                     )
                 )
@@ -1976,50 +3269,129 @@ class AsyncClient:
 
     async def upload_file(
         self,
-        path: os.PathLike,
+        path: os.PathLike | BinaryIO,
         *,
         repository: UploadRepositoryId | None = None,
         fallback_repository: UploadRepositoryId
         | list[UploadRepositoryId]
         | None = None,
         lifecycle: StorageSettings | None = None,
+        resumable: bool = False,
     ) -> str:
-        """Upload a local file and return the access URL.
+        """Upload a local file (or the rest of an open binary file object) and return
+        the access URL. The file is streamed, never read into memory as a whole.
 
         Pass `lifecycle` to control uploaded object expiration and initial ACL
-        settings.
+        settings. Pass `resumable=True` to make large (multipart) uploads of a
+        file path resumable: calling again after an interruption only uploads
+        the parts that did not make it.
         """
 
-        mime_type, _ = mimetypes.guess_type(path)
+        file_name = _upload_file_name(path)
+        mime_type, _ = mimetypes.guess_type(file_name)
         if mime_type is None:
             mime_type = "application/octet-stream"
 
+        resolved_lifecycle = _normalize_upload_lifecycle(lifecycle)
         repository_chain = _normalize_upload_repositories(
             repository, fallback_repository
         )
-        if (
-            await aiofiles.os.path.getsize(path) > MULTIPART_THRESHOLD
-            and repository_chain[0] == "fal_v3"
-        ):
-            resolved_lifecycle = _normalize_upload_lifecycle(lifecycle)
-            token_manager = await self._token_manager
-            async with self._cdn_client() as client:
-                return await AsyncMultipartUpload.save_file(
-                    file_path=str(path),
-                    client=client,
-                    token_manager=token_manager,
-                    content_type=mime_type,
-                    object_lifecycle_preference=resolved_lifecycle,
+        async with _async_open_upload_source(path) as source:
+            cache_key, url = await self._cached_upload(
+                source, mime_type, file_name, repository_chain, resolved_lifecycle
+            )
+            if url is not None:
+                return url
+
+            if source.size > MULTIPART_THRESHOLD and repository_chain[0] == "fal_v3":
+                manifest = None
+                if resumable:
+                    if not isinstance(path, (str, os.PathLike)):
+                        raise ValueError("Resumable uploads require a file path.")
+                    manifest = await asyncio.get_running_loop().run_in_executor(
+                        None, _UploadManifest.for_file, path, None
+                    )
+                token_manager = await self._token_manager
+                async with self._cdn_client() as client:
+                    # The open source is reused, file objects can't be reopened
+                    url = await AsyncMultipartUpload._save_source(
+                        client=client,
+                        token_manager=token_manager,
+                        source=source,
+                        file_name=file_name,
+                        content_type=mime_type,
+                        object_lifecycle_preference=resolved_lifecycle,
+                        manifest=manifest,
+                    )
+            else:
+                url = await self._upload_single(
+                    _AsyncUploadBody(source),
+                    mime_type,
+                    file_name,
+                    repository_chain=repository_chain,
+                    lifecycle=resolved_lifecycle,
                 )
+        self._cache_upload(cache_key, url, resolved_lifecycle)
+        return url
 
-        async with aiofiles.open(path, "rb") as file:
-            return await self.upload(
-                await file.read(),
-                mime_type,
-                file_name=os.path.basename(path),
-                repository=repository,
-                fallback_repository=fallback_repository,
-                lifecycle=lifecycle,
+    async def upload_stream(
+        self,
+        stream: AsyncIterable[bytes],
+        content_type: str,
+        file_name: str | None = None,
+        *,
+        repository: UploadRepositoryId | None = None,
+        fallback_repository: UploadRepositoryId
+        | list[UploadRepositoryId]
+        | None = None,
+        lifecycle: StorageSettings | None = None,
+    ) -> str:
+        """Upload data produced by an async iterator of byte strings and return the
+        access URL.
+
+        Data that fits in a single multipart chunk is sent in one request, larger
+        streams are uploaded in parts as they are produced, with memory use bounded
+        by the multipart concurrency times the chunk size.
+        """
+
+        resolved_lifecycle = _normalize_upload_lifecycle(lifecycle)
+        repository_chain = _normalize_upload_repositories(
+            repository, fallback_repository
+        )
+        chunks = _aiter_chunks(stream, MULTIPART_CHUNK_SIZE)
+        head: list[bytearray] = []
+        async for chunk in chunks:
+            head.append(chunk)
+            if len(head) == 2:
+                break
+
+        if len(head) < 2 or repository_chain[0] != "fal_v3":
+            # Non-multipart repositories need the whole payload up front.
+            data = bytearray().join(head)
+            async for chunk in chunks:
+                data += chunk
+            return await self._upload_single(
+                _AsyncUploadBody(_MemoryUploadSource(data)),
+                content_type,
+                file_name,
+                repository_chain=repository_chain,
+                lifecycle=resolved_lifecycle,
+            )
+
+        async def _rest() -> AsyncIterator[bytes]:
+            for chunk in head:
+                yield chunk
+            async for chunk in chunks:
+                yield chunk
+
+        async with self._cdn_client() as cdn_client:
+            return await AsyncMultipartUpload.save_stream(
+                client=cdn_client,
+                token_manager=await self._token_manager,
+                file_name=file_name or "upload.bin",
+                stream=_rest(),
+                content_type=content_type,
+                object_lifecycle_preference=resolved_lifecycle,
             )
 
     async def upload_image(
@@ -2111,6 +3483,12 @@ class AsyncClient:
 class SyncClient:
     key: str | None = field(default=None, repr=False)
     default_timeout: float = 120.0
+    cdn_max_connections: int = CDN_MAX_CONNECTIONS
+    cdn_max_keepalive_connections: int = CDN_MAX_KEEPALIVE_CONNECTIONS
+    cdn_http2: bool = False
+    # Opt-in: return the URL of an earlier upload of the same content, instead of
+    # uploading it again, while that URL is valid.
+    upload_cache: UploadCache | None = None
 
     @cached_property
     def _auth(self) -> AuthCredentials:
@@ -2138,16 +3516,21 @@ class SyncClient:
     def _executor(self) -> concurrent.futures.ThreadPoolExecutor:
         return EXECUTOR
 
-    def _get_cdn_client(self) -> httpx.Client:
-        token = self._token_manager.get_token()
+    @cached_property
+    def _pooled_cdn_client(self) -> httpx.Client:
         return httpx.Client(
-            headers={
-                "Authorization": f"{token.token_type} {token.token}",
-                "User-Agent": USER_AGENT,
-            },
-            timeout=self.default_timeout,
+            **_cdn_client_options(
+                _CDNTokenAuth(self._token_manager),
+                timeout=self.default_timeout,
+                max_connections=self.cdn_max_connections,
+                max_keepalive_connections=self.cdn_max_keepalive_connections,
+                http2=self.cdn_http2,
+            )
         )
 
+    def _get_cdn_client(self) -> httpx.Client:
+        return self._pooled_cdn_client
+
     def _get_realtime_token(
         self,
         application: str,
@@ -2287,11 +3670,15 @@ class SyncClient:
         headers: dict[str, str] = {},
         start_timeout: Optional[Union[int, float]] = None,
         client_timeout: Optional[Union[int, float]] = None,
+        wait_mode: QueueWaitMode = "poll",
     ) -> AnyJSON:
         """Subscribe to an application and wait for the result.
 
         Args:
             interval: Polling interval in seconds while waiting for request updates.
+            wait_mode: How to wait for completion: "poll" at a fixed interval,
+                "backoff" with a growing interval, or "stream" status updates
+                pushed by the server (falls back to "backoff" if unavailable).
             start_timeout: Server-side request timeout in seconds. Limits total time spent
                 waiting before processing starts (includes queue wait, retries, and
                 routing). Does not apply once the application begins processing.
@@ -2328,10 +3715,17 @@ class SyncClient:
                 on_enqueue(handle.request_id)
 
             if on_queue_update is not None:
-                for event in handle.iter_events(with_logs=with_logs, interval=interval):
+                for event in handle._wait_events(
+                    with_logs=with_logs, interval=interval, wait_mode=wait_mode
+                ):
                     on_queue_update(event)
 
-            return handle.get(interval=interval)
+                # The stream already delivered the completion, re-opening it
+                # just to observe it again would cost another connection.
+                if wait_mode == "stream":
+                    return handle._fetch_result()
+
+            return handle.get(interval=interval, wait_mode=wait_mode)
 
         if client_timeout is None:
             return _do_subscribe()
@@ -2360,14 +3754,125 @@ class SyncClient:
         handle = self.get_handle(application, request_id)
         return handle.status(with_logs=with_logs)
 
-    def result(self, application: str, request_id: str) -> AnyJSON:
+    def result(
+        self,
+        application: str,
+        request_id: str,
+        *,
+        wait_mode: QueueWaitMode = "poll",
+    ) -> AnyJSON:
         handle = self.get_handle(application, request_id)
-        return handle.get()
+        return handle.get(wait_mode=wait_mode)
 
     def cancel(self, application: str, request_id: str) -> None:
         handle = self.get_handle(application, request_id)
         handle.cancel()
 
+    def _iter_completed(
+        self,
+        handles: list[SyncRequestHandle],
+        *,
+        interval: float,
+        max_interval: float | None,
+        max_concurrency: int,
+    ) -> Iterator[tuple[int, AnyJSON]]:
+        _check_max_concurrency(max_concurrency)
+        schedule = _PollSchedule(len(handles), interval, max_interval)
+
+        def check(index: int) -> tuple[int, Status, AnyJSON | None]:
+            handle = handles[index]
+            status = handle.status()
+            if isinstance(status, Completed):
+                return index, status, handle._fetch_result()
+            return index, status, None
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="FAL_CLIENT_WAITER"
+        )
+        in_flight: set[concurrent.futures.Future] = set()
+        try:
+            while schedule or in_flight:
+                for index in schedule.pop_due(max_concurrency - len(in_flight)):
+                    in_flight.add(executor.submit(check, index))
+
+                timeout = schedule.time_until_next()
+                if not in_flight:
+                    time.sleep(timeout or 0)
+                    continue
+                if len(in_flight) >= max_concurrency:
+                    timeout = None
+
+                done, in_flight = concurrent.futures.wait(
+                    in_flight,
+                    timeout=timeout,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in done:
+                    index, status, result = future.result()
+                    if isinstance(status, Completed):
+                        yield index, result
+                    else:
+                        schedule.reschedule(index, status)
+        finally:
+            # The other handles' checks are cancelled, e.g. when one of them failed.
+            # The ones that already started finish in the background.
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def as_completed(
+        self,
+        handles: Iterable[SyncRequestHandle],
+        *,
+        interval: float = DEFAULT_QUEUE_POLL_INTERVAL,
+        max_interval: float | None = QUEUE_MAX_POLL_INTERVAL,
+        max_concurrency: int = QUEUE_WAIT_MAX_CONCURRENCY,
+    ) -> Iterator[tuple[SyncRequestHandle, AnyJSON]]:
+        """Wait for many requests at once and yield `(handle, result)` pairs in the
+        order they complete.
+
+        All handles share one scheduler: each is polled when its own deadline comes
+        up (backing off up to `max_interval` while its status doesn't change), with
+        at most `max_concurrency` status/result calls in flight.
+
+        If checking the status or fetching the result of a handle fails, its error is
+        raised and the checks of the other handles are cancelled. The handles that
+        weren't yielded yet can be waited for again.
+
+        Raises:
+            ValueError: If `max_concurrency` isn't positive.
+        """
+        handle_list = list(handles)
+        for index, result in self._iter_completed(
+            handle_list,
+            interval=interval,
+            max_interval=max_interval,
+            max_concurrency=max_concurrency,
+        ):
+            yield handle_list[index], result
+
+    def wait_many(
+        self,
+        handles: Iterable[SyncRequestHandle],
+        *,
+        interval: float = DEFAULT_QUEUE_POLL_INTERVAL,
+        max_interval: float | None = QUEUE_MAX_POLL_INTERVAL,
+        max_concurrency: int = QUEUE_WAIT_MAX_CONCURRENCY,
+    ) -> list[AnyJSON]:
+        """Wait for all the given requests and return their results in the same
+        order as `handles`. See `as_completed()` for the scheduling options and
+        how errors are handled."""
+        handle_list = list(handles)
+        results: list[AnyJSON] = [{} for _ in handle_list]
+        for index, result in self._iter_completed(
+            handle_list,
+            interval=interval,
+            max_interval=max_interval,
+            max_concurrency=max_concurrency,
+        ):
+            results[index] = result
+        return results
+
     def stream(
         self,
         application: str,
@@ -2417,8 +3922,6 @@ class SyncClient:
         control uploaded object expiration and initial ACL settings.
         """
 
-        auth = self._auth
-
         if isinstance(data, str):
             data = data.encode("utf-8")
 
@@ -2427,11 +3930,21 @@ class SyncClient:
         repository_chain = _normalize_upload_repositories(
             repository, fallback_repository
         )
+        cache_key, url = self._cached_upload(
+            _MemoryUploadSource(data),
+            content_type,
+            file_name,
+            repository_chain,
+            resolved_lifecycle,
+        )
+        if url is not None:
+            return url
+
         if len(data) > MULTIPART_THRESHOLD and repository_chain[0] == "fal_v3":
             if file_name is None:
                 file_name = "upload.bin"
             client = self._get_cdn_client()
-            return MultipartUpload.save(
+            url = MultipartUpload.save(
                 client=client,
                 token_manager=self._token_manager,
                 file_name=file_name,
@@ -2439,11 +3952,60 @@ class SyncClient:
                 content_type=content_type,
                 object_lifecycle_preference=resolved_lifecycle,
             )
+        else:
+            url = self._upload_single(
+                data,
+                content_type,
+                file_name,
+                repository_chain=repository_chain,
+                lifecycle=resolved_lifecycle,
+            )
+        self._cache_upload(cache_key, url, resolved_lifecycle)
+        return url
 
+    def _cached_upload(
+        self,
+        source: _UploadSource,
+        content_type: str,
+        file_name: str | None,
+        repository_chain: list[UploadRepositoryId],
+        lifecycle: LifecyclePreferencePayload | None,
+    ) -> tuple[str | None, str | None]:
+        """Look the content up in the upload cache, returning its cache key and
+        the URL of an earlier upload (if there is one)."""
+        if self.upload_cache is None:
+            return None, None
+        key = self.upload_cache.key(
+            _source_digest(source),
+            file_name,
+            repository_chain[0],
+            content_type,
+            lifecycle,
+        )
+        return key, self.upload_cache.get(key)
+
+    def _cache_upload(
+        self,
+        key: str | None,
+        url: str,
+        lifecycle: LifecyclePreferencePayload | None,
+    ) -> None:
+        if key is not None and self.upload_cache is not None:
+            self.upload_cache.put(key, url, lifecycle_expiration(lifecycle))
+
+    def _upload_single(
+        self,
+        data: bytes | _SyncUploadBody,
+        content_type: str,
+        file_name: str | None,
+        *,
+        repository_chain: list[UploadRepositoryId],
+        lifecycle: LifecyclePreferencePayload | None,
+    ) -> str:
         headers = {"Content-Type": content_type}
         if file_name is not None:
             headers["X-Fal-File-Name"] = file_name
-        _object_lifecycle_headers(headers, resolved_lifecycle)
+        _object_lifecycle_headers(headers, lifecycle)
 
         attempts: list[tuple[str, Callable[[], str]]] = []
         for repo in repository_chain:
@@ -2462,11 +4024,11 @@ class SyncClient:
                         partial(
                             _upload_via_storage,
                             self._client,
-                            auth,
+                            self._auth,
                             data=data,
                             content_type=content_type,
                             file_name=file_name,
-                            object_lifecycle_preference=resolved_lifecycle,
+                            object_lifecycle_preference=lifecycle,
                         ),
                     )
                 )
@@ -2475,51 +4037,114 @@ class SyncClient:
 
     def upload_file(
         self,
-        path: os.PathLike,
+        path: os.PathLike | BinaryIO,
         *,
         repository: UploadRepositoryId | None = None,
         fallback_repository: UploadRepositoryId
         | list[UploadRepositoryId]
         | None = None,
         lifecycle: StorageSettings | None = None,
+        resumable: bool = False,
     ) -> str:
-        """Upload a local file and return the access URL.
+        """Upload a local file (or the rest of an open binary file object) and return
+        the access URL. The file is streamed, never read into memory as a whole.
 
         Pass `lifecycle` to control uploaded object expiration and initial ACL
-        settings.
+        settings. Pass `resumable=True` to make large (multipart) uploads of a
+        file path resumable: calling again after an interruption only uploads
+        the parts that did not make it.
         """
 
-        mime_type, _ = mimetypes.guess_type(path)
+        file_name = _upload_file_name(path)
+        mime_type, _ = mimetypes.guess_type(file_name)
         if mime_type is None:
             mime_type = "application/octet-stream"
 
+        resolved_lifecycle = _normalize_upload_lifecycle(lifecycle)
         repository_chain = _normalize_upload_repositories(
             repository, fallback_repository
         )
-        if (
-            os.path.getsize(path) > MULTIPART_THRESHOLD
-            and repository_chain[0] == "fal_v3"
-        ):
-            resolved_lifecycle = _normalize_upload_lifecycle(lifecycle)
-            client = self._get_cdn_client()
-            return MultipartUpload.save_file(
-                file_path=str(path),
-                client=client,
-                token_manager=self._token_manager,
-                content_type=mime_type,
-                object_lifecycle_preference=resolved_lifecycle,
+        with _open_upload_source(path) as source:
+            cache_key, url = self._cached_upload(
+                source, mime_type, file_name, repository_chain, resolved_lifecycle
             )
+            if url is not None:
+                return url
+
+            if source.size > MULTIPART_THRESHOLD and repository_chain[0] == "fal_v3":
+                manifest = None
+                if resumable:
+                    if not isinstance(path, (str, os.PathLike)):
+                        raise ValueError("Resumable uploads require a file path.")
+                    manifest = _UploadManifest.for_file(path, None)
+                # The open source is reused, file objects can't be reopened
+                url = MultipartUpload._save_source(
+                    client=self._get_cdn_client(),
+                    token_manager=self._token_manager,
+                    source=source,
+                    file_name=file_name,
+                    content_type=mime_type,
+                    object_lifecycle_preference=resolved_lifecycle,
+                    manifest=manifest,
+                )
+            else:
+                url = self._upload_single(
+                    _SyncUploadBody(source),
+                    mime_type,
+                    file_name,
+                    repository_chain=repository_chain,
+                    lifecycle=resolved_lifecycle,
+                )
+        self._cache_upload(cache_key, url, resolved_lifecycle)
+        return url
 
-        with open(path, "rb") as file:
-            return self.upload(
-                file.read(),
-                mime_type,
-                file_name=os.path.basename(path),
-                repository=repository,
-                fallback_repository=fallback_repository,
-                lifecycle=lifecycle,
+    def upload_stream(
+        self,
+        stream: Iterable[bytes],
+        content_type: str,
+        file_name: str | None = None,
+        *,
+        repository: UploadRepositoryId | None = None,
+        fallback_repository: UploadRepositoryId
+        | list[UploadRepositoryId]
+        | None = None,
+        lifecycle: StorageSettings | None = None,
+    ) -> str:
+        """Upload data produced by an iterator of byte strings and return the
+        access URL.
+
+        Data that fits in a single multipart chunk is sent in one request, larger
+        streams are uploaded in parts as they are produced, with memory use bounded
+        by the multipart concurrency times the chunk size.
+        """
+
+        resolved_lifecycle = _normalize_upload_lifecycle(lifecycle)
+        repository_chain = _normalize_upload_repositories(
+            repository, fallback_repository
+        )
+        chunks = _iter_chunks(stream, MULTIPART_CHUNK_SIZE)
+        head = list(itertools.islice(chunks, 2))
+
+        if len(head) < 2 or repository_chain[0] != "fal_v3":
+            # Non-multipart repositories need the whole payload up front.
+            data = bytearray().join(itertools.chain(head, chunks))
+            return self._upload_single(
+                _SyncUploadBody(_MemoryUploadSource(data)),
+                content_type,
+                file_name,
+                repository_chain=repository_chain,
+                lifecycle=resolved_lifecycle,
             )
 
+        return MultipartUpload.save_stream(
+            client=self._get_cdn_client(),
+            token_manager=self._token_manager,
+            file_name=file_name or "upload.bin",
+            stream=itertools.chain(head, chunks),
+            content_type=content_type,
+            object_lifecycle_preference=resolved_lifecycle,
+        )
+
     def upload_image(
         self,
         image: Image.Image,
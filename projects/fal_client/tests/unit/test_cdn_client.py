@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+import fal_client.client as client_mod
+from fal_client.client import AsyncClient, CDNToken, SyncClient
+
+UPLOADS = 25
+
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.authorizations.append(self.headers.get("Authorization"))
+        body = json.dumps({"access_url": "https://v3.fal.media/files/x"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def cdn(monkeypatch, local_server):
+    server = local_server(_UploadHandler, authorizations=[])
+    monkeypatch.setattr(
+        client_mod, "CDN_URL", f"http://127.0.0.1:{server.server_address[1]}"
+    )
+    return server
+
+
+def _token(value: str) -> CDNToken:
+    return CDNToken(
+        token=value,
+        token_type="Bearer",
+        base_upload_url="",
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+
+
+class _FakeTokenManager:
+    def __init__(self) -> None:
+        self.tokens = iter(_token(f"token-{i}") for i in range(UPLOADS))
+
+    def get_token(self) -> CDNToken:
+        return next(self.tokens)
+
+
+class _FakeAsyncTokenManager(_FakeTokenManager):
+    async def get_token(self) -> CDNToken:
+        return next(self.tokens)
+
+    def __await__(self):
+        async def _return_self():
+            return self
+
+        return _return_self().__await__()
+
+
+def test_sync_uploads_reuse_one_cdn_connection(cdn):
+    client = SyncClient(key="test-key")
+    client.__dict__["_token_manager"] = _FakeTokenManager()
+
+    for _ in range(UPLOADS):
+        client.upload(b"x" * 1024, "text/plain", fallback_repository=[])
+
+    assert cdn.connections == 1
+    # Every request picks up the token that is current at the time it is sent.
+    assert cdn.authorizations == [f"Bearer token-{i}" for i in range(UPLOADS)]
+
+
+@pytest.mark.asyncio
+async def test_async_uploads_share_a_bounded_cdn_pool(cdn):
+    client = AsyncClient(key="test-key", cdn_max_connections=4)
+    client.__dict__["_token_manager"] = _FakeAsyncTokenManager()
+
+    await asyncio.gather(
+        *(
+            client.upload(b"x" * 1024, "text/plain", fallback_repository=[])
+            for _ in range(UPLOADS)
+        )
+    )
+
+    assert 1 <= cdn.connections <= 4
+    assert sorted(cdn.authorizations) == sorted(
+        f"Bearer token-{i}" for i in range(UPLOADS)
+    )
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import io
+import threading
 import time
 import json
 from contextlib import asynccontextmanager, contextmanager
 from typing import Dict, Optional
-from unittest.mock import AsyncMock, Mock, call, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 import msgpack
 import pytest
 
+from fal_client._upload_cache import UploadCache
 from fal_client.client import (
     AsyncClient,
     AsyncMultipartUpload,
@@ -21,6 +24,7 @@ from fal_client.client import (
     FalClientHTTPError,
     FalClientTimeoutError,
     InProgress,
+    MultipartUpload,
     Queued,
     RealtimeConnection,
     RealtimeError,
@@ -32,6 +36,7 @@ from fal_client.client import (
     SyncRequestHandle,
     USER_AGENT,
     _BaseRequestHandle,
+    _MemoryUploadSource,
     _normalize_upload_repositories,
     _raise_for_status,
     _upload_v3,
@@ -403,7 +408,7 @@ def test_sync_upload_file_passes_lifecycle_to_multipart(tmp_path, monkeypatch):
     settings = StorageSettings(expires_in=3600)
 
     with patch(
-        "fal_client.client.MultipartUpload.save_file", return_value="https://file"
+        "fal_client.client.MultipartUpload._save_source", return_value="https://file"
     ) as mock_save, patch("fal_client.client.SyncClient._get_cdn_client") as mock_cdn:
         mock_cdn.return_value = Mock()
         client = SyncClient(key="test-key")
@@ -415,6 +420,25 @@ def test_sync_upload_file_passes_lifecycle_to_multipart(tmp_path, monkeypatch):
     }
 
 
+def test_sync_upload_file_caches_multipart_file_objects(tmp_path, monkeypatch):
+    monkeypatch.setattr("fal_client.client.MULTIPART_THRESHOLD", 1)
+    uploaded = []
+
+    def save_source(*, source, **kwargs):
+        uploaded.append(source.read_at(0, source.size))
+        return "https://file"
+
+    client = SyncClient(key="test-key", upload_cache=UploadCache(directory=tmp_path))
+    with patch(
+        "fal_client.client.MultipartUpload._save_source", side_effect=save_source
+    ), patch("fal_client.client.SyncClient._get_cdn_client"):
+        assert client.upload_file(io.BytesIO(b"hello world")) == "https://file"
+        assert client.upload_file(io.BytesIO(b"hello world")) == "https://file"
+
+    # The content hashed for the cache is uploaded whole, once
+    assert uploaded == [b"hello world"]
+
+
 def test_sync_upload_lifecycle_expires_in_is_normalized():
     with patch("fal_client.client._maybe_retry_request") as mock_request, patch(
         "fal_client.client.SyncClient._get_cdn_client"
@@ -920,7 +944,7 @@ async def test_async_upload_file_passes_lifecycle_to_multipart(tmp_path, monkeyp
     settings = StorageSettings(expires_in=3600)
 
     with patch(
-        "fal_client.client.AsyncMultipartUpload.save_file",
+        "fal_client.client.AsyncMultipartUpload._save_source",
         new_callable=AsyncMock,
         return_value="https://file",
     ) as mock_save, patch("fal_client.client.AsyncClient._cdn_client") as mock_cdn:
@@ -935,86 +959,71 @@ async def test_async_upload_file_passes_lifecycle_to_multipart(tmp_path, monkeyp
 
 
 @pytest.mark.asyncio
-async def test_async_upload_file_uses_aiofiles_for_non_multipart_path(
-    tmp_path, monkeypatch
-):
-    class FakeAsyncFile:
-        def __init__(self, data: bytes) -> None:
-            self.read = AsyncMock(return_value=data)
+async def test_async_upload_file_caches_multipart_file_objects(tmp_path, monkeypatch):
+    @asynccontextmanager
+    async def fake_cdn_client():
+        yield Mock()
 
-        async def __aenter__(self):
-            return self
+    monkeypatch.setattr("fal_client.client.MULTIPART_THRESHOLD", 1)
+    uploaded = []
 
-        async def __aexit__(self, exc_type, exc, tb):
-            return None
+    async def save_source(*, source, **kwargs):
+        uploaded.append(source.read_at(0, source.size))
+        return "https://file"
 
+    client = AsyncClient(key="test-key", upload_cache=UploadCache(directory=tmp_path))
+    with patch(
+        "fal_client.client.AsyncMultipartUpload._save_source", side_effect=save_source
+    ), patch("fal_client.client.AsyncClient._cdn_client") as mock_cdn:
+        mock_cdn.side_effect = lambda: fake_cdn_client()
+        assert await client.upload_file(io.BytesIO(b"hello world")) == "https://file"
+        assert await client.upload_file(io.BytesIO(b"hello world")) == "https://file"
+
+    assert uploaded == [b"hello world"]
+
+
+@pytest.mark.asyncio
+async def test_async_upload_file_streams_non_multipart_path(tmp_path, monkeypatch):
     file_path = tmp_path / "upload.txt"
     file_path.write_bytes(b"hello")
-    fake_file = FakeAsyncFile(b"hello")
     monkeypatch.setattr("fal_client.client.MULTIPART_THRESHOLD", 1024)
 
-    with patch("fal_client.client.aiofiles.open", return_value=fake_file) as mock_open:
-        client = AsyncClient(key="test-key")
-        with patch(
-            "fal_client.client.AsyncClient.upload",
-            new_callable=AsyncMock,
-            return_value="https://file",
-        ) as mock_upload:
-            url = await client.upload_file(file_path)
-
-    assert url == "https://file"
-    mock_open.assert_called_once_with(file_path, "rb")
-    fake_file.read.assert_awaited_once_with()
-    assert mock_upload.await_count == 1
-    assert mock_upload.await_args.args == (b"hello", "text/plain")
-    assert mock_upload.await_args.kwargs == {
-        "file_name": "upload.txt",
-        "repository": None,
-        "fallback_repository": None,
-        "lifecycle": None,
-    }
+    client = AsyncClient(key="test-key")
+    bodies = []
 
+    async def upload_single(data, content_type, file_name, **kwargs):
+        bodies.append(b"".join([bytes(piece) async for piece in data]))
+        assert data.headers == {"Content-Length": "5"}
+        assert (content_type, file_name) == ("text/plain", "upload.txt")
+        assert kwargs == {"repository_chain": ["fal_v3", "fal"], "lifecycle": None}
+        return "https://file"
 
-@pytest.mark.asyncio
-async def test_async_multipart_save_file_uses_aiofiles(tmp_path):
-    class FakeAsyncFile:
-        def __init__(self, data_by_offset: dict[int, bytes]) -> None:
-            self.offset: int | None = None
-            self.seek = AsyncMock(side_effect=self._seek)
-            self.read = AsyncMock(side_effect=lambda size: data_by_offset[self.offset])
-
-        async def __aenter__(self):
-            return self
+    with patch.object(AsyncClient, "_upload_single", side_effect=upload_single):
+        url = await client.upload_file(file_path)
 
-        async def __aexit__(self, exc_type, exc, tb):
-            return None
+    assert url == "https://file"
+    assert bodies == [b"hello"]
 
-        async def _seek(self, offset: int) -> None:
-            self.offset = offset
 
+@pytest.mark.asyncio
+async def test_async_multipart_save_file_reads_parts_from_one_file(
+    tmp_path, monkeypatch
+):
     file_path = tmp_path / "upload.txt"
-    file_path.write_bytes(b"abcd")
-    first_file = FakeAsyncFile({0: b"ab"})
-    second_file = FakeAsyncFile({2: b"cd"})
+    file_path.write_bytes(b"abcde")
+    monkeypatch.setattr("fal_client.client.UPLOAD_STREAM_CHUNK_SIZE", 1)
+    parts = {}
 
-    open_calls = {"count": 0}
+    async def upload_part(self, part_number, data):
+        parts[part_number] = [bytes(piece) async for piece in data]
 
-    def open_side_effect(*args, **kwargs):
-        open_calls["count"] += 1
-        return first_file if open_calls["count"] == 1 else second_file
-
-    with patch(
-        "fal_client.client.aiofiles.open",
-        side_effect=open_side_effect,
-    ) as mock_open, patch.object(
+    with patch("builtins.open", wraps=open) as mock_open, patch.object(
         AsyncMultipartUpload,
         "create",
         new_callable=AsyncMock,
     ) as mock_create, patch.object(
-        AsyncMultipartUpload,
-        "upload_part",
-        new_callable=AsyncMock,
-    ) as mock_upload_part, patch.object(
+        AsyncMultipartUpload, "upload_part", new=upload_part
+    ), patch.object(
         AsyncMultipartUpload,
         "complete",
         new_callable=AsyncMock,
@@ -1029,15 +1038,341 @@ async def test_async_multipart_save_file_uses_aiofiles(tmp_path):
 
     assert url == "https://file"
     mock_create.assert_awaited_once_with(object_lifecycle_preference=None)
-    assert mock_open.call_count == 2
-    first_file.seek.assert_awaited_once_with(0)
-    first_file.read.assert_awaited_once_with(2)
-    second_file.seek.assert_awaited_once_with(2)
-    second_file.read.assert_awaited_once_with(2)
-    mock_upload_part.assert_has_awaits([call(1, b"ab"), call(2, b"cd")], any_order=True)
+    mock_open.assert_called_once_with(file_path, "rb")
+    # Each part is streamed in UPLOAD_STREAM_CHUNK_SIZE pieces.
+    assert parts == {1: [b"a", b"b"], 2: [b"c", b"d"], 3: [b"e"]}
     mock_complete.assert_awaited_once_with()
 
 
+def test_sync_multipart_save_slices_parts_without_copies():
+    data = bytearray(b"abcdefg")
+    parts = {}
+
+    def upload_part(self, part_number, body):
+        parts[part_number] = list(body)
+
+    with patch.object(MultipartUpload, "create"), patch.object(
+        MultipartUpload, "upload_part", new=upload_part
+    ), patch.object(MultipartUpload, "complete", return_value="https://file"):
+        url = MultipartUpload.save(
+            client=Mock(),
+            token_manager=Mock(),
+            file_name="upload.bin",
+            data=data,
+            chunk_size=3,
+        )
+
+    assert url == "https://file"
+    assert {n: b"".join(p) for n, p in parts.items()} == {
+        1: b"abc",
+        2: b"def",
+        3: b"g",
+    }
+    assert all(isinstance(p, memoryview) for pieces in parts.values() for p in pieces)
+    data[0:1] = b"X"
+    assert bytes(parts[1][0]) == b"Xbc"
+
+
+def test_sync_upload_file_streams_file_objects():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"access_url": "https://file"})
+
+    client = SyncClient(key="test-key")
+    client.__dict__["_pooled_cdn_client"] = httpx.Client(
+        transport=httpx.MockTransport(handler)
+    )
+    buffer = io.BytesIO(b"skip:payload")
+    buffer.name = "/tmp/data.json"
+    buffer.seek(5)
+
+    assert client.upload_file(buffer, fallback_repository=[]) == "https://file"
+
+    (request,) = requests
+    assert request.content == b"payload"
+    assert request.headers["Content-Length"] == "7"
+    assert "Transfer-Encoding" not in request.headers
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.headers["X-Fal-File-Name"] == "data.json"
+
+
+@pytest.mark.asyncio
+async def test_async_multipart_save_stream_bounds_buffered_chunks():
+    produced = 0
+    uploaded = 0
+    max_ahead = 0
+    release = asyncio.Event()
+
+    async def stream():
+        nonlocal produced
+        for _ in range(12):
+            produced += 1
+            yield b"xx"
+
+    async def upload_part(self, part_number, body):
+        nonlocal uploaded, max_ahead
+        max_ahead = max(max_ahead, produced - uploaded)
+        if part_number == 1:
+            await release.wait()
+        else:
+            release.set()
+        await asyncio.sleep(0)
+        assert b"".join([bytes(p) async for p in body]) == b"xx"
+        uploaded += 1
+
+    with patch.object(
+        AsyncMultipartUpload, "create", new_callable=AsyncMock
+    ), patch.object(AsyncMultipartUpload, "upload_part", new=upload_part), patch.object(
+        AsyncMultipartUpload,
+        "complete",
+        new_callable=AsyncMock,
+        return_value="https://file",
+    ):
+        url = await AsyncMultipartUpload.save_stream(
+            client=Mock(),
+            token_manager=Mock(),
+            file_name="upload.bin",
+            stream=stream(),
+            chunk_size=2,
+            max_concurrency=3,
+        )
+
+    assert url == "https://file"
+    assert uploaded == 12
+    assert max_ahead <= 3
+
+
+class _FakeMultipartCDN:
+    """Stand-in for the CDN's multipart API. `failures` maps part numbers to the
+    statuses returned (one per attempt) before the part is accepted."""
+
+    def __init__(self, failures: Optional[Dict[int, list]] = None) -> None:
+        self.failures = failures or {}
+        self.uploads = 0
+        self.put_parts: list = []
+        self.completed: list = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/files/upload/multipart":
+            self.uploads += 1
+            return httpx.Response(
+                200,
+                json={
+                    "access_url": "https://cdn.test/files/f",
+                    "uploadId": f"upload-{self.uploads}",
+                },
+            )
+        upload_id, part = path.rsplit("/", 2)[-2:]
+        if part == "complete":
+            if upload_id != f"upload-{self.uploads}":
+                return httpx.Response(404, json={"detail": "Unknown upload"})
+            self.completed.append((upload_id, json.loads(request.content)["parts"]))
+            return httpx.Response(200, json={})
+        part_number = int(part)
+        self.put_parts.append((upload_id, part_number))
+        if upload_id != f"upload-{self.uploads}":
+            return httpx.Response(404, json={"detail": "Unknown upload"})
+        if self.failures.get(part_number):
+            return httpx.Response(self.failures[part_number].pop(0), json={})
+        return httpx.Response(200, headers={"etag": f"etag-{part_number}"})
+
+
+class _FakeUploadTokenManager:
+    def get_token(self):
+        return Mock(
+            token_type="Bearer", token="cdn-token", base_upload_url="https://cdn.test"
+        )
+
+
+class _FakeAsyncUploadTokenManager:
+    async def get_token(self):
+        return _FakeUploadTokenManager().get_token()
+
+
+def test_sync_resumable_save_file_skips_uploaded_parts(tmp_path, monkeypatch):
+    import fal_client.client as client_mod
+
+    monkeypatch.setattr(client_mod, "BASE_DELAY", 0.0)
+    file_path = tmp_path / "upload.bin"
+    file_path.write_bytes(b"abcdefg")
+    manifest_dir = tmp_path / "manifests"
+    # Part 3 recovers after a retryable error; part 2 fails for good.
+    cdn = _FakeMultipartCDN(failures={2: [400], 3: [429]})
+    client = httpx.Client(transport=httpx.MockTransport(cdn))
+
+    def save_file():
+        return MultipartUpload.save_file(
+            client=client,
+            token_manager=_FakeUploadTokenManager(),
+            file_path=file_path,
+            chunk_size=2,
+            max_concurrency=1,
+            resumable=True,
+            manifest_dir=manifest_dir,
+        )
+
+    with pytest.raises(FalClientHTTPError):
+        save_file()
+    assert len(list(manifest_dir.iterdir())) == 1
+
+    assert save_file() == "https://cdn.test/files/f"
+
+    assert cdn.uploads == 1
+    # Only the failed part is sent again when resuming.
+    assert cdn.put_parts == [
+        ("upload-1", 1),
+        ("upload-1", 2),
+        ("upload-1", 3),
+        ("upload-1", 3),
+        ("upload-1", 4),
+        ("upload-1", 2),
+    ]
+    assert cdn.completed == [
+        (
+            "upload-1",
+            [{"partNumber": n, "etag": f"etag-{n}"} for n in range(1, 5)],
+        )
+    ]
+    assert list(manifest_dir.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_async_resumable_save_file_restarts_stale_upload(tmp_path):
+    file_path = tmp_path / "upload.bin"
+    file_path.write_bytes(b"abcde")
+    manifest_dir = tmp_path / "manifests"
+    cdn = _FakeMultipartCDN(failures={2: [400]})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(cdn))
+
+    async def save_file():
+        return await AsyncMultipartUpload.save_file(
+            client=client,
+            token_manager=_FakeAsyncUploadTokenManager(),
+            file_path=file_path,
+            chunk_size=2,
+            resumable=True,
+            manifest_dir=manifest_dir,
+        )
+
+    with pytest.raises(FalClientHTTPError):
+        await save_file()
+    # The CDN forgets about the first upload, e.g. because it expired.
+    cdn.uploads += 1
+
+    assert await save_file() == "https://cdn.test/files/f"
+
+    assert cdn.completed == [
+        (
+            "upload-3",
+            [{"partNumber": n, "etag": f"etag-{n}"} for n in range(1, 4)],
+        )
+    ]
+    assert list(manifest_dir.iterdir()) == []
+
+
+def test_multipart_chunk_size_grows_with_upload_size():
+    from fal_client.client import (
+        MULTIPART_CHUNK_SIZE,
+        MULTIPART_MAX_PARTS,
+        _multipart_chunk_size,
+    )
+
+    mib = 1024 * 1024
+    assert _multipart_chunk_size(100 * mib) == MULTIPART_CHUNK_SIZE
+    assert _multipart_chunk_size(5 * 1024 * mib) == 20 * mib
+    # Capped at MULTIPART_MAX_CHUNK_SIZE...
+    assert _multipart_chunk_size(100 * 1024 * mib) == 64 * mib
+    # ...unless that would need too many parts.
+    size = 1024 * 1024 * mib
+    chunk_size = _multipart_chunk_size(size)
+    assert chunk_size % mib == 0
+    assert -(-size // chunk_size) <= MULTIPART_MAX_PARTS
+
+
+def test_part_throttle_tunes_concurrency_to_throughput():
+    import fal_client.client as client_mod
+
+    clock = [0.0]
+    with patch.object(client_mod.time, "monotonic", lambda: clock[0]):
+        throttle = client_mod._PartThrottle(initial=2, maximum=10)
+
+        def window(seconds_per_part: float) -> None:
+            for _ in range(throttle.limit):
+                clock[0] += seconds_per_part
+                throttle._record(1_000_000)
+
+        # Throughput keeps improving as parts are added: double the limit.
+        window(1.0)
+        assert throttle.limit == 4
+        window(0.5)
+        assert throttle.limit == 8
+        window(0.25)
+        assert throttle.limit == 10
+        # No further improvement, then a regression: step back one at a time.
+        window(0.25)
+        assert throttle.limit == 10
+        window(0.5)
+        assert throttle.limit == 9
+
+    stats = throttle.stats(chunk_size=1_000_000)
+    assert stats.parts == throttle.parts == 2 + 4 + 8 + 10 + 10
+    assert stats.max_concurrency == 10
+    assert stats.concurrency == 9
+    assert stats.throughput == pytest.approx(stats.bytes / stats.seconds / 1e6)
+
+
+def test_sync_multipart_save_reports_stats():
+    cdn = _FakeMultipartCDN()
+    multipart = MultipartUpload(
+        file_name="upload.bin",
+        client=httpx.Client(transport=httpx.MockTransport(cdn)),
+        token_manager=_FakeUploadTokenManager(),
+    )
+    data = bytes(25 * 1024 * 1024)
+
+    multipart.create()
+    multipart._upload_source(_MemoryUploadSource(data))
+    multipart.complete()
+
+    assert multipart.stats.chunk_size == 10 * 1024 * 1024
+    assert multipart.stats.parts == 3
+    assert multipart.stats.bytes == len(data)
+    assert 1 <= multipart.stats.max_concurrency <= multipart.max_concurrency
+    assert multipart.stats.throughput > 0
+
+
+def test_resumable_save_file_requires_a_path():
+    with pytest.raises(ValueError, match="file path"):
+        MultipartUpload.save_file(
+            client=Mock(),
+            token_manager=Mock(),
+            file_path=io.BytesIO(b"data"),
+            resumable=True,
+        )
+
+
+@pytest.mark.asyncio
+async def test_async_upload_stream_small_payload_is_single_request():
+    async def stream():
+        yield b"hel"
+        yield b"lo"
+
+    client = AsyncClient(key="test-key")
+    with patch.object(
+        AsyncClient, "_upload_single", new_callable=AsyncMock, return_value="https://f"
+    ) as mock_upload, patch.object(
+        AsyncMultipartUpload, "save_stream", new_callable=AsyncMock
+    ) as mock_save_stream:
+        assert await client.upload_stream(stream(), "text/plain") == "https://f"
+
+    mock_save_stream.assert_not_awaited()
+    body = mock_upload.await_args.args[0]
+    assert b"".join([bytes(p) async for p in body]) == b"hello"
+
+
 @pytest.mark.asyncio
 async def test_async_multipart_save_respects_max_concurrency():
     active_uploads = 0
@@ -1725,6 +2060,349 @@ async def test_async_handle_retries_ingress(monkeypatch):
     assert client.request.await_count == 6
 
 
+class _FakeQueue:
+    """A local stand-in for the queue API that counts the requests it serves."""
+
+    def __init__(
+        self, run_for: float, *, stream_status: int = 200, stream_timeouts: int = 0
+    ) -> None:
+        self.done_at = time.monotonic() + run_for
+        self.stream_status = stream_status
+        # How many stream requests time out before any event
+        self.stream_timeouts = stream_timeouts
+        self.requests: list[str] = []
+
+    def _status(self) -> dict:
+        if time.monotonic() >= self.done_at:
+            return {"status": "COMPLETED", "logs": None, "metrics": {}}
+        return {"status": "IN_PROGRESS", "logs": None}
+
+    def _events(self):
+        yield b'data: {"status": "IN_PROGRESS", "logs": null}\n\n'
+        time.sleep(max(self.done_at - time.monotonic(), 0))
+        yield f"data: {json.dumps(self._status())}\n\n".encode()
+
+    async def _aevents(self):
+        yield b'data: {"status": "IN_PROGRESS", "logs": null}\n\n'
+        await asyncio.sleep(max(self.done_at - time.monotonic(), 0))
+        yield f"data: {json.dumps(self._status())}\n\n".encode()
+
+    def _handle(self, request: httpx.Request, events) -> httpx.Response:
+        path = request.url.path
+        self.requests.append(path)
+        if path.endswith("/status/stream"):
+            if self.stream_timeouts > 0:
+                self.stream_timeouts -= 1
+                raise httpx.ReadTimeout("timed out", request=request)
+            if self.stream_status != 200:
+                return httpx.Response(self.stream_status, json={"detail": "nope"})
+            return httpx.Response(
+                200,
+                headers={"Content-Type": "text/event-stream"},
+                content=events(),
+            )
+        if path.endswith("/status"):
+            return httpx.Response(200, json=self._status())
+        return httpx.Response(200, json={"ok": True})
+
+    def client(self) -> httpx.Client:
+        return httpx.Client(
+            transport=httpx.MockTransport(lambda r: self._handle(r, self._events))
+        )
+
+    def async_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda r: self._handle(r, self._aevents))
+        )
+
+
+def _fake_handle(cls, client):
+    return cls.from_request_id(client, "fal-ai/fake", "req-1")
+
+
+def test_sync_get_stream_mode_needs_two_requests():
+    poll_queue = _FakeQueue(run_for=0.3)
+    assert _fake_handle(SyncRequestHandle, poll_queue.client()).get(interval=0.01) == {
+        "ok": True
+    }
+
+    stream_queue = _FakeQueue(run_for=0.3)
+    assert _fake_handle(SyncRequestHandle, stream_queue.client()).get(
+        interval=0.01, wait_mode="stream"
+    ) == {"ok": True}
+
+    assert stream_queue.requests == [
+        "/fal-ai/fake/requests/req-1/status/stream",
+        "/fal-ai/fake/requests/req-1",
+    ]
+    assert len(poll_queue.requests) > 10 * len(stream_queue.requests)
+
+
+@pytest.mark.asyncio
+async def test_async_get_stream_mode_needs_two_requests():
+    queue = _FakeQueue(run_for=0.3)
+    handle = _fake_handle(AsyncRequestHandle, queue.async_client())
+
+    assert await handle.get(interval=0.01, wait_mode="stream") == {"ok": True}
+    assert queue.requests == [
+        "/fal-ai/fake/requests/req-1/status/stream",
+        "/fal-ai/fake/requests/req-1",
+    ]
+
+
+def test_sync_get_stream_mode_falls_back_to_backoff_polling(monkeypatch):
+    import fal_client.client as client_mod
+
+    sleeps = []
+    monkeypatch.setattr(client_mod.time, "sleep", sleeps.append)
+    monkeypatch.setattr(client_mod, "QUEUE_MAX_POLL_INTERVAL", 0.2)
+
+    queue = _FakeQueue(run_for=float("inf"), stream_status=404)
+    handle = _fake_handle(SyncRequestHandle, queue.client())
+    events = handle.stream_events(interval=0.1)
+    for _ in range(5):
+        assert isinstance(next(events), InProgress)
+
+    assert queue.requests[0].endswith("/status/stream")
+    assert sleeps == pytest.approx([0.1, 0.15, 0.2, 0.2])
+
+
+def test_sync_stream_mode_reconnects_after_a_timeout():
+    queue = _FakeQueue(run_for=0.05, stream_timeouts=2)
+    handle = _fake_handle(SyncRequestHandle, queue.client())
+
+    assert handle.get(interval=0.01, wait_mode="stream") == {"ok": True}
+    assert queue.requests == [
+        "/fal-ai/fake/requests/req-1/status/stream",
+        "/fal-ai/fake/requests/req-1/status/stream",
+        "/fal-ai/fake/requests/req-1/status/stream",
+        "/fal-ai/fake/requests/req-1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_stream_mode_falls_back_to_polling_after_repeated_timeouts():
+    import fal_client.client as client_mod
+
+    queue = _FakeQueue(run_for=0.05, stream_timeouts=10)
+    handle = _fake_handle(AsyncRequestHandle, queue.async_client())
+
+    assert await handle.get(interval=0.01, wait_mode="stream") == {"ok": True}
+    streams = [path for path in queue.requests if path.endswith("/stream")]
+    assert len(streams) == 1 + client_mod.QUEUE_STREAM_MAX_RECONNECTS
+    assert "/fal-ai/fake/requests/req-1/status" in queue.requests
+
+
+@pytest.mark.asyncio
+async def test_async_iter_events_backoff_resets_on_status_change(monkeypatch):
+    handle = AsyncRequestHandle(
+        request_id="req-1",
+        response_url="http://resp",
+        status_url="http://status",
+        cancel_url="http://cancel",
+        client=httpx.AsyncClient(),
+    )
+    statuses = [
+        Queued(position=3),
+        Queued(position=2),
+        Queued(position=1),
+        InProgress(logs=None),
+        InProgress(logs=None),
+        Completed(logs=None, metrics={}),
+    ]
+    monkeypatch.setattr(
+        AsyncRequestHandle, "status", AsyncMock(side_effect=statuses), raising=True
+    )
+    sleep = AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    seen = [event async for event in handle.iter_events(interval=1.0, max_interval=1.5)]
+
+    assert seen == statuses
+    assert [c.args[0] for c in sleep.await_args_list] == [1.0, 1.5, 1.5, 1.0, 1.5]
+
+
+def test_sync_subscribe_stream_mode_skips_extra_status_check(monkeypatch):
+    queue = _FakeQueue(run_for=0.05)
+    handle = _fake_handle(SyncRequestHandle, queue.client())
+    monkeypatch.setattr(SyncClient, "submit", lambda self, *a, **kw: handle)
+
+    updates = []
+    result = SyncClient(key="test-key").subscribe(
+        "fal-ai/fake", {}, on_queue_update=updates.append, wait_mode="stream"
+    )
+
+    assert result == {"ok": True}
+    assert isinstance(updates[-1], Completed)
+    assert len(queue.requests) == 2
+
+
+class _FakeFanOutQueue:
+    """Queue stand-in for many requests, each completing after its own delay."""
+
+    def __init__(self, run_for: dict[str, float]) -> None:
+        start = time.monotonic()
+        self.done_at = {rid: start + delay for rid, delay in run_for.items()}
+        self.status_calls = 0
+        self.result_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.split("/")
+        request_id = parts[4]
+        if parts[-1] == "status":
+            self.status_calls += 1
+            if time.monotonic() >= self.done_at[request_id]:
+                return httpx.Response(
+                    200, json={"status": "COMPLETED", "logs": None, "metrics": {}}
+                )
+            return httpx.Response(200, json={"status": "IN_QUEUE", "queue_position": 0})
+        self.result_calls += 1
+        return httpx.Response(200, json={"request_id": request_id})
+
+    def client(self) -> httpx.Client:
+        lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            with lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                time.sleep(0.005)
+                with lock:
+                    return self._handle(request)
+            finally:
+                with lock:
+                    self.in_flight -= 1
+
+        return httpx.Client(transport=httpx.MockTransport(handler))
+
+    def async_client(self) -> httpx.AsyncClient:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.005)
+                return self._handle(request)
+            finally:
+                self.in_flight -= 1
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_sync_client_as_completed_yields_in_completion_order():
+    queue = _FakeFanOutQueue({"slow": 0.3, "fast": 0.05, "mid": 0.15})
+    client = queue.client()
+    handles = [
+        SyncRequestHandle.from_request_id(client, "fal-ai/fake", rid)
+        for rid in ("slow", "fast", "mid")
+    ]
+
+    completed = list(
+        SyncClient(key="test-key").as_completed(
+            handles, interval=0.01, max_interval=0.05, max_concurrency=2
+        )
+    )
+
+    assert [handle.request_id for handle, _ in completed] == ["fast", "mid", "slow"]
+    assert [result for _, result in completed] == [
+        {"request_id": "fast"},
+        {"request_id": "mid"},
+        {"request_id": "slow"},
+    ]
+    assert queue.result_calls == 3
+    assert queue.max_in_flight <= 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_wait_many_preserves_order_and_caps_concurrency():
+    run_for = {f"req-{i}": 0.02 * (i % 5) for i in range(40)}
+    queue = _FakeFanOutQueue(run_for)
+    client = queue.async_client()
+    handles = [
+        AsyncRequestHandle.from_request_id(client, "fal-ai/fake", rid)
+        for rid in run_for
+    ]
+
+    results = await AsyncClient(key="test-key").wait_many(
+        handles, interval=0.01, max_interval=0.05, max_concurrency=8
+    )
+
+    assert results == [{"request_id": rid} for rid in run_for]
+    assert queue.result_calls == len(run_for)
+    assert queue.max_in_flight <= 8
+
+
+@pytest.mark.asyncio
+async def test_async_client_as_completed_backs_off_per_handle():
+    queue = _FakeFanOutQueue({"slow": 0.5})
+    client = queue.async_client()
+    handle = AsyncRequestHandle.from_request_id(client, "fal-ai/fake", "slow")
+
+    completed = [
+        item
+        async for item in AsyncClient(key="test-key").as_completed(
+            [handle], interval=0.01, max_interval=0.1
+        )
+    ]
+
+    assert completed == [(handle, {"request_id": "slow"})]
+    # A fixed 10ms interval would take ~35 status calls to cover 0.5s.
+    assert queue.status_calls < 15
+
+
+def test_sync_client_as_completed_raises_the_error_of_a_failing_handle():
+    queue = _FakeFanOutQueue({"slow": 10, "missing": 0})
+    client = queue.client()
+    handles = [
+        SyncRequestHandle.from_request_id(client, "fal-ai/fake", rid)
+        for rid in ("slow", "missing")
+    ]
+    queue._handle = Mock(  # type: ignore[method-assign]
+        side_effect=lambda request: httpx.Response(
+            404 if "missing" in request.url.path else 200,
+            json={"status": "IN_QUEUE", "queue_position": 0},
+        )
+    )
+
+    with pytest.raises(FalClientHTTPError):
+        list(SyncClient(key="test-key").as_completed(handles, interval=0.01))
+
+
+@pytest.mark.asyncio
+async def test_async_client_wait_many_cancels_the_other_handles_on_error():
+    queue = _FakeFanOutQueue({"slow": 10, "missing": 0})
+    client = queue.async_client()
+    handles = [
+        AsyncRequestHandle.from_request_id(client, "fal-ai/fake", rid)
+        for rid in ("slow", "missing")
+    ]
+    queue._handle = Mock(  # type: ignore[method-assign]
+        side_effect=lambda request: httpx.Response(
+            404 if "missing" in request.url.path else 200,
+            json={"status": "IN_QUEUE", "queue_position": 0},
+        )
+    )
+
+    with pytest.raises(FalClientHTTPError):
+        await AsyncClient(key="test-key").wait_many(handles, interval=0.01)
+    assert queue.in_flight == 0
+
+
+@pytest.mark.parametrize("max_concurrency", [0, -1])
+def test_waiting_for_many_handles_needs_a_positive_concurrency(max_concurrency):
+    with pytest.raises(ValueError, match="max_concurrency"):
+        SyncClient(key="test-key").wait_many([], max_concurrency=max_concurrency)
+
+
+@pytest.mark.asyncio
+async def test_async_waiting_for_many_handles_needs_a_positive_concurrency():
+    with pytest.raises(ValueError, match="max_concurrency"):
+        async for _ in AsyncClient(key="test-key").as_completed([], max_concurrency=0):
+            pass
+
+
 def test_realtime_connection_decodes_messages():
     fake_ws = Mock()
     payload = {"foo": "bar"}
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from fal_client import UploadCache
+from fal_client.client import AsyncClient, StorageSettings, SyncClient
+
+
+def test_upload_cache_evicts_least_recently_used():
+    cache = UploadCache(max_entries=2)
+    cache.put("a", "https://a")
+    cache.put("b", "https://b")
+    assert cache.get("a") == "https://a"
+    cache.put("c", "https://c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "https://a"
+    assert cache.get("c") == "https://c"
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_upload_cache_entries_expire():
+    cache = UploadCache(ttl=60)
+    with patch("fal_client._upload_cache.time.time", return_value=1000.0):
+        cache.put("default", "https://default")
+        cache.put("short", "https://short", expires_in=10)
+        # An object that expires immediately is never cached.
+        cache.put("gone", "https://gone", expires_in=0)
+
+    with patch("fal_client._upload_cache.time.time", return_value=1030.0):
+        assert cache.get("default") == "https://default"
+        assert cache.get("short") is None
+        assert cache.get("gone") is None
+
+    with patch("fal_client._upload_cache.time.time", return_value=1060.0):
+        assert cache.get("default") is None
+
+
+def test_upload_cache_disk_store_is_shared(tmp_path):
+    UploadCache(directory=tmp_path).put("key", "https://file")
+
+    cache = UploadCache(directory=tmp_path)
+    assert cache.get("key") == "https://file"
+    cache.clear()
+    assert UploadCache(directory=tmp_path).get("key") is None
+
+
+def test_upload_cache_prunes_expired_entries_on_put(tmp_path):
+    cache = UploadCache(directory=tmp_path, ttl=60)
+    with patch("fal_client._upload_cache.time.time", return_value=1000.0):
+        cache.put("short", "https://short", expires_in=10)
+        cache.put("long", "https://long")
+
+    with patch("fal_client._upload_cache.time.time", return_value=1030.0):
+        assert sorted(path.stem for path in tmp_path.iterdir()) == ["long", "short"]
+
+    with patch("fal_client._upload_cache.time.time", return_value=1070.0):
+        cache.put("new", "https://new")
+
+    assert sorted(path.stem for path in tmp_path.iterdir()) == ["new"]
+    assert list(cache._entries) == ["new"]
+
+
+def test_sync_upload_cache_skips_repeated_uploads(tmp_path):
+    client = SyncClient(key="test-key", upload_cache=UploadCache())
+    file_path = tmp_path / "image.png"
+    file_path.write_bytes(b"same bytes")
+
+    with patch.object(
+        SyncClient, "_upload_single", return_value="https://file"
+    ) as mock_upload:
+        assert client.upload(b"same bytes", "image/png", "image.png") == "https://file"
+        assert client.upload(b"same bytes", "image/png", "image.png") == "https://file"
+        # Files are keyed by their content too.
+        assert client.upload_file(file_path) == "https://file"
+        assert mock_upload.call_count == 1
+
+        # Different options mean a different upload.
+        client.upload(b"same bytes", "image/jpeg", "image.png")
+        client.upload(b"same bytes", "image/png", "other.png")
+        client.upload(
+            b"same bytes",
+            "image/png",
+            "image.png",
+            lifecycle=StorageSettings(expires_in="1h"),
+        )
+        assert mock_upload.call_count == 4
+
+    assert (client.upload_cache.hits, client.upload_cache.misses) == (2, 4)
+
+
+def test_sync_upload_without_cache_always_uploads():
+    client = SyncClient(key="test-key")
+    with patch.object(
+        SyncClient, "_upload_single", return_value="https://file"
+    ) as mock_upload:
+        client.upload(b"same bytes", "image/png")
+        client.upload(b"same bytes", "image/png")
+
+    assert mock_upload.call_count == 2
+
+
+class _FakeAsyncTokenManager:
+    def __await__(self):
+        async def _return_self():
+            return self
+
+        return _return_self().__await__()
+
+
+@pytest.mark.asyncio
+async def test_async_upload_cache_skips_repeated_uploads():
+    client = AsyncClient(key="test-key", upload_cache=UploadCache())
+    client.__dict__["_token_manager"] = _FakeAsyncTokenManager()
+
+    with patch.object(
+        AsyncClient,
+        "_upload_single",
+        new_callable=AsyncMock,
+        return_value="https://file",
+    ) as mock_upload:
+        assert await client.upload(b"same bytes", "image/png") == "https://file"
+        assert await client.upload(b"same bytes", "image/png") == "https://file"
+
+    mock_upload.assert_awaited_once()
+    assert client.upload_cache.hits == 1